@@ -0,0 +1,63 @@
+# Неблокирующее чтение клавиш для режима реального времени
+# POSIX: терминал в режиме cbreak (клавиши приходят сразу, без Enter) + select
+# Windows: msvcrt.kbhit/getwch
+
+import os
+import sys
+import time
+from typing import List, Optional
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+    import select
+    import termios
+    import tty
+
+
+class KeyReader:
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdin
+        self._pending: List[str] = []
+        self._saved = None
+
+    def __enter__(self) -> "KeyReader":
+        if msvcrt is None:
+            fd = self.stream.fileno()
+            self._saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._saved is not None:
+            termios.tcsetattr(self.stream.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def read_key(self, timeout: float) -> Optional[str]:
+        # Ждет клавишу не дольше timeout секунд; None - клавиш не было
+        if self._pending:
+            return self._pending.pop(0)
+        if msvcrt is not None:
+            return self._read_windows(timeout)
+
+        fd = self.stream.fileno()
+        ready, _, _ = select.select([fd], [], [], max(0.0, timeout))
+        if not ready:
+            return None
+        data = os.read(fd, 64).decode("utf-8", errors="ignore")
+        if not data:
+            return None
+        self._pending.extend(data[1:])
+        return data[0]
+
+    def _read_windows(self, timeout: float) -> Optional[str]:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            if msvcrt.kbhit():
+                return msvcrt.getwch()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(0.002, remaining))
@@ -0,0 +1,195 @@
+# Сетевой режим консольной версии: игра на сервере app.py через HTTP API
+# Все вызовы идут по одному keep-alive соединению (golan_client.py), покупка
+# и статус отправляются конвейером, состояние приходит потоком SSE - экран
+# обновляется без опроса сервера
+
+import threading
+from typing import Dict, List, Optional
+
+from terminal_auction import Colors
+from renderer import TerminalRenderer
+from keyinput import KeyReader
+from golan_client import ApiError, GolanClient
+
+
+class OnlineGame:
+
+    def __init__(self, server: str, game_id: Optional[str] = None):
+        self.client = GolanClient(server, game_id)
+        self.renderer = TerminalRenderer()
+        self.state: Dict = {}
+        self.state_version = 0
+        self.user_id: Optional[int] = None
+        self.show_leaderboard = True
+        self.messages: List[str] = []
+        self.stream_error = ""
+        self._stop = threading.Event()
+        self._state_lock = threading.Lock()
+
+    def format_money(self, amount: int) -> str:
+        return f"{int(amount):,} ₽"
+
+    def add_message(self, text: str):
+        self.messages.append(text)
+        del self.messages[:-3]
+
+    def set_state(self, state: Dict):
+        with self._state_lock:
+            self.state = state
+            self.state_version += 1
+
+    def _read_stream(self):
+        # Фоновый поток: последнее состояние из SSE; при обрыве - переподключение
+        while not self._stop.is_set():
+            try:
+                for event, data, _ in self.client.stream(stop=self._stop):
+                    if event == "state" and isinstance(data, dict):
+                        self.set_state(data)
+                        self.stream_error = ""
+            except ApiError as e:
+                self.stream_error = str(e)
+            self._stop.wait(1.0)
+
+    def current_product(self) -> Optional[Dict]:
+        game = self.state.get("game") or {}
+        product_id = game.get("current_product_id")
+        return next((p for p in self.state.get("products", []) if p["id"] == product_id), None)
+
+    def user(self) -> Optional[Dict]:
+        return next((p for p in self.state.get("players", []) if p["id"] == self.user_id), None)
+
+    def compose_frame(self, menu: List[str]) -> List[str]:
+        game = self.state.get("game") or {}
+        lines = [
+            f"{Colors.BOLD}{Colors.PURPLE}" + "=" * 60 + Colors.END,
+            f"{Colors.BOLD}{Colors.PURPLE}🌐 ГОЛЛАНДСКИЙ АУКЦИОН GOLAN - СЕТЕВАЯ ИГРА 🌐{Colors.END}",
+            f"{Colors.BOLD}{Colors.PURPLE}" + "=" * 60 + Colors.END,
+            f"Сервер: {self.client.host_header}   Игра: {self.client.game_id or '-'}   "
+            f"Раунд: {game.get('current_round', 0)}   Статус: {game.get('status', '-')}",
+            "",
+        ]
+
+        product = self.current_product()
+        if product:
+            lines += [
+                f"{Colors.BOLD}{Colors.YELLOW}💎 ТЕКУЩИЙ ЛОТ{Colors.END}",
+                f"   🌸 Товар: {Colors.BOLD}{product['name']}{Colors.END}",
+                f"   📦 Количество: {Colors.CYAN}{product['quantity']} шт.{Colors.END}",
+                f"   💰 Текущая цена: {Colors.GREEN}{self.format_money(product['current_price'])}{Colors.END}",
+                f"   💸 Себестоимость: {Colors.RED}{self.format_money(product['cost'])}{Colors.END}",
+                "",
+            ]
+
+        user = self.user()
+        if user:
+            lines += [
+                f"{Colors.BOLD}ВАШ ПРОФИЛЬ{Colors.END}",
+                f"{Colors.CYAN}👤 {user['name']}{Colors.END}",
+                f"   💰 Баланс: {Colors.GREEN}{self.format_money(user['balance'])}{Colors.END}",
+                f"   📈 Прибыль: {Colors.BLUE}{self.format_money(user['total_profit'])}{Colors.END}",
+                f"   🛒 Покупки: {Colors.YELLOW}{user['purchases']}{Colors.END}",
+                "",
+            ]
+
+        if self.show_leaderboard:
+            players = sorted(self.state.get("players", []), key=lambda p: p["total_profit"], reverse=True)
+            lines += [f"{Colors.BOLD}{Colors.PURPLE}🏆 ТАБЛИЦА ЛИДЕРОВ{Colors.END}", "-" * 50]
+            for i, player in enumerate(players[:10], 1):
+                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+                you = " (вы)" if player["id"] == self.user_id else ""
+                lines.append(f"{medal} {player['name']}{you}: {self.format_money(player['total_profit'])}")
+            lines.append("")
+
+        lines += menu
+        lines.append(self.latency_line())
+        if self.stream_error:
+            lines.append(f"{Colors.RED}Поток состояния: {self.stream_error}{Colors.END}")
+        lines += self.messages[-3:]
+        return lines
+
+    def latency_line(self) -> str:
+        summary = self.client.latency.summary()
+        parts = [
+            f"{name} p50 {stats['p50']:.1f} / p99 {stats['p99']:.1f} мс"
+            for name, stats in summary.items() if name in ("buy", "status", "next-round")
+        ]
+        return f"{Colors.BLUE}⚡ {'   '.join(parts) or 'Задержки API появятся после первых вызовов'}{Colors.END}"
+
+    def start(self, name: str):
+        # Сначала start (выдает cookie сессии), затем имя и статус одним конвейером
+        started = self.client.start_game()
+        if not started or not started.get("success"):
+            raise ApiError((started or {}).get("message", "Не удалось начать игру"))
+        self.user_id = (started.get("user_data") or {}).get("id")
+        _, status = self.client.pipeline([self.client.set_name_call(name), self.client.status_call()])
+        if status.ok:
+            self.set_state(status.json())
+
+    def buy(self):
+        product = self.current_product()
+        if not product:
+            self.add_message(f"{Colors.YELLOW}Нет текущего лота - начните раунд{Colors.END}")
+            return
+        buy, status = self.client.pipeline([self.client.buy_call(product["id"]), self.client.status_call()])
+        result = buy.json() or {}
+        color = Colors.GREEN if result.get("success") else Colors.RED
+        self.add_message(f"{color}{result.get('message', f'HTTP {buy.status}')}{Colors.END}")
+        if status.ok:
+            self.set_state(status.json())
+
+    def next_round(self):
+        result = self.client.next_round() or {}
+        color = Colors.GREEN if result.get("success") else Colors.YELLOW
+        self.add_message(f"{color}{result.get('message', 'Раунд проведен')}{Colors.END}")
+
+    def run(self):
+        self.renderer.start()
+        try:
+            self.renderer.render([f"{Colors.CYAN}Подключение к {self.client.host_header}...{Colors.END}"])
+            name = self.renderer.prompt(2, f"{Colors.YELLOW}Введите ваше имя: {Colors.END}").strip()
+            self.start(name or "Игрок")
+            threading.Thread(target=self._read_stream, daemon=True).start()
+            self._play()
+        finally:
+            self._stop.set()
+            self.renderer.stop()
+            self.client.close()
+
+        print(f"{Colors.BOLD}Задержки вызовов API (мс):{Colors.END}")
+        for name, stats in self.client.latency.summary().items():
+            print(f"  {name:<12} n={stats['count']:<5} ошибок={stats['errors']:<3} "
+                  f"p50={stats['p50']:.2f} p95={stats['p95']:.2f} p99={stats['p99']:.2f} max={stats['max']:.2f}")
+        print(f"Соединений для вызовов: {self.client.connections_opened}")
+
+    def _play(self):
+        menu = [
+            f"{Colors.YELLOW}Клавиши:{Colors.END}",
+            "n - ▶️ следующий раунд   1/Пробел - 🛒 купить лот   3 - 📊 таблица лидеров   q - выход",
+        ]
+        shown_version = -1
+        with KeyReader() as keys:
+            while True:
+                if self.state_version != shown_version:
+                    shown_version = self.state_version
+                    self.renderer.render(self.compose_frame(menu))
+
+                key = keys.read_key(timeout=self.renderer.frame_interval)
+                if key is None:
+                    continue
+                if key == "q":
+                    break
+                try:
+                    if key in ("1", " "):
+                        self.buy()
+                    elif key == "n":
+                        self.next_round()
+                    elif key == "3":
+                        self.show_leaderboard = not self.show_leaderboard
+                except ApiError as e:
+                    self.add_message(f"{Colors.RED}Ошибка соединения: {e}{Colors.END}")
+                # Сообщение и задержка видны сразу, не дожидаясь потока
+                self.renderer.render(self.compose_frame(menu))
+
+
+def run_online(server: str, game_id: Optional[str] = None):
+    OnlineGame(server, game_id).run()
@@ -0,0 +1,169 @@
+# Инкрементальная отрисовка консольной версии
+# Экран хранится как буфер ячеек (стиль + символ); на каждом кадре в терминал
+# уходят только изменившиеся ячейки строки (ANSI-последовательности, без
+# os.system("clear") и без перерисовки всего экрана)
+
+import os
+import re
+import sys
+import time
+import shutil
+import unicodedata
+from typing import List, Optional, TextIO, Tuple
+
+CSI = "\033["
+RESET = "\033[0m"
+SGR_PATTERN = re.compile(r"\033\[[0-9;]*m")
+
+# Символы, ширину которых терминалы считают по-разному (эмодзи-селектор, ZWJ)
+UNCERTAIN_WIDTH = ("\ufe0f", "\u200d")
+
+# Ячейка: (стиль, символ с нулевыми модификаторами, ширина в колонках)
+Cell = Tuple[str, str, int]
+
+
+def enable_ansi() -> None:
+    # Windows 10+: включаем обработку ANSI-последовательностей в консоли
+    if os.name != "nt":
+        return
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (AttributeError, OSError):
+        pass
+
+
+def char_width(char: str) -> int:
+    if unicodedata.combining(char) or char in UNCERTAIN_WIDTH:
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+
+def split_cells(line: str, max_width: int) -> Tuple[List[Cell], int]:
+    # Возвращает ячейки строки (обрезанные по ширине терминала) и число ячеек
+    # в начале строки, для которых колонка на экране известна точно
+    cells: List[Cell] = []
+    exact = -1
+    style = ""
+    width = 0
+    position = 0
+    for match in SGR_PATTERN.finditer(line + RESET):
+        for char in line[position:match.start()]:
+            char_w = char_width(char)
+            if char_w == 0 and cells:
+                cell_style, text, cell_w = cells[-1]
+                cells[-1] = (cell_style, text + char, cell_w)
+                if char in UNCERTAIN_WIDTH and exact < 0:
+                    exact = len(cells) - 1
+                continue
+            if width + char_w > max_width:
+                return cells, len(cells) if exact < 0 else exact
+            cells.append((style, char, char_w))
+            width += char_w
+        code = match.group()
+        style = "" if code == RESET else style + code
+        position = match.end()
+    return cells, len(cells) if exact < 0 else exact
+
+
+class TerminalRenderer:
+
+    def __init__(self, stream: Optional[TextIO] = None, fps: int = 20):
+        self.stream = stream or sys.stdout
+        self.frame_interval = 1.0 / fps
+        self.frames = 0
+        self.bytes_written = 0
+        self._rows: List[List[Cell]] = []
+        self._next_frame = 0.0
+        self.active = False
+
+    def start(self) -> None:
+        # Альтернативный экран терминала, скрытый курсор, одна очистка за игру
+        enable_ansi()
+        self._write(f"{CSI}?1049h{CSI}?25l{CSI}2J{CSI}H")
+        self._rows = []
+        self._next_frame = time.monotonic()
+        self.active = True
+
+    def stop(self) -> None:
+        if self.active:
+            self._write(f"{RESET}{CSI}?25h{CSI}?1049l")
+            self.active = False
+
+    def invalidate(self, row: Optional[int] = None) -> None:
+        # Строка (или весь экран) будет перерисована на следующем кадре
+        if row is None:
+            self._write(f"{CSI}2J")
+            self._rows = []
+        elif row < len(self._rows):
+            self._rows[row] = None
+
+    def render(self, lines: List[str]) -> None:
+        columns = shutil.get_terminal_size((80, 24)).columns - 1
+        out = []
+        rows = []
+        for row, line in enumerate(lines):
+            cells, exact = split_cells(line, columns)
+            rows.append(cells)
+            old = self._rows[row] if row < len(self._rows) else None
+            if old == cells:
+                continue
+
+            # Первая отличающаяся ячейка; колонку до нее считаем по ширинам
+            start = 0
+            if old is not None:
+                limit = min(len(old), len(cells))
+                while start < limit and old[start] == cells[start]:
+                    start += 1
+                if start > exact:
+                    start = 0
+            column = sum(cell[2] for cell in cells[:start]) + 1
+            out.append(f"{CSI}{row + 1};{column}H{RESET}")
+            style = ""
+            for cell_style, text, _ in cells[start:]:
+                if cell_style != style:
+                    out.append(RESET + cell_style)
+                    style = cell_style
+                out.append(text)
+            out.append(f"{RESET}{CSI}K")
+
+        # Строки, которых больше нет в кадре, стираются
+        for row in range(len(lines), len(self._rows)):
+            out.append(f"{CSI}{row + 1};1H{CSI}K")
+
+        self._rows = rows
+        self.frames += 1
+        if out:
+            self._write("".join(out))
+
+    def wait_frame(self) -> None:
+        # Ровная частота кадров: ждем до следующей границы кадра
+        now = time.monotonic()
+        self._next_frame = max(self._next_frame + self.frame_interval, now)
+        delay = self._next_frame - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def prompt(self, row: int, text: str) -> str:
+        # Ввод строки в заданной строке экрана; эхо ввода портит эту и следующую
+        # строку буфера, поэтому они перерисовываются на следующем кадре
+        self._write(f"{CSI}{row + 1};1H{CSI}K{CSI}?25h")
+        try:
+            return input(text)
+        finally:
+            self._write(f"{CSI}?25l")
+            self.invalidate(row)
+            self.invalidate(row + 1)
+            if row + 1 >= shutil.get_terminal_size((80, 24)).lines:
+                # Ввод прокрутил экран - буфер больше не совпадает с экраном
+                self.invalidate()
+
+    def _write(self, data: str) -> None:
+        self.stream.write(data)
+        self.stream.flush()
+        self.bytes_written += len(data)
@@ -2,6 +2,15 @@
 import random
 import time
 import os
+import sys
+
+# Products, AI players and auction rules come from the shared core (auction_core)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from auction_core import (AuctionCore, Player, MATCH_CONTAINS, TERMINAL_CATALOG, TERMINAL_PLAYERS,
+                          build_players, build_products, drop_price)
+
+# Price step: 5% per tick
+PRICE_STEP = 0.05
 
 # Color
 RED = "\033[91m"
@@ -13,36 +22,9 @@ CYAN = "\033[96m"
 BOLD = "\033[1m"
 END = "\033[0m"
 
-# Products for game
-PRODUCTS = [
-    ("🌹 Розы", 15000, 8000),
-    ("🌻 Подсолнухи", 8000, 4000),
-    ("🌺 Орхидеи", 25000, 12000),
-    ("🌷 Тюльпаны", 12000, 6000),
-    ("🌸 Сакура", 30000, 15000),
-    ("🌼 Ромашки", 5000, 2500),
-    ("🌿 Лаванда", 10000, 5000),
-    ("🌺 Пионы", 18000, 9000),
-    ("🌻 Георгины", 14000, 7000),
-    ("🌷 Ирисы", 11000, 5500),
-    ("🌹 Гвоздики", 9000, 4500),
-    ("🌺 Лилии", 20000, 10000),
-]
-
-# Ai players
-AI_PLAYERS = [
-    ("Ваня", 150000, "Пионы", "Розы"),
-    ("Анастасия", 280000, "Розы", "Пионы"),
-    ("Игорь", 200000, "Орхидеи", "Ромашки"),
-    ("Марина", 120000, "Тюльпаны", "Георгины"),
-    ("Дмитрий", 300000, "Лаванда", "Лилии"),
-    ("Светлана", 175000, "Ирисы", "Гвоздики"),
-]
-
-
-# Clean terminal
+# Clean terminal (ANSI: cursor home + clear screen, no shell per frame)
 def clear():
-    os.system("cls" if os.name == "nt" else "clear")
+    print("\033[H\033[2J", end="", flush=True)
 
 
 # Showing the balance
@@ -56,28 +38,21 @@ def print_header():
     print(f"{'='*50}{END}")
 
 
-def ai_buy_decision(player, product_name, price): #Ai thinking about buying or not
-    name, balance, likes, dislikes = player
-    if balance < price:
-        return False
-    if likes in product_name:
-        return random.random() < 0.7
-    if dislikes in product_name:
-        return random.random() < 0.1
-    return random.random() < 0.3
-
-
 def main():
+    if os.name == "nt":
+        os.system("")  # Once: enables ANSI codes in the Windows console
     clear()
     print_header()
 
+    # Ai players think with the "simple" strategy: first one who agrees buys
+    core = AuctionCore(build_players(TERMINAL_PLAYERS, "simple"), build_products(TERMINAL_CATALOG),
+                       MATCH_CONTAINS)
+
     # Create user 
     user_name = input(f"{CYAN}Введите ваше имя: {END}").strip() or "Игрок"
-    user_balance = 200000
-    user_profit = 0
-    user_purchases = 0
+    user = Player(len(core.players) + 1, user_name, 200000, "", "")
 
-    print(f"\n{GREEN}Привет, {user_name}! У вас {format_money(user_balance)}{END}")
+    print(f"\n{GREEN}Привет, {user_name}! У вас {format_money(user.balance)}{END}")
     input(f"{YELLOW}Нажмите Enter для начала...{END}")
 
     # Play 5 rounds
@@ -87,8 +62,9 @@ def main():
         print(f"{BOLD}Раунд {round_num}/5{END}\n")
 
         # Choosing a product
-        product_name, start_price, cost = random.choice(PRODUCTS)
-        current_price = start_price
+        product = random.choice([p for p in core.products if p.is_available()])
+        product_name, start_price, cost = product.name, product.initial_price, product.cost
+        product.current_price = start_price
 
         print(f"{BOLD}{YELLOW}💎 ТОВАР: {product_name}{END}")
         print(f"💰 Начальная цена: {GREEN}{format_money(start_price)}{END}")
@@ -103,50 +79,45 @@ def main():
 
         # Showing usre
         print(f"{BOLD}👤 ВАШ ПРОФИЛЬ{END}")
-        print(f"💰 Баланс: {GREEN}{format_money(user_balance)}{END}")
-        profit_color = GREEN if user_profit >= 0 else RED
-        profit_sign = "+" if user_profit >= 0 else ""
+        print(f"💰 Баланс: {GREEN}{format_money(user.balance)}{END}")
+        profit_color = GREEN if user.total_profit >= 0 else RED
+        profit_sign = "+" if user.total_profit >= 0 else ""
         print(
-            f"📈 Прибыль: {profit_color}{profit_sign}{format_money(user_profit)}{END}"
+            f"📈 Прибыль: {profit_color}{profit_sign}{format_money(user.total_profit)}{END}"
         )
-        print(f"🛒 Покупки: {YELLOW}{user_purchases}{END}\n")
+        print(f"🛒 Покупки: {YELLOW}{user.purchases}{END}\n")
 
         # Auction
         winner = None
-        final_price = 0
 
-        while current_price > cost:
+        while product.current_price > cost:
+            current_price = product.current_price
             print(f"{BOLD}💰 Текущая цена: {GREEN}{format_money(current_price)}{END}")
 
             # User decision
             choice = input(f"\n{CYAN}1-Купить, 2-Ждать: {END}").strip()
 
             if choice == "1":
-                if user_balance >= current_price:
-                    # User buy 
-                    user_balance -= current_price
-                    profit_multiplier = 1.3  # 130% прибыли
-                    profit = current_price * profit_multiplier
-                    user_profit += profit
-                    user_purchases += 1
+                # User buy (profit = 130% of the price)
+                profit = core.sell(user, product)
+                if profit is not None:
                     winner = (user_name, current_price, profit)
                     break
                 else:
                     print(f"{RED}❌ Недостаточно средств!{END}")
 
             # Ai players choosing 
-            for player in AI_PLAYERS:
-                if ai_buy_decision(player, product_name, current_price):
-                    profit_multiplier = 1.3  # 130% прибыли
-                    profit = current_price * profit_multiplier
-                    winner = (player[0], current_price, profit)
+            for player in core.buyers_in_order(product, random):
+                profit = core.sell(player, product)
+                if profit is not None:
+                    winner = (player.name, current_price, profit)
                     break
 
             if winner:
                 break
 
             # Price lower 
-            current_price = int(current_price * 0.95)
+            drop_price(product, PRICE_STEP)
             time.sleep(0.5)
 
         # Round results
@@ -169,13 +140,13 @@ def main():
     print_header()
     print(f"{BOLD}{GREEN}🎉 ИГРА ЗАВЕРШЕНА! 🎉{END}\n")
     print(f"{BOLD}👤 ВАШИ РЕЗУЛЬТАТЫ:{END}")
-    print(f"💰 Финальный баланс: {GREEN}{format_money(user_balance)}{END}")
-    profit_color = GREEN if user_profit >= 0 else RED
-    profit_sign = "+" if user_profit >= 0 else ""
+    print(f"💰 Финальный баланс: {GREEN}{format_money(user.balance)}{END}")
+    profit_color = GREEN if user.total_profit >= 0 else RED
+    profit_sign = "+" if user.total_profit >= 0 else ""
     print(
-        f"📈 Общая прибыль: {profit_color}{profit_sign}{format_money(user_profit)}{END}"
+        f"📈 Общая прибыль: {profit_color}{profit_sign}{format_money(user.total_profit)}{END}"
     )
-    print(f"🛒 Покупок: {YELLOW}{user_purchases}{END}")
+    print(f"🛒 Покупок: {YELLOW}{user.purchases}{END}")
     print(f"\n{CYAN}Спасибо за игру! 👋{END}")
 
 
@@ -3,10 +3,17 @@ import random
 import time
 import os
 import sys
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import argparse
+from typing import List, Optional
 from datetime import datetime
 
+# Правила, товары и ИИ общие с веб-версией (пакет auction_core в корне проекта)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from auction_core import (AuctionCore, Player, Product, MATCH_CONTAINS, TERMINAL_CATALOG,
+                          TERMINAL_PLAYERS, build_players, build_products, drop_price, get_strategy)
+from renderer import CSI, TerminalRenderer
+from keyinput import KeyReader
+
 
 class Colors:
     RED = "\033[91m"
@@ -21,69 +28,32 @@ class Colors:
     END = "\033[0m"
 
 
-@dataclass
-class Product:
-    id: int
-    name: str
-    quantity: int
-    start_price: int
-    current_price: int
-    cost: int
-    description: str
-
-
-@dataclass
-class Player:
-    name: str
-    balance: int
-    total_profit: int
-    purchases: int
-    wants: str
-    no_wants: str
+# Шаг снижения цены консольной версии, ₽
+PRICE_STEP = 1000
 
 
 class DutchAuctionGame:
 
-    def __init__(self):
-        self.products = self._create_products()
-        self.players = self._create_players()
+    def __init__(self, strategy: str = "additive"):
+        # additive - исходное поведение консольной версии, см. auction_core/strategies.py
+        self.strategy = get_strategy(strategy)
+        self.players = build_players(TERMINAL_PLAYERS, self.strategy.name)
+        # Ядро видит все товары; self.products - лоты, которые еще в продаже
+        self.core = AuctionCore(self.players, build_products(TERMINAL_CATALOG), MATCH_CONTAINS)
+        self.products: List[Product] = list(self.core.products)
         self.current_round = 0
+        self.sold_count = 0
         self.current_product = None
         self.game_active = False
         self.user_player = None
-
-    def _create_products(self) -> List[Product]:
-        products = [
-            Product(
-                1, "🌹 Розы", 50, 15000, 15000, 8000, "Красные розы - символ любви"
-            ),
-            Product(2, "🌻 Подсолнухи", 30, 8000, 8000, 4000, "Яркие подсолнухи"),
-            Product(3, "🌺 Орхидеи", 20, 25000, 25000, 12000, "Экзотические орхидеи"),
-            Product(4, "🌷 Тюльпаны", 40, 12000, 12000, 6000, "Весенние тюльпаны"),
-            Product(5, "🌸 Сакура", 15, 30000, 30000, 15000, "Цветущая сакура"),
-            Product(6, "🌼 Ромашки", 60, 5000, 5000, 2500, "Простые ромашки"),
-            Product(7, "🌿 Лаванда", 35, 10000, 10000, 5000, "Ароматная лаванда"),
-            Product(8, "🌺 Пионы", 25, 18000, 18000, 9000, "Пышные пионы"),
-            Product(9, "🌻 Георгины", 30, 14000, 14000, 7000, "Крупные георгины"),
-            Product(10, "🌷 Ирисы", 40, 11000, 11000, 5500, "Элегантные ирисы"),
-            Product(11, "🌹 Гвоздики", 45, 9000, 9000, 4500, "Классические гвоздики"),
-            Product(12, "🌺 Лилии", 20, 20000, 20000, 10000, "Белые лилии"),
-        ]
-        return products
-
-    def _create_players(self) -> List[Player]:
-        players = [
-            Player("Ваня", 150000, 0, 0, "Пионы", "Розы"),
-            Player("Анастасия", 280000, 0, 0, "Розы", "Пионы"),
-            Player("Игорь", 200000, 0, 0, "Орхидеи", "Ромашки"),
-            Player("Марина", 120000, 0, 0, "Тюльпаны", "Георгины"),
-            Player("Дмитрий", 300000, 0, 0, "Лаванда", "Лилии"),
-            Player("Светлана", 175000, 0, 0, "Ирисы", "Гвоздики"),
-        ]
-        return players
+        self.renderer = TerminalRenderer()
+        self.show_leaderboard = True
+        self.messages: List[str] = []
+        self.latencies: List[float] = []
 
     def create_user_player(self, name: str) -> Player:
-        self.user_player = Player(name, 200000, 0, 0, "Розы", "Орхидеи")
+        # Пользователь не входит в игроков ядра: его не оценивают стратегии ИИ
+        self.user_player = Player(len(self.players) + 1, name, 200000, "Розы", "Орхидеи")
         return self.user_player
 
     def start_new_round(self) -> bool:
@@ -93,267 +63,452 @@ class DutchAuctionGame:
         self.current_round += 1
 
         self.current_product = random.choice(self.products)
-        self.current_product.current_price = self.current_product.start_price
+        self.current_product.current_price = self.current_product.initial_price
         self.game_active = True
 
         return True
 
-    def decrease_price(self, amount: int = 1000) -> bool:
+    def decrease_price(self, amount: int = PRICE_STEP) -> bool:
         if not self.current_product or not self.game_active:
             return False
 
-        self.current_product.current_price -= amount
-
-        if self.current_product.current_price <= self.current_product.cost:
-            self.current_product.current_price = self.current_product.cost
-            return False
-
-        return True
+        return drop_price(self.current_product, amount)
 
     def buy_product(self, player: Player) -> bool:
         if not self.current_product or not self.game_active:
             return False
 
-        if player.balance < self.current_product.current_price:
+        if self.core.sell(player, self.current_product) is None:
             return False
 
-        player.balance -= self.current_product.current_price
-        profit_multiplier = 1.3
-        profit = self.current_product.current_price * profit_multiplier
-        player.total_profit += profit
-        player.purchases += 1
-
-        self.current_product.quantity -= 1
-
-        if self.current_product.quantity <= 0:
+        self.sold_count += 1
+        if not self.current_product.is_available():
             self.products.remove(self.current_product)
 
         self.game_active = False
         return True
 
+    def set_player_strategies(self, names: List[str]):
+        # Стратегии ИИ-игроков по местам (для турниров ботов)
+        for player, name in zip(self.players, names):
+            player.strategy = name
+        self.core.rebuild_strategies()
+
     def get_ai_decision(self, player: Player) -> bool:
         if not self.current_product:
             return False
 
-        can_afford = player.balance >= self.current_product.current_price
-        good_price = (
-            self.current_product.current_price <= self.current_product.start_price * 0.7
-        )
+        context = self.core.bid_context(self.current_product)
+        index = self.core.player_slots[player.id]
+        return bool(get_strategy(player.strategy).evaluate(context, [index], random))
 
-        likes_product = player.wants.lower() in self.current_product.name.lower()
-        dislikes_product = player.no_wants.lower() in self.current_product.name.lower()
-        buy_probability = 0.1
+    def get_ai_buyers(self) -> List[Player]:
+        # Каждая стратегия оценивает свою группу ИИ-игроков одним вызовом
+        if not self.current_product:
+            return []
 
-        if can_afford:
-            buy_probability += 0.3
-        if good_price:
-            buy_probability += 0.2
-        if likes_product:
-            buy_probability += 0.3
-        if dislikes_product:
-            buy_probability -= 0.2
+        return self.core.buyers_in_order(self.current_product, random)
 
-        return random.random() < buy_probability
+    def play_headless(self, max_rounds: int = 10, max_ticks: int = 100) -> int:
+        # Игра только ИИ-игроков без экрана и ввода (турниры, бенчмарки)
+        # Returns: число проданных лотов
+        sold = 0
+        for _ in range(max_rounds):
+            if not self.start_new_round():
+                break
+            for _ in range(max_ticks):
+                if not self.decrease_price():
+                    break
+                buyers = self.get_ai_buyers()
+                if buyers and self.buy_product(buyers[0]):
+                    sold += 1
+                    break
+        self.game_active = False
+        return sold
 
     def format_money(self, amount: int) -> str:
         return f"{amount:,} ₽"
 
     def clear_screen(self):
-        os.system("cls" if os.name == "nt" else "clear")
-
-    def print_header(self):
-        print(f"{Colors.BOLD}{Colors.PURPLE}")
-        print("=" * 60)
-        print("🔥 ГОЛЛАНДСКИЙ АУКЦИОН GOLAN - КОНСОЛЬНАЯ ВЕРСИЯ 🔥")
-        print("=" * 60)
-        print(f"{Colors.END}")
+        # Полная очистка без запуска оболочки (os.system) - только ANSI
+        if self.renderer.active:
+            self.renderer.invalidate()
+        else:
+            print(f"{CSI}H{CSI}2J", end="", flush=True)
+
+    def header_lines(self) -> List[str]:
+        return [
+            f"{Colors.BOLD}{Colors.PURPLE}" + "=" * 60 + Colors.END,
+            f"{Colors.BOLD}{Colors.PURPLE}🔥 ГОЛЛАНДСКИЙ АУКЦИОН GOLAN - КОНСОЛЬНАЯ ВЕРСИЯ 🔥{Colors.END}",
+            f"{Colors.BOLD}{Colors.PURPLE}" + "=" * 60 + Colors.END,
+            "",
+        ]
 
-    def print_player_info(self, player: Player):
-        print(f"{Colors.CYAN}👤 {player.name}{Colors.END}")
-        print(
-            f"   💰 Баланс: {Colors.GREEN}{self.format_money(player.balance)}{Colors.END}"
-        )
-        print(
-            f"   📈 Прибыль: {Colors.BLUE}{self.format_money(player.total_profit)}{Colors.END}"
-        )
-        print(f"   🛒 Покупки: {Colors.YELLOW}{player.purchases}{Colors.END}")
-        print(f"   ❤️  Любит: {Colors.RED}{player.wants}{Colors.END}")
-        print(f"   💔 Не любит: {Colors.RED}{player.no_wants}{Colors.END}")
-        print()
+    def player_lines(self, player: Player) -> List[str]:
+        return [
+            f"{Colors.CYAN}👤 {player.name}{Colors.END}",
+            f"   💰 Баланс: {Colors.GREEN}{self.format_money(player.balance)}{Colors.END}",
+            f"   📈 Прибыль: {Colors.BLUE}{self.format_money(player.total_profit)}{Colors.END}",
+            f"   🛒 Покупки: {Colors.YELLOW}{player.purchases}{Colors.END}",
+            f"   ❤️  Любит: {Colors.RED}{player.wants}{Colors.END}",
+            f"   💔 Не любит: {Colors.RED}{player.no_wants}{Colors.END}",
+            "",
+        ]
 
-    def print_product_info(self):
+    def product_lines(self, price: Optional[int] = None) -> List[str]:
         if not self.current_product:
-            return
+            return []
 
-        print(f"{Colors.BOLD}{Colors.YELLOW}💎 ТЕКУЩИЙ ЛОТ{Colors.END}")
-        print(f"   🌸 Товар: {Colors.BOLD}{self.current_product.name}{Colors.END}")
-        print(
-            f"   📦 Количество: {Colors.CYAN}{self.current_product.quantity} шт.{Colors.END}"
-        )
-        print(
-            f"   💰 Текущая цена: {Colors.GREEN}{self.format_money(self.current_product.current_price)}{Colors.END}"
-        )
-        print(
-            f"   💸 Себестоимость: {Colors.RED}{self.format_money(self.current_product.cost)}{Colors.END}"
-        )
-        potential_profit = (
-            self.current_product.cost - self.current_product.current_price
-        )
+        product = self.current_product
+        if price is None:
+            price = product.current_price
+        potential_profit = product.cost - price
         profit_color = Colors.GREEN if potential_profit >= 0 else Colors.RED
         profit_sign = "+" if potential_profit >= 0 else ""
-        print(
-            f"   📈 Потенциальная прибыль: {profit_color}{profit_sign}{self.format_money(potential_profit)}{Colors.END}"
-        )
-        print(f"   💡 Прибыль = Цена покупки × 1.3 (130%)")
-        print(f"   📝 Описание: {self.current_product.description}")
-        print()
+        return [
+            f"{Colors.BOLD}{Colors.YELLOW}💎 ТЕКУЩИЙ ЛОТ{Colors.END}",
+            f"   🌸 Товар: {Colors.BOLD}{product.name}{Colors.END}",
+            f"   📦 Количество: {Colors.CYAN}{product.quantity} шт.{Colors.END}",
+            f"   💰 Текущая цена: {Colors.GREEN}{self.format_money(price)}{Colors.END}",
+            f"   💸 Себестоимость: {Colors.RED}{self.format_money(product.cost)}{Colors.END}",
+            f"   📈 Потенциальная прибыль: {profit_color}{profit_sign}{self.format_money(potential_profit)}{Colors.END}",
+            f"   💡 Прибыль = Цена покупки × 1.3 (130%)",
+            f"   📝 Описание: {product.description}",
+            "",
+        ]
 
-    def print_leaderboard(self):
+    def leaderboard_lines(self) -> List[str]:
         sorted_players = sorted(
             self.players + ([self.user_player] if self.user_player else []),
             key=lambda p: p.total_profit,
             reverse=True,
         )
 
-        print(f"{Colors.BOLD}{Colors.PURPLE}🏆 ТАБЛИЦА ЛИДЕРОВ{Colors.END}")
-        print("-" * 50)
+        lines = [f"{Colors.BOLD}{Colors.PURPLE}🏆 ТАБЛИЦА ЛИДЕРОВ{Colors.END}", "-" * 50]
         for i, player in enumerate(sorted_players, 1):
             medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
             profit_color = Colors.GREEN if player.total_profit >= 0 else Colors.RED
             profit_sign = "+" if player.total_profit >= 0 else ""
-            print(
+            lines.append(
                 f"{medal} {player.name}: {profit_color}{profit_sign}{self.format_money(player.total_profit)}{Colors.END}"
             )
-        print()
+        lines.append("")
+        return lines
+
+    def print_header(self):
+        print("\n".join(self.header_lines()))
+
+    def print_player_info(self, player: Player):
+        print("\n".join(self.player_lines(player)))
+
+    def print_product_info(self):
+        if self.current_product:
+            print("\n".join(self.product_lines()))
+
+    def print_leaderboard(self):
+        print("\n".join(self.leaderboard_lines()))
+
+    def compose_frame(self, title: str, price: Optional[int] = None,
+                      menu: Optional[List[str]] = None, status: str = "") -> List[str]:
+        # Кадр: заголовок, лот с ценой, профиль, таблица лидеров, меню, сообщения
+        lines = self.header_lines() + [title, ""]
+        lines += self.product_lines(price)
+        lines += [f"{Colors.BOLD}ВАШ ПРОФИЛЬ{Colors.END}"] + self.player_lines(self.user_player)
+        if self.show_leaderboard:
+            lines += self.leaderboard_lines()
+        lines += menu or [
+            f"{Colors.YELLOW}Ваши действия:{Colors.END}",
+            "1. 🛒 Купить товар   2. ⏳ Ждать снижения цены   "
+            "3. 📊 Таблица лидеров   4. ❌ Пропустить раунд",
+        ]
+        lines += [status]
+        lines += self.messages[-3:]
+        return lines
+
+    def add_message(self, text: str):
+        self.messages.append(text)
+        del self.messages[:-3]
+
+    def animate_price(self, title: str, old_price: int, new_price: int, duration: float = 0.5):
+        # Цена "стекает" до нового значения с ровной частотой кадров;
+        # каждый кадр меняет только ячейки цены и прибыли
+        frames = max(1, int(duration / self.renderer.frame_interval))
+        for frame in range(1, frames + 1):
+            price = old_price + (new_price - old_price) * frame // frames
+            self.renderer.render(self.compose_frame(title, price))
+            self.renderer.wait_frame()
+
+    def prompt(self, title: str, text: str) -> str:
+        lines = self.compose_frame(title)
+        self.renderer.render(lines)
+        return self.renderer.prompt(len(lines) + 1, text).strip()
 
     def run_game(self):
-        self.clear_screen()
+        self.renderer.start()
+        try:
+            self._play()
+        finally:
+            self.renderer.stop()
+
+        self.print_results()
+
+    def print_results(self):
+        # Итоги печатаются в обычный экран терминала, чтобы остаться после выхода
         self.print_header()
+        print(f"{Colors.BOLD}{Colors.GREEN}🎉 ИГРА ЗАВЕРШЕНА! 🎉{Colors.END}\n")
+
+        print(f"{Colors.BOLD}📊 ФИНАЛЬНЫЕ РЕЗУЛЬТАТЫ:{Colors.END}")
+        self.print_leaderboard()
+
+        if self.user_player:
+            print(f"{Colors.BOLD}👤 ВАШИ РЕЗУЛЬТАТЫ:{Colors.END}")
+            self.print_player_info(self.user_player)
+
+        print(f"{Colors.CYAN}Спасибо за игру! До свидания! 👋{Colors.END}")
+
+    def run_realtime(self, tick_interval: float = 0.7):
+        # Режим реального времени: цена снижается сама каждые tick_interval
+        # секунд, клавиши читаются без блокировки и без Enter
+        self.renderer.start()
+        try:
+            self._play_realtime(tick_interval)
+        finally:
+            self.renderer.stop()
+
+        self.print_results()
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            median = latencies[len(latencies) // 2]
+            print(
+                f"{Colors.BLUE}⚡ Задержка ввод→покупка на экране: медиана {median:.2f} мс, "
+                f"максимум {latencies[-1]:.2f} мс ({len(latencies)} покупок){Colors.END}"
+            )
+
+    def _play_realtime(self, tick_interval: float):
+        welcome = self.header_lines() + [
+            f"{Colors.CYAN}Добро пожаловать в Голландский Аукцион!{Colors.END}",
+            f"{Colors.YELLOW}Цена снижается сама - успейте купить раньше ИИ.{Colors.END}",
+        ]
+        self.renderer.render(welcome)
+        user_name = self.renderer.prompt(
+            len(welcome) + 1, f"{Colors.YELLOW}Введите ваше имя: {Colors.END}"
+        ).strip()
+        self.create_user_player(user_name or "Игрок")
+        self.clear_screen()
+
+        menu = [
+            f"{Colors.YELLOW}Клавиши:{Colors.END}",
+            "1/Пробел - 🛒 купить   3 - 📊 таблица лидеров   4 - ❌ пропустить раунд   q - выход",
+        ]
+        max_rounds = 10
+        round_count = 0
+
+        with KeyReader() as keys:
+            while round_count < max_rounds and self.products:
+                if not self.start_new_round():
+                    break
+                round_count += 1
+                title = f"{Colors.BOLD}Раунд {round_count}/{max_rounds}{Colors.END}"
+                self.messages = []
+
+                if not self._realtime_round(keys, title, menu, tick_interval):
+                    break
+
+                self.show_leaderboard = True
+                if round_count < max_rounds and self.products:
+                    self.add_message(f"{Colors.YELLOW}Любая клавиша - следующий раунд{Colors.END}")
+                    self.renderer.render(self.compose_frame(title, menu=menu))
+                    if keys.read_key(timeout=60.0) == "q":
+                        break
+
+    def _realtime_round(self, keys: KeyReader, title: str, menu: List[str],
+                        tick_interval: float) -> bool:
+        # Цикл событий раунда: клавиши, тики цены и кадры по своим дедлайнам
+        # Returns: False, если игрок вышел из игры
+        now = time.monotonic()
+        next_tick = now + tick_interval
+        next_frame = now
+
+        while self.game_active:
+            now = time.monotonic()
+            if now >= next_frame:
+                countdown = max(0.0, next_tick - now)
+                status = f"⏱️ Следующее снижение через {countdown:.1f} с"
+                if self.latencies:
+                    status += f"   ⚡ Ввод→покупка: {self.latencies[-1]:.2f} мс"
+                self.renderer.render(self.compose_frame(title, menu=menu, status=status))
+                next_frame = max(next_frame + self.renderer.frame_interval, now)
+
+            key = keys.read_key(timeout=min(next_tick, next_frame) - time.monotonic())
+            if key is not None:
+                key_time = time.perf_counter()
+                if key == "q":
+                    return False
+                if key in ("1", " "):
+                    # Покупка по живой цене в момент чтения клавиши
+                    price = self.current_product.current_price
+                    if self.buy_product(self.user_player):
+                        self.add_message(
+                            f"{Colors.GREEN}🎉 Вы купили {self.current_product.name} за {self.format_money(price)}!{Colors.END}"
+                        )
+                        # Задержка от чтения клавиши до покупки на экране
+                        self.renderer.render(self.compose_frame(title, menu=menu))
+                        self.latencies.append((time.perf_counter() - key_time) * 1000)
+                        break
+                    else:
+                        self.add_message(f"{Colors.RED}❌ Недостаточно средств!{Colors.END}")
+                elif key == "3":
+                    self.show_leaderboard = not self.show_leaderboard
+                elif key == "4":
+                    self.add_message(f"{Colors.YELLOW}⏭️ Раунд пропущен{Colors.END}")
+                    self.game_active = False
+                # Реакция на клавишу видна сразу, не дожидаясь следующего кадра
+                next_frame = time.monotonic()
+                continue
+
+            if time.monotonic() >= next_tick:
+                next_tick += tick_interval
+                if not self.decrease_price():
+                    self.add_message(f"{Colors.RED}❌ Цена достигла минимума!{Colors.END}")
+                    self.game_active = False
+                    break
+                # ИИ оценивает каждый тик цены
+                for player in self.get_ai_buyers():
+                    if self.buy_product(player):
+                        self.add_message(f"{Colors.CYAN}🤖 {player.name} купил товар!{Colors.END}")
+                        break
+
+        self.renderer.render(self.compose_frame(title, menu=menu))
+        return True
 
-        print(f"{Colors.CYAN}Добро пожаловать в Голландский Аукцион!{Colors.END}")
-        user_name = input(f"{Colors.YELLOW}Введите ваше имя: {Colors.END}").strip()
+    def _play(self):
+        welcome = self.header_lines() + [
+            f"{Colors.CYAN}Добро пожаловать в Голландский Аукцион!{Colors.END}"
+        ]
+        self.renderer.render(welcome)
+        user_name = self.renderer.prompt(
+            len(welcome) + 1, f"{Colors.YELLOW}Введите ваше имя: {Colors.END}"
+        ).strip()
         if not user_name:
             user_name = "Игрок"
 
         self.create_user_player(user_name)
 
-        print(
-            f"\n{Colors.GREEN}Привет, {user_name}! У вас есть {self.format_money(self.user_player.balance)}{Colors.END}"
+        welcome.append(
+            f"{Colors.GREEN}Привет, {user_name}! У вас есть {self.format_money(self.user_player.balance)}{Colors.END}"
+        )
+        self.renderer.render(welcome)
+        self.renderer.prompt(
+            len(welcome) + 1, f"{Colors.YELLOW}Нажмите Enter для начала игры...{Colors.END}"
         )
-        input(f"{Colors.YELLOW}Нажмите Enter для начала игры...{Colors.END}")
+        self.clear_screen()
 
         round_count = 0
         max_rounds = 10
 
         while round_count < max_rounds and self.products:
-            self.clear_screen()
-            self.print_header()
-
             if not self.start_new_round():
                 break
 
             round_count += 1
-            print(f"{Colors.BOLD}Раунд {round_count}/{max_rounds}{Colors.END}\n")
-
-            self.print_product_info()
-
-            print(f"{Colors.BOLD}ВАШ ПРОФИЛЬ{Colors.END}")
-            self.print_player_info(self.user_player)
+            title = f"{Colors.BOLD}Раунд {round_count}/{max_rounds}{Colors.END}"
+            self.messages = []
 
             auction_active = True
             price_decrease_count = 0
 
             while auction_active and self.current_product:
-                print(
-                    f"{Colors.BOLD}💰 Текущая цена: {Colors.GREEN}{self.format_money(self.current_product.current_price)}{Colors.END}"
+                choice = self.prompt(
+                    title, f"{Colors.CYAN}Выберите действие (1-4): {Colors.END}"
                 )
 
-                print(f"\n{Colors.YELLOW}Ваши действия:{Colors.END}")
-                print("1. 🛒 Купить товар")
-                print("2. ⏳ Ждать снижения цены")
-                print("3. 📊 Показать таблицу лидеров")
-                print("4. ❌ Пропустить раунд")
-
-                choice = input(
-                    f"\n{Colors.CYAN}Выберите действие (1-4): {Colors.END}"
-                ).strip()
-
                 if choice == "1":
+                    price = self.current_product.current_price
                     if self.buy_product(self.user_player):
-                        print(
-                            f"\n{Colors.GREEN}🎉 Поздравляем! Вы купили {self.current_product.name} за {self.format_money(self.current_product.current_price)}!{Colors.END}"
+                        self.add_message(
+                            f"{Colors.GREEN}🎉 Поздравляем! Вы купили {self.current_product.name} за {self.format_money(price)}!{Colors.END}"
                         )
-                        profit = (
-                            self.current_product.cost
-                            - self.current_product.current_price
-                        )
-                        print(
+                        profit = self.current_product.cost - price
+                        self.add_message(
                             f"{Colors.BLUE}💰 Ваша прибыль: {self.format_money(profit)}{Colors.END}"
                         )
                         auction_active = False
                     else:
-                        print(f"\n{Colors.RED}❌ Недостаточно средств!{Colors.END}")
+                        self.add_message(f"{Colors.RED}❌ Недостаточно средств!{Colors.END}")
 
                 elif choice == "2":
+                    old_price = self.current_product.current_price
                     if self.decrease_price():
-                        print(f"\n{Colors.YELLOW}⏳ Цена снижается...{Colors.END}")
+                        self.add_message(f"{Colors.YELLOW}⏳ Цена снижается...{Colors.END}")
                         price_decrease_count += 1
+                        self.animate_price(title, old_price, self.current_product.current_price)
 
-                        for player in self.players:
-                            if self.get_ai_decision(player) and self.buy_product(
-                                player
-                            ):
-                                print(
+                        for player in self.get_ai_buyers():
+                            if self.buy_product(player):
+                                self.add_message(
                                     f"{Colors.CYAN}🤖 {player.name} купил товар!{Colors.END}"
                                 )
                                 auction_active = False
                                 break
                     else:
-                        print(f"\n{Colors.RED}❌ Цена достигла минимума!{Colors.END}")
+                        self.add_message(f"{Colors.RED}❌ Цена достигла минимума!{Colors.END}")
                         auction_active = False
 
                 elif choice == "3":
-                    self.print_leaderboard()
-                    input(
-                        f"{Colors.YELLOW}Нажмите Enter для продолжения...{Colors.END}"
-                    )
+                    self.show_leaderboard = not self.show_leaderboard
 
                 elif choice == "4":
-                    print(f"\n{Colors.YELLOW}⏭️ Раунд пропущен{Colors.END}")
+                    self.add_message(f"{Colors.YELLOW}⏭️ Раунд пропущен{Colors.END}")
                     auction_active = False
 
                 else:
-                    print(f"\n{Colors.RED}❌ Неверный выбор!{Colors.END}")
-
-                if auction_active:
-                    time.sleep(0.5)
+                    self.add_message(f"{Colors.RED}❌ Неверный выбор!{Colors.END}")
 
             if not auction_active:
-                print(f"\n{Colors.BOLD}📊 Результат раунда:{Colors.END}")
-                self.print_leaderboard()
+                self.show_leaderboard = True
+                self.add_message(f"{Colors.BOLD}📊 Результат раунда - в таблице лидеров{Colors.END}")
 
                 if round_count < max_rounds and self.products:
-                    input(
-                        f"{Colors.YELLOW}Нажмите Enter для следующего раунда...{Colors.END}"
+                    self.prompt(
+                        title, f"{Colors.YELLOW}Нажмите Enter для следующего раунда...{Colors.END}"
                     )
-
-        self.clear_screen()
-        self.print_header()
-        print(f"{Colors.BOLD}{Colors.GREEN}🎉 ИГРА ЗАВЕРШЕНА! 🎉{Colors.END}\n")
-
-        print(f"{Colors.BOLD}📊 ФИНАЛЬНЫЕ РЕЗУЛЬТАТЫ:{Colors.END}")
-        self.print_leaderboard()
-
-        print(f"{Colors.BOLD}👤 ВАШИ РЕЗУЛЬТАТЫ:{Colors.END}")
-        self.print_player_info(self.user_player)
-
-        print(f"{Colors.CYAN}Спасибо за игру! До свидания! 👋{Colors.END}")
+                else:
+                    self.renderer.render(self.compose_frame(title))
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Голландский аукцион Golan - консольная версия")
+    parser.add_argument("--classic", action="store_true",
+                        help="Пошаговый режим: цена снижается только по команде игрока")
+    parser.add_argument("--tick", type=float, default=0.7,
+                        help="Секунд между снижениями цены в режиме реального времени")
+    parser.add_argument("--strategy", default="additive",
+                        help="Стратегия ИИ-игроков (см. auction_core/strategies.py)")
+    parser.add_argument("--server",
+                        help="Играть на сервере app.py по HTTP API (например, http://localhost:5000)")
+    parser.add_argument("--game", help="ID игры на сервере (сетевой режим)")
+    args = parser.parse_args()
+
+    if args.server:
+        if not sys.stdin.isatty():
+            parser.error("Сетевой режим работает только в терминале")
+        from online import run_online
+
+        try:
+            run_online(args.server, args.game)
+        except KeyboardInterrupt:
+            print(f"\n\n{Colors.RED}Игра прервана пользователем{Colors.END}")
+        except Exception as e:
+            print(f"\n\n{Colors.RED}Ошибка: {e}{Colors.END}")
+        return
+
     try:
-        game = DutchAuctionGame()
-        game.run_game()
+        game = DutchAuctionGame(args.strategy)
+        # Без терминала (ввод из файла или канала) работает только пошаговый режим
+        if args.classic or not sys.stdin.isatty():
+            game.run_game()
+        else:
+            game.run_realtime(args.tick)
     except KeyboardInterrupt:
         print(f"\n\n{Colors.RED}Игра прервана пользователем{Colors.END}")
     except Exception as e:
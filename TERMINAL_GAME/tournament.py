@@ -0,0 +1,169 @@
+# Турнир ботов: игры только ИИ-игроков на всех ядрах с рейтингом Эло
+#
+# Каждая игра - DutchAuctionGame.play_headless() с отдельной стратегией на
+# каждом месте. Игры раздаются процессам пачками, обратно возвращаются только
+# стратегии мест и прибыли; рейтинг Эло считается в главном процессе в порядке
+# номеров игр, поэтому результат с тем же --seed воспроизводим при любом
+# числе процессов.
+#
+# Запуск:
+#     python tournament.py --games 100000 --workers 8
+
+import os
+import json
+import time
+import random
+import argparse
+from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+from terminal_auction import DutchAuctionGame
+from auction_core import available_strategies
+
+# Результат игры: (стратегии по местам, прибыли по местам)
+GameResult = Tuple[Tuple[str, ...], Tuple[float, ...]]
+
+ELO_START = 1500.0
+ELO_K = 16.0
+
+
+def seat_lineup(rng: random.Random, strategies: List[str], seats: int) -> List[str]:
+    # Места заполняются по кругу со случайным сдвигом и перемешиваются:
+    # каждая стратегия получает почти поровну мест
+    offset = rng.randrange(len(strategies))
+    lineup = [strategies[(offset + i) % len(strategies)] for i in range(seats)]
+    rng.shuffle(lineup)
+    return lineup
+
+
+def play_chunk(first_game: int, count: int, seed: int, strategies: List[str],
+               max_rounds: int) -> List[GameResult]:
+    results = []
+    for number in range(first_game, first_game + count):
+        # Своя последовательность случайных чисел у каждой игры
+        rng = random.Random(seed * 1_000_003 + number)
+        random.seed(rng.random())
+        game = DutchAuctionGame()
+        lineup = seat_lineup(rng, strategies, len(game.players))
+        game.set_player_strategies(lineup)
+        game.play_headless(max_rounds)
+        results.append((tuple(lineup), tuple(p.total_profit for p in game.players)))
+    return results
+
+
+class EloTable:
+
+    def __init__(self, strategies: List[str]):
+        self.ratings = {name: ELO_START for name in strategies}
+        self.games = {name: 0 for name in strategies}
+        self.wins = {name: 0 for name in strategies}
+        self.profit = {name: 0.0 for name in strategies}
+
+    def record(self, lineup: Tuple[str, ...], profits: Tuple[float, ...]):
+        # Игра на n мест - все пары мест как отдельные встречи с весом K / (n - 1)
+        seats = len(lineup)
+        best = max(profits)
+        for name, profit in zip(lineup, profits):
+            self.games[name] += 1
+            self.profit[name] += profit
+            if profit == best:
+                self.wins[name] += 1
+
+        ratings = self.ratings
+        k = ELO_K / (seats - 1)
+        deltas = [0.0] * seats
+        for a in range(seats):
+            for b in range(a + 1, seats):
+                name_a, name_b = lineup[a], lineup[b]
+                if name_a == name_b:
+                    continue
+                expected = 1.0 / (1.0 + 10 ** ((ratings[name_b] - ratings[name_a]) / 400))
+                if profits[a] > profits[b]:
+                    score = 1.0
+                elif profits[a] < profits[b]:
+                    score = 0.0
+                else:
+                    score = 0.5
+                deltas[a] += k * (score - expected)
+                deltas[b] -= k * (score - expected)
+        for name, delta in zip(lineup, deltas):
+            ratings[name] += delta
+
+    def rows(self) -> List[Dict]:
+        rows = []
+        for name in self.ratings:
+            games = self.games[name] or 1
+            rows.append({
+                "strategy": name,
+                "elo": round(self.ratings[name], 1),
+                "seats": self.games[name],
+                "win_rate": round(self.wins[name] / games, 4),
+                "avg_profit": round(self.profit[name] / games, 1),
+            })
+        rows.sort(key=lambda row: row["elo"], reverse=True)
+        return rows
+
+
+def run_tournament(games: int, strategies: List[str], workers: int, seed: int,
+                   chunk_size: int = 2000, max_rounds: int = 10) -> Dict:
+    table = EloTable(strategies)
+    chunks = [(start, min(chunk_size, games - start)) for start in range(0, games, chunk_size)]
+    started = time.perf_counter()
+
+    if workers <= 1:
+        for start, count in chunks:
+            for lineup, profits in play_chunk(start, count, seed, strategies, max_rounds):
+                table.record(lineup, profits)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_chunk, start, count, seed, strategies, max_rounds)
+                       for start, count in chunks]
+            # Результаты учитываются в порядке игр, а не в порядке готовности
+            for future in futures:
+                for lineup, profits in future.result():
+                    table.record(lineup, profits)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "games": games,
+        "workers": workers,
+        "seed": seed,
+        "elapsed_s": round(elapsed, 3),
+        "games_per_hour": int(games / elapsed * 3600) if elapsed else 0,
+        "ratings": table.rows(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Турнир ботов голландского аукциона")
+    parser.add_argument("--games", type=int, default=20000, help="Число игр")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Процессов")
+    parser.add_argument("--strategies", default=",".join(available_strategies()),
+                        help="Стратегии через запятую")
+    parser.add_argument("--seed", type=int, default=1, help="Зерно случайных чисел")
+    parser.add_argument("--rounds", type=int, default=10, help="Раундов в игре")
+    parser.add_argument("--json", help="Сохранить результат в JSON-файл")
+    args = parser.parse_args()
+
+    strategies = [name.strip() for name in args.strategies.split(",") if name.strip()]
+    unknown = [name for name in strategies if name not in available_strategies()]
+    if unknown or not strategies:
+        parser.error(f"Неизвестные стратегии: {', '.join(unknown)}")
+
+    result = run_tournament(args.games, strategies, args.workers, args.seed,
+                            max_rounds=args.rounds)
+
+    print(f"Игр: {result['games']}, процессов: {result['workers']}, "
+          f"время: {result['elapsed_s']} с, игр в час: {result['games_per_hour']:,}")
+    print(f"{'Стратегия':<12} {'Эло':>7} {'Мест':>8} {'Побед':>7} {'Прибыль':>11}")
+    for row in result["ratings"]:
+        print(f"{row['strategy']:<12} {row['elo']:>7} {row['seats']:>8} "
+              f"{row['win_rate']:>7.1%} {row['avg_profit']:>11,.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+📈 АНАЛИТИКА РЫНКА GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Аналитика по товарам, которая обновляется при каждой сделке
+и каждом лоте, а не пересчитывается по истории
+Особенности:
+- Цены сделок: счетчики, сумма, минимум, максимум, последняя цена
+- Ряд цен сделок с прореживанием: не больше max_points точек на товар;
+  когда ряд заполнен, соседние точки сливаются попарно, и каждая новая
+  точка покрывает вдвое больше сделок (память постоянная, запись - O(1)
+  в среднем)
+- Гистограмма числа снижений цены до продажи - фиксированные корзины
+- Продаваемость: лоты выставлены / проданы / не проданы
+- Запрос сводки - O(товаров × точек ряда), без обхода сделок
+- Состояние сохраняется словарем (to_dict / from_dict) в снимке и архиве
+  игры вместе с журналом сделок
+"""
+
+class PriceSeries:
+    """
+    Ряд цен сделок с прореживанием
+
+    Точка: [номер первой сделки, раунд последней сделки, минимум, максимум,
+    сумма цен, число сделок]. В точке не больше span сделок.
+
+    Args:
+        max_points: Наибольшее число точек (четное)
+    """
+
+    def __init__(self, max_points=64):
+        self.max_points = max(2, max_points + max_points % 2)
+        self.span = 1
+        self.points = []
+        self.sales = 0
+
+    def add(self, price, round_number):
+        """Добавляет сделку"""
+        points = self.points
+        last = points[-1] if points else None
+        if last is not None and last[5] < self.span:
+            last[1] = round_number
+            last[2] = min(last[2], price)
+            last[3] = max(last[3], price)
+            last[4] += price
+            last[5] += 1
+        else:
+            if len(points) == self.max_points:
+                self._compact()
+            self.points.append([self.sales, round_number, price, price, price, 1])
+        self.sales += 1
+
+    def _compact(self):
+        """Сливает соседние точки попарно, span удваивается"""
+        merged = []
+        points = self.points
+        for first, second in zip(points[::2], points[1::2]):
+            merged.append([first[0], second[1], min(first[2], second[2]), max(first[3], second[3]),
+                           first[4] + second[4], first[5] + second[5]])
+        self.points = merged
+        self.span *= 2
+
+    def to_dict(self):
+        """Состояние ряда для снимка и архива"""
+        return {'span': self.span, 'sales': self.sales, 'points': [list(point) for point in self.points]}
+
+    @classmethod
+    def from_dict(cls, data, max_points=64):
+        """Ряд из словаря to_dict (лишние точки сливаются под max_points)"""
+        series = cls(max_points)
+        series.span = data['span']
+        series.sales = data['sales']
+        series.points = [list(point) for point in data['points']]
+        while len(series.points) > series.max_points:
+            series._compact()
+        return series
+
+    def to_list(self):
+        """Точки ряда для JSON"""
+        return [{
+            'sale': first,
+            'round': round_number,
+            'min': low,
+            'max': high,
+            'avg': round(total / count, 2),
+            'count': count
+        } for first, round_number, low, high, total, count in self.points]
+
+class ProductMarket:
+    """
+    Аналитика одного товара
+
+    Атрибуты:
+    - sales: Сделок (включая покупки пользователя вне лота)
+    - lots / lots_sold / lots_unsold: Лоты аукциона и их исход
+    - drop_histogram: Лоты, проданные после N снижений цены (последняя
+      корзина - N и больше)
+    """
+
+    def __init__(self, max_points=64, histogram_bins=21):
+        self.sales = 0
+        self.price_sum = 0
+        self.price_min = None
+        self.price_max = None
+        self.last_price = None
+        self.lots = 0
+        self.lots_sold = 0
+        self.lots_unsold = 0
+        self.drop_histogram = [0] * histogram_bins
+        self.series = PriceSeries(max_points)
+
+    def record_sale(self, price, round_number):
+        self.sales += 1
+        self.price_sum += price
+        self.price_min = price if self.price_min is None else min(self.price_min, price)
+        self.price_max = price if self.price_max is None else max(self.price_max, price)
+        self.last_price = price
+        self.series.add(price, round_number)
+
+    def record_lot(self, sold, drops):
+        self.lots += 1
+        if sold:
+            self.lots_sold += 1
+            self.drop_histogram[min(drops, len(self.drop_histogram) - 1)] += 1
+        else:
+            self.lots_unsold += 1
+
+    def to_dict(self):
+        """Состояние товара для снимка и архива"""
+        return {
+            'sales': self.sales,
+            'price_sum': self.price_sum,
+            'price_min': self.price_min,
+            'price_max': self.price_max,
+            'last_price': self.last_price,
+            'lots': self.lots,
+            'lots_sold': self.lots_sold,
+            'lots_unsold': self.lots_unsold,
+            'drop_histogram': list(self.drop_histogram),
+            'series': self.series.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data, max_points=64, histogram_bins=21):
+        """Товар из словаря to_dict"""
+        market = cls(max_points, histogram_bins)
+        for name in ('sales', 'price_sum', 'price_min', 'price_max', 'last_price',
+                     'lots', 'lots_sold', 'lots_unsold'):
+            setattr(market, name, data[name])
+        # Корзины сверх histogram_bins складываются в последнюю
+        for drops, count in enumerate(data['drop_histogram']):
+            market.drop_histogram[min(drops, histogram_bins - 1)] += count
+        market.series = PriceSeries.from_dict(data['series'], max_points)
+        return market
+
+    def summary(self):
+        return {
+            'sales': self.sales,
+            'avg_price': round(self.price_sum / self.sales, 2) if self.sales else None,
+            'min_price': self.price_min,
+            'max_price': self.price_max,
+            'last_price': self.last_price,
+            'lots': self.lots,
+            'lots_sold': self.lots_sold,
+            'lots_unsold': self.lots_unsold,
+            'sell_through': round(self.lots_sold / self.lots, 4) if self.lots else None,
+            'drop_histogram': list(self.drop_histogram),
+            'price_series': self.series.to_list(),
+            'series_span': self.series.span
+        }
+
+class MarketAnalytics:
+    """
+    Аналитика рынка одной игры (вызовы записи - под блокировкой комнаты)
+
+    Args:
+        max_points: Точек в ряде цен каждого товара
+        histogram_bins: Корзин гистограммы снижений (обычно max_drops + 1)
+    """
+
+    def __init__(self, max_points=64, histogram_bins=21):
+        self.max_points = max_points
+        self.histogram_bins = histogram_bins
+        self.products = {}
+
+    def product(self, product_id):
+        """Аналитика товара (создается при первой записи)"""
+        market = self.products.get(product_id)
+        if market is None:
+            market = self.products[product_id] = ProductMarket(self.max_points, self.histogram_bins)
+        return market
+
+    def record_sale(self, product_id, price, round_number):
+        """Сделка по цене price"""
+        self.product(product_id).record_sale(price, round_number)
+
+    def record_lot(self, product_id, sold, drops):
+        """Исход лота: продан ли и после скольких снижений цены"""
+        self.product(product_id).record_lot(sold, drops)
+
+    def to_dict(self):
+        """Состояние аналитики для снимка и архива (ключи - ID товаров строкой, как в JSON)"""
+        return {str(product_id): market.to_dict() for product_id, market in self.products.items()}
+
+    @classmethod
+    def from_dict(cls, data, max_points=64, histogram_bins=21):
+        """Аналитика из словаря to_dict"""
+        analytics = cls(max_points, histogram_bins)
+        analytics.products = {int(product_id): ProductMarket.from_dict(item, max_points, histogram_bins)
+                              for product_id, item in data.items()}
+        return analytics
+
+    def summary(self, products):
+        """
+        Сводка по товарам
+
+        Args:
+            products: Товары игры (имена, остатки)
+
+        Returns:
+            dict: Итоги рынка и сводка каждого товара
+        """
+        items = []
+        totals = {'sales': 0, 'lots': 0, 'lots_sold': 0, 'lots_unsold': 0}
+        for product in products:
+            market = self.products.get(product.id) or ProductMarket(self.max_points, self.histogram_bins)
+            item = market.summary()
+            item.update(product_id=product.id, name=product.name,
+                        units_sold=product.initial_quantity - product.quantity,
+                        initial_quantity=product.initial_quantity)
+            items.append(item)
+            for key in totals:
+                totals[key] += item[key]
+        totals['sell_through'] = round(totals['lots_sold'] / totals['lots'], 4) if totals['lots'] else None
+        return dict(totals, products=items)
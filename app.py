@@ -13,12 +13,46 @@
 - Реалистичная экономика
 """
 
+import time
+
+# Время начала импорта модуля - точка отсчета для замеров запуска
+_MODULE_STARTED = time.perf_counter()
+
 import os
+import re
 import sys
 import random
 import uuid
+import atexit
+import signal
+import argparse
+import functools
+import threading
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, session
+
+_flask_import_started = time.perf_counter()
+from flask import Flask, Response, abort, redirect, render_template, request, jsonify, session
+
+# Замеры запуска процесса в миллисекундах (отдаются в /healthz)
+STARTUP_TIMINGS = {
+    'import_flask_ms': round((time.perf_counter() - _flask_import_started) * 1000, 2)
+}
+
+from assets import AssetPipeline, PageCache, IMMUTABLE_CACHE_CONTROL, PAGE_CACHE_CONTROL
+from compression import ResponseCompressor, negotiate_encoding
+from ratelimit import TrafficShaper, retry_after_header
+from archive import GameArchive
+from snapshot import RoomImage, SnapshotStore
+from fanout import FanoutHub
+from arbitration import BidArbiter
+from idempotency import IdempotencyCache, StoredResponse, UNSTORED_STATUSES, stored_headers
+from ledger import TransactionLedger, LotJournal
+from analytics import MarketAnalytics
+from export import ExportError, ExportIncomplete, export_game
+from auction_core import (AuctionCore, Player, Product, Game, DEFAULT_STRATEGY, available_strategies,
+                          parse_strategy_mix, assign_strategies, price_ladder, MATCHING_SCAN, MATCHING_INDEX, MATCHING_MODES,
+                          WEB_CATALOG, WEB_AI_NAMES, WEB_BALANCE_RANGE, build_products, load_catalog, load_players,
+                          choose_preferences)
 
 # ============================================================================
 # НАСТРОЙКА FLASK ПРИЛОЖЕНИЯ
@@ -28,484 +62,1026 @@ from flask import Flask, render_template, request, jsonify, session
 app = Flask(__name__)
 app.secret_key = 'golan-auction-secret-key-2024'  # Секретный ключ для сессий
 
+# Статика сжимается и хешируется один раз при запуске, страницы кэшируются
+_assets_started = time.perf_counter()
+asset_pipeline = AssetPipeline(app.static_folder).build()
+page_cache = PageCache()
+app.jinja_env.globals['asset_url'] = asset_pipeline.url_for
+STARTUP_TIMINGS['build_assets_ms'] = round((time.perf_counter() - _assets_started) * 1000, 2)
+
+# Сжатие JSON ответов API (уровень и порог настраиваются переменными окружения)
+api_compressor = ResponseCompressor(
+    level=int(os.environ.get('GOLAN_COMPRESS_LEVEL', '6')),
+    brotli_quality=int(os.environ.get('GOLAN_BROTLI_QUALITY', '4')),
+    min_size=int(os.environ.get('GOLAN_COMPRESS_MIN_SIZE', '1024'))
+)
+
+@app.before_request
+def _record_first_request():
+    """Запоминает время до первого запроса (один раз за процесс)"""
+    if 'first_request_ms' not in STARTUP_TIMINGS:
+        STARTUP_TIMINGS['first_request_ms'] = round((time.perf_counter() - _MODULE_STARTED) * 1000, 2)
+
+@app.after_request
+def compress_api_response(response):
+    """
+    Сжимает большие JSON ответы API по Accept-Encoding клиента
+    
+    Маленькие ответы отдаются как есть: сжатие стоило бы дороже,
+    чем экономия трафика.
+    """
+    if (not request.path.startswith('/api/')
+            or response.mimetype != 'application/json'
+            or response.is_streamed
+            or response.status_code < 200
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if not api_compressor.should_compress(len(data)):
+        return response
+    
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'), api_compressor.encodings)
+    if encoding:
+        response.set_data(api_compressor.compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
 # ============================================================================
 # МОДЕЛИ ДАННЫХ
 # ============================================================================
 
-class Player:
+# Player, Product и Game - модели ядра аукциона (auction_core/models.py)
+
+class GameRoom(AuctionCore):
     """
-    Игрок в аукционе
+    Игровая комната - отдельная игра со своими игроками и товарами
+    
+    Игроки, товары, таблица предпочтений, группы стратегий и индекс цен
+    резервирования - состояние ядра аукциона (auction_core.AuctionCore).
     
     Атрибуты:
-    - id: Уникальный идентификатор игрока
-    - name: Имя игрока
-    - balance: Текущий баланс
-    - initial_balance: Начальный баланс
-    - wants: Любимый товар (бонус к покупке)
-    - no_wants: Нелюбимый товар (штраф к покупке)
-    - total_profit: Общая прибыль
-    - purchases: Количество покупок
-    - sales: Количество продаж
-    - is_user: Является ли пользователем (не ИИ)
-    - session_id: ID сессии для пользователя
-    """
-    def __init__(self, id, name, balance, wants, no_wants):
-        self.id = id
-        self.name = name
-        self.balance = balance
-        self.initial_balance = balance
-        self.wants = wants  # Любимый товар
-        self.no_wants = no_wants  # Нелюбимый товар
-        self.total_profit = 0  # Общая прибыль
-        self.purchases = 0  # Количество покупок
-        self.sales = 0  # Количество продаж
-        self.is_user = False  # Является ли пользователем
-        self.session_id = None  # ID сессии
+    - game_id: Идентификатор игры (по нему запросы направляются в комнату)
+    - players: Игроки комнаты
+    - products: Товары комнаты
+    - current_game: Текущая игровая сессия (Game) или None
+    - user_session_id: ID последней сессии пользователя
+    - state_version: Версия состояния (растет при каждом изменении)
+    - last_activity: Время последнего обращения (time.time())
+    - strategy_mix: Пропорции стратегий ИИ-игроков {имя: вес}
+    - matching_mode: Поиск покупателя - scan (перебор) или index (цены резервирования)
+    - live_lot: Расписание лота, который торгуется в реальном времени (или итог последнего)
+    - live_outcome: Заранее рассчитанный исход лота для ИИ [ID покупателя, шаг, цена]
+    - lot_timer: Таймер закрытия лота (threading.Timer)
+    - ledger: Журнал сделок текущей игры (ledger.TransactionLedger)
+    - lots: Журнал исходов лотов текущей игры (ledger.LotJournal)
+    - market: Аналитика рынка текущей игры (analytics.MarketAnalytics)
+    - state_changed: Условие на блокировке комнаты, срабатывает при изменении состояния
+    - lock: Блокировка для изменений состояния комнаты
+    """
+    def __init__(self, game_id):
+        super().__init__()
+        self.game_id = game_id
+        self.current_game = None
+        self.user_session_id = None
+        self.state_version = 0
+        self.last_activity = time.time()
+        self.strategy_mix = dict(DEFAULT_STRATEGY_MIX)
+        self.matching_mode = DEFAULT_MATCHING_MODE
+        self.live_lot = None
+        self.live_outcome = None
+        self.lot_timer = None
+        self.ledger = new_ledger()
+        self.lots = new_lot_journal()
+        self.market = new_market()
+        self.lock = threading.RLock()
+        self.state_changed = threading.Condition(self.lock)
     
-    def to_dict(self):
-        """Преобразует игрока в словарь для JSON"""
+    def settings(self):
+        """Настройки и текущая игра комнаты (без игроков и товаров)"""
         return {
-            'id': self.id,
-            'name': self.name,
-            'balance': self.balance,
-            'initial_balance': self.initial_balance,
-            'wants': self.wants,
-            'no_wants': self.no_wants,
-            'total_profit': self.total_profit,
-            'purchases': self.purchases,
-            'sales': self.sales
+            'game_id': self.game_id,
+            'current_game': self.current_game.to_dict() if self.current_game else None,
+            'user_session_id': self.user_session_id,
+            'state_version': self.state_version,
+            'strategy_mix': dict(self.strategy_mix),
+            'matching_mode': self.matching_mode,
+            'live_lot': dict(self.live_lot) if self.live_lot else None,
+            'live_outcome': list(self.live_outcome) if self.live_outcome else None
         }
     
-    def can_buy(self, price):
-        """Проверяет, может ли игрок купить товар по указанной цене"""
-        return self.balance >= price
-    
-    def get_preference_multiplier(self, product_name):
-        """
-        Возвращает множитель предпочтения для товара
-        1.5 - для любимого товара
-        0.3 - для нелюбимого товара
-        1.0 - для обычного товара
-        """
-        if product_name == self.wants:
-            return 1.5  # Бонус за любимый товар
-        elif product_name == self.no_wants:
-            return 0.3  # Штраф за нелюбимый товар
-        else:
-            return 1.0  # Обычный товар
-    
-    def buy_product(self, product, price):
-        """
-        Покупает товар по указанной цене
-        Возвращает прибыль от покупки
-        """
-        if not self.can_buy(price):
-            return 0  # Недостаточно средств
-        
-        # Списываем деньги
-        self.balance -= price
-        self.purchases += 1
-        
-        # Рассчитываем прибыль как процент от цены покупки (130% = 1.3)
-        profit_multiplier = 1.3  # 130% прибыли
-        profit = price * profit_multiplier
-        self.total_profit += profit
-        self.sales += 1
-        
-        return profit
-
-class Product:
-    """
-    Товар в аукционе
-    
-    Атрибуты:
-    - id: Уникальный идентификатор товара
-    - name: Название товара
-    - cost: Себестоимость товара
-    - initial_price: Начальная цена аукциона
-    - current_price: Текущая цена (снижается в голландском аукционе)
-    - quantity: Количество товара
-    - initial_quantity: Начальное количество
-    """
-    def __init__(self, id, name, cost, price, quantity):
-        self.id = id
-        self.name = name
-        self.cost = cost  # Себестоимость
-        self.initial_price = price  # Начальная цена
-        self.current_price = price  # Текущая цена (снижается)
-        self.quantity = quantity  # Количество
-        self.initial_quantity = quantity  # Начальное количество
+    def apply_settings(self, data):
+        """Восстанавливает настройки комнаты из словаря settings"""
+        self.user_session_id = data.get('user_session_id')
+        self.state_version = data.get('state_version', 0)
+        self.strategy_mix = data.get('strategy_mix') or dict(DEFAULT_STRATEGY_MIX)
+        self.matching_mode = data.get('matching_mode', DEFAULT_MATCHING_MODE)
+        self.live_lot = data.get('live_lot')
+        self.live_outcome = data.get('live_outcome')
     
     def to_dict(self):
-        """Преобразует товар в словарь для JSON"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'cost': self.cost,
-            'initial_price': self.initial_price,
-            'current_price': self.current_price,
-            'quantity': self.quantity,
-            'initial_quantity': self.initial_quantity
-        }
+        """Полное состояние комнаты для архива (включая сессии пользователей, журналы и аналитику)"""
+        return dict(
+            self.settings(),
+            players=[dict(p.to_dict(), is_user=p.is_user, session_id=p.session_id)
+                     for p in self.players],
+            products=[p.to_dict() for p in self.products],
+            ledger={name: column.tolist() for name, column in self.ledger.export_columns().items()},
+            lots={name: column.tolist() for name, column in self.lots.export_columns().items()},
+            market=self.market.to_dict()
+        )
     
-    def is_available(self):
-        """Проверяет, доступен ли товар для продажи"""
-        return self.quantity > 0
+    @classmethod
+    def from_dict(cls, data):
+        """Восстанавливает комнату из словаря to_dict"""
+        room = cls(data['game_id'])
+        room.players = [Player.from_dict(p) for p in data['players']]
+        room.products = [Product.from_dict(p) for p in data['products']]
+        room.current_game = Game.from_dict(data['current_game']) if data['current_game'] else None
+        room.apply_settings(data)
+        if data.get('ledger'):
+            room.ledger = TransactionLedger.from_columns(data['ledger'], LEDGER_CAPACITY, LEDGER_RING)
+        if data.get('lots'):
+            room.lots = LotJournal.from_columns(data['lots'], LEDGER_CAPACITY, LEDGER_RING)
+        room.market = restore_market(data.get('market'))
+        room.rebuild_preferences()
+        return room
     
-    def reduce_price(self, ratio=0.95):
-        """
-        Снижает цену товара (голландский аукцион)
-        ratio: коэффициент снижения (0.95 = снижение на 5%)
-        """
-        self.current_price = int(self.current_price * ratio)
+    def sell(self, player, product, price=None):
+        """Продает одну единицу товара и записывает сделку в журнал и аналитику рынка"""
+        if price is None:
+            price = product.current_price
+        profit = super().sell(player, product, price)
+        if profit is not None:
+            round_number = self.current_game.current_round if self.current_game else 0
+            self.ledger.append(round_number, player.id, product.id, price, profit)
+            self.market.record_sale(product.id, price, round_number)
+        return profit
     
-    def sell_one(self):
-        """Продает одну единицу товара"""
-        if self.is_available():
-            self.quantity -= 1
-            return True
-        return False
+    def find_player(self, player_id):
+        """Игрок по ID или None (через player_slots, без перебора)"""
+        slot = self.player_slots.get(player_id)
+        if slot is not None and slot < len(self.players) and self.players[slot].id == player_id:
+            return self.players[slot]
+        return next((p for p in self.players if p.id == player_id), None)
     
-    def reset_to_initial(self):
-        """Сбрасывает товар к начальному состоянию"""
-        self.current_price = self.initial_price
-        self.quantity = self.initial_quantity
-
-class Game:
-    """Игровая сессия"""
-    def __init__(self):
-        self.id = 1
-        self.status = 'waiting'
-        self.current_round = 0
-        self.current_product_id = None
-        self.winner_id = None
-        self.start_time = datetime.now()
-        self.end_time = None
+    def to_image(self):
+        """Копия состояния для двоичного снимка (вызывается под блокировкой комнаты)"""
+        return RoomImage.capture(dict(self.settings(), market=self.market.to_dict()),
+                                 self.players, self.products, self.ledger, self.lots)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'status': self.status,
-            'current_round': self.current_round,
-            'current_product_id': self.current_product_id,
-            'winner_id': self.winner_id,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None
-        }
+    @classmethod
+    def from_image(cls, image):
+        """Восстанавливает комнату из снимка (snapshot.RoomImage)"""
+        room = cls(image.settings['game_id'])
+        room.players = image.build_players()
+        room.products = image.build_products()
+        room.current_game = image.build_game()
+        room.apply_settings(image.settings)
+        room.ledger = TransactionLedger.from_columns(image.ledger, LEDGER_CAPACITY, LEDGER_RING)
+        room.lots = LotJournal.from_columns(image.lots, LEDGER_CAPACITY, LEDGER_RING)
+        room.market = restore_market(image.settings.get('market'))
+        room.rebuild_preferences()
+        return room
 
 # ============================================================================
 # ГЛОБАЛЬНЫЕ ПЕРЕМЕННЫЕ
 # ============================================================================
 
-players = []
-products = []
-current_game = None
-user_session_id = None
+# Комнаты по ID игры. Комната по умолчанию - обычная локальная игра
+DEFAULT_GAME_ID = 'main'
+GAME_COOKIE_NAME = 'golan_game'
+GAME_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+rooms = {}
+rooms_lock = threading.Lock()
+# Выгруженные комнаты, архив которых еще записывается (под rooms_lock)
+archiving = {}
+
+# Выгрузка неактивных игр из памяти в сжатый архив на диске
+ARCHIVE_DIR = os.environ.get('GOLAN_ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive'))
+FINISHED_ROOM_TTL = float(os.environ.get('GOLAN_FINISHED_TTL', '300'))  # Завершенная игра, секунды
+IDLE_ROOM_TTL = float(os.environ.get('GOLAN_IDLE_TTL', '1800'))  # Игра без обращений, секунды
+REAPER_INTERVAL = float(os.environ.get('GOLAN_REAPER_INTERVAL', '30'))
+
+game_archive = GameArchive(ARCHIVE_DIR)
+
+# Двоичные снимки всех комнат: восстанавливаются при запуске, пишутся в фоне
+# Рабочие процессы launcher.py пишут каждый свой файл (GOLAN_SNAPSHOT_NAME)
+SNAPSHOT_DIR = os.environ.get('GOLAN_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+SNAPSHOT_NAME = os.environ.get('GOLAN_SNAPSHOT_NAME', 'golan')
+SNAPSHOT_INTERVAL = float(os.environ.get('GOLAN_SNAPSHOT_INTERVAL', '10'))  # Секунды, 0 - без фоновых снимков
+# GOLAN_SNAPSHOT=0 - без восстановления и автоматических снимков (бенчмарки)
+SNAPSHOT_ENABLED = os.environ.get('GOLAN_SNAPSHOT', '1') != '0'
+
+snapshot_store = SnapshotStore(os.path.join(SNAPSHOT_DIR, f'{SNAPSHOT_NAME}.snap'))
+snapshot_lock = threading.Lock()
+
+# Замеры последнего снимка (отдаются в /api/snapshot и /healthz)
+snapshot_stats = {}
+
+# Пропорции стратегий ИИ-игроков в новых комнатах, например "random:2,reservation:1"
+DEFAULT_STRATEGY_MIX = parse_strategy_mix(os.environ.get('GOLAN_STRATEGY_MIX', DEFAULT_STRATEGY))
+
+# Поиск покупателя в новых комнатах: scan (исходный случайный) или index
+DEFAULT_MATCHING_MODE = os.environ.get('GOLAN_MATCHING', MATCHING_SCAN)
+if DEFAULT_MATCHING_MODE not in MATCHING_MODES:
+    DEFAULT_MATCHING_MODE = MATCHING_SCAN
+
+# Подписчики на изменения состояния игр (рассылка state_hubs и ASGI-версия)
+state_listeners = []
+
+# Каталог товаров и ИИ-игроки веб-версии: файлы GOLAN_CATALOG и GOLAN_PLAYERS
+# (CSV, JSON или JSON Lines, см. auction_core/catalog.py), иначе встроенные.
+# Большой каталог не разбирается при запуске: CSV и JSON Lines читаются через mmap,
+# запись проверяется при обращении; GOLAN_CATALOG_CHECK=1 проверяет весь файл сразу
+CATALOG_FULL_CHECK = os.environ.get('GOLAN_CATALOG_CHECK', '0') == '1'
+WEB_PRODUCTS = (load_catalog(os.environ['GOLAN_CATALOG'], full_check=CATALOG_FULL_CHECK)
+                if os.environ.get('GOLAN_CATALOG') else WEB_CATALOG)
+WEB_ROSTER = (load_players(os.environ['GOLAN_PLAYERS'], WEB_PRODUCTS) if os.environ.get('GOLAN_PLAYERS')
+              else [{'name': name} for name in WEB_AI_NAMES])
+
+# Лотов в комнате: каталог больше этого - комната получает случайную выборку лотов
+ROOM_LOTS = max(2, int(os.environ.get('GOLAN_ROOM_LOTS', '100')))
+
+# Шаг часов цены лота, который торгуется в реальном времени (миллисекунды)
+LOT_TICK_MS = int(os.environ.get('GOLAN_LOT_TICK_MS', '700'))
+
+# Журналы сделок и лотов игры: емкость и кольцевой режим (0 - массивы растут всю игру)
+LEDGER_CAPACITY = int(os.environ.get('GOLAN_LEDGER_CAPACITY', '4096'))
+LEDGER_RING = os.environ.get('GOLAN_LEDGER_RING', '1') != '0'
+
+def new_ledger():
+    """Пустой журнал сделок по настройкам процесса"""
+    return TransactionLedger(LEDGER_CAPACITY, LEDGER_RING)
+
+def new_lot_journal():
+    """Пустой журнал лотов по настройкам процесса"""
+    return LotJournal(LEDGER_CAPACITY, LEDGER_RING)
+
+# Аналитика рынка: точек в ряде цен товара и корзин гистограммы снижений
+# (0..20 - max_price_drops движка; последняя корзина - 20 и больше)
+MARKET_SERIES_POINTS = int(os.environ.get('GOLAN_MARKET_POINTS', '64'))
+MARKET_HISTOGRAM_BINS = 21
+
+def new_market():
+    """Пустая аналитика рынка по настройкам процесса"""
+    return MarketAnalytics(MARKET_SERIES_POINTS, MARKET_HISTOGRAM_BINS)
+
+def restore_market(data):
+    """Аналитика рынка из снимка или архива (пустая, если ее не сохраняли)"""
+    if not data:
+        return new_market()
+    return MarketAnalytics.from_dict(data, MARKET_SERIES_POINTS, MARKET_HISTOGRAM_BINS)
+
+# Микроокно сбора одновременных покупок одного лота (миллисекунды, 0 - без ожидания)
+BID_WINDOW_MS = float(os.environ.get('GOLAN_BID_WINDOW_MS', '5'))
+
+# Емкость очереди кадров одного подписчика потока (медленный получит последний)
+STREAM_QUEUE_LIMIT = int(os.environ.get('GOLAN_STREAM_QUEUE', '8'))
 
 # ============================================================================
 # ФУНКЦИИ ДАННЫХ
 # ============================================================================
 
-def create_initial_data():
-    """Создает начальные данные"""
-    global players, products
-    
-    all_products = [
-        "Розы", "Пионы", "Георгины", "Ромашки", "Лилии", "Тюльпаны",
-        "Орхидеи", "Хризантемы", "Лаванда", "Нарциссы", "Ирисы", "Гвоздики"
-    ]
-    
-    player_names = ["Ваня", "Анастасия", "Игорь", "Марина", "Дмитрий", "Светлана"]
+def create_initial_data(room):
+    """Создает начальные данные комнаты"""
+    # Создаем товары (предпочтения игроков выбираются из товаров комнаты)
+    room.products = deal_products()
     
     # Создаем AI игроков
     players = []
-    for i, name in enumerate(player_names):
-        wants = random.choice(all_products)
-        no_wants = random.choice([p for p in all_products if p != wants])
-        balance = random.randint(150000, 195000)
+    for i, entry in enumerate(WEB_ROSTER):
+        wants, no_wants, balance = roll_player_setup(room, entry)
         
-        player = Player(i + 1, name, balance, wants, no_wants)
+        player = Player(i + 1, entry['name'], balance, wants, no_wants)
         players.append(player)
     
     # Создаем пользователя
-    user_wants = random.choice(all_products)
-    user_no_wants = random.choice([p for p in all_products if p != user_wants])
-    user_balance = random.randint(150000, 195000)
+    user_wants, user_no_wants, user_balance = roll_player_setup(room)
     
     user_player = Player(len(players) + 1, "Вы (Пользователь)", user_balance, user_wants, user_no_wants)
     user_player.is_user = True
     players.append(user_player)
     
-    # Создаем товары
-    products_data = [
-        {"name": "Розы", "cost": 50000, "price": 80000, "quantity": 300},
-        {"name": "Пионы", "cost": 85000, "price": 150000, "quantity": 100},
-        {"name": "Георгины", "cost": 30000, "price": 50000, "quantity": 80},
-        {"name": "Ромашки", "cost": 100000, "price": 130000, "quantity": 500},
-        {"name": "Лилии", "cost": 60000, "price": 95000, "quantity": 200},
-        {"name": "Тюльпаны", "cost": 40000, "price": 65000, "quantity": 350},
-        {"name": "Орхидеи", "cost": 120000, "price": 200000, "quantity": 60},
-        {"name": "Хризантемы", "cost": 45000, "price": 70000, "quantity": 250},
-        {"name": "Лаванда", "cost": 20000, "price": 35000, "quantity": 400},
-        {"name": "Нарциссы", "cost": 55000, "price": 90000, "quantity": 150},
-        {"name": "Ирисы", "cost": 70000, "price": 115000, "quantity": 120},
-        {"name": "Гвоздики", "cost": 25000, "price": 45000, "quantity": 300}
-    ]
-    
-    products = []
-    for i, product_data in enumerate(products_data):
-        product = Product(
-            i + 1,
-            product_data["name"],
-            product_data["cost"],
-            product_data["price"],
-            product_data["quantity"]
-        )
-        products.append(product)
+    room.players = players
+    assign_room_strategies(room)
+    room.rebuild_preferences()
+
+def deal_products():
+    """Товары новой комнаты: весь каталог или ROOM_LOTS случайных лотов большого каталога"""
+    if len(WEB_PRODUCTS) <= ROOM_LOTS:
+        return build_products(WEB_PRODUCTS)
+    picked = sorted(random.sample(range(len(WEB_PRODUCTS)), ROOM_LOTS))
+    return build_products([WEB_PRODUCTS[i] for i in picked])
+
+def roll_player_setup(room, entry=None):
+    """
+    Любимый и нелюбимый товары и баланс игрока
+    
+    Что задано в составе игроков (entry), берется оттуда, остальное - случайно;
+    любимый и нелюбимый товары всегда разные. Товар из состава, которого нет
+    среди лотов комнаты (комната получила выборку большого каталога),
+    тоже выбирается случайно из лотов комнаты.
+    
+    Returns:
+        tuple: (wants, no_wants, balance)
+    """
+    entry = entry or {}
+    names = [p.name for p in room.products]
+    wants, no_wants = choose_preferences(names, random)
+    balance = random.randint(*WEB_BALANCE_RANGE)
+    if 'wants' in entry or 'no_wants' in entry:
+        lots = set(names)
+        if entry.get('wants') in lots:
+            wants, no_wants = entry['wants'], (wants if no_wants == entry['wants'] else no_wants)
+        if entry.get('no_wants') in lots:
+            wants, no_wants = (no_wants if wants == entry['no_wants'] else wants), entry['no_wants']
+    return wants, no_wants, entry.get('balance', balance)
 
-def reset_all_players():
-    """Сбрасывает всех игроков"""
-    global players
-    for player in players:
+def reset_all_players(room):
+    """Сбрасывает всех игроков комнаты"""
+    for player in room.players:
         player.balance = player.initial_balance
         player.total_profit = 0
         player.purchases = 0
         player.sales = 0
+    room.reservation_index = None
 
-def reset_all_products():
-    """Сбрасывает все товары"""
-    global products
-    for product in products:
+def reset_all_products(room):
+    """Сбрасывает все товары комнаты"""
+    for product in room.products:
         product.reset_to_initial()
 
-def randomize_all_players():
-    """Рандомизирует всех игроков"""
-    global players
-    all_products = [
-        "Розы", "Пионы", "Георгины", "Ромашки", "Лилии", "Тюльпаны",
-        "Орхидеи", "Хризантемы", "Лаванда", "Нарциссы", "Ирисы", "Гвоздики"
-    ]
-    
-    for player in players:
-        if not player.is_user:
-            player.wants = random.choice(all_products)
-            player.no_wants = random.choice([p for p in all_products if p != player.wants])
-            player.initial_balance = random.randint(150000, 195000)
-            player.balance = player.initial_balance
-            player.total_profit = 0
-            player.purchases = 0
-            player.sales = 0
-
-def create_new_user_session(session_id):
-    """Создает новую сессию пользователя"""
-    global players, user_session_id
-    user_session_id = session_id
+def randomize_all_players(room):
+    """Рандомизирует всех игроков комнаты"""
+    # ИИ-игроки идут в порядке состава игроков; игроки сверх состава - без заданных полей
+    ai_players = [p for p in room.players if not p.is_user]
+    for i, player in enumerate(ai_players):
+        entry = WEB_ROSTER[i] if i < len(WEB_ROSTER) else None
+        player.wants, player.no_wants, player.initial_balance = roll_player_setup(room, entry)
+        player.balance = player.initial_balance
+        player.total_profit = 0
+        player.purchases = 0
+        player.sales = 0
+    
+    assign_room_strategies(room)
+    room.rebuild_preferences()
+
+def assign_room_strategies(room):
+    """Распределяет стратегии между ИИ-игроками комнаты по room.strategy_mix"""
+    ai_players = [p for p in room.players if not p.is_user]
+    for player, name in zip(ai_players, assign_strategies(len(ai_players), room.strategy_mix, random)):
+        player.strategy = name
+
+def create_new_user_session(room, session_id):
+    """Создает новую сессию пользователя в комнате"""
+    room.user_session_id = session_id
     
     # Удаляем старого пользователя
-    players = [p for p in players if not p.is_user]
+    room.players = [p for p in room.players if not p.is_user]
     
-    # Создаем нового пользователя
-    all_products = [
-        "Розы", "Пионы", "Георгины", "Ромашки", "Лилии", "Тюльпаны",
-        "Орхидеи", "Хризантемы", "Лаванда", "Нарциссы", "Ирисы", "Гвоздики"
-    ]
+    # Создаем нового пользователя: ID - следующий по числу игроков, как и раньше
+    return add_user_player(room, session_id, player_id=len(room.players) + 1)
+
+def add_user_player(room, session_id, name="Вы (Пользователь)", player_id=None):
+    """
+    Добавляет в комнату игрока-пользователя сессии session_id
     
-    user_wants = random.choice(all_products)
-    user_no_wants = random.choice([p for p in all_products if p != user_wants])
-    user_balance = random.randint(150000, 195000)
+    Args:
+        player_id: ID игрока; по умолчанию - на единицу больше наибольшего ID
+            в комнате (пользователи, вошедшие в идущую игру, не совпадают по ID
+            с игроками, добавленными после других пользователей)
+    """
+    user_wants, user_no_wants, user_balance = roll_player_setup(room)
     
-    user_player = Player(len(players) + 1, "Вы (Пользователь)", user_balance, user_wants, user_no_wants)
+    if player_id is None:
+        player_id = max((p.id for p in room.players), default=0) + 1
+    user_player = Player(player_id, name, user_balance, user_wants, user_no_wants)
     user_player.is_user = True
     user_player.session_id = session_id
-    players.append(user_player)
+    room.players.append(user_player)
+    room.rebuild_preferences()
     
     return user_player
 
-def get_user_player(session_id):
-    """Получает пользователя по session_id"""
-    for player in players:
+def add_state_listener(callback):
+    """
+    Подписывает callback(game_id, version) на изменения состояния игр
+    Callback вызывается в потоке, который изменил состояние
+    """
+    state_listeners.append(callback)
+
+def notify_state_changed(room):
+    """Увеличивает версию состояния комнаты и оповещает подписчиков"""
+    with room.lock:
+        room.state_version += 1
+        room.state_changed.notify_all()
+    for callback in list(state_listeners):
+        try:
+            callback(room.game_id, room.state_version)
+        except Exception as e:
+            print(f"Ошибка подписчика состояния: {e}")
+
+def snapshot_room_state(game_id):
+    """Версия и состояние игры для рассылки (снимаются вместе под блокировкой комнаты)"""
+    room = get_room(game_id)
+    with room.lock:
+        # Состояние снимается первым: при этом может закрыться лот (версия растет)
+        state = auction_engine.get_current_game_state(room)
+        return room.state_version, state
+
+def now_ms():
+    """Время сервера в миллисекундах (часы лотов и синхронизация клиента)"""
+    return int(time.time() * 1000)
+
+def get_room_version(game_id):
+    """Текущая версия состояния игры"""
+    return get_room(game_id).state_version
+
+def get_user_player(room, session_id):
+    """Получает пользователя комнаты по session_id"""
+    for player in room.players:
         if player.is_user and player.session_id == session_id:
             return player
     return None
 
+def is_valid_game_id(game_id):
+    """Проверяет формат ID игры (буквы, цифры, '-' и '_')"""
+    return bool(game_id) and bool(GAME_ID_PATTERN.match(game_id))
+
+def get_room(game_id=DEFAULT_GAME_ID):
+    """
+    Возвращает комнату по ID игры
+    
+    Если комнаты нет в памяти, она загружается из архива (игра была
+    выгружена) или создается заново при первом обращении. Архив читается
+    вне общей блокировки rooms_lock: распаковка большой игры не задерживает
+    остальные комнаты. Если комнату за это время уже вставил другой поток,
+    возвращается его комната.
+    """
+    with rooms_lock:
+        room = rooms.get(game_id)
+        if room is None:
+            # Игру только что выгрузили, но архив еще пишется - берем ее из памяти
+            room = archiving.get(game_id)
+            if room is not None:
+                rooms[game_id] = room
+        if room is not None:
+            room.last_activity = time.time()
+            return room
+    
+    archived = game_archive.load(game_id)
+    if archived is not None:
+        room = GameRoom.from_dict(archived)
+    else:
+        room = GameRoom(game_id)
+        create_initial_data(room)
+    
+    with rooms_lock:
+        existing = rooms.get(game_id) or archiving.get(game_id)
+        if existing is not None:
+            room = existing
+        elif archived is not None:
+            auction_engine.arm_live_lot(room)
+        rooms[game_id] = room
+        room.last_activity = time.time()
+        return room
+
+def reap_rooms(now=None):
+    """
+    Выгружает из памяти завершенные и простаивающие игры
+    
+    Игры, которые успели начаться, сохраняются в архив; комнаты, где игра
+    так и не началась, просто удаляются.
+    
+    Returns:
+        int: Сколько комнат выгружено
+    """
+    if now is None:
+        now = time.time()
+    
+    evicted = []
+    removed = []
+    with rooms_lock:
+        for game_id, room in list(rooms.items()):
+            with room.lock:
+                idle = now - room.last_activity
+                finished = room.current_game is not None and room.current_game.status == 'finished'
+                if idle < IDLE_ROOM_TTL and not (finished and idle >= FINISHED_ROOM_TTL):
+                    continue
+                del rooms[game_id]
+                removed.append(game_id)
+                if room.current_game is not None:
+                    archiving[game_id] = room
+                    evicted.append((game_id, room, room.to_dict()))
+    
+    # Подписчики выгруженных игр переподпишутся на комнату из архива
+    for game_id in removed:
+        state_hubs.discard(game_id)
+    
+    # Запись на диск - вне блокировок, чтобы не задерживать запросы
+    for game_id, room, data in evicted:
+        try:
+            game_archive.save(game_id, data)
+        except OSError as e:
+            print(f"Ошибка архивации игры {game_id}: {e}")
+        finally:
+            with rooms_lock:
+                if archiving.get(game_id) is room:
+                    del archiving[game_id]
+    return len(evicted)
+
+def start_room_reaper(interval=REAPER_INTERVAL):
+    """Запускает фоновую выгрузку неактивных игр"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                reap_rooms()
+            except Exception as e:
+                print(f"Ошибка выгрузки игр: {e}")
+    
+    thread = threading.Thread(target=run, name='golan-room-reaper', daemon=True)
+    thread.start()
+    return thread
+
+def rooms_fingerprint():
+    """Версии состояния всех комнат - снимок не пишется, если они не менялись"""
+    with rooms_lock:
+        return tuple(sorted((game_id, room.state_version) for game_id, room in rooms.items()))
+
+def take_snapshot(force=False):
+    """
+    Сохраняет двоичный снимок всех комнат
+    
+    Каждая комната копируется под своей блокировкой: остальные комнаты
+    в это время работают, пауза комнаты - только копирование столбцов.
+    Кодирование и запись на диск идут без блокировок комнат.
+    
+    Args:
+        force: Писать снимок, даже если состояние не менялось
+    
+    Returns:
+        dict | None: Замеры снимка или None, если снимок не понадобился
+    """
+    with snapshot_lock:
+        fingerprint = rooms_fingerprint()
+        if not force and fingerprint == snapshot_stats.get('fingerprint'):
+            return None
+        
+        with rooms_lock:
+            room_list = list(rooms.values())
+        images = []
+        pauses = []
+        for room in room_list:
+            with room.lock:
+                started = time.perf_counter()
+                images.append(room.to_image())
+                pauses.append(time.perf_counter() - started)
+        
+        stats = snapshot_store.save(images)
+        stats.update(
+            pause_max_ms=round(max(pauses, default=0) * 1000, 3),
+            pause_total_ms=round(sum(pauses) * 1000, 3),
+            taken_at=datetime.now().isoformat()
+        )
+        snapshot_stats.clear()
+        snapshot_stats.update(stats, fingerprint=fingerprint)
+        return stats
+
+def get_snapshot_stats():
+    """Замеры последнего снимка для ответов API"""
+    stats = {key: value for key, value in snapshot_stats.items() if key != 'fingerprint'}
+    stats['path'] = snapshot_store.path
+    stats['interval'] = SNAPSHOT_INTERVAL
+    return stats
+
+def restore_snapshot():
+    """
+    Восстанавливает комнаты из снимка (при запуске процесса)
+    
+    Returns:
+        int: Сколько комнат восстановлено
+    """
+    images = snapshot_store.load()
+    if not images:
+        return 0
+    restored = [GameRoom.from_image(image) for image in images]
+    with rooms_lock:
+        for room in restored:
+            if rooms.setdefault(room.game_id, room) is room:
+                auction_engine.arm_live_lot(room)
+    return len(restored)
+
+def start_snapshotter(interval=SNAPSHOT_INTERVAL):
+    """Запускает фоновые снимки состояния (каждые interval секунд)"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                take_snapshot()
+            except Exception as e:
+                print(f"Ошибка снимка состояния: {e}")
+    
+    thread = threading.Thread(target=run, name='golan-snapshotter', daemon=True)
+    thread.start()
+    return thread
+
 # ============================================================================
 # ДВИЖОК АУКЦИОНА
 # ============================================================================
 
 class DutchAuctionEngine:
-    """Движок голландского аукциона"""
+    """Движок голландского аукциона (работает с одной комнатой за вызов)"""
     
     def __init__(self):
         self.price_reduction_step = 0.05
         self.min_price_ratio = 0.3
+        self.max_price_drops = 20  # Максимум снижений цены за раунд
+        self.lot_tick_ms = LOT_TICK_MS
+        # Исход ИИ объявляется с запасом на сбор заявок, поступивших до него
+        self.settle_grace_ms = int(BID_WINDOW_MS * 2) + 1
     
-    def start_new_game(self, session_id=None):
-        """Начинает новую игру"""
-        global current_game, players, products
-        
+    def start_new_game(self, room, session_id=None):
+        """Начинает новую игру в комнате"""
         try:
-            current_game = Game()
-            current_game.status = 'playing'
-            current_game.current_round = 1
-            
-            randomize_all_players()
-            
-            if session_id:
-                create_new_user_session(session_id)
-            
-            reset_all_products()
+            with room.lock:
+                self.cancel_live_lot(room)
+                room.ledger = new_ledger()
+                room.lots = new_lot_journal()
+                room.market = new_market()
+                room.current_game = Game(room.game_id)
+                room.current_game.status = 'playing'
+                room.current_game.current_round = 1
+                
+                randomize_all_players(room)
+                
+                if session_id:
+                    create_new_user_session(room, session_id)
+                
+                reset_all_products(room)
+                notify_state_changed(room)
             
             return True
         except Exception as e:
             print(f"Ошибка при запуске новой игры: {e}")
             return False
     
-    def get_current_game_state(self):
-        """Возвращает текущее состояние игры"""
-        global current_game, players, products
-        
-        if not current_game:
+    def get_current_game_state(self, room):
+        """Возвращает текущее состояние игры комнаты"""
+        with room.lock:
+            self.settle_live_lot(room)
+            if not room.current_game:
+                return {
+                    'game': None,
+                    'players': [],
+                    'products': [],
+                    'message': 'Нет активной игры'
+                }
+            
             return {
-                'game': None,
-                'players': [],
-                'products': [],
-                'message': 'Нет активной игры'
+                'game': room.current_game.to_dict(),
+                'players': [p.to_dict() for p in room.players],
+                'products': [p.to_dict() for p in room.products],
+                'lot': dict(room.live_lot) if room.live_lot else None
             }
-        
-        return {
-            'game': current_game.to_dict(),
-            'players': [p.to_dict() for p in players],
-            'products': [p.to_dict() for p in products]
-        }
     
-    def conduct_dutch_auction_round(self):
+    def conduct_dutch_auction_round(self, room):
         """Проводит раунд голландского аукциона с автоматическим снижением цены"""
-        global current_game, players, products
-        
         try:
-            if not current_game or current_game.status != 'playing':
-                return {
-                    'success': False,
-                    'message': 'Игра не активна. Начните новую игру.'
-                }
+            with room.lock:
+                return self._conduct_round(room)
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Ошибка при проведении раунда: {str(e)}'
+            }
+    
+    def _select_lot(self, room):
+        """
+        Выбирает товар раунда (вызывается под блокировкой комнаты)
+        
+        Returns:
+            tuple: (товар, None) или (None, ответ с ошибкой / концом игры)
+        """
+        current_game = room.current_game
+        if not current_game or current_game.status != 'playing':
+            return None, {
+                'success': False,
+                'message': 'Игра не активна. Начните новую игру.'
+            }
+        
+        self.settle_live_lot(room)
+        if room.live_lot and room.live_lot['status'] == 'live':
+            return None, {
+                'success': False,
+                'message': 'Торги по текущему лоту еще идут'
+            }
+        
+        # Выбираем случайный доступный товар
+        available_products = [p for p in room.products if p.is_available()]
+        if not available_products:
+            current_game.status = 'finished'
+            current_game.end_time = datetime.now()
+            notify_state_changed(room)
+            return None, {
+                'success': False,
+                'message': 'Все товары проданы!',
+                'game_over': True
+            }
+        
+        selected_product = random.choice(available_products)
+        current_game.current_product_id = selected_product.id
+        return selected_product, None
+    
+    def _find_winner(self, room, product):
+        """ГОЛЛАНДСКИЙ АУКЦИОН: снижаем цену, пока кто-то из ИИ не купит"""
+        if room.matching_mode == MATCHING_INDEX:
+            return self._match_by_index(room, product, self.max_price_drops)
+        return self._run_price_clock(room, product, self.max_price_drops)
+    
+    def _conduct_round(self, room):
+        """Тело раунда (вызывается под блокировкой комнаты)"""
+        selected_product, error = self._select_lot(room)
+        if error:
+            return error
+        current_game = room.current_game
+        start_price = selected_product.current_price
+        
+        winner = self._find_winner(room, selected_product)
+        self._record_lot(room, selected_product, start_price, selected_product.cost,
+                         selected_product.current_price, winner, room.clock_drops)
+        
+        if winner:
+            # Есть покупатель! Продаем товар
+            profit = room.sell(winner, selected_product)
+            
+            current_game.current_round += 1
             
-            # Выбираем случайный доступный товар
-            available_products = [p for p in products if p.is_available()]
-            if not available_products:
+            # Проверяем окончание игры
+            game_over, message = self._check_game_over(room)
+            if game_over:
                 current_game.status = 'finished'
                 current_game.end_time = datetime.now()
-                return {
-                    'success': False,
-                    'message': 'Все товары проданы!',
-                    'game_over': True
-                }
+            notify_state_changed(room)
             
-            selected_product = random.choice(available_products)
-            current_game.current_product_id = selected_product.id
-            
-            # ГОЛЛАНДСКИЙ АУКЦИОН: Автоматически снижаем цену до тех пор, пока кто-то не купит
-            max_price_drops = 20  # Максимум снижений цены
-            price_drops = 0
-            
-            while price_drops < max_price_drops:
-                # Проверяем, есть ли покупатели по текущей цене
-                winner = self._find_first_buyer(selected_product)
-                
-                if winner:
-                    # Есть покупатель! Продаем товар
-                    profit = winner.buy_product(selected_product, selected_product.current_price)
-                    selected_product.sell_one()
-                    
-                    current_game.current_round += 1
-                    
-                    # Проверяем окончание игры
-                    game_over, message = self._check_game_over()
-                    if game_over:
-                        current_game.status = 'finished'
-                        current_game.end_time = datetime.now()
-                    
-                    return {
-                        'success': True,
-                        'round': current_game.current_round - 1,
-                        'current_lot': selected_product.to_dict(),
-                        'winner': {
-                            'id': winner.id,
-                            'name': winner.name,
-                            'purchase_price': selected_product.current_price,
-                            'profit': profit
-                        },
-                        'message': f'{winner.name} купил {selected_product.name} за {selected_product.current_price:,} ₽',
-                        'game_over': game_over,
-                        'game_over_message': message
-                    }
-                else:
-                    # Никто не купил - снижаем цену (ГОЛЛАНДСКИЙ АУКЦИОН!)
-                    old_price = selected_product.current_price
-                    selected_product.reduce_price(1 - self.price_reduction_step)
-                    price_drops += 1
-                    
-                    # Если цена достигла минимума (себестоимости), прекращаем
-                    if selected_product.current_price <= selected_product.cost:
-                        selected_product.current_price = selected_product.cost
-                        break
-            
-            # Если никто не купил после всех снижений - пропускаем товар
             return {
                 'success': True,
-                'round': current_game.current_round,
+                'round': current_game.current_round - 1,
                 'current_lot': selected_product.to_dict(),
-                'winner': None,
-                'message': f'Товар {selected_product.name} не продан. Цена снижена до {selected_product.current_price:,} ₽',
-                'game_over': False
+                'winner': {
+                    'id': winner.id,
+                    'name': winner.name,
+                    'purchase_price': selected_product.current_price,
+                    'profit': profit
+                },
+                'message': f'{winner.name} купил {selected_product.name} за {selected_product.current_price:,} ₽',
+                'game_over': game_over,
+                'game_over_message': message
             }
-                
+        
+        # Если никто не купил после всех снижений - пропускаем товар
+        notify_state_changed(room)
+        return {
+            'success': True,
+            'round': current_game.current_round,
+            'current_lot': selected_product.to_dict(),
+            'winner': None,
+            'message': f'Товар {selected_product.name} не продан. Цена снижена до {selected_product.current_price:,} ₽',
+            'game_over': False
+        }
+    
+    def _record_lot(self, room, product, start_price, floor, price, winner, drops=None):
+        """
+        Записывает исход лота в журнал лотов и аналитику
+        
+        Число снижений drops сообщает движок (room.clock_drops); без него
+        это шаг цены price на лестнице цен лота.
+        """
+        sold = winner is not None
+        if drops is None:
+            checked, _ = price_ladder(start_price, floor, self.price_reduction_step, self.max_price_drops)
+            drops = checked.index(price) if sold and price in checked else len(checked)
+        round_number = room.current_game.current_round if room.current_game else 0
+        room.lots.append(round_number, product.id, start_price, floor, price, drops,
+                         winner.id if sold else None)
+        room.market.record_lot(product.id, sold, drops)
+    
+    # ------------------------------------------------------------------
+    # Лот в реальном времени
+    # ------------------------------------------------------------------
+    
+    def open_live_lot(self, room):
+        """
+        Открывает лот, цена которого снижается в реальном времени
+        
+        Клиент получает расписание цены один раз (начальная цена, доля
+        снижения, шаг часов, себестоимость) и считает цену сам. Исход для
+        ИИ рассчитывается сразу тем же движком, что и обычный раунд, но
+        объявляется, только когда часы дойдут до его шага; пользователь,
+        купивший раньше, забирает лот по цене своего шага.
+        """
+        try:
+            with room.lock:
+                return self._open_live_lot(room)
         except Exception as e:
             return {
                 'success': False,
-                'message': f'Ошибка при проведении раунда: {str(e)}'
+                'message': f'Ошибка при открытии лота: {str(e)}'
             }
     
-    def _find_first_buyer(self, product):
-        """Находит первого покупателя"""
-        global players
+    def _open_live_lot(self, room):
+        """Тело открытия лота (вызывается под блокировкой комнаты)"""
+        product, error = self._select_lot(room)
+        if error:
+            return error
         
-        active_players = [p for p in players if p.balance > 0]
-        players_with_preference = []
+        start_price = product.current_price
+        checked, final_price = price_ladder(start_price, product.cost,
+                                            self.price_reduction_step, self.max_price_drops)
+        winner = self._find_winner(room, product)
+        if winner:
+            outcome = [winner.id, checked.index(product.current_price), product.current_price]
+        else:
+            outcome = [None, len(checked), final_price]
+        product.current_price = start_price
         
-        for player in active_players:
-            if player.can_buy(product.current_price):
-                preference_multiplier = player.get_preference_multiplier(product.name)
-                random_factor = random.uniform(0.1, 1.0)
-                purchase_probability = preference_multiplier * random_factor
-                players_with_preference.append((player, purchase_probability))
+        previous = room.live_lot
+        room.live_lot = {
+            'id': previous['id'] + 1 if previous else 1,
+            'product_id': product.id,
+            'start_price': start_price,
+            'step_ratio': self.price_reduction_step,
+            'tick_ms': self.lot_tick_ms,
+            'floor': product.cost,
+            'max_drops': self.max_price_drops,
+            'opened_at': now_ms(),
+            'status': 'live',
+            'winner_id': None,
+            'price': None,
+            'profit': None
+        }
+        room.live_outcome = outcome
+        if not self.settle_live_lot(room):
+            self.arm_live_lot(room)
+            notify_state_changed(room)
         
-        if not players_with_preference:
-            return None
+        return {
+            'success': True,
+            'lot': dict(room.live_lot),
+            'current_lot': product.to_dict(),
+            'server_time': now_ms(),
+            'message': f'Торги: {product.name} от {start_price:,} ₽'
+        }
+    
+    def lot_price(self, lot, tick):
+        """Цена лота на шаге часов tick (та же лестница цен, что у ИИ)"""
+        checked, final_price = price_ladder(lot['start_price'], lot['floor'],
+                                            lot['step_ratio'], lot['max_drops'])
+        return checked[tick] if tick < len(checked) else final_price
+    
+    def lot_tick(self, lot, now):
+        """Шаг часов лота в момент now (мс)"""
+        return max(0, (now - lot['opened_at']) // lot['tick_ms'])
+    
+    def lot_due(self, lot, tick):
+        """
+        Время закрытия лота исходом ИИ на шаге tick (мс)
         
-        # Сортируем по вероятности покупки
-        players_with_preference.sort(key=lambda x: x[1], reverse=True)
+        ИИ отвечает в конце своего шага: весь шаг цена доступна пользователю,
+        и лот не закрывается сразу при открытии, если ИИ купил бы по начальной цене.
+        """
+        return lot['opened_at'] + (tick + 1) * lot['tick_ms']
+    
+    def arm_live_lot(self, room):
+        """Ставит таймер закрытия лота на шаг, где его купит ИИ (или часы остановятся)"""
+        lot = room.live_lot
+        if not lot or lot['status'] != 'live':
+            return
+        if room.lot_timer is not None:
+            room.lot_timer.cancel()
+        due = self.lot_due(lot, room.live_outcome[1]) + self.settle_grace_ms
         
-        # Выбираем игрока
-        if len(players_with_preference) > 1:
-            top_players = players_with_preference[:min(3, len(players_with_preference))]
-            if random.random() < 0.7:
-                return top_players[0][0]
-            else:
-                return random.choice(top_players)[0]
-        else:
-            return players_with_preference[0][0]
+        def settle():
+            with room.lock:
+                if room.live_lot is lot:
+                    self.settle_live_lot(room)
+        
+        room.lot_timer = threading.Timer(max(0, due - now_ms()) / 1000, settle)
+        room.lot_timer.daemon = True
+        room.lot_timer.start()
     
-    def _check_game_over(self):
-        """Проверяет условия окончания игры"""
-        global products, players
+    def settle_live_lot(self, room, now=None):
+        """
+        Закрывает лот, если часы дошли до шага исхода ИИ (под блокировкой комнаты)
+        
+        Args:
+            now: Момент проверки (мс); по умолчанию - сейчас минус запас на заявки
+                пользователей, которые поступили раньше исхода ИИ и еще собираются
+        
+        Returns:
+            bool: Лот закрыт этим вызовом
+        """
+        lot = room.live_lot
+        if not lot or lot['status'] != 'live':
+            return False
+        winner_id, tick, price = room.live_outcome
+        if now is None:
+            now = now_ms() - self.settle_grace_ms
+        if now < self.lot_due(lot, tick):
+            return False
+        
+        product = next(p for p in room.products if p.id == lot['product_id'])
+        product.current_price = price
+        winner = next((p for p in room.players if p.id == winner_id), None)
+        profit = room.sell(winner, product) if winner else None
+        self._finish_live_lot(room, winner if profit is not None else None, price, profit)
+        return True
+    
+    def buy_live_lot(self, room, player, product, now=None):
+        """
+        Покупка лота, который сейчас торгуется (под блокировкой комнаты)
+        
+        Args:
+            now: Время поступления заявки (мс); цена и то, успел ли раньше ИИ,
+                считаются на этот момент
+        
+        Returns:
+            tuple | None: (прибыль, цена) или None, если товар сейчас не торгуется;
+            прибыль None - не хватает денег
+        """
+        if now is None:
+            now = now_ms()
+        self.settle_live_lot(room, now)
+        lot = room.live_lot
+        if not lot or lot['status'] != 'live' or lot['product_id'] != product.id:
+            return None
+        price = self.lot_price(lot, self.lot_tick(lot, now))
+        if not player.can_buy(price):
+            return None, price
+        product.current_price = price
+        profit = room.sell(player, product)
+        self._finish_live_lot(room, player, price, profit)
+        return profit, price
+    
+    def _finish_live_lot(self, room, winner, price, profit):
+        """Записывает итог лота и завершает раунд"""
+        lot = room.live_lot
+        lot.update(status='sold' if winner else 'unsold', price=price, profit=profit,
+                   winner_id=winner.id if winner else None)
+        product = next(p for p in room.products if p.id == lot['product_id'])
+        self._record_lot(room, product, lot['start_price'], lot['floor'], price, winner)
+        room.live_outcome = None
+        if room.lot_timer is not None:
+            room.lot_timer.cancel()
+            room.lot_timer = None
         
+        current_game = room.current_game
+        if winner and current_game:
+            current_game.current_round += 1
+            game_over, _ = self._check_game_over(room)
+            if game_over:
+                current_game.status = 'finished'
+                current_game.end_time = datetime.now()
+        notify_state_changed(room)
+    
+    def cancel_live_lot(self, room):
+        """Снимает лот без покупателя (новая игра или сброс)"""
+        if room.lot_timer is not None:
+            room.lot_timer.cancel()
+            room.lot_timer = None
+        room.live_lot = None
+        room.live_outcome = None
+    
+    def _run_price_clock(self, room, product, max_price_drops):
+        """
+        Исходный режим: на каждом шаге цены игроки оцениваются стратегиями
+        Returns: Покупатель или None (цена товара остается на последнем шаге)
+        """
+        return room.run_price_clock(product, self.price_reduction_step, max_price_drops, random)
+    
+    def _match_by_index(self, room, product, max_price_drops):
+        """
+        Режим индекса: первый покупатель - игрок с наибольшей ценой резервирования
+        Returns: Покупатель или None (цена товара остается на последнем шаге)
+        """
+        return room.match_by_index(product, self.price_reduction_step, max_price_drops)
+    
+    def _find_first_buyer(self, room, product):
+        """Находит первого покупателя на текущей цене"""
+        return room.first_buyer(product, random)
+    
+    def _check_game_over(self, room):
+        """Проверяет условия окончания игры"""
         # Проверяем товары
-        available_products = [p for p in products if p.is_available()]
+        available_products = [p for p in room.products if p.is_available()]
         if len(available_products) == 0:
             return True, "Все товары проданы!"
         
         # Проверяем активных игроков
-        active_players = [p for p in players if p.balance > 0]
+        active_players = [p for p in room.players if p.balance > 0]
         
         if len(active_players) <= 1:
             if len(active_players) == 1:
@@ -515,41 +1091,47 @@ class DutchAuctionEngine:
         
         return False, ""
     
-    def get_game_statistics(self):
-        """Возвращает статистику игры"""
-        global players, current_game
-        
+    def get_game_statistics(self, room):
+        """Возвращает статистику игры комнаты"""
         try:
-            sorted_players = sorted(players, key=lambda p: p.total_profit, reverse=True)
-            
-            total_profit = sum(p.total_profit for p in players)
-            total_purchases = sum(p.purchases for p in players)
-            best_player = sorted_players[0] if sorted_players else None
-            
-            return {
-                'players': [p.to_dict() for p in sorted_players],
-                'total_profit': total_profit,
-                'total_purchases': total_purchases,
-                'best_player': best_player.name if best_player else 'Нет данных',
-                'game_info': current_game.to_dict() if current_game else None
-            }
+            with room.lock:
+                players = room.players
+                sorted_players = sorted(players, key=lambda p: p.total_profit, reverse=True)
+                
+                total_profit = sum(p.total_profit for p in players)
+                total_purchases = sum(p.purchases for p in players)
+                best_player = sorted_players[0] if sorted_players else None
+                
+                return {
+                    'players': [p.to_dict() for p in sorted_players],
+                    'total_profit': total_profit,
+                    'total_purchases': total_purchases,
+                    'best_player': best_player.name if best_player else 'Нет данных',
+                    'game_info': room.current_game.to_dict() if room.current_game else None,
+                    'products': [p.to_dict() for p in room.products],
+                    'market': room.market.summary(room.products)
+                }
         except Exception as e:
             return {
                 'success': False,
                 'message': f'Ошибка получения статистики: {str(e)}'
             }
     
-    def reset_game(self):
-        """Сбрасывает игру"""
-        global current_game, players, products
-        
+    def reset_game(self, room):
+        """Сбрасывает игру комнаты"""
         try:
-            if current_game:
-                current_game.status = 'finished'
-                current_game.end_time = datetime.now()
-            
-            reset_all_players()
-            reset_all_products()
+            with room.lock:
+                if room.current_game:
+                    room.current_game.status = 'finished'
+                    room.current_game.end_time = datetime.now()
+                
+                self.cancel_live_lot(room)
+                room.ledger = new_ledger()
+                room.lots = new_lot_journal()
+                room.market = new_market()
+                reset_all_players(room)
+                reset_all_products(room)
+                notify_state_changed(room)
             
             return True
         except Exception as e:
@@ -563,27 +1145,247 @@ class DutchAuctionEngine:
 # Создаем движок аукциона
 auction_engine = DutchAuctionEngine()
 
-# Инициализируем данные
-create_initial_data()
+# Рассылка состояния игр: кодируется один раз на изменение для всех подписчиков
+state_hubs = FanoutHub(snapshot_room_state, get_room_version, queue_limit=STREAM_QUEUE_LIMIT)
+add_state_listener(state_hubs.mark_dirty)
+state_hubs.start()
+
+# Восстанавливаем игры из последнего снимка
+if SNAPSHOT_ENABLED:
+    _restore_started = time.perf_counter()
+    STARTUP_TIMINGS['restored_rooms'] = restore_snapshot()
+    STARTUP_TIMINGS['restore_snapshot_ms'] = round((time.perf_counter() - _restore_started) * 1000, 2)
+
+# Инициализируем комнату по умолчанию
+_initial_data_started = time.perf_counter()
+get_room(DEFAULT_GAME_ID)
+STARTUP_TIMINGS['create_initial_data_ms'] = round((time.perf_counter() - _initial_data_started) * 1000, 2)
+# Фоновая выгрузка неактивных игр
+start_room_reaper()
+# Фоновые снимки и последний снимок при остановке процесса. Начальное
+# состояние не пишется: процесс, где игры не менялись (например, импорт
+# модуля или наблюдатель перезагрузчика), не затирает снимок
+snapshot_stats['fingerprint'] = rooms_fingerprint()
+if SNAPSHOT_ENABLED:
+    if SNAPSHOT_INTERVAL > 0:
+        start_snapshotter()
+    atexit.register(take_snapshot)
+STARTUP_TIMINGS['module_ready_ms'] = round((time.perf_counter() - _MODULE_STARTED) * 1000, 2)
+
+def get_request_game_id():
+    """
+    Определяет ID игры запроса
+    
+    Порядок: параметр ?game=, заголовок X-Game-Id, cookie golan_game.
+    Тот же порядок использует маршрутизатор launcher.py в production-режиме.
+    """
+    for game_id in (request.args.get('game'),
+                    request.headers.get('X-Game-Id'),
+                    request.cookies.get(GAME_COOKIE_NAME)):
+        if is_valid_game_id(game_id):
+            return game_id
+    return DEFAULT_GAME_ID
+
+def get_request_room():
+    """Возвращает комнату текущего запроса"""
+    return get_room(get_request_game_id())
+
+# Ограничение частоты раундов и покупок (настраивается переменными окружения)
+traffic_shaper = TrafficShaper(
+    session_rate=float(os.environ.get('GOLAN_RATE_SESSION', '5')),
+    session_burst=float(os.environ.get('GOLAN_BURST_SESSION', '10')),
+    game_rate=float(os.environ.get('GOLAN_RATE_GAME', '50')),
+    game_burst=float(os.environ.get('GOLAN_BURST_GAME', '100')),
+    max_inflight=int(os.environ.get('GOLAN_MAX_INFLIGHT', '64'))
+)
+
+# Процесс работает за маршрутизатором launcher.py (он задает переменную своим
+# процессам): только тогда X-Forwarded-For ставит маршрутизатор, а не клиент
+BEHIND_ROUTER = os.environ.get('GOLAN_BEHIND_ROUTER') == '1'
+
+def get_client_key():
+    """Ключ клиента для ограничения: сессия пользователя или адрес"""
+    session_id = session.get('user_session_id')
+    if session_id:
+        return session_id
+    # За маршрутизатором настоящий адрес приходит в X-Forwarded-For; без него
+    # заголовок выбрал бы сам клиент (и свою область ограничений)
+    if BEHIND_ROUTER and request.remote_addr in ('127.0.0.1', '::1'):
+        return request.headers.get('X-Forwarded-For', request.remote_addr)
+    return request.remote_addr
+
+def rate_limited(route):
+    """
+    Декоратор тяжелых маршрутов: token bucket по сессии и по игре,
+    плюс отказ 429 с Retry-After, когда движок перегружен
+    """
+    @functools.wraps(route)
+    def wrapper(*args, **kwargs):
+        retry_after = traffic_shaper.admit(request.endpoint, get_client_key(), get_request_game_id())
+        if retry_after is not None:
+            response = jsonify({
+                'success': False,
+                'message': 'Слишком много запросов, попробуйте позже',
+                'retry_after': round(retry_after, 3)
+            })
+            response.status_code = 429
+            response.headers['Retry-After'] = retry_after_header(retry_after)
+            return response
+        try:
+            return route(*args, **kwargs)
+        finally:
+            traffic_shaper.release()
+    return wrapper
+
+# Кэш ответов по Idempotency-Key: сколько ключей и сколько секунд хранится ответ
+idempotency_cache = IdempotencyCache(
+    capacity=int(os.environ.get('GOLAN_IDEMPOTENCY_CAPACITY', '4096')),
+    ttl=float(os.environ.get('GOLAN_IDEMPOTENCY_TTL', '300'))
+)
+
+# Наибольшая длина ключа идемпотентности
+IDEMPOTENCY_KEY_MAX = 255
+
+def idempotent(route):
+    """
+    Декоратор действий: повтор запроса с тем же заголовком Idempotency-Key
+    отдает сохраненный ответ первого запроса, не вызывая движок
+    
+    Ключ действует для клиента, игры и маршрута. Повтор во время выполнения
+    первого запроса ждет его ответ; тот же ключ с другим телом - 422.
+    Запросы без заголовка выполняются как обычно.
+    
+    Декоратор намеренно стоит снаружи @rate_limited: повтор сохраненного
+    ответа не тратит токены и не занимает слот движка, а отказ 429 первого
+    запроса проходит мимо кэша (UNSTORED_STATUSES) - запрос можно повторить
+    с тем же ключом, когда лимит восстановится.
+    """
+    @functools.wraps(route)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return route(*args, **kwargs)
+        key = key.strip()
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX:
+            return jsonify({
+                'success': False,
+                'message': f'Idempotency-Key должен быть непустым и не длиннее {IDEMPOTENCY_KEY_MAX} символов'
+            }), 400
+        
+        scope = (get_client_key(), get_request_game_id(), request.endpoint, key)
+        outcome, value = idempotency_cache.begin(scope, IdempotencyCache.fingerprint(request.get_data()))
+        if outcome == 'replay':
+            response = Response(value.body, status=value.status, headers=value.headers)
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        if outcome == 'conflict':
+            return jsonify({
+                'success': False,
+                'message': 'Idempotency-Key уже использован с другим запросом'
+            }), 422
+        if outcome == 'busy':
+            response = jsonify({
+                'success': False,
+                'message': 'Запрос с этим Idempotency-Key еще выполняется'
+            })
+            response.status_code = 409
+            response.headers['Retry-After'] = '1'
+            return response
+        
+        stored = None
+        try:
+            response = app.make_response(route(*args, **kwargs))
+            if (response.status_code < 500 and response.status_code not in UNSTORED_STATUSES
+                    and not response.is_streamed):
+                stored = StoredResponse(response.status_code, stored_headers(response.headers.items()),
+                                        response.get_data())
+            return response
+        finally:
+            idempotency_cache.finish(scope, value, stored)
+    return wrapper
 
 # ============================================================================
 # МАРШРУТЫ СТРАНИЦ
 # ============================================================================
 
+def send_prepared(content, cache_control):
+    """
+    Отдает подготовленное содержимое (assets.PreparedContent)
+    
+    Учитывает If-None-Match (ответ 304) и Accept-Encoding (готовая
+    сжатая версия без повторного сжатия).
+    """
+    if request.if_none_match.contains(content.etag):
+        response = Response(status=304)
+    else:
+        body, encoding = content.select(request.headers.get('Accept-Encoding'))
+        response = Response(body, content_type=content.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(content.etag)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept-Encoding')
+    return response
+
+def send_frame(frame):
+    """
+    Отдает закодированное состояние игры (fanout.Frame)
+    
+    JSON и сжатые варианты готовятся один раз на версию состояния,
+    все запросы этой версии получают одни и те же байты.
+    """
+    encoding = None
+    if api_compressor.should_compress(len(frame.payload)):
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'), api_compressor.encodings)
+    response = Response(frame.encoded(encoding, api_compressor.compress), mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['X-State-Version'] = str(frame.version)
+    response.headers['X-Server-Time'] = str(now_ms())
+    return response
+
+def render_page(template_name):
+    """Отдает страницу из кэша (отрисовывается один раз на процесс)"""
+    page = page_cache.get(request.endpoint, lambda: render_template(template_name))
+    return send_prepared(page, PAGE_CACHE_CONTROL)
+
 @app.route('/')
 def index():
     """Главная страница"""
-    return render_template('index.html')
+    return render_page('index.html')
 
 @app.route('/game')
 def game():
     """Страница игры"""
-    return render_template('game.html')
+    return render_page('game.html')
 
 @app.route('/statistics')
 def statistics():
     """Страница статистики"""
-    return render_template('statistics.html')
+    return render_page('statistics.html')
+
+@app.route('/assets/<digest>/<path:filename>')
+def hashed_asset(digest, filename):
+    """Статический файл с хешем содержимого в URL (кэшируется навсегда)"""
+    asset = asset_pipeline.get(filename)
+    if asset is None:
+        abort(404)
+    if asset.digest != digest:
+        # Устаревший хеш - отправляем на актуальную версию файла
+        return redirect(asset_pipeline.url_for(filename))
+    return send_prepared(asset, IMMUTABLE_CACHE_CONTROL)
+
+@app.route('/healthz')
+def healthz():
+    """Проверка работоспособности процесса (используется launcher.py)"""
+    return jsonify({
+        'status': 'ok',
+        'pid': os.getpid(),
+        'rooms': len(rooms),
+        'startup': STARTUP_TIMINGS,
+        'snapshot': get_snapshot_stats()
+    })
 
 # ============================================================================
 # API ENDPOINTS
@@ -592,8 +1394,6 @@ def statistics():
 @app.route('/api/set-player-name', methods=['POST'])
 def set_player_name():
     """API endpoint для установки имени пользователя"""
-    global players
-    
     try:
         data = request.get_json()
         name = data.get('name', '').strip()
@@ -604,21 +1404,24 @@ def set_player_name():
                 'message': 'Имя не может быть пустым'
             }), 400
         
-        # Создаем начальные данные если их нет
-        if not players:
-            create_initial_data()
-        
-        # Находим пользователя и устанавливаем имя
-        for player in players:
-            if player.is_user:
-                player.name = name
-                break
+        room = get_request_room()
+        with room.lock:
+            # Создаем начальные данные если их нет
+            if not room.players:
+                create_initial_data(room)
+            
+            # Находим пользователя и устанавливаем имя
+            for player in room.players:
+                if player.is_user:
+                    player.name = name
+                    break
+            notify_state_changed(room)
         
         return jsonify({
             'success': True,
             'message': f'Имя "{name}" успешно установлено!'
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -627,26 +1430,76 @@ def set_player_name():
 
 @app.route('/api/game/start', methods=['POST'])
 def start_game():
-    """Начинает новую игру"""
+    """Начинает новую игру в комнате запроса (?game=, X-Game-Id или cookie)"""
     try:
+        game_id = get_request_game_id()
         session_id = str(uuid.uuid4())
         session['user_session_id'] = session_id
         
-        success = auction_engine.start_new_game(session_id)
+        room = get_room(game_id)
+        success = auction_engine.start_new_game(room, session_id)
         
         if success:
-            user_player = get_user_player(session_id)
-            return jsonify({
+            user_player = get_user_player(room, session_id)
+            response = jsonify({
                 'success': True,
                 'message': 'Игра успешно начата!',
+                'game_id': room.game_id,
                 'user_data': user_player.to_dict() if user_player else None
             })
+            response.set_cookie(GAME_COOKIE_NAME, room.game_id, samesite='Lax')
+            return response
         else:
             return jsonify({
                 'success': False,
                 'message': 'Ошибка при запуске игры'
             }), 500
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Ошибка сервера: {str(e)}'
+        }), 500
+
+@app.route('/api/game/join', methods=['POST'])
+def join_game():
+    """
+    Подключает сессию к идущей игре комнаты еще одним пользователем
+    
+    В отличие от /api/game/start игра и остальные пользователи остаются;
+    тело запроса (необязательно): {"name": "..."}.
+    """
+    try:
+        game_id = get_request_game_id()
+        data = request.get_json(silent=True) or {}
+        name = str(data.get('name') or '').strip() or "Вы (Пользователь)"
+        
+        room = get_room(game_id)
+        with room.lock:
+            if not room.current_game or room.current_game.status != 'playing':
+                return jsonify({
+                    'success': False,
+                    'message': 'Игра не активна. Начните новую игру.'
+                }), 409
             
+            session_id = session.get('user_session_id')
+            user_player = get_user_player(room, session_id) if session_id else None
+            if user_player is None:
+                session_id = str(uuid.uuid4())
+                session['user_session_id'] = session_id
+                user_player = add_user_player(room, session_id, name)
+                notify_state_changed(room)
+            user_data = user_player.to_dict()
+        
+        response = jsonify({
+            'success': True,
+            'message': 'Вы в игре!',
+            'game_id': room.game_id,
+            'user_data': user_data
+        })
+        response.set_cookie(GAME_COOKIE_NAME, room.game_id, samesite='Lax')
+        return response
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -654,10 +1507,21 @@ def start_game():
         }), 500
 
 @app.route('/api/game/next-round', methods=['POST'])
+@idempotent
+@rate_limited
 def next_round():
-    """Следующий раунд"""
+    """
+    Следующий раунд
+    
+    {"live": true} - лот торгуется в реальном времени: в ответе расписание
+    цены, исход приходит в состоянии игры (поле lot), когда лот закроется.
+    """
     try:
-        result = auction_engine.conduct_dutch_auction_round()
+        data = request.get_json(silent=True) or {}
+        if data.get('live'):
+            result = auction_engine.open_live_lot(get_request_room())
+        else:
+            result = auction_engine.conduct_dutch_auction_round(get_request_room())
         return jsonify(result)
     except Exception as e:
         return jsonify({
@@ -669,8 +1533,7 @@ def next_round():
 def game_status():
     """Статус игры"""
     try:
-        game_state = auction_engine.get_current_game_state()
-        return jsonify(game_state)
+        return send_frame(state_hubs.current_frame(get_request_game_id()))
     except Exception as e:
         return jsonify({
             'success': False,
@@ -681,7 +1544,7 @@ def game_status():
 def game_statistics():
     """Статистика игры"""
     try:
-        stats = auction_engine.get_game_statistics()
+        stats = auction_engine.get_game_statistics(get_request_room())
         return jsonify(stats)
     except Exception as e:
         return jsonify({
@@ -693,7 +1556,7 @@ def game_statistics():
 def reset_game():
     """Сброс игры"""
     try:
-        success = auction_engine.reset_game()
+        success = auction_engine.reset_game(get_request_room())
         if success:
             return jsonify({
                 'success': True,
@@ -710,9 +1573,159 @@ def reset_game():
             'message': f'Ошибка сервера: {str(e)}'
         }), 500
 
+@app.route('/api/game/strategies', methods=['GET', 'POST'])
+def game_strategies():
+    """
+    Стратегии ИИ-игроков комнаты
+    GET - доступные стратегии, пропорции, режим поиска покупателя и распределение по игрокам
+    POST {"mix": {"random": 1, "reservation": 2}, "matching": "index"} - новые
+    пропорции (сразу перераспределяются) и/или режим поиска покупателя
+    """
+    try:
+        room = get_request_room()
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            matching = data.get('matching')
+            if matching is not None and matching not in MATCHING_MODES:
+                return jsonify({
+                    'success': False,
+                    'message': f'Неизвестный режим поиска покупателя: {matching}'
+                }), 400
+            mix = None
+            if 'mix' in data:
+                try:
+                    mix = parse_strategy_mix(data['mix'])
+                except ValueError as e:
+                    return jsonify({
+                        'success': False,
+                        'message': str(e)
+                    }), 400
+            
+            with room.lock:
+                if matching is not None:
+                    room.matching_mode = matching
+                if mix is not None:
+                    room.strategy_mix = mix
+                    assign_room_strategies(room)
+                    room.rebuild_preferences()
+                notify_state_changed(room)
+        
+        with room.lock:
+            return jsonify({
+                'success': True,
+                'available': available_strategies(),
+                'mix': room.strategy_mix,
+                'matching': room.matching_mode,
+                'matching_modes': list(MATCHING_MODES),
+                'players': [{'id': p.id, 'name': p.name, 'strategy': p.strategy}
+                            for p in room.players if not p.is_user]
+            })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Ошибка сервера: {str(e)}'
+        }), 500
+
+def bid_key(room, product_id):
+    """
+    Ключ пачки заявок: игра, товар и лот, который сейчас торгуется
+    (для товара, который не торгуется сейчас, - без лота)
+    
+    Шаг часов в ключ не входит: заявки по обе стороны границы шага
+    разбираются вместе в порядке поступления, каждая - по цене своего шага.
+    """
+    lot = room.live_lot
+    if lot and lot['status'] == 'live' and lot['product_id'] == product_id:
+        return room.game_id, product_id, lot['id']
+    return room.game_id, product_id, None
+
+def resolve_bids(key, bids):
+    """
+    Разбирает пачку заявок на покупку под одной блокировкой комнаты
+    
+    Заявки идут в порядке поступления; лот, который торгуется сейчас,
+    достается первой заявке, которой хватает денег, по цене шага часов
+    на момент ее поступления.
+    
+    Returns:
+        list: (ответ, код) для каждой заявки
+    """
+    room = bids[0].payload[0]
+    with room.lock:
+        return [resolve_buy(room, *bid.payload[1:]) for bid in bids]
+
+def resolve_buy(room, session_id, product_id, arrived_ms, lot_id=None):
+    """
+    Покупка товара пользователем (под блокировкой комнаты)
+    
+    Args:
+        lot_id: Лот, который торговался при поступлении заявки (ключ bid_key)
+    
+    Returns:
+        tuple: (ответ, код)
+    """
+    # Получаем пользователя и товар
+    user_player = get_user_player(room, session_id)
+    if not user_player:
+        return {
+            'success': False,
+            'message': 'Пользователь-игрок не найден'
+        }, 404
+    
+    product = next((p for p in room.products if p.id == product_id), None)
+    if not product:
+        return {
+            'success': False,
+            'message': 'Товар не найден'
+        }, 404
+    
+    # Лот, который торгуется сейчас, покупается по цене шага часов на момент заявки
+    live = auction_engine.buy_live_lot(room, user_player, product, arrived_ms)
+    if live is not None:
+        profit, price = live
+    elif lot_id is not None:
+        # Лот забрала более ранняя заявка или ИИ, или часы уже остановились
+        return {
+            'success': False,
+            'message': f'Торги по лоту {product.name} уже закрыты'
+        }, 409
+    else:
+        price = product.current_price
+        profit = room.sell(user_player, product)
+        if profit is not None:
+            notify_state_changed(room)
+    
+    # Проверяем баланс
+    if profit is None:
+        return {
+            'success': False,
+            'message': 'Недостаточно средств для покупки'
+        }, 400
+    
+    return {
+        'success': True,
+        'message': f'Товар {product.name} куплен за {price:,} ₽',
+        'user_data': user_player.to_dict(),
+        'profit': profit,
+        'price': price,
+        'server_time': now_ms()
+    }, 200
+
+# Одновременные покупки одного лота разбираются пачками по времени поступления
+bid_arbiter = BidArbiter(resolve_bids, window_ms=BID_WINDOW_MS)
+
 @app.route('/api/user/buy', methods=['POST'])
+@idempotent
+@rate_limited
 def buy_product():
-    """Покупка товара пользователем"""
+    """
+    Покупка товара пользователем
+    
+    Заявка получает отметку времени при поступлении и разбирается вместе
+    с одновременными заявками на тот же лот (bid_arbiter): побеждает
+    поступившая раньше, а не та, чей поток первым взял блокировку.
+    """
+    arrived, arrived_ms = time.perf_counter(), now_ms()
     try:
         data = request.get_json()
         product_id = data.get('product_id')
@@ -730,45 +1743,188 @@ def buy_product():
                 'message': 'Сессия пользователя не найдена'
             }), 400
         
-        # Получаем пользователя и товар
-        user_player = get_user_player(session_id)
+        room = get_request_room()
+        key = bid_key(room, product_id)
+        body, status = bid_arbiter.submit(key, (room, session_id, product_id, arrived_ms, key[2]), arrived)
+        return jsonify(body), status
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Ошибка сервера: {str(e)}'
+        }), 500
+
+# Пауза без изменений, после которой в поток отправляется комментарий-пинг
+SSE_HEARTBEAT = 15.0
+
+# Наибольшее ожидание long-poll запроса (секунды)
+LONG_POLL_MAX = 60.0
+
+@app.route('/api/game/stream')
+def game_stream():
+    """
+    Поток состояния игры в формате Server-Sent Events (тот же формат, что в asgi.py)
+    
+    Соединение - подписчик рассылки игры: кадр кодируется один раз
+    на изменение и отправляется всем подписчикам одними и теми же байтами.
+    """
+    game_id = get_request_game_id()
+    
+    def generate():
+        subscription = state_hubs.subscribe(game_id)
+        try:
+            while True:
+                frame = subscription.get(SSE_HEARTBEAT)
+                if frame is not None:
+                    yield frame.sse
+                elif subscription.closed:
+                    # Игру выгрузили в архив - подписываемся на новую комнату
+                    subscription = state_hubs.subscribe(game_id)
+                else:
+                    yield b': ping\n\n'
+        finally:
+            subscription.close()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/game/poll')
+def game_poll():
+    """
+    Long-poll состояния игры
+    
+    Параметры: since - последняя полученная версия (заголовок X-State-Version),
+    timeout - сколько ждать изменения (секунды, до LONG_POLL_MAX).
+    Возвращает состояние другой версии сразу или после изменения,
+    204 - если за timeout ничего не изменилось.
+    """
+    since = request.args.get('since', -1, type=int)
+    timeout = min(max(request.args.get('timeout', 25.0, type=float), 0.0), LONG_POLL_MAX)
+    frame = state_hubs.wait_newer(get_request_game_id(), since, timeout)
+    if frame is None:
+        return Response(status=204)
+    return send_frame(frame)
+
+@app.route('/api/metrics/traffic')
+def traffic_metrics():
+    """Сколько запросов пропущено, ограничено и отброшено"""
+    return jsonify(traffic_shaper.metrics())
+
+@app.route('/api/metrics/arbitration')
+def arbitration_metrics():
+    """Заявки на покупку, пачки и перцентили задержки арбитража"""
+    return jsonify(bid_arbiter.metrics())
+
+@app.route('/api/metrics/idempotency')
+def idempotency_metrics():
+    """Кэш ответов по Idempotency-Key: размер, повторы, вытеснения"""
+    return jsonify(idempotency_cache.metrics())
+
+@app.route('/api/metrics/fanout')
+def fanout_metrics():
+    """Подписчики потоков и сколько кадров закодировано, разослано и отброшено"""
+    return jsonify(state_hubs.metrics())
+
+@app.route('/api/snapshot', methods=['GET', 'POST'])
+def snapshot():
+    """
+    Снимок состояния всех игр
+    
+    GET - замеры последнего снимка (размер, пауза комнат, время записи),
+    POST - сделать снимок сейчас.
+    """
+    if request.method == 'POST':
+        try:
+            take_snapshot(force=True)
+        except OSError as e:
+            return jsonify({'success': False, 'message': f'Ошибка снимка: {e}'}), 500
+        return jsonify({'success': True, 'snapshot': get_snapshot_stats()})
+    return jsonify(get_snapshot_stats())
+
+# Наибольший размер страницы истории сделок
+HISTORY_PAGE_MAX = 200
+
+def history_page(room, player_id=None):
+    """
+    Страница журнала сделок по параметрам запроса (cursor, limit)
+    
+    Журнал читается без блокировки комнаты: чтение истории не задерживает раунды.
+    """
+    cursor = request.args.get('cursor', type=int)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), HISTORY_PAGE_MAX)
+    ledger = room.ledger
+    entries, next_cursor = ledger.read(cursor, limit, player_id)
+    
+    products = {p.id: p.name for p in room.products}
+    for entry in entries:
+        del entry['player_prev']
+        buyer = room.find_player(entry['player_id'])
+        entry['player'] = buyer.name if buyer else None
+        entry['product'] = products.get(entry['product_id'])
+    return dict(ledger.stats(), success=True, entries=entries, next_cursor=next_cursor)
+
+@app.route('/api/game/history')
+def game_history():
+    """
+    История сделок игры, от новых к старым
+    
+    Параметры: cursor - next_cursor предыдущей страницы, limit - размер
+    страницы (до HISTORY_PAGE_MAX), player_id - только сделки игрока.
+    """
+    try:
+        return jsonify(history_page(get_request_room(), request.args.get('player_id', type=int)))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Ошибка сервера: {str(e)}'
+        }), 500
+
+@app.route('/api/user/history')
+def user_history():
+    """История покупок пользователя (параметры как у /api/game/history)"""
+    try:
+        session_id = session.get('user_session_id')
+        room = get_request_room()
+        user_player = get_user_player(room, session_id) if session_id else None
+        
         if not user_player:
             return jsonify({
                 'success': False,
                 'message': 'Пользователь-игрок не найден'
             }), 404
         
-        product = next((p for p in products if p.id == product_id), None)
-        if not product:
-            return jsonify({
-                'success': False,
-                'message': 'Товар не найден'
-            }), 404
-        
-        # Проверяем баланс
-        if not user_player.can_buy(product.current_price):
-            return jsonify({
-                'success': False,
-                'message': 'Недостаточно средств для покупки'
-            }), 400
-        
-        # Покупаем товар
-        profit = user_player.buy_product(product, product.current_price)
-        product.sell_one()
-        
-        return jsonify({
-            'success': True,
-            'message': f'Товар {product.name} куплен за {product.current_price:,} ₽',
-            'user_data': user_player.to_dict(),
-            'profit': profit
-        })
-        
+        return jsonify(history_page(room, user_player.id))
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Ошибка сервера: {str(e)}'
         }), 500
 
+@app.route('/api/game/export')
+def game_export():
+    """
+    Выгрузка результатов игры файлом
+    
+    Параметры: dataset - players, sales или lots; format - csv или parquet;
+    partial=1 - выгрузить, даже если кольцевой журнал уже перезаписал
+    начало игры (иначе 409). Ответ отдается частями по мере чтения
+    журнала, весь файл в памяти не собирается.
+    """
+    room = get_request_room()
+    dataset = request.args.get('dataset', 'sales')
+    try:
+        export = export_game(room, dataset, request.args.get('format', 'csv'),
+                             partial=request.args.get('partial') in ('1', 'true'))
+    except ExportError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 409 if isinstance(e, ExportIncomplete) else 400
+    
+    return Response(export.chunks, headers=export.headers(room.game_id, dataset))
+
 @app.route('/api/user/data')
 def get_user_data():
     """Данные пользователя"""
@@ -781,7 +1937,7 @@ def get_user_data():
                 'message': 'Сессия пользователя не найдена'
             })
         
-        user_player = get_user_player(session_id)
+        user_player = get_user_player(get_request_room(), session_id)
         
         if not user_player:
             return jsonify({
@@ -793,7 +1949,7 @@ def get_user_data():
             'success': True,
             'user_data': user_player.to_dict()
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -804,17 +1960,52 @@ def get_user_data():
 # ЗАПУСК ПРИЛОЖЕНИЯ
 # ============================================================================
 
+def serve_production(host, port, threads=16):
+    """
+    Запускает приложение без отладчика (рабочий процесс launcher.py)
+    
+    Использует waitress, если он установлен, иначе многопоточный
+    сервер werkzeug без перезагрузчика и отладчика.
+    """
+    try:
+        from waitress import serve
+        serve(app, host=host, port=port, threads=threads, _quiet=True)
+    except ImportError:
+        import logging
+        from werkzeug.serving import run_simple
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        run_simple(host, port, app, threaded=True,
+                   use_reloader=False, use_debugger=False)
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Голландский аукцион Golan')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--production', action='store_true',
+                        help='Запуск без отладчика (рабочий процесс launcher.py)')
+    args = parser.parse_args()
+    
+    if args.production:
+        # launcher.py останавливает процесс через SIGTERM - выходим штатно,
+        # чтобы atexit успел записать последний снимок
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        serve_production(args.host, args.port)
+        sys.exit(0)
+    
     print("=" * 60)
     print("🔥 ГОЛЛАНДСКИЙ АУКЦИОН GOLAN 🔥")
     print("=" * 60)
     print()
     print("🚀 Запускаем приложение...")
-    print("📱 Откройте браузер: http://localhost:5000")
+    print(f"📱 Откройте браузер: http://localhost:{args.port}")
     print("⏹️  Для остановки нажмите Ctrl+C")
     print()
     
+    # В режиме отладки шаблоны и статика меняются на лету
+    page_cache.enabled = False
+    asset_pipeline.auto_reload = True
+    
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        app.run(debug=True, host=args.host, port=args.port)
     except KeyboardInterrupt:
         print("\n👋 Приложение остановлено!")
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+⚖️ АРБИТРАЖ ПОКУПОК GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Детерминированный и справедливый порядок одновременных покупок
+одного лота несколькими пользователями
+Особенности:
+- Заявка получает отметку времени сервера при поступлении запроса
+- Заявки с одним ключом (игра, товар, лот) собираются в течение
+  микроокна и разбираются одной пачкой: блокировка комнаты берется один раз
+  на пачку, а не на каждую заявку
+- Порядок в пачке - время поступления, затем номер заявки; пачки одного
+  ключа разбираются в порядке открытия (следующая ждет предыдущую), так что
+  исход не зависит от того, какой поток первым дошел до блокировки
+- Без фонового потока: первая заявка пачки (ведущая) ждет окно и разбирает
+  пачку, остальные ждут свой результат
+- Задержка арбитража (от поступления до результата) - перцентили в metrics()
+"""
+
+import time
+import threading
+from collections import deque
+
+class Bid:
+    """
+    Заявка на покупку
+
+    Атрибуты:
+    - key: Ключ пачки
+    - payload: Данные заявки для resolve
+    - arrived: Время поступления (time.perf_counter)
+    - seq: Номер заявки (разрешает равные отметки времени)
+    - result: Результат resolve для этой заявки
+    """
+
+    __slots__ = ('key', 'payload', 'arrived', 'seq', 'result', 'error', 'done')
+
+    def __init__(self, key, payload, arrived, seq):
+        self.key = key
+        self.payload = payload
+        self.arrived = arrived
+        self.seq = seq
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+class BidArbiter:
+    """
+    Сбор заявок в пачки по ключу и разбор пачки одним вызовом
+
+    Args:
+        resolve: resolve(key, bids) -> результаты в порядке bids; заявки
+            переданы уже упорядоченными по времени поступления
+        window_ms: Микроокно сбора пачки (мс), 0 - без ожидания
+        samples: Сколько последних задержек хранить для перцентилей
+    """
+
+    def __init__(self, resolve, window_ms=5.0, samples=4096):
+        self.resolve = resolve
+        self.window = window_ms / 1000
+        self._open = {}
+        self._tails = {}  # Ключ -> событие завершения последней открытой пачки
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._latencies = deque(maxlen=samples)
+        self.bids = 0
+        self.batches = 0
+        self.contested = 0
+        self.largest_batch = 0
+
+    def submit(self, key, payload, arrived=None):
+        """
+        Подает заявку и ждет результат ее пачки
+
+        Args:
+            arrived: Время поступления запроса (time.perf_counter); по умолчанию - сейчас
+
+        Returns:
+            Результат resolve для этой заявки
+        """
+        if arrived is None:
+            arrived = time.perf_counter()
+        with self._lock:
+            self._seq += 1
+            bid = Bid(key, payload, arrived, self._seq)
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = []
+                previous = self._tails.get(key)
+                finished = self._tails[key] = threading.Event()
+            batch.append(bid)
+
+        if leader:
+            self._run_batch(key, batch, arrived + self.window, previous, finished)
+        else:
+            bid.done.wait()
+        if bid.error is not None:
+            raise bid.error
+        return bid.result
+
+    def _run_batch(self, key, batch, deadline, previous, finished):
+        """
+        Ждет окно, закрывает пачку и разбирает ее (выполняет ведущая заявка)
+
+        Args:
+            previous: Событие завершения предыдущей пачки того же ключа или None
+            finished: Событие завершения этой пачки
+        """
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        with self._lock:
+            del self._open[key]
+        # Пачка, открытая позже, не разбирается раньше предыдущей: в ней заявки,
+        # поступившие позже
+        if previous is not None:
+            previous.wait()
+
+        batch.sort(key=lambda bid: (bid.arrived, bid.seq))
+        try:
+            results = self.resolve(key, batch)
+            for bid, result in zip(batch, results):
+                bid.result = result
+        except Exception as e:
+            for bid in batch:
+                bid.error = e
+
+        done_at = time.perf_counter()
+        with self._lock:
+            self.bids += len(batch)
+            self.batches += 1
+            self.contested += len(batch) > 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self._latencies.extend(done_at - bid.arrived for bid in batch)
+            if self._tails.get(key) is finished:
+                del self._tails[key]
+        finished.set()
+        for bid in batch:
+            bid.done.set()
+
+    def metrics(self):
+        """Заявки, пачки и перцентили задержки арбитража (мс)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'window_ms': self.window * 1000,
+                'bids': self.bids,
+                'batches': self.batches,
+                'contested_batches': self.contested,
+                'largest_batch': self.largest_batch,
+                'open_batches': len(self._open)
+            }
+        for name, share in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            stats[f'{name}_ms'] = round(percentile(latencies, share) * 1000, 3)
+        stats['max_ms'] = round(latencies[-1] * 1000, 3) if latencies else 0.0
+        return stats
+
+def percentile(ordered, share):
+    """Перцентиль отсортированного списка (0.0 для пустого)"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
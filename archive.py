@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+🗄️ АРХИВ ЗАВЕРШЕННЫХ ИГР GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Сжатое хранение игр, выгруженных из памяти
+Особенности:
+- Одна игра - один файл <game_id>.json.gz
+- Запись атомарная: сначала временный файл, затем переименование
+- Игры читаются с диска только по требованию
+"""
+
+import os
+import gzip
+import json
+import threading
+
+class GameArchive:
+    """
+    Архив игр на диске
+
+    Args:
+        directory: Папка архива (создается при первой записи)
+        compresslevel: Уровень gzip
+    """
+
+    def __init__(self, directory, compresslevel=6):
+        self.directory = directory
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+
+    def _path(self, game_id):
+        return os.path.join(self.directory, f'{game_id}.json.gz')
+
+    def save(self, game_id, data):
+        """
+        Сохраняет игру в архив
+
+        Returns:
+            int: Размер файла в байтах
+        """
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        path = self._path(game_id)
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+        with gzip.open(temp_path, 'wb', compresslevel=self.compresslevel) as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+        return os.path.getsize(path)
+
+    def load(self, game_id):
+        """Загружает игру из архива или возвращает None"""
+        try:
+            with gzip.open(self._path(game_id), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Ошибка чтения архива игры {game_id}: {e}")
+            return None
+
+    def exists(self, game_id):
+        """Проверяет, есть ли игра в архиве"""
+        return os.path.exists(self._path(game_id))
+
+    def list_games(self):
+        """Список ID игр в архиве"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len('.json.gz')] for name in names if name.endswith('.json.gz'))
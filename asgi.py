@@ -0,0 +1,550 @@
+# -*- coding: utf-8 -*-
+"""
+⚡ ASGI-ВЕРСИЯ ГОЛЛАНДСКОГО АУКЦИОНА GOLAN ⚡
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Асинхронная точка входа для того же приложения и движка
+Особенности:
+- Все маршруты app.py работают без изменений (через мост ASGI -> WSGI)
+- Блокирующие вызовы движка выполняются в ограниченном пуле потоков
+- Потоковые соединения (SSE) и long-poll живут в event loop и не
+  занимают потоки
+- Выгрузка результатов отдается частями: поток пула занят только
+  на время кодирования одной пачки строк
+- Состояние игры сериализуется один раз на изменение, а не на клиента
+
+Запуск:
+    python asgi.py
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+"""
+
+import io
+import os
+import sys
+import json
+import asyncio
+import functools
+from http.cookies import SimpleCookie, CookieError
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor
+
+import app as golan
+from export import ExportError, ExportIncomplete, export_game
+
+# ============================================================================
+# НАСТРОЙКИ
+# ============================================================================
+
+# Количество потоков для блокирующих вызовов движка
+ENGINE_WORKERS = int(os.environ.get('GOLAN_ENGINE_WORKERS', '8'))
+
+# Максимум вызовов движка в очереди (выполняются + ждут свободный поток)
+ENGINE_QUEUE_LIMIT = int(os.environ.get('GOLAN_ENGINE_QUEUE', str(ENGINE_WORKERS * 8)))
+
+# Максимальный размер тела запроса (байт)
+MAX_BODY_SIZE = 1024 * 1024
+
+# Интервал пустых сообщений для поддержания SSE соединения (секунды)
+SSE_HEARTBEAT = 15.0
+
+# Путь потока состояния игры
+STREAM_PATH = '/api/game/stream'
+
+# Путь long-poll состояния игры
+POLL_PATH = '/api/game/poll'
+
+# Путь выгрузки результатов игры
+EXPORT_PATH = '/api/game/export'
+
+# ============================================================================
+# ОГРАНИЧЕННЫЙ ПУЛ ДЛЯ БЛОКИРУЮЩИХ ВЫЗОВОВ
+# ============================================================================
+
+executor = ThreadPoolExecutor(max_workers=ENGINE_WORKERS, thread_name_prefix='golan-engine')
+_engine_slots = None  # asyncio.Semaphore, создается внутри event loop
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Выполняет блокирующую функцию в пуле потоков движка
+
+    Очередь ограничена ENGINE_QUEUE_LIMIT: лишние вызовы ждут в event loop,
+    не создавая новых потоков и не накапливая задачи в пуле.
+    """
+    loop = asyncio.get_running_loop()
+    async with _engine_slots:
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+# ============================================================================
+# РАССЫЛКА СОСТОЯНИЯ ИГРЫ
+# ============================================================================
+
+class StateBroadcaster:
+    """
+    Хранит последний закодированный кадр состояния одной игры
+
+    Движок сообщает об изменениях через app.add_state_listener. Кадр
+    берется из общей рассылки app.state_hubs (кодируется один раз на
+    изменение для потоков, long-poll и /api/game/status обеих версий),
+    после чего все ожидающие клиенты просыпаются и отправляют одни и те
+    же байты. Клиент всегда получает последний кадр - промежуточные
+    версии медленного клиента пропускаются.
+
+    Атрибуты:
+    - latest: Последний кадр (fanout.Frame) или None
+    - listeners: Сколько потоков и long-poll сейчас ждут кадры игры
+    """
+
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.version = -1
+        self.frame = b''
+        self.latest = None
+        self.listeners = 0
+        self._changed = asyncio.Event()
+        self._dirty = False
+        self._refreshing = False
+
+    def mark_dirty(self, *_):
+        """Отмечает, что состояние изменилось (вызывается в event loop)"""
+        self._dirty = True
+        if not self._refreshing:
+            self._refreshing = True
+            asyncio.ensure_future(self._refresh())
+
+    async def _refresh(self):
+        """Пересчитывает кадр, пока есть непрочитанные изменения"""
+        try:
+            while self._dirty:
+                self._dirty = False
+                frame = await run_blocking(golan.state_hubs.current_frame, self.game_id)
+                self.latest = frame
+                self.frame = frame.sse
+                self.version = frame.version
+                changed, self._changed = self._changed, asyncio.Event()
+                changed.set()
+        except Exception as e:
+            print(f"Ошибка обновления потока состояния: {e}")
+        finally:
+            self._refreshing = False
+
+    async def wait_frame(self, seen_version, timeout):
+        """
+        Ждет кадр новее seen_version
+
+        Returns:
+            tuple | None: (версия, байты кадра) или None по таймауту
+        """
+        if self.version < 0 and not self._refreshing:
+            self.mark_dirty()
+        if self.version == seen_version or self.version < 0:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.version, self.frame
+
+    async def wait_newer(self, since, timeout):
+        """
+        Кадр версии, отличной от since (long-poll, как app.game_poll)
+
+        Первый кадр новой рассылки ждется всегда (не дольше LONG_POLL_MAX),
+        изменение после него - не дольше timeout.
+
+        Returns:
+            fanout.Frame | None: Кадр или None по таймауту
+        """
+        loop = asyncio.get_running_loop()
+        if self.latest is None:
+            if not self._refreshing:
+                self.mark_dirty()
+            try:
+                await asyncio.wait_for(self._changed.wait(), golan.LONG_POLL_MAX)
+            except asyncio.TimeoutError:
+                return None
+        deadline = loop.time() + timeout
+        # Пока кадр пересчитывается, он может оказаться старее версии клиента
+        while self._refreshing or self.latest.version == since:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return self.latest
+
+# Рассыльщики по ID игры: живут, пока у игры есть слушатели
+broadcasters = {}
+_started = False
+
+def get_broadcaster(game_id):
+    """
+    Возвращает рассыльщика игры и учитывает нового слушателя
+    (вызывается в event loop; когда слушатель уходит - release_broadcaster)
+    """
+    broadcaster = broadcasters.get(game_id)
+    if broadcaster is None:
+        broadcaster = broadcasters[game_id] = StateBroadcaster(game_id)
+    broadcaster.listeners += 1
+    return broadcaster
+
+def release_broadcaster(broadcaster):
+    """
+    Слушатель ушел; рассыльщик без слушателей удаляется
+
+    Так словарь не растет с числом игр: рассыльщики выгруженных
+    и забытых игр уходят вместе с последним клиентом.
+    """
+    broadcaster.listeners -= 1
+    if broadcaster.listeners <= 0 and broadcasters.get(broadcaster.game_id) is broadcaster:
+        del broadcasters[broadcaster.game_id]
+
+def _on_state_changed_in_loop(game_id):
+    """Помечает кадр игры устаревшим, если у нее есть подписчики"""
+    broadcaster = broadcasters.get(game_id)
+    if broadcaster is not None:
+        broadcaster.mark_dirty()
+
+def _ensure_started():
+    """Инициализирует объекты event loop и подписку на движок (один раз)"""
+    global _engine_slots, _started
+    if _started:
+        return
+    loop = asyncio.get_running_loop()
+    _engine_slots = asyncio.Semaphore(ENGINE_QUEUE_LIMIT)
+
+    def on_state_changed(game_id, version):
+        # Вызывается в потоке движка - передаем событие в event loop
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(_on_state_changed_in_loop, game_id)
+
+    golan.add_state_listener(on_state_changed)
+    _started = True
+
+def resolve_game_id(scope):
+    """
+    Определяет ID игры запроса так же, как app.get_request_game_id:
+    параметр ?game=, заголовок X-Game-Id, cookie golan_game
+    """
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    candidates = [query.get('game', [None])[0]]
+    cookie_header = ''
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').lower()
+        if name == 'x-game-id':
+            candidates.append(raw_value.decode('latin-1'))
+        elif name == 'cookie':
+            cookie_header = raw_value.decode('latin-1')
+    if cookie_header:
+        cookie = SimpleCookie()
+        try:
+            cookie.load(cookie_header)
+        except CookieError:
+            cookie = {}
+        if golan.GAME_COOKIE_NAME in cookie:
+            candidates.append(cookie[golan.GAME_COOKIE_NAME].value)
+    for game_id in candidates:
+        if golan.is_valid_game_id(game_id):
+            return game_id
+    return golan.DEFAULT_GAME_ID
+
+# ============================================================================
+# МОСТ ASGI -> WSGI
+# ============================================================================
+
+def build_environ(scope, body):
+    """Собирает WSGI environ из ASGI scope"""
+    server = scope.get('server') or ('localhost', 5000)
+    client = scope.get('client') or ('127.0.0.1', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': str(client[0]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            key = 'CONTENT_TYPE'
+        elif name == 'CONTENT_LENGTH':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = f'HTTP_{name}'
+        if key in environ:
+            separator = '; ' if key == 'HTTP_COOKIE' else ','
+            environ[key] = environ[key] + separator + value
+        else:
+            environ[key] = value
+    return environ
+
+def call_wsgi(environ):
+    """
+    Вызывает Flask-приложение синхронно (выполняется в пуле движка)
+
+    Returns:
+        tuple: (код ответа, список заголовков, тело ответа)
+    """
+    chunks = []
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = status
+        response['headers'] = headers
+        return chunks.append
+
+    result = golan.app(environ, start_response)
+    try:
+        for chunk in result:
+            if chunk:
+                chunks.append(chunk)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+
+    status_code = int(response['status'].split(' ', 1)[0])
+    headers = [(name.encode('latin-1'), value.encode('latin-1'))
+               for name, value in response['headers']]
+    return status_code, headers, b''.join(chunks)
+
+async def read_body(receive):
+    """Читает тело запроса целиком (не больше MAX_BODY_SIZE)"""
+    body = bytearray()
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body.extend(message.get('body', b''))
+        if len(body) > MAX_BODY_SIZE:
+            raise ValueError('Слишком большое тело запроса')
+        more_body = message.get('more_body', False)
+    return bytes(body)
+
+# ============================================================================
+# ОБРАБОТЧИКИ
+# ============================================================================
+
+async def handle_wsgi(scope, receive, send):
+    """Передает обычный запрос во Flask-приложение"""
+    try:
+        body = await read_body(receive)
+    except ValueError as e:
+        await send_json(send, 413, {'success': False, 'message': str(e)})
+        return
+    if body is None:
+        return
+
+    status_code, headers, content = await run_blocking(call_wsgi, build_environ(scope, body))
+    await send({'type': 'http.response.start', 'status': status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': content})
+
+async def handle_stream(scope, receive, send):
+    """
+    Поток состояния игры запроса в формате Server-Sent Events
+
+    Каждое соединение - это корутина в event loop, а не поток ОС,
+    поэтому тысячи простаивающих клиентов почти ничего не стоят.
+    """
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                return
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    broadcaster = get_broadcaster(resolve_game_id(scope))
+    seen_version = -1
+    try:
+        while not disconnected.is_set():
+            frame = await broadcaster.wait_frame(seen_version, SSE_HEARTBEAT)
+            if frame is None:
+                payload = b': ping\n\n'
+            else:
+                seen_version, payload = frame
+            await send({'type': 'http.response.body', 'body': payload, 'more_body': True})
+    except (OSError, asyncio.CancelledError):
+        pass
+    finally:
+        watcher.cancel()
+        release_broadcaster(broadcaster)
+
+async def handle_poll(scope, receive, send):
+    """
+    Long-poll состояния игры (те же параметры и ответы, что у app.game_poll)
+
+    Ожидание идет в event loop: ждущий клиент не занимает поток пула
+    движка, как и поток SSE.
+    """
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    try:
+        since = int(query.get('since', ['-1'])[0])
+    except ValueError:
+        since = -1
+    try:
+        timeout = float(query.get('timeout', ['25'])[0])
+    except ValueError:
+        timeout = 25.0
+    timeout = min(max(timeout, 0.0), golan.LONG_POLL_MAX)
+
+    broadcaster = get_broadcaster(resolve_game_id(scope))
+    try:
+        frame = await broadcaster.wait_newer(since, timeout)
+    finally:
+        release_broadcaster(broadcaster)
+    if frame is None:
+        await send({'type': 'http.response.start', 'status': 204, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    compressor = golan.api_compressor
+    encoding = None
+    if compressor.should_compress(len(frame.payload)):
+        accept = next((value.decode('latin-1') for name, value in scope.get('headers', [])
+                       if name.lower() == b'accept-encoding'), None)
+        encoding = golan.negotiate_encoding(accept, compressor.encodings)
+    # Сжатие - в пуле движка (один раз на кадр и кодировку, дальше из кэша кадра)
+    body = await run_blocking(frame.encoded, encoding, compressor.compress) if encoding else frame.payload
+    headers = [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(body)).encode('latin-1')),
+        (b'vary', b'Accept-Encoding'),
+        (b'x-state-version', str(frame.version).encode('latin-1')),
+        (b'x-server-time', str(golan.now_ms()).encode('latin-1')),
+    ]
+    if encoding:
+        headers.append((b'content-encoding', encoding.encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def handle_export(scope, receive, send):
+    """
+    Выгрузка результатов игры частями (те же параметры, что у маршрута app.py)
+
+    Через мост WSGI файл собрался бы в памяти целиком (call_wsgi). Здесь
+    каждая часть кодируется в пуле движка и сразу уходит клиенту.
+    """
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    dataset = query.get('dataset', ['sales'])[0]
+    fmt = query.get('format', ['csv'])[0]
+    partial = query.get('partial', [''])[0] in ('1', 'true')
+    room = await run_blocking(golan.get_room, resolve_game_id(scope))
+    try:
+        export = await run_blocking(export_game, room, dataset, fmt, partial)
+    except ExportError as e:
+        status_code = 409 if isinstance(e, ExportIncomplete) else 400
+        await send_json(send, status_code, {'success': False, 'message': str(e)})
+        return
+
+    chunks = export.chunks
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                        for name, value in export.headers(room.game_id, dataset)],
+        })
+        while True:
+            chunk = await run_blocking(next, chunks, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    except OSError:
+        pass
+    finally:
+        await run_blocking(chunks.close)
+
+async def send_json(send, status_code, data):
+    """Отправляет JSON ответ"""
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status_code,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode('latin-1'))],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def handle_lifespan(receive, send):
+    """Запуск и остановка ASGI-сервера"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            _ensure_started()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+# ============================================================================
+# ASGI ПРИЛОЖЕНИЕ
+# ============================================================================
+
+async def application(scope, receive, send):
+    """Точка входа ASGI"""
+    if scope['type'] == 'lifespan':
+        await handle_lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    _ensure_started()
+    if scope['path'] == STREAM_PATH and scope['method'] == 'GET':
+        await handle_stream(scope, receive, send)
+    elif scope['path'] == POLL_PATH and scope['method'] == 'GET':
+        await handle_poll(scope, receive, send)
+    elif scope['path'] == EXPORT_PATH and scope['method'] == 'GET':
+        await handle_export(scope, receive, send)
+    else:
+        await handle_wsgi(scope, receive, send)
+
+# ============================================================================
+# ЗАПУСК ПРИЛОЖЕНИЯ
+# ============================================================================
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ Для ASGI-режима нужен uvicorn: pip install uvicorn")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("⚡ ГОЛЛАНДСКИЙ АУКЦИОН GOLAN (ASGI) ⚡")
+    print("=" * 60)
+    print()
+    print("📱 Откройте браузер: http://localhost:5000")
+    print(f"📡 Поток состояния: http://localhost:5000{STREAM_PATH}")
+    print("⏹️  Для остановки нажмите Ctrl+C")
+    print()
+
+    uvicorn.run(application, host='0.0.0.0', port=5000, backlog=4096,
+                timeout_keep_alive=75, log_level='warning')
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+📦 СТАТИЧЕСКИЕ ФАЙЛЫ И КЭШ СТРАНИЦ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Подготовка статики при запуске и кэширование HTML страниц
+Особенности:
+- Файлы static/ сжимаются заранее (gzip и brotli) один раз при запуске
+- URL содержит хеш содержимого: /assets/<хеш>/js/game.js
+- Такие URL кэшируются браузером навсегда (immutable)
+- Отрисованные страницы хранятся в памяти вместе со сжатыми версиями
+
+Сборка без запуска сервера (проверка размеров):
+    python assets.py
+"""
+
+import os
+import hashlib
+import mimetypes
+import threading
+
+from compression import compress_gzip, compress_brotli, negotiate_encoding
+
+# Сжимаем только текстовые форматы - картинки и шрифты уже сжаты
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/javascript', 'application/json',
+    'application/xml', 'image/svg+xml'
+)
+
+# Кэширование файлов с хешем в URL - год, без повторных проверок
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Страницы кэшируются в памяти, но браузер проверяет их по ETag
+PAGE_CACHE_CONTROL = 'no-cache'
+
+class PreparedContent:
+    """
+    Содержимое, подготовленное к отдаче
+
+    Атрибуты:
+    - data: Исходные байты
+    - encoded: Сжатые версии {'gzip': bytes, 'br': bytes}
+    - digest: Хеш содержимого (12 hex-символов)
+    - etag: ETag для условных запросов
+    - mimetype: MIME-тип
+    """
+    def __init__(self, data, mimetype):
+        self.data = data
+        self.mimetype = mimetype
+        self.digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+        self.etag = self.digest
+        self.encoded = {}
+        if mimetype.startswith(COMPRESSIBLE_TYPES):
+            for encoding, compress in (('br', compress_brotli), ('gzip', compress_gzip)):
+                compressed = compress(data)
+                # Храним сжатую версию, только если она действительно меньше
+                if compressed is not None and len(compressed) < len(data):
+                    self.encoded[encoding] = compressed
+
+    def select(self, accept_encoding):
+        """
+        Выбирает версию по Accept-Encoding
+
+        Returns:
+            tuple: (байты, кодировка или None)
+        """
+        encoding = negotiate_encoding(accept_encoding, tuple(self.encoded))
+        if encoding:
+            return self.encoded[encoding], encoding
+        return self.data, None
+
+class StaticAsset(PreparedContent):
+    """Файл из static/ с временем изменения (для пересборки в режиме отладки)"""
+    def __init__(self, filename, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if mimetype.startswith('text/') or mimetype == 'application/javascript':
+            mimetype += '; charset=utf-8'
+        super().__init__(data, mimetype)
+        self.filename = filename
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+
+class AssetPipeline:
+    """
+    Набор подготовленных статических файлов
+
+    Args:
+        static_folder: Папка со статикой
+        url_prefix: Префикс URL файлов с хешем
+        auto_reload: Пересобирать файл, если он изменился на диске (отладка)
+    """
+    def __init__(self, static_folder, url_prefix='/assets', auto_reload=False):
+        self.static_folder = static_folder
+        self.url_prefix = url_prefix
+        self.auto_reload = auto_reload
+        self.assets = {}
+        self._lock = threading.Lock()
+
+    def build(self):
+        """Подготавливает все файлы из static_folder"""
+        assets = {}
+        for root, _, files in os.walk(self.static_folder):
+            for name in files:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+                assets[filename] = StaticAsset(filename, path)
+        with self._lock:
+            self.assets = assets
+        return self
+
+    def get(self, filename):
+        """Возвращает подготовленный файл или None"""
+        asset = self.assets.get(filename)
+        if asset is not None and self.auto_reload:
+            try:
+                if os.path.getmtime(asset.path) != asset.mtime:
+                    asset = StaticAsset(filename, asset.path)
+                    with self._lock:
+                        self.assets[filename] = asset
+            except OSError:
+                return None
+        return asset
+
+    def url_for(self, filename):
+        """
+        URL файла с хешем содержимого
+
+        Для отсутствующих файлов возвращает обычный /static/ путь,
+        чтобы ошибка была видна так же, как раньше.
+        """
+        asset = self.get(filename)
+        if asset is None:
+            return f'/static/{filename}'
+        return f'{self.url_prefix}/{asset.digest}/{filename}'
+
+class PageCache:
+    """
+    Кэш отрисованных страниц в памяти
+
+    Страницы не зависят от пользователя (данные приходят через API),
+    поэтому каждая страница отрисовывается один раз на процесс.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.pages = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, render):
+        """
+        Возвращает страницу из кэша, при промахе вызывает render()
+
+        Returns:
+            PreparedContent: Подготовленная страница
+        """
+        page = self.pages.get(key) if self.enabled else None
+        if page is None:
+            page = PreparedContent(render().encode('utf-8'), 'text/html; charset=utf-8')
+            if self.enabled:
+                with self._lock:
+                    self.pages[key] = page
+        return page
+
+    def clear(self):
+        """Очищает кэш"""
+        with self._lock:
+            self.pages = {}
+
+if __name__ == '__main__':
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    pipeline = AssetPipeline(folder).build()
+    for filename, asset in sorted(pipeline.assets.items()):
+        sizes = ', '.join(f'{enc}: {len(data):,} Б' for enc, data in asset.encoded.items())
+        print(f'{pipeline.url_for(filename)}  {len(asset.data):,} Б  ({sizes or "без сжатия"})')
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+🌸 ЯДРО АУКЦИОНА GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Общий движок голландского аукциона для всех версий игры
+Особенности:
+- app.py (веб), terminal_auction.py и simple_auction.py (консоль) - тонкие
+  адаптеры поверх одного ядра: модели, каталоги, стратегии ИИ, таблица
+  предпочтений, индекс цен резервирования и правила торгов
+- Оптимизации ядра сразу работают во всех версиях
+"""
+
+from .models import Player, Product, Game, PROFIT_MULTIPLIER
+from .preferences import (PreferenceMatrix, LIKED_MULTIPLIER, DISLIKED_MULTIPLIER, NEUTRAL_MULTIPLIER,
+                          MATCH_EXACT, MATCH_CONTAINS)
+from .strategies import (BidContext, BidderStrategy, DEFAULT_STRATEGY, get_strategy, register_strategy,
+                         available_strategies, parse_strategy_mix, assign_strategies, group_by_strategy)
+from .matching import ReservationIndex, price_ladder, MATCHING_SCAN, MATCHING_INDEX, MATCHING_MODES
+from .engine import AuctionCore, drop_price, pick_winner
+from .catalog import (WEB_CATALOG, WEB_AI_NAMES, WEB_BALANCE_RANGE, TERMINAL_CATALOG, TERMINAL_PLAYERS,
+                      product_names, build_products, build_players, CatalogError, RecordFile, load_catalog,
+                      load_players, validate_catalog, choose_preferences, MIN_CATALOG_PRODUCTS)
+
+__all__ = [
+    # Модели
+    'Player', 'Product', 'Game', 'PROFIT_MULTIPLIER',
+    # Таблица предпочтений
+    'PreferenceMatrix', 'LIKED_MULTIPLIER', 'DISLIKED_MULTIPLIER', 'NEUTRAL_MULTIPLIER',
+    'MATCH_EXACT', 'MATCH_CONTAINS',
+    # Стратегии ИИ
+    'BidContext', 'BidderStrategy', 'DEFAULT_STRATEGY', 'get_strategy', 'register_strategy',
+    'available_strategies', 'parse_strategy_mix', 'assign_strategies', 'group_by_strategy',
+    # Индекс цен резервирования
+    'ReservationIndex', 'price_ladder', 'MATCHING_SCAN', 'MATCHING_INDEX', 'MATCHING_MODES',
+    # Правила торгов
+    'AuctionCore', 'drop_price', 'pick_winner',
+    # Каталоги
+    'WEB_CATALOG', 'WEB_AI_NAMES', 'WEB_BALANCE_RANGE', 'TERMINAL_CATALOG', 'TERMINAL_PLAYERS',
+    'product_names', 'build_products', 'build_players', 'CatalogError', 'RecordFile', 'load_catalog',
+    'load_players', 'validate_catalog', 'choose_preferences', 'MIN_CATALOG_PRODUCTS'
+]
@@ -0,0 +1,480 @@
+# -*- coding: utf-8 -*-
+"""
+🌷 КАТАЛОГИ ТОВАРОВ И ИГРОКОВ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Товары, цены и ИИ-игроки всех версий игры в одном месте
+Особенности:
+- WEB_CATALOG - товары веб-версии (app.py)
+- TERMINAL_CATALOG и TERMINAL_PLAYERS - консольные версии
+  (terminal_auction.py и simple_auction.py играют одним каталогом)
+- Каталог - обычные данные; модели собираются функциями build_*
+- Каталог и состав ИИ-игроков можно загрузить из файла (load_catalog,
+  load_players): CSV, JSON (массив) или JSON Lines, с проверкой полей
+- Большие каталоги CSV / JSON Lines читаются через mmap: при загрузке
+  строится только индекс начала записей, запись разбирается и
+  проверяется при обращении к ней (с файлом и строкой в ошибке)
+- Полная проверка каталога, включая повторы названий, - по запросу
+  (load_catalog(path, full_check=True) или validate_catalog)
+"""
+
+import os
+import csv
+import json
+import mmap
+from array import array
+from collections.abc import Sequence
+
+from .models import Player, Product
+
+# Товары веб-версии: себестоимость, начальная цена, количество
+WEB_CATALOG = [
+    {"name": "Розы", "cost": 50000, "price": 80000, "quantity": 300},
+    {"name": "Пионы", "cost": 85000, "price": 150000, "quantity": 100},
+    {"name": "Георгины", "cost": 30000, "price": 50000, "quantity": 80},
+    {"name": "Ромашки", "cost": 100000, "price": 130000, "quantity": 500},
+    {"name": "Лилии", "cost": 60000, "price": 95000, "quantity": 200},
+    {"name": "Тюльпаны", "cost": 40000, "price": 65000, "quantity": 350},
+    {"name": "Орхидеи", "cost": 120000, "price": 200000, "quantity": 60},
+    {"name": "Хризантемы", "cost": 45000, "price": 70000, "quantity": 250},
+    {"name": "Лаванда", "cost": 20000, "price": 35000, "quantity": 400},
+    {"name": "Нарциссы", "cost": 55000, "price": 90000, "quantity": 150},
+    {"name": "Ирисы", "cost": 70000, "price": 115000, "quantity": 120},
+    {"name": "Гвоздики", "cost": 25000, "price": 45000, "quantity": 300}
+]
+
+# Имена ИИ-игроков веб-версии (предпочтения и балансы случайные)
+WEB_AI_NAMES = ["Ваня", "Анастасия", "Игорь", "Марина", "Дмитрий", "Светлана"]
+
+# Диапазон случайного начального баланса в веб-версии
+WEB_BALANCE_RANGE = (150000, 195000)
+
+# Товары консольных версий
+TERMINAL_CATALOG = [
+    {"name": "🌹 Розы", "cost": 8000, "price": 15000, "quantity": 50, "description": "Красные розы - символ любви"},
+    {"name": "🌻 Подсолнухи", "cost": 4000, "price": 8000, "quantity": 30, "description": "Яркие подсолнухи"},
+    {"name": "🌺 Орхидеи", "cost": 12000, "price": 25000, "quantity": 20, "description": "Экзотические орхидеи"},
+    {"name": "🌷 Тюльпаны", "cost": 6000, "price": 12000, "quantity": 40, "description": "Весенние тюльпаны"},
+    {"name": "🌸 Сакура", "cost": 15000, "price": 30000, "quantity": 15, "description": "Цветущая сакура"},
+    {"name": "🌼 Ромашки", "cost": 2500, "price": 5000, "quantity": 60, "description": "Простые ромашки"},
+    {"name": "🌿 Лаванда", "cost": 5000, "price": 10000, "quantity": 35, "description": "Ароматная лаванда"},
+    {"name": "🌺 Пионы", "cost": 9000, "price": 18000, "quantity": 25, "description": "Пышные пионы"},
+    {"name": "🌻 Георгины", "cost": 7000, "price": 14000, "quantity": 30, "description": "Крупные георгины"},
+    {"name": "🌷 Ирисы", "cost": 5500, "price": 11000, "quantity": 40, "description": "Элегантные ирисы"},
+    {"name": "🌹 Гвоздики", "cost": 4500, "price": 9000, "quantity": 45, "description": "Классические гвоздики"},
+    {"name": "🌺 Лилии", "cost": 10000, "price": 20000, "quantity": 20, "description": "Белые лилии"}
+]
+
+# ИИ-игроки консольных версий: баланс и предпочтения фиксированы
+TERMINAL_PLAYERS = [
+    {"name": "Ваня", "balance": 150000, "wants": "Пионы", "no_wants": "Розы"},
+    {"name": "Анастасия", "balance": 280000, "wants": "Розы", "no_wants": "Пионы"},
+    {"name": "Игорь", "balance": 200000, "wants": "Орхидеи", "no_wants": "Ромашки"},
+    {"name": "Марина", "balance": 120000, "wants": "Тюльпаны", "no_wants": "Георгины"},
+    {"name": "Дмитрий", "balance": 300000, "wants": "Лаванда", "no_wants": "Лилии"},
+    {"name": "Светлана", "balance": 175000, "wants": "Ирисы", "no_wants": "Гвоздики"}
+]
+
+def product_names(catalog):
+    """Названия товаров каталога (в порядке каталога; для файла - ленивая последовательность)"""
+    if isinstance(catalog, RecordFile):
+        return catalog.field("name")
+    return [item["name"] for item in catalog]
+
+def build_products(catalog):
+    """Товары каталога с ID 1..n"""
+    return [
+        Product(i + 1, item["name"], item["cost"], item["price"], item["quantity"],
+                item.get("description") or "")
+        for i, item in enumerate(catalog)
+    ]
+
+def build_players(roster, strategy=None, first_id=1):
+    """
+    ИИ-игроки с фиксированными балансами и предпочтениями
+
+    Args:
+        roster: Список словарей name/balance/wants/no_wants
+        strategy: Стратегия всех игроков (None - стратегия по умолчанию)
+        first_id: ID первого игрока
+    """
+    players = []
+    for i, item in enumerate(roster):
+        player = Player(first_id + i, item["name"], item["balance"], item["wants"], item["no_wants"])
+        if strategy:
+            player.strategy = strategy
+        players.append(player)
+    return players
+
+# ============================================================================
+# ЗАГРУЗКА ИЗ ФАЙЛОВ
+# ============================================================================
+
+# Наименьший каталог: любимый и нелюбимый товары игрока должны различаться
+MIN_CATALOG_PRODUCTS = 2
+
+class CatalogError(ValueError):
+    """Ошибка в файле каталога или состава игроков (с указанием файла и строки)"""
+
+def _whole_number(record, field, where, required=True, minimum=0):
+    """Целое поле записи (строка CSV или число JSON) не меньше minimum"""
+    value = record.get(field)
+    # Частый случай - обычное целое (число JSON или цифры CSV) - без проверок ниже
+    if type(value) is int or (type(value) is str and value.isdigit() and value.isascii()):
+        number = int(value)
+        if number < minimum:
+            raise CatalogError(f"{where}: {field} должно быть не меньше {minimum}, а не {number}")
+        return number
+    if value is None or value == "":
+        if required:
+            raise CatalogError(f"{where}: нет поля {field}")
+        return None
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise CatalogError(f"{where}: {field} должно быть целым числом, а не {value!r}")
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise CatalogError(f"{where}: {field} должно быть целым числом, а не {value!r}") from None
+    if number < minimum:
+        raise CatalogError(f"{where}: {field} должно быть не меньше {minimum}, а не {number}")
+    return number
+
+def _text(record, field, where, required=True):
+    value = record.get(field)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise CatalogError(f"{where}: нет поля {field}")
+    return value
+
+def check_product(record, where):
+    """
+    Проверяет товар каталога из файла
+
+    Returns:
+        dict: name, cost, price, quantity, description (как в WEB_CATALOG)
+    """
+    item = {
+        "name": _text(record, "name", where),
+        "cost": _whole_number(record, "cost", where, minimum=1),
+        "price": _whole_number(record, "price", where, minimum=1),
+        "quantity": _whole_number(record, "quantity", where, minimum=1),
+        "description": _text(record, "description", where, required=False)
+    }
+    if item["price"] < item["cost"]:
+        raise CatalogError(f"{where}: цена {item['price']} ниже себестоимости {item['cost']}")
+    return item
+
+def check_player(record, where):
+    """
+    Проверяет ИИ-игрока из файла
+
+    Обязательно только имя; баланс и предпочтения, которых нет в файле,
+    выбираются случайно в каждой игре.
+    """
+    entry = {"name": _text(record, "name", where)}
+    balance = _whole_number(record, "balance", where, required=False, minimum=1)
+    if balance is not None:
+        entry["balance"] = balance
+    for field in ("wants", "no_wants"):
+        value = _text(record, field, where, required=False)
+        if value:
+            entry[field] = value
+    if entry.get("wants") and entry.get("wants") == entry.get("no_wants"):
+        raise CatalogError(f"{where}: wants и no_wants совпадают ({entry['wants']})")
+    return entry
+
+class RecordFile(Sequence):
+    """
+    Записи файла CSV или JSON Lines, читаемые через mmap
+
+    В памяти держится только индекс начала записей (array), запись
+    разбирается и проверяется функцией check заново при обращении по номеру.
+    Индекс строится при первом обращении (len, [i] или итерация) одним
+    проходом по байтам файла: ищутся только границы записей, сами записи
+    не разбираются. Поле CSV в кавычках может содержать перевод строки,
+    тогда запись занимает несколько строк файла (граница - перевод строки
+    после четного числа кавычек). Пустые строки пропускаются.
+
+    Args:
+        path: Путь к файлу (.csv или .jsonl)
+        check: check(запись, "файл:строка") -> проверенная запись
+    """
+
+    def __init__(self, path, check):
+        self.path = path
+        self.check = check
+        self.csv = path.lower().endswith(".csv")
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._start = 3 if self._data[:3] == b"\xef\xbb\xbf" else 0
+        self._first_line = 1
+        self._offsets = None
+        self._numbers = None
+        self.header = None
+        if self.csv:
+            starts = []
+            self.header = [name.strip() for name in next(self._reader(self._start, starts), [])]
+            self._first_line += len(starts)
+            if starts:
+                end = self._data.find(b"\n", starts[-1])
+                self._start = len(self._data) if end < 0 else end + 1
+
+    def _file_lines(self, position, starts):
+        """Строки файла с позиции position (с переводом строки); начало каждой - в starts"""
+        data = self._data
+        size = len(data)
+        while position < size:
+            end = data.find(b"\n", position)
+            end = size if end < 0 else end + 1
+            starts.append(position)
+            try:
+                yield data[position:end].decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise CatalogError(f"{self.path}: строка с байта {position} не в UTF-8 ({e.reason})") from None
+            position = end
+
+    def _reader(self, position, starts):
+        """csv.reader с позиции position: строки каждой записи попадают в starts"""
+        return csv.reader(self._file_lines(position, starts))
+
+    def _scan(self):
+        """Индекс записей: начало каждой и номер ее строки в файле, без разбора записей"""
+        data = self._data
+        size = len(data)
+        csv_quotes = self.csv
+        offsets = array("q")
+        numbers = array("q")
+        position = self._start
+        number = self._first_line
+        while position < size:
+            start = position
+            lines = 0
+            quotes = 0
+            while True:
+                end = data.find(b"\n", position)
+                end = size if end < 0 else end + 1
+                lines += 1
+                if csv_quotes and data.find(b'"', position, end) >= 0:
+                    quotes += data[position:end].count(b'"')
+                position = end
+                if not quotes % 2 or position >= size:
+                    break
+            # Пустая строка: для CSV - только перевод строки (как у csv.reader)
+            if data[start] in b" \t\r\n":
+                line = data[start:position]
+                if not (line.strip(b"\r\n") if csv_quotes else line.strip()):
+                    number += lines
+                    continue
+            offsets.append(start)
+            numbers.append(number)
+            number += lines
+        return offsets, numbers
+
+    def _check(self, number, raw):
+        """Запись из значений CSV или строки JSON, проверенная функцией check"""
+        where = f"{self.path}:{number}"
+        if self.csv:
+            if len(raw) != len(self.header):
+                raise CatalogError(f"{where}: {len(raw)} полей, в заголовке {len(self.header)}")
+            record = dict(zip(self.header, raw))
+        else:
+            try:
+                record = json.loads(raw)
+            except ValueError as e:
+                raise CatalogError(f"{where}: не JSON ({e})") from None
+            if not isinstance(record, dict):
+                raise CatalogError(f"{where}: запись должна быть объектом JSON")
+        return self.check(record, where)
+
+    def _parse(self, number, position):
+        """Запись, которая начинается с байта position (проверенная функцией check)"""
+        if self.csv:
+            try:
+                raw = next(self._reader(position, []))
+            except csv.Error as e:
+                raise CatalogError(f"{self.path}:{number}: ошибка CSV ({e})") from None
+        else:
+            raw = next(self._file_lines(position, []))
+        return self._check(number, raw)
+
+    def _index(self):
+        if self._offsets is None:
+            self._offsets, self._numbers = self._scan()
+        return self._offsets
+
+    def line_number(self, index):
+        """Номер строки файла, с которой начинается запись index"""
+        self._index()
+        return self._numbers[index]
+
+    def __len__(self):
+        return len(self._index())
+
+    def __getitem__(self, index):
+        offsets = self._index()
+        if index < 0:
+            index += len(offsets)
+        if not 0 <= index < len(offsets):
+            raise IndexError("запись вне файла")
+        return self._parse(self._numbers[index], offsets[index])
+
+    def __iter__(self):
+        self._index()
+        for number, position in zip(self._numbers, self._offsets):
+            yield self._parse(number, position)
+
+    def field(self, name):
+        """Одно поле всех записей - ленивая последовательность"""
+        return FieldView(self, name)
+
+class FieldView(Sequence):
+    """Поле name записей RecordFile (годится для random.choice)"""
+
+    def __init__(self, records, name):
+        self.records = records
+        self.name = name
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index][self.name]
+
+    def __iter__(self):
+        for record in self.records:
+            yield record[self.name]
+
+def _load_records(path, check):
+    """Записи файла: CSV и JSON Lines - через mmap (RecordFile), JSON-массив - списком"""
+    if not os.path.isfile(path):
+        raise CatalogError(f"{path}: файл не найден")
+    lower = path.lower()
+    if lower.endswith((".csv", ".jsonl", ".ndjson")):
+        records = RecordFile(path, check)
+        if records.header is not None:
+            missing = {"name"} - set(records.header)
+            if missing:
+                raise CatalogError(f"{path}: в заголовке нет столбцов {', '.join(sorted(missing))}")
+        return records
+    if lower.endswith(".json"):
+        with open(path, encoding="utf-8-sig") as file:
+            try:
+                data = json.load(file)
+            except ValueError as e:
+                raise CatalogError(f"{path}: не JSON ({e})") from None
+        if not isinstance(data, list):
+            raise CatalogError(f"{path}: ожидается массив объектов JSON")
+        records = []
+        for i, record in enumerate(data):
+            if not isinstance(record, dict):
+                raise CatalogError(f"{path}[{i}]: запись должна быть объектом JSON")
+            records.append(check(record, f"{path}[{i}]"))
+        return records
+    raise CatalogError(f"{path}: неизвестный формат (нужен .csv, .json или .jsonl)")
+
+def load_catalog(path, full_check=False):
+    """
+    Каталог товаров из файла
+
+    Поля: name, cost, price, quantity (целые, cost <= price),
+    description (необязательно). CSV и JSON Lines при загрузке только
+    индексируются (в памяти индекс записей, а не сами записи): запись
+    проверяется при обращении к ней, а при загрузке - лишь заголовок
+    и число товаров. full_check=True проверяет весь файл сразу
+    (validate_catalog, с повторами названий).
+
+    Raises:
+        CatalogError: Файл не найден, неизвестный формат, ошибка в заголовке
+            или слишком мало товаров; ошибка в записи JSON-массива (он
+            разбирается целиком), а с full_check - в любой записи и повтор названия
+    """
+    catalog = _load_records(path, check_product)
+    if isinstance(catalog, RecordFile) and catalog.header is not None:
+        missing = {"cost", "price", "quantity"} - set(catalog.header)
+        if missing:
+            raise CatalogError(f"{path}: в заголовке нет столбцов {', '.join(sorted(missing))}")
+    if full_check:
+        validate_catalog(catalog, path)
+    elif len(catalog) < MIN_CATALOG_PRODUCTS:
+        raise CatalogError(f"{path}: товаров в каталоге: {len(catalog)}, нужно не меньше {MIN_CATALOG_PRODUCTS}")
+    return catalog
+
+def load_players(path, catalog=None):
+    """
+    Состав ИИ-игроков из файла
+
+    Поля: name; необязательно balance, wants, no_wants.
+    Состав загружается целиком (игроков немного); wants и no_wants
+    сверяются с каталогом одним проходом по его названиям.
+
+    Raises:
+        CatalogError: Ошибка в файле или товара нет в каталоге
+    """
+    roster = list(_load_records(path, check_player))
+    if not roster:
+        raise CatalogError(f"{path}: нет ни одного игрока")
+    if catalog is not None:
+        wanted = {entry[field] for entry in roster for field in ("wants", "no_wants") if field in entry}
+        if wanted:
+            for name in product_names(catalog):
+                wanted.discard(name)
+                if not wanted:
+                    break
+        if wanted:
+            raise CatalogError(f"{path}: товаров нет в каталоге: {', '.join(sorted(wanted))}")
+    return roster
+
+def _record_place(catalog, path, index):
+    """Где в файле запись index: файл:строка или файл[индекс]"""
+    if isinstance(catalog, RecordFile):
+        return f"{path}:{catalog.line_number(index)}"
+    return f"{path}[{index}]"
+
+def validate_catalog(catalog, path="каталог"):
+    """
+    Полная проверка каталога одним проходом: все записи, уникальность
+    названий и размер не меньше MIN_CATALOG_PRODUCTS
+
+    Для уникальности в проходе запоминаются только хэши названий (array,
+    8 байт на товар); совпавшие хэши потом сверяются по самим названиям.
+
+    Returns:
+        int: Число товаров
+
+    Raises:
+        CatalogError: Ошибка в записи, повтор названия (с обоими местами
+            в файле) или слишком мало товаров
+    """
+    hashes = array("q", map(hash, (item["name"] for item in catalog)))
+    if len(hashes) < MIN_CATALOG_PRODUCTS:
+        raise CatalogError(f"{path}: товаров в каталоге: {len(hashes)}, нужно не меньше {MIN_CATALOG_PRODUCTS}")
+
+    ordered = sorted(hashes)
+    repeated = {value for value, following in zip(ordered, ordered[1:]) if value == following}
+    if repeated:
+        seen = {}
+        for index, value in enumerate(hashes):
+            if value not in repeated:
+                continue
+            name = catalog[index]["name"]
+            first = seen.setdefault(name, index)
+            if first != index:
+                raise CatalogError(f"{_record_place(catalog, path, index)}: товар {name} уже есть "
+                                   f"в каталоге ({_record_place(catalog, path, first)})")
+    return len(hashes)
+
+def choose_preferences(names, rng):
+    """
+    Случайные любимый и нелюбимый товары (разные)
+
+    Расходует генератор так же, как выбор из списка названий без любимого,
+    но списка не строит - годится для ленивых каталогов.
+
+    Returns:
+        tuple: (wants, no_wants)
+    """
+    index = rng.randrange(len(names))
+    other = rng.randrange(len(names) - 1)
+    return names[index], names[other if other < index else other + 1]
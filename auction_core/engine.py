@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+⚙️ ЯДРО ГОЛЛАНДСКОГО АУКЦИОНА GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Правила аукциона, общие для веб-версии и консольных версий
+Особенности:
+- AuctionCore хранит игроков, товары и все производные структуры:
+  таблицу предпочтений, группы стратегий, индекс цен резервирования
+- Снижение цены, сбор ставок стратегий, выбор победителя и покупка
+  реализованы один раз; версии игры задают только параметры и порядок шагов
+- Генератор случайных чисел передается явно (модуль random или random.Random)
+"""
+
+import heapq
+
+from .preferences import PreferenceMatrix, MATCH_EXACT
+from .strategies import BidContext, get_strategy, group_by_strategy
+from .matching import ReservationIndex, price_ladder
+
+def drop_price(product, step):
+    """
+    Снижает цену товара на один шаг часов голландского аукциона
+
+    Args:
+        product: Товар (меняется current_price)
+        step: Доля снижения (0.05 = на 5%) или фиксированная сумма (1000)
+
+    Returns:
+        bool: False, если цена дошла до себестоимости (цена = себестоимость)
+    """
+    if step < 1:
+        product.current_price = int(product.current_price * (1 - step))
+    else:
+        product.current_price -= step
+    if product.current_price <= product.cost:
+        product.current_price = product.cost
+        return False
+    return True
+
+def pick_winner(bids, rng):
+    """
+    Выбор победителя веб-версии: из трех лучших по оценке
+    с вероятностью 70% лучший, иначе случайный из трех
+
+    Args:
+        bids: Пары (индекс игрока, оценка) в порядке сбора
+
+    Returns:
+        int | None: Индекс победителя
+    """
+    if not bids:
+        return None
+    if len(bids) == 1:
+        return bids[0][0]
+    # nlargest дает тот же порядок, что и полная сортировка
+    top = heapq.nlargest(3, bids, key=lambda bid: bid[1])
+    if rng.random() < 0.7:
+        return top[0][0]
+    return rng.choice(top)[0]
+
+class AuctionCore:
+    """
+    Состояние и правила одного аукциона
+
+    Атрибуты:
+    - players: Игроки, которых оценивают стратегии (порядок важен)
+    - products: Все товары аукциона
+    - preferences: Таблица множителей предпочтений (PreferenceMatrix)
+    - strategy_groups: Индексы игроков по стратегиям
+    - bidders: Пары (стратегия, индексы ее игроков) - стратегии взяты
+      из реестра при сборке групп
+    - uses_progress: Нужна ли хоть одной стратегии доля проданного
+      (для ставок или для цены резервирования)
+    - player_slots: ID игрока -> индекс в players
+    - reservation_index: Индекс цен резервирования (строится по требованию)
+    - clock_drops: Снижений цены в последнем прогоне часов (run_price_clock,
+      match_by_index) - номер шага продажи или число проверенных шагов
+
+    Args:
+        players: Игроки
+        products: Товары
+        match: Сравнение предпочтений с названиями (MATCH_EXACT / MATCH_CONTAINS)
+    """
+
+    def __init__(self, players=None, products=None, match=MATCH_EXACT):
+        self.players = players if players is not None else []
+        self.products = products if products is not None else []
+        self.match = match
+        self.clock_drops = 0
+        self.rebuild_preferences()
+
+    def rebuild_preferences(self):
+        """
+        Пересобирает таблицу предпочтений и группы стратегий
+        Вызывается только при смене предпочтений, стратегий или состава игроков
+        """
+        self.preferences = PreferenceMatrix(self.players, self.products, self.match)
+        self.player_slots = {p.id: i for i, p in enumerate(self.players)}
+        self.rebuild_strategies()
+
+    def rebuild_strategies(self):
+        """
+        Пересобирает группы стратегий, не трогая таблицу предпочтений
+        Вызывается при смене стратегий игроков (и после register_strategy)
+        """
+        self.strategy_groups = group_by_strategy(self.players)
+        self.bidders = [(get_strategy(name), indices) for name, indices in self.strategy_groups.items()]
+        self.uses_progress = any(strategy.uses_progress or strategy.progress_dependent
+                                 for strategy, _ in self.bidders)
+        self.reservation_index = None
+
+    def sold_share(self):
+        """Доля проданного товара (0.0 - 1.0)"""
+        total = sum(p.initial_quantity for p in self.products)
+        if not total:
+            return 0.0
+        return (total - sum(p.quantity for p in self.products)) / total
+
+    def progress(self):
+        """
+        Доля проданного для стратегий: 0.0, если ни одной она не нужна
+        (подсчет - проход по всем товарам, а нужна она не всем стратегиям)
+        """
+        return self.sold_share() if self.uses_progress else 0.0
+
+    def get_reservation_index(self):
+        """Индекс цен резервирования (строится при первом обращении)"""
+        if self.reservation_index is None:
+            self.reservation_index = ReservationIndex(
+                self.players, self.products, self.preferences, self.progress()
+            )
+        return self.reservation_index
+
+    def on_purchase(self, player):
+        """Обновляет индекс цен резервирования после покупки (баланс игрока изменился)"""
+        slot = self.player_slots.get(player.id)
+        if self.reservation_index is not None and slot is not None:
+            self.reservation_index.on_sale(slot, self.progress())
+
+    # ------------------------------------------------------------------
+    # Ставки
+    # ------------------------------------------------------------------
+
+    def bid_context(self, product):
+        """Данные текущего шага цены для стратегий (собираются один раз на шаг)"""
+        players = self.players
+        return BidContext(
+            product.id,
+            product.current_price,
+            product.initial_price,
+            product.cost,
+            [p.balance for p in players],
+            [p.initial_balance for p in players],
+            self.preferences.column(product.id),
+            self.progress()
+        )
+
+    def collect_bids(self, product, rng):
+        """
+        Ставки всех игроков на текущем шаге цены
+
+        Каждая стратегия оценивает свою группу игроков одним вызовом.
+
+        Returns:
+            list: Пары (индекс игрока, оценка) по группам стратегий
+        """
+        return self._evaluate(self.bid_context(product), rng)
+
+    def _evaluate(self, context, rng):
+        """Ставки по готовым данным шага: одна группа - без сборки общего списка"""
+        bidders = self.bidders
+        if len(bidders) == 1:
+            strategy, indices = bidders[0]
+            return strategy.evaluate(context, indices, rng)
+        bids = []
+        for strategy, indices in bidders:
+            bids.extend(strategy.evaluate(context, indices, rng))
+        return bids
+
+    def first_buyer(self, product, rng):
+        """Покупатель на текущем шаге по правилу веб-версии (см. pick_winner)"""
+        winner = pick_winner(self.collect_bids(product, rng), rng)
+        return None if winner is None else self.players[winner]
+
+    def buyers_in_order(self, product, rng):
+        """
+        Готовые купить игроки по правилу консольных версий:
+        первым покупает тот, кто раньше в списке игроков
+        """
+        bids = self.collect_bids(product, rng)
+        if len(self.bidders) > 1:
+            bids.sort()
+        return [self.players[index] for index, _ in bids]
+
+    # ------------------------------------------------------------------
+    # Часы цены
+    # ------------------------------------------------------------------
+
+    def run_price_clock(self, product, step, max_drops, rng):
+        """
+        Перебор шагов цены: на каждом шаге игроки оцениваются стратегиями
+        Returns: Покупатель или None (цена товара остается на последнем шаге)
+        """
+        # Пока идут часы лота, балансы, предпочтения и доля проданного
+        # не меняются: данные шага собираются один раз, меняется только цена
+        context = self.bid_context(product)
+        self.clock_drops = 0
+        for _ in range(max_drops):
+            context.price = product.current_price
+            winner = pick_winner(self._evaluate(context, rng), rng)
+            if winner is not None:
+                return self.players[winner]
+            self.clock_drops += 1
+            if not drop_price(product, step):
+                break
+        return None
+
+    def match_by_index(self, product, step, max_drops):
+        """
+        Первый покупатель - игрок с наибольшей ценой резервирования,
+        шаг цены находится bisect по лестнице цен вместо перебора игроков
+        Returns: Покупатель или None (цена товара остается на последнем шаге)
+        """
+        checked, final_price = price_ladder(product.current_price, product.cost, step, max_drops)
+        match = self.get_reservation_index().first_buyer(product.id, checked)
+        if match is None:
+            product.current_price = final_price
+            self.clock_drops = len(checked)
+            return None
+        player_index, product.current_price = match
+        self.clock_drops = checked.index(product.current_price)
+        return self.players[player_index]
+
+    def sell(self, player, product, price=None):
+        """
+        Продает одну единицу товара игроку
+
+        Args:
+            player: Покупатель (может не входить в players, например пользователь консоли)
+            product: Товар
+            price: Цена (по умолчанию текущая цена товара)
+
+        Returns:
+            float | None: Прибыль покупателя или None, если денег не хватает
+        """
+        if price is None:
+            price = product.current_price
+        if not player.can_buy(price):
+            return None
+        profit = player.buy_product(product, price)
+        product.sell_one()
+        self.on_purchase(player)
+        return profit
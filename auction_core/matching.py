@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+📈 ИНДЕКС ЦЕН РЕЗЕРВИРОВАНИЯ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Поиск первого покупателя на падающей цене без перебора игроков
+Особенности:
+- Для каждого товара хранится отсортированный список цен резервирования
+  (максимальная цена, которую игрок готов и может заплатить)
+- Столбец товара строится и обновляется лениво, при запросе по этому
+  товару: пересчитываются только записи покупателей после прошлого
+  запроса и игроков, зависящих от хода игры. Запись переставляется
+  бинарным поиском и сдвигом списка (O(n) на запись, сдвиг - memmove);
+  если изменилась большая часть записей, столбец пересортировывается
+- Первый покупатель - игрок с наибольшей ценой резервирования; шаг цены,
+  на котором он покупает, находится bisect по лестнице цен
+- Режим scan (исходный случайный перебор) остается режимом по умолчанию
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+from .strategies import get_strategy
+
+# Режимы поиска покупателя
+MATCHING_SCAN = 'scan'  # Перебор игроков стратегиями на каждом шаге цены
+MATCHING_INDEX = 'index'  # Индекс цен резервирования
+MATCHING_MODES = (MATCHING_SCAN, MATCHING_INDEX)
+
+def price_ladder(price, cost, step, max_drops):
+    """
+    Лестница цен голландского аукциона
+
+    Повторяет шаги движка: цена проверяется, затем снижается на step;
+    цена на уровне себестоимости и после max_drops снижений не проверяется.
+
+    Returns:
+        tuple: (проверяемые цены по убыванию, цена, если никто не купил)
+    """
+    checked = []
+    for _ in range(max_drops):
+        checked.append(price)
+        price = int(price * (1 - step))
+        if price <= cost:
+            price = cost
+            break
+    return checked, price
+
+class ReservationIndex:
+    """
+    Отсортированные цены резервирования игроков по товарам
+
+    Ключ записи - (цена резервирования, -индекс игрока): максимальный ключ
+    дает игрока с наибольшей ценой, при равенстве - более раннего в списке.
+
+    Продажи только записываются в журнал игроков, чьи балансы изменились;
+    столбец товара догоняет журнал при запросе (best), так что продажа
+    не трогает столбцы товаров, которые больше не запрашиваются. Ключ
+    зависит только от текущих баланса и доли проданного, поэтому
+    отложенный пересчет дает те же ключи, что пересчет после каждой продажи.
+
+    Args:
+        players: Игроки комнаты (индексы совпадают с room.players)
+        products: Товары комнаты (столбцы совпадают с PreferenceMatrix)
+        preferences: PreferenceMatrix комнаты
+        progress: Доля проданного товара (для стратегий, зависящих от хода игры)
+    """
+
+    def __init__(self, players, products, preferences, progress=0.0):
+        self.players = players
+        self.preferences = preferences
+        self.start_prices = [product.initial_price for product in products]
+        self.strategies = [get_strategy(player.strategy) for player in players]
+        # Игроки, чья цена меняется с ходом игры (обновляются после каждой продажи)
+        self.progress_dependent = [i for i, strategy in enumerate(self.strategies)
+                                   if strategy.progress_dependent]
+        self.progress = progress
+        self._changed = []  # Журнал игроков, чьи записи устарели (по продажам)
+        self._keys = [None] * len(products)  # Столбец -> отсортированный список ключей
+        self._entries = [None] * len(products)  # Столбец -> ключ каждого игрока
+        self._synced = [0] * len(products)  # Столбец -> сколько записей журнала учтено
+
+    def _key(self, slot, i, progress):
+        player = self.players[i]
+        reservation = self.strategies[i].reservation_price(
+            self.start_prices[slot],
+            self.preferences.columns[slot][i],
+            player.balance,
+            player.initial_balance,
+            progress
+        )
+        # Дороже баланса игрок купить не может
+        return (min(reservation, player.balance), -i)
+
+    def update(self, indices, progress=0.0):
+        """Отмечает записи игроков устаревшими (после изменения их балансов)"""
+        self.progress = progress
+        self._changed.extend(indices)
+
+    def on_sale(self, buyer_index, progress):
+        """Отмечает продажу: устарели покупатель и зависящие от хода игры игроки"""
+        self.update((buyer_index,), progress)
+
+    def _column(self, slot):
+        """Отсортированные ключи столбца, догнавшего журнал продаж"""
+        keys = self._keys[slot]
+        changed = self._changed
+        if keys is None:
+            entries = [self._key(slot, i, self.progress) for i in range(len(self.players))]
+            keys = sorted(entries)
+            self._entries[slot] = entries
+            self._keys[slot] = keys
+        elif self._synced[slot] < len(changed):
+            entries = self._entries[slot]
+            indices = set(changed[self._synced[slot]:])
+            indices.update(self.progress_dependent)
+            moved = []
+            for i in indices:
+                new_key = self._key(slot, i, self.progress)
+                if new_key != entries[i]:
+                    moved.append((entries[i], new_key))
+                    entries[i] = new_key
+            if len(moved) * 4 > len(keys):
+                # Изменилась большая часть столбца: пересортировка дешевле сдвигов
+                keys[:] = sorted(entries)
+            else:
+                for old_key, new_key in moved:
+                    del keys[bisect_left(keys, old_key)]
+                    insort(keys, new_key)
+        self._synced[slot] = len(changed)
+        return keys
+
+    def best(self, product_id):
+        """
+        Игрок с наибольшей ценой резервирования для товара
+
+        Returns:
+            tuple | None: (цена резервирования, индекс игрока)
+        """
+        keys = self._column(self.preferences.product_slots[product_id])
+        if not keys:
+            return None
+        reservation, negative_index = keys[-1]
+        return reservation, -negative_index
+
+    def first_buyer(self, product_id, checked):
+        """
+        Первый покупатель на лестнице цен
+
+        Args:
+            product_id: ID товара
+            checked: Проверяемые цены по убыванию (см. price_ladder)
+
+        Returns:
+            tuple | None: (индекс игрока, цена покупки)
+        """
+        best = self.best(product_id)
+        if best is None or not checked:
+            return None
+        reservation, player_index = best
+        # Лестница убывает: ищем первую цену не выше цены резервирования
+        ascending = checked[::-1]
+        position = bisect_right(ascending, reservation)
+        if position == 0:
+            return None
+        price = ascending[position - 1]
+        if price <= 0:
+            return None
+        return player_index, price
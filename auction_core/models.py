@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+🌸 МОДЕЛИ ГОЛЛАНДСКОГО АУКЦИОНА GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Игрок, товар и игровая сессия - общие для веб- и консольных версий
+Особенности:
+- Покупка (баланс, прибыль, счетчики) считается в одном месте
+- Сериализация to_dict/from_dict для API и архива игр
+"""
+
+from datetime import datetime
+
+from .preferences import LIKED_MULTIPLIER, DISLIKED_MULTIPLIER, NEUTRAL_MULTIPLIER
+from .strategies import DEFAULT_STRATEGY
+
+# Прибыль покупателя - процент от цены покупки (130% = 1.3)
+PROFIT_MULTIPLIER = 1.3
+
+class Player:
+    """
+    Игрок в аукционе
+
+    Атрибуты:
+    - id: Уникальный идентификатор игрока
+    - name: Имя игрока
+    - balance: Текущий баланс
+    - initial_balance: Начальный баланс
+    - wants: Любимый товар (бонус к покупке)
+    - no_wants: Нелюбимый товар (штраф к покупке)
+    - total_profit: Общая прибыль
+    - purchases: Количество покупок
+    - sales: Количество продаж
+    - is_user: Является ли пользователем (не ИИ)
+    - session_id: ID сессии для пользователя
+    - strategy: Имя стратегии ставок (см. strategies.py)
+    """
+    def __init__(self, id, name, balance, wants, no_wants):
+        self.id = id
+        self.name = name
+        self.balance = balance
+        self.initial_balance = balance
+        self.wants = wants  # Любимый товар
+        self.no_wants = no_wants  # Нелюбимый товар
+        self.total_profit = 0  # Общая прибыль
+        self.purchases = 0  # Количество покупок
+        self.sales = 0  # Количество продаж
+        self.is_user = False  # Является ли пользователем
+        self.session_id = None  # ID сессии
+        self.strategy = DEFAULT_STRATEGY  # Стратегия ставок
+
+    def to_dict(self):
+        """Преобразует игрока в словарь для JSON"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'balance': self.balance,
+            'initial_balance': self.initial_balance,
+            'wants': self.wants,
+            'no_wants': self.no_wants,
+            'total_profit': self.total_profit,
+            'purchases': self.purchases,
+            'sales': self.sales,
+            'strategy': self.strategy
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Восстанавливает игрока из словаря (to_dict + is_user/session_id)"""
+        player = cls(data['id'], data['name'], data['balance'], data['wants'], data['no_wants'])
+        player.initial_balance = data['initial_balance']
+        player.total_profit = data['total_profit']
+        player.purchases = data['purchases']
+        player.sales = data['sales']
+        player.is_user = data.get('is_user', False)
+        player.session_id = data.get('session_id')
+        player.strategy = data.get('strategy', DEFAULT_STRATEGY)
+        return player
+
+    def can_buy(self, price):
+        """Проверяет, может ли игрок купить товар по указанной цене"""
+        return self.balance >= price
+
+    def get_preference_multiplier(self, product_name):
+        """
+        Возвращает множитель предпочтения для товара
+        1.5 - для любимого товара
+        0.3 - для нелюбимого товара
+        1.0 - для обычного товара
+        """
+        if product_name == self.wants:
+            return LIKED_MULTIPLIER  # Бонус за любимый товар
+        elif product_name == self.no_wants:
+            return DISLIKED_MULTIPLIER  # Штраф за нелюбимый товар
+        else:
+            return NEUTRAL_MULTIPLIER  # Обычный товар
+
+    def buy_product(self, product, price):
+        """
+        Покупает товар по указанной цене
+        Возвращает прибыль от покупки
+        """
+        if not self.can_buy(price):
+            return 0  # Недостаточно средств
+
+        # Списываем деньги
+        self.balance -= price
+        self.purchases += 1
+
+        # Рассчитываем прибыль как процент от цены покупки (130% = 1.3)
+        profit = price * PROFIT_MULTIPLIER
+        self.total_profit += profit
+        self.sales += 1
+
+        return profit
+
+class Product:
+    """
+    Товар в аукционе
+
+    Атрибуты:
+    - id: Уникальный идентификатор товара
+    - name: Название товара
+    - cost: Себестоимость товара
+    - initial_price: Начальная цена аукциона
+    - current_price: Текущая цена (снижается в голландском аукционе)
+    - quantity: Количество товара
+    - initial_quantity: Начальное количество
+    - description: Описание (показывается в консольной версии)
+    """
+    def __init__(self, id, name, cost, price, quantity, description=''):
+        self.id = id
+        self.name = name
+        self.cost = cost  # Себестоимость
+        self.initial_price = price  # Начальная цена
+        self.current_price = price  # Текущая цена (снижается)
+        self.quantity = quantity  # Количество
+        self.initial_quantity = quantity  # Начальное количество
+        self.description = description
+
+    def to_dict(self):
+        """Преобразует товар в словарь для JSON"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'cost': self.cost,
+            'initial_price': self.initial_price,
+            'current_price': self.current_price,
+            'quantity': self.quantity,
+            'initial_quantity': self.initial_quantity
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Восстанавливает товар из словаря to_dict"""
+        product = cls(data['id'], data['name'], data['cost'], data['initial_price'], data['initial_quantity'])
+        product.current_price = data['current_price']
+        product.quantity = data['quantity']
+        return product
+
+    def is_available(self):
+        """Проверяет, доступен ли товар для продажи"""
+        return self.quantity > 0
+
+    def reduce_price(self, ratio=0.95):
+        """
+        Снижает цену товара (голландский аукцион)
+        ratio: коэффициент снижения (0.95 = снижение на 5%)
+        """
+        self.current_price = int(self.current_price * ratio)
+
+    def sell_one(self):
+        """Продает одну единицу товара"""
+        if self.is_available():
+            self.quantity -= 1
+            return True
+        return False
+
+    def reset_to_initial(self):
+        """Сбрасывает товар к начальному состоянию"""
+        self.current_price = self.initial_price
+        self.quantity = self.initial_quantity
+
+class Game:
+    """Игровая сессия"""
+    def __init__(self, game_id=1):
+        self.id = game_id
+        self.status = 'waiting'
+        self.current_round = 0
+        self.current_product_id = None
+        self.winner_id = None
+        self.start_time = datetime.now()
+        self.end_time = None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'current_round': self.current_round,
+            'current_product_id': self.current_product_id,
+            'winner_id': self.winner_id,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'end_time': self.end_time.isoformat() if self.end_time else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Восстанавливает игровую сессию из словаря to_dict"""
+        game = cls(data['id'])
+        game.status = data['status']
+        game.current_round = data['current_round']
+        game.current_product_id = data['current_product_id']
+        game.winner_id = data['winner_id']
+        game.start_time = datetime.fromisoformat(data['start_time']) if data['start_time'] else None
+        game.end_time = datetime.fromisoformat(data['end_time']) if data['end_time'] else None
+        return game
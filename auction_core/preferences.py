@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+❤️ ТАБЛИЦА ПРЕДПОЧТЕНИЙ ИГРОКОВ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Предрассчитанные множители предпочтений игрок × товар
+Особенности:
+- Названия товаров заменяются целыми номерами один раз при сборке
+- Множители хранятся по столбцам: на каждом снижении цены движок
+  перебирает всех игроков для одного товара, это один список
+- Таблица пересобирается только когда меняются предпочтения или состав игроков
+- Названия сравниваются точно (веб-версия) или по вхождению без учета
+  регистра ("Розы" в "🌹 Розы", консольные версии)
+"""
+
+from array import array
+
+# Множители предпочтений (совпадают с Player.get_preference_multiplier)
+LIKED_MULTIPLIER = 1.5  # Любимый товар
+DISLIKED_MULTIPLIER = 0.3  # Нелюбимый товар
+NEUTRAL_MULTIPLIER = 1.0  # Обычный товар
+
+# Сравнение любимого/нелюбимого товара с названием товара
+MATCH_EXACT = 'exact'  # Название совпадает полностью
+MATCH_CONTAINS = 'contains'  # Название содержит строку (без учета регистра)
+
+class PreferenceMatrix:
+    """
+    Множители предпочтений игроков для товаров комнаты
+
+    Атрибуты:
+    - product_slots: ID товара -> номер столбца
+    - columns: Номер столбца -> array('d') множителей в порядке игроков
+
+    Args:
+        players: Игроки в том порядке, в котором их перебирает движок
+        products: Товары комнаты
+        match: MATCH_EXACT или MATCH_CONTAINS
+    """
+
+    def __init__(self, players, products, match=MATCH_EXACT):
+        # Интернируем названия: название -> номер столбца
+        name_slots = {}
+        self.product_slots = {}
+        for slot, product in enumerate(products):
+            name_slots.setdefault(product.name, slot)
+            self.product_slots[product.id] = slot
+
+        self.columns = [array('d', [NEUTRAL_MULTIPLIER]) * len(players) for _ in products]
+        if match == MATCH_CONTAINS:
+            self._fill_contains(players, products)
+            return
+        for player_index, player in enumerate(players):
+            # Сначала "не любит", затем "любит": при совпадении выигрывает
+            # любимый товар, как в Player.get_preference_multiplier
+            disliked = name_slots.get(player.no_wants)
+            if disliked is not None:
+                self.columns[disliked][player_index] = DISLIKED_MULTIPLIER
+            liked = name_slots.get(player.wants)
+            if liked is not None:
+                self.columns[liked][player_index] = LIKED_MULTIPLIER
+
+    def column(self, product_id):
+        """Множители всех игроков для товара (в порядке игроков)"""
+        return self.columns[self.product_slots[product_id]]
+
+    def multiplier(self, player_index, product_id):
+        """Множитель одного игрока для товара"""
+        return self.columns[self.product_slots[product_id]][player_index]
+
+    def _fill_contains(self, players, products):
+        """Заполняет столбцы по вхождению строки в название (любимый товар важнее)"""
+        names = [product.name.lower() for product in products]
+        for player_index, player in enumerate(players):
+            wants = player.wants.lower()
+            no_wants = player.no_wants.lower()
+            for slot, name in enumerate(names):
+                if wants and wants in name:
+                    self.columns[slot][player_index] = LIKED_MULTIPLIER
+                elif no_wants and no_wants in name:
+                    self.columns[slot][player_index] = DISLIKED_MULTIPLIER
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""
+🤖 СТРАТЕГИИ ИИ-ПОКУПАТЕЛЕЙ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Подключаемые стратегии ставок ИИ-игроков
+Особенности:
+- Стратегия оценивает сразу всю свою группу игроков за один вызов на шаг цены
+- Общие данные шага (балансы, множители предпочтений) собираются один раз
+- Реестр стратегий: каждая комната может смешивать стратегии в своих пропорциях
+- Встроены: random (исходное поведение), additive (консольная версия),
+  simple (простая консольная версия), reservation (цена резервирования),
+  pacing (распределение бюджета), logistic (обучаемая логистическая политика)
+"""
+
+import json
+import math
+
+from .preferences import LIKED_MULTIPLIER, DISLIKED_MULTIPLIER
+
+# Стратегия по умолчанию - исходное поведение веб-версии
+DEFAULT_STRATEGY = 'random'
+
+# Какую долю начальной цены готов заплатить игрок без предпочтений
+DEFAULT_VALUE_RATIO = 0.75
+
+class BidContext:
+    """
+    Данные одного шага цены, общие для всех стратегий
+
+    Все списки выровнены по индексу игрока в room.players.
+
+    Атрибуты:
+    - product_id: ID товара
+    - price: Текущая цена
+    - start_price: Начальная цена товара
+    - min_price: Минимальная цена (себестоимость)
+    - balances: Балансы игроков
+    - initial_balances: Начальные балансы игроков
+    - preferences: Множители предпочтений игроков для товара
+    - progress: Доля проданного товара в игре (0.0 - 1.0); 0.0, если ни одна
+      стратегия комнаты ее не использует (uses_progress)
+    """
+    __slots__ = ('product_id', 'price', 'start_price', 'min_price',
+                 'balances', 'initial_balances', 'preferences', 'progress')
+
+    def __init__(self, product_id, price, start_price, min_price,
+                 balances, initial_balances, preferences, progress=0.0):
+        self.product_id = product_id
+        self.price = price
+        self.start_price = start_price
+        self.min_price = min_price
+        self.balances = balances
+        self.initial_balances = initial_balances
+        self.preferences = preferences
+        self.progress = progress
+
+class BidderStrategy:
+    """
+    Базовая стратегия ставок
+
+    Подкласс задает name и реализует evaluate(). reservation_price()
+    используется индексом цен резервирования (matching.py).
+    """
+    name = None
+    progress_dependent = False  # Зависит ли цена резервирования от хода игры
+    uses_progress = False  # Читает ли evaluate() context.progress
+
+    def evaluate(self, context, indices, rng):
+        """
+        Оценивает группу игроков на текущем шаге цены
+
+        Args:
+            context: BidContext шага
+            indices: Индексы игроков группы (в порядке room.players)
+            rng: Генератор случайных чисел (модуль random или random.Random)
+
+        Returns:
+            list: Пары (индекс игрока, оценка) для игроков, готовых купить.
+            Чем выше оценка, тем охотнее игрок покупает.
+        """
+        raise NotImplementedError
+
+    def reservation_price(self, start_price, preference, balance, initial_balance, progress):
+        """
+        Максимальная цена, которую игрок готов заплатить (без учета баланса)
+
+        Для случайных стратегий - доля начальной цены × множитель предпочтения.
+        """
+        return start_price * DEFAULT_VALUE_RATIO * preference
+
+class RandomPreferenceStrategy(BidderStrategy):
+    """Исходное поведение: множитель предпочтения × случайный фактор, покупает любой, кому хватает денег"""
+    name = 'random'
+
+    def evaluate(self, context, indices, rng):
+        price = context.price
+        balances = context.balances
+        preferences = context.preferences
+        # То же, что rng.uniform(0.1, 1.0), без вызова Python-функции на игрока
+        draw = rng.random
+        span = 1.0 - 0.1
+        return [(i, preferences[i] * (0.1 + span * draw()))
+                for i in indices if balances[i] > 0 and balances[i] >= price]
+
+class AdditiveStrategy(BidderStrategy):
+    """
+    Поведение консольной версии: вероятность покупки складывается из надбавок
+
+    База 0.1, +0.3 если хватает денег, +0.2 если цена не выше 70% начальной,
+    +0.3 за любимый товар, -0.2 за нелюбимый
+    """
+    name = 'additive'
+    PREFERENCE_BONUS = {LIKED_MULTIPLIER: 0.3, DISLIKED_MULTIPLIER: -0.2}
+
+    def evaluate(self, context, indices, rng):
+        price = context.price
+        balances = context.balances
+        preferences = context.preferences
+        bonus = self.PREFERENCE_BONUS
+        # Покупают только те, кому хватает денег, поэтому +0.3 есть у всех кандидатов
+        base = 0.1 + 0.3 + (0.2 if price <= context.start_price * 0.7 else 0.0)
+        draw = rng.random
+        bids = []
+        for i in indices:
+            if balances[i] >= price:
+                probability = base + bonus.get(preferences[i], 0.0)
+                if draw() < probability:
+                    bids.append((i, probability))
+        return bids
+
+class SimpleChanceStrategy(BidderStrategy):
+    """
+    Поведение простой консольной версии: игроки спрашиваются по порядку,
+    первый согласный покупает, остальные уже не оцениваются
+
+    Вероятность согласия: 0.7 за любимый товар, 0.1 за нелюбимый, 0.3 за обычный
+    """
+    name = 'simple'
+    CHANCE = {LIKED_MULTIPLIER: 0.7, DISLIKED_MULTIPLIER: 0.1}
+    NEUTRAL_CHANCE = 0.3
+
+    def evaluate(self, context, indices, rng):
+        price = context.price
+        balances = context.balances
+        preferences = context.preferences
+        chances = self.CHANCE
+        draw = rng.random
+        for i in indices:
+            if balances[i] < price:
+                continue
+            chance = chances.get(preferences[i], self.NEUTRAL_CHANCE)
+            if draw() < chance:
+                return [(i, chance)]
+        return []
+
+class ReservationPriceStrategy(BidderStrategy):
+    """
+    Цена резервирования: игрок покупает, как только цена опустилась
+    до его максимальной цены (доля начальной цены × множитель предпочтения)
+
+    Args:
+        value_ratio: Какую долю начальной цены готов заплатить игрок без предпочтений
+    """
+    name = 'reservation'
+
+    def __init__(self, value_ratio=DEFAULT_VALUE_RATIO):
+        self.value_ratio = value_ratio
+
+    def reservation_price(self, start_price, preference, balance, initial_balance, progress):
+        return start_price * self.value_ratio * preference
+
+    def evaluate(self, context, indices, rng):
+        price = context.price
+        balances = context.balances
+        limit = context.start_price * self.value_ratio
+        preferences = context.preferences
+        bids = []
+        for i in indices:
+            reservation = limit * preferences[i]
+            if price <= reservation and balances[i] >= price:
+                bids.append((i, reservation / price))
+        return bids
+
+class BudgetPacingStrategy(ReservationPriceStrategy):
+    """
+    Распределение бюджета: цена резервирования снижается, если игрок
+    потратил большую долю бюджета, чем доля уже проданного товара
+
+    Args:
+        value_ratio: Как у ReservationPriceStrategy
+        min_shade: Нижняя граница понижающего коэффициента
+    """
+    name = 'pacing'
+    progress_dependent = True
+    uses_progress = True
+
+    def __init__(self, value_ratio=DEFAULT_VALUE_RATIO, min_shade=0.5):
+        super().__init__(value_ratio)
+        self.min_shade = min_shade
+
+    def reservation_price(self, start_price, preference, balance, initial_balance, progress):
+        spent = 1.0 - balance / initial_balance if initial_balance else 1.0
+        shade = 1.0 - (spent - progress) if spent > progress else 1.0
+        return start_price * self.value_ratio * preference * max(self.min_shade, shade)
+
+    def evaluate(self, context, indices, rng):
+        price = context.price
+        balances = context.balances
+        initial_balances = context.initial_balances
+        preferences = context.preferences
+        progress = context.progress
+        limit = context.start_price * self.value_ratio
+        min_shade = self.min_shade
+        bids = []
+        for i in indices:
+            balance = balances[i]
+            if balance < price:
+                continue
+            # То же, что reservation_price(), но без вызовов методов на игрока
+            initial = initial_balances[i]
+            spent = 1.0 - balance / initial if initial else 1.0
+            shade = 1.0 - (spent - progress) if spent > progress else 1.0
+            reservation = limit * preferences[i] * (shade if shade > min_shade else min_shade)
+            if price <= reservation:
+                bids.append((i, reservation / price))
+        return bids
+
+class LogisticStrategy(BidderStrategy):
+    """
+    Логистическая политика: вероятность покупки = sigmoid(w · x)
+
+    Признаки: bias, discount (скидка от начальной цены), preference
+    (логарифм множителя предпочтения), affordability (запас баланса, до 1.0),
+    pacing (опережение бюджета относительно хода игры).
+    Веса можно обучить отдельно и загрузить через from_file().
+
+    Args:
+        weights: Словарь весов (недостающие берутся из DEFAULT_WEIGHTS)
+    """
+    name = 'logistic'
+    uses_progress = True
+    DEFAULT_WEIGHTS = {
+        'bias': -2.5,
+        'discount': 6.0,
+        'preference': 2.0,
+        'affordability': 1.0,
+        'pacing': 1.5
+    }
+
+    def __init__(self, weights=None):
+        self.weights = dict(self.DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+
+    @classmethod
+    def from_file(cls, path):
+        """Загружает веса из JSON-файла {"bias": ..., "discount": ...}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def evaluate(self, context, indices, rng):
+        w = self.weights
+        price = context.price
+        balances = context.balances
+        initial_balances = context.initial_balances
+        preferences = context.preferences
+        # Общая для всех часть линейной формы считается один раз на шаг
+        shared = w['bias'] + w['discount'] * (1.0 - price / context.start_price) - w['pacing'] * context.progress
+        w_preference = w['preference']
+        w_affordability = w['affordability']
+        w_pacing = w['pacing']
+        exp = math.exp
+        log = math.log
+        draw = rng.random
+        bids = []
+        for i in indices:
+            balance = balances[i]
+            if balance < price:
+                continue
+            spent = 1.0 - balance / initial_balances[i] if initial_balances[i] else 1.0
+            z = (shared
+                 + w_preference * log(preferences[i])
+                 + w_affordability * min(1.0, (balance - price) / price)
+                 - w_pacing * spent)
+            probability = 1.0 / (1.0 + exp(-z))
+            if draw() < probability:
+                bids.append((i, probability))
+        return bids
+
+# ============================================================================
+# РЕЕСТР
+# ============================================================================
+
+STRATEGIES = {}
+
+def register_strategy(strategy):
+    """Регистрирует экземпляр стратегии под ее именем strategy.name"""
+    STRATEGIES[strategy.name] = strategy
+    return strategy
+
+def get_strategy(name):
+    """Стратегия по имени (неизвестное имя - стратегия по умолчанию)"""
+    return STRATEGIES.get(name) or STRATEGIES[DEFAULT_STRATEGY]
+
+def available_strategies():
+    """Имена зарегистрированных стратегий"""
+    return sorted(STRATEGIES)
+
+for _strategy in (RandomPreferenceStrategy(), AdditiveStrategy(), SimpleChanceStrategy(),
+                  ReservationPriceStrategy(), BudgetPacingStrategy(), LogisticStrategy()):
+    register_strategy(_strategy)
+
+def parse_strategy_mix(value):
+    """
+    Разбирает пропорции стратегий
+
+    Args:
+        value: Словарь {имя: вес} или строка "random:2,reservation:1"
+
+    Returns:
+        dict: Имя -> вес (только положительные веса)
+
+    Raises:
+        ValueError: Неизвестная стратегия, неверный вес или пустая смесь
+    """
+    if isinstance(value, str):
+        items = []
+        for part in value.split(','):
+            if not part.strip():
+                continue
+            name, _, weight = part.partition(':')
+            items.append((name.strip(), weight.strip() or '1'))
+    elif isinstance(value, dict):
+        items = list(value.items())
+    else:
+        raise ValueError('Смесь стратегий должна быть словарем или строкой')
+
+    mix = {}
+    for name, weight in items:
+        if name not in STRATEGIES:
+            raise ValueError(f'Неизвестная стратегия: {name}')
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f'Неверный вес стратегии {name}: {weight}')
+        if weight < 0 or not math.isfinite(weight):
+            raise ValueError(f'Неверный вес стратегии {name}: {weight}')
+        if weight > 0:
+            mix[name] = weight
+    if not mix:
+        raise ValueError('Смесь стратегий пуста')
+    return mix
+
+def assign_strategies(count, mix, rng):
+    """
+    Распределяет стратегии между count игроками пропорционально весам
+
+    Число игроков каждой стратегии считается методом наибольшего остатка,
+    затем порядок перемешивается. Для смеси из одной стратегии
+    генератор случайных чисел не используется.
+
+    Returns:
+        list: Имена стратегий по игрокам
+    """
+    if len(mix) == 1:
+        return [next(iter(mix))] * count
+    total = sum(mix.values())
+    quotas = [(name, count * weight / total) for name, weight in mix.items()]
+    counts = {name: int(quota) for name, quota in quotas}
+    remainder = count - sum(counts.values())
+    for name, quota in sorted(quotas, key=lambda item: item[1] - int(item[1]), reverse=True)[:remainder]:
+        counts[name] += 1
+    names = [name for name, _ in quotas for _ in range(counts[name])]
+    rng.shuffle(names)
+    return names
+
+def group_by_strategy(players):
+    """
+    Группирует индексы игроков по стратегиям
+
+    Returns:
+        dict: Имя стратегии -> список индексов (в порядке игроков)
+    """
+    groups = {}
+    for index, player in enumerate(players):
+        name = player.strategy if player.strategy in STRATEGIES else DEFAULT_STRATEGY
+        groups.setdefault(name, []).append(index)
+    return groups
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+📈 БЕНЧМАРК АНАЛИТИКИ РЫНКА
+
+Описание: Стоимость обновления аналитики и сводки при росте числа сделок
+- Запись: время одной сделки и одного исхода лота
+- Сводка: время summary() и число точек ряда цен - не растут вместе
+  с числом сделок
+- Раунды: время раунда app.py с аналитикой и без записи в нее
+
+Запуск:
+    python benchmarks/bench_analytics.py --sales 1000000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Игры бенчмарка не восстанавливаются из снимка и не попадают в него
+os.environ.setdefault('GOLAN_SNAPSHOT', '0')
+
+import app
+from analytics import MarketAnalytics
+
+def time_records(market, sales, product_ids):
+    started = time.perf_counter()
+    for i in range(sales):
+        product_id = product_ids[i % len(product_ids)]
+        market.record_sale(product_id, 100000 + i % 5000, i // 10)
+        market.record_lot(product_id, i % 3 != 0, i % 25)
+    return (time.perf_counter() - started) * 1e9 / sales
+
+def time_summary(market, products, repeats=20):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        summary = market.summary(products)
+    points = sum(len(item['price_series']) for item in summary['products'])
+    return (time.perf_counter() - started) * 1e6 / repeats, points
+
+def time_rounds(rounds, record):
+    """Раунды до конца игр; record=False - аналитика не обновляется"""
+    random.seed(1)
+    room = app.GameRoom('bench-analytics')
+    app.create_initial_data(room)
+    played = 0
+    started = time.perf_counter()
+    while played < rounds:
+        app.auction_engine.start_new_game(room, 'bench')
+        if not record:
+            room.market.record_sale = room.market.record_lot = lambda *args, **kwargs: None
+        while played < rounds:
+            played += 1
+            if app.auction_engine.conduct_dutch_auction_round(room).get('game_over') is not False:
+                break
+    return (time.perf_counter() - started) * 1e6 / played
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк аналитики рынка")
+    parser.add_argument("--sales", type=int, default=1000000)
+    parser.add_argument("--points", type=int, default=app.MARKET_SERIES_POINTS)
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    room = app.GameRoom('bench-analytics')
+    app.create_initial_data(room)
+    products = room.products
+
+    print(f"{'Сделок':>10} {'Запись, нс':>11} {'Сводка, мкс':>12} {'Точек ряда':>11}")
+    market = MarketAnalytics(args.points, app.MARKET_HISTOGRAM_BINS)
+    recorded = 0
+    sales = 1000
+    while sales <= args.sales:
+        per_record = time_records(market, sales - recorded, [p.id for p in products])
+        recorded = sales
+        summary_us, points = time_summary(market, products)
+        print(f"{sales:>10} {per_record:>11.0f} {summary_us:>12.1f} {points:>11}")
+        sales *= 10
+
+    with_market = time_rounds(args.rounds, True)
+    without_market = time_rounds(args.rounds, False)
+    print(f"Раунд с аналитикой: {with_market:.1f} мкс, без записи: {without_market:.1f} мкс")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+⚖️ БЕНЧМАРК АРБИТРАЖА ПОКУПОК
+
+Описание: Одновременные покупки одного лота многими пользователями
+- Комната с заданным числом пользователей (как после /api/game/join),
+  открыт лот в реальном времени; все пользователи покупают его разом
+- lock: каждая заявка сама берет блокировку комнаты (как до арбитража) -
+  лот достается потоку, который первым взял блокировку
+- arbiter: заявки собираются в микроокне и разбираются пачкой по времени
+  поступления
+- Между поступлением заявки и покупкой - случайная задержка до --jitter мс
+  (разбор запроса, сессия, ограничение частоты)
+- Для каждого режима: сколько раз лот достался не самой ранней заявке,
+  сколько раз бралась блокировка комнаты, пропускная способность
+  и перцентили задержки заявки
+
+Запуск:
+    python benchmarks/bench_arbitration.py --users 64 --trials 50
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Игры бенчмарка не восстанавливаются из снимка и не попадают в него
+os.environ.setdefault('GOLAN_SNAPSHOT', '0')
+
+import app
+from arbitration import BidArbiter, percentile
+
+def build_room(users):
+    """Комната с идущей игрой, users пользователями и открытым лотом"""
+    room = app.GameRoom('bench-arbitration')
+    app.create_initial_data(room)
+    app.auction_engine.start_new_game(room, 'user-0')
+    for i in range(1, users):
+        app.add_user_player(room, f'user-{i}')
+    for player in room.players:
+        if player.is_user:
+            player.balance = player.initial_balance = 10 ** 9
+    # Часы лота стоят на первом шаге, исход ИИ не наступит во время замера
+    app.auction_engine.lot_tick_ms = 60000
+    app.auction_engine.open_live_lot(room)
+    return room
+
+def run_trial(room, users, buy, jitter):
+    """
+    Все пользователи покупают лот одновременно
+
+    Заявки после закрытия лота покупают товар по обычной цене, как и раньше;
+    победитель лота - из room.live_lot.
+
+    Returns:
+        tuple: (сессия победителя лота, сессия самой ранней заявки, задержки заявок)
+    """
+    product_id = room.live_lot['product_id']
+    start = threading.Barrier(users)
+    arrivals = {}
+    latencies = []
+    lock = threading.Lock()
+
+    def bidder(session_id):
+        start.wait()
+        arrived, arrived_ms = time.perf_counter(), app.now_ms()
+        # Разбор запроса, сессия, ограничение частоты - разное время у разных потоков
+        time.sleep(random.uniform(0, jitter))
+        buy(room, session_id, product_id, arrived, arrived_ms)
+        finished = time.perf_counter()
+        with lock:
+            arrivals[session_id] = arrived
+            latencies.append(finished - arrived)
+
+    threads = [threading.Thread(target=bidder, args=(f'user-{i}',)) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    winner = next(p.session_id for p in room.players if p.id == room.live_lot['winner_id'])
+    return winner, min(arrivals, key=arrivals.get), latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк арбитража покупок")
+    parser.add_argument("--users", type=int, default=64, help="Пользователей в комнате")
+    parser.add_argument("--trials", type=int, default=50, help="Лотов на режим")
+    parser.add_argument("--window", type=float, default=app.BID_WINDOW_MS, help="Микроокно, мс")
+    parser.add_argument("--jitter", type=float, default=2.0, help="Задержка до покупки, мс")
+    args = parser.parse_args()
+
+    random.seed(1)
+    arbiter = BidArbiter(app.resolve_bids, window_ms=args.window)
+
+    def buy_with_lock(room, session_id, product_id, arrived, arrived_ms):
+        key = app.bid_key(room, product_id)
+        with room.lock:
+            return app.resolve_buy(room, session_id, product_id, arrived_ms, key[2])
+
+    def buy_with_arbiter(room, session_id, product_id, arrived, arrived_ms):
+        key = app.bid_key(room, product_id)
+        return arbiter.submit(key, (room, session_id, product_id, arrived_ms, key[2]), arrived)
+
+    print(f"Пользователей: {args.users}, лотов: {args.trials}, окно: {args.window} мс")
+    failed = False
+    for mode, buy in (('lock', buy_with_lock), ('arbiter', buy_with_arbiter)):
+        unfair = 0
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(args.trials):
+            room = build_room(args.users)
+            winner, earliest, trial_latencies = run_trial(room, args.users, buy, args.jitter / 1000)
+            unfair += winner != earliest
+            latencies += trial_latencies
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        locks = arbiter.metrics()['batches'] if mode == 'arbiter' else len(latencies)
+        print(f"{mode:<8} не самая ранняя заявка: {unfair}/{args.trials}, блокировок комнаты: {locks}, "
+              f"{len(latencies) / elapsed:8.0f} заявок/с, "
+              f"p50 {percentile(latencies, 0.5) * 1000:.2f} мс, p99 {percentile(latencies, 0.99) * 1000:.2f} мс")
+        if mode == 'arbiter':
+            failed = unfair > 0
+            metrics = arbiter.metrics()
+            print(f"Пачек: {metrics['batches']}, спорных: {metrics['contested_batches']}, "
+                  f"наибольшая: {metrics['largest_batch']} заявок")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
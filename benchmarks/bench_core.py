@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+⚙️ ПАРИТЕТ И БЕНЧМАРК ЯДРА АУКЦИОНА
+
+Описание: Сравнивает прежние реализации правил (до пакета auction_core)
+с адаптерами поверх ядра
+- Прежнее дерево извлекается из git (git archive) во временную папку
+- Одни и те же сценарии с одинаковыми зернами запускаются в прежнем
+  и текущем дереве отдельными процессами; результаты должны совпасть
+- Сценарии: раунды app.py (scan, index, смесь стратегий, большая комната),
+  play_headless консольной версии (одна стратегия и смесь),
+  simple_auction.main() со сценарием ввода (сравнивается весь вывод)
+- Для каждого сценария печатается время в прежнем и текущем дереве -
+  лучший из --repeat прогонов (один прогон на загруженной машине шумит)
+
+Запуск:
+    python benchmarks/bench_core.py --seeds 200 --repeat 5
+    python benchmarks/bench_core.py --reference <коммит>
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import tarfile
+import argparse
+import tempfile
+import subprocess
+import contextlib
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ['web', 'web-index', 'web-mixed', 'web-large', 'terminal', 'terminal-mixed', 'simple']
+
+# Смесь стратегий для сценариев со смешанными игроками
+WEB_MIX = {'random': 2, 'reservation': 1, 'pacing': 1, 'logistic': 1}
+TERMINAL_LINEUP = ['additive', 'reservation', 'pacing', 'logistic', 'random', 'additive']
+
+# ============================================================================
+# СЦЕНАРИИ (выполняются внутри проверяемого дерева)
+# ============================================================================
+
+def play_web(seed, matching='scan', mix=None, bots=0, max_rounds=60):
+    """Раунды веб-версии до конца игры; результат - сообщения раундов и итоги игроков"""
+    import app
+    random.seed(seed)
+    room = app.GameRoom(f'parity{seed}')
+    room.strategy_mix = dict(mix or {'random': 1})
+    room.matching_mode = matching
+    app.create_initial_data(room)
+    if bots:
+        names = [p.name for p in room.products]
+        room.players += [app.Player(len(room.players) + i + 1, f'Бот {i + 1}', 150000, names[0], names[1])
+                         for i in range(bots)]
+    app.auction_engine.start_new_game(room, 'parity')
+
+    rounds = []
+    for _ in range(max_rounds):
+        result = app.auction_engine.conduct_dutch_auction_round(room)
+        rounds.append([result.get('message'), (result.get('winner') or {}).get('id')])
+        if result.get('game_over') or not result.get('success'):
+            break
+    players = [[p.id, p.balance, p.total_profit, p.purchases] for p in room.players]
+    return [rounds, players]
+
+def play_terminal(seed, lineup=None):
+    """Игра только ИИ-игроков консольной версии"""
+    from terminal_auction import DutchAuctionGame
+    random.seed(seed)
+    game = DutchAuctionGame()
+    if lineup:
+        game.set_player_strategies(lineup)
+    sold = game.play_headless(10)
+    return [sold, [[p.name, p.balance, p.total_profit, p.purchases] for p in game.players]]
+
+def play_simple(seed):
+    """simple_auction.main() с вводом по своему генератору; результат - весь вывод"""
+    import builtins
+    import simple_auction
+    answers = random.Random(seed + 1_000_000)
+    calls = []
+
+    def scripted_input(prompt=''):
+        print(prompt)
+        calls.append(prompt)
+        if len(calls) == 1:
+            return 'Тест'
+        return '1' if answers.random() < 0.15 else '2'
+
+    original_input, original_sleep = builtins.input, time.sleep
+    builtins.input, time.sleep = scripted_input, lambda seconds: None
+    output = io.StringIO()
+    try:
+        random.seed(seed)
+        with contextlib.redirect_stdout(output):
+            simple_auction.main()
+    finally:
+        builtins.input, time.sleep = original_input, original_sleep
+    return output.getvalue()
+
+def run_worker(tree, scenario, seeds, repeat=1):
+    """
+    Выполняет сценарий для зерен 0..seeds-1 в дереве tree repeat раз
+    и печатает JSON: результаты первого прогона и лучшее время
+    """
+    sys.path[:0] = [tree, os.path.join(tree, 'TERMINAL_GAME')]
+    os.chdir(tree)
+    if scenario == 'web':
+        play = lambda seed: play_web(seed)
+    elif scenario == 'web-index':
+        play = lambda seed: play_web(seed, matching='index', mix={'reservation': 1})
+    elif scenario == 'web-mixed':
+        play = lambda seed: play_web(seed, mix=WEB_MIX)
+    elif scenario == 'web-large':
+        seeds = max(1, seeds // 20)
+        play = lambda seed: play_web(seed, bots=2000, max_rounds=40)
+    elif scenario == 'terminal':
+        play = play_terminal
+    elif scenario == 'terminal-mixed':
+        play = lambda seed: play_terminal(seed, TERMINAL_LINEUP)
+    else:
+        play = play_simple
+
+    # Импорт модулей дерева не входит в замер
+    play(0)
+    results = None
+    elapsed_ms = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        run = [play(seed) for seed in range(seeds)]
+        elapsed = (time.perf_counter() - started) * 1000
+        results = results if results is not None else run
+        elapsed_ms = elapsed if elapsed_ms is None else min(elapsed_ms, elapsed)
+    json.dump({'results': results, 'elapsed_ms': elapsed_ms}, sys.stdout, ensure_ascii=False)
+
+# ============================================================================
+# СРАВНЕНИЕ
+# ============================================================================
+
+def git(*args):
+    return subprocess.run(['git', *args], cwd=BASE_DIR, check=True, capture_output=True).stdout
+
+def default_reference():
+    """Коммит перед появлением auction_core (или HEAD, если ядро еще не закоммичено)"""
+    added = git('log', '--diff-filter=A', '--format=%H', '--', 'auction_core/__init__.py').split()
+    return added[-1].decode() + '^' if added else 'HEAD'
+
+def extract_tree(revision, target):
+    """Извлекает дерево ревизии в папку target"""
+    with tarfile.open(fileobj=io.BytesIO(git('archive', '--format=tar', revision))) as archive:
+        archive.extractall(target)
+
+def run_scenario(tree, scenario, seeds, repeat=1):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', tree, '--scenario', scenario,
+         '--seeds', str(seeds), '--repeat', str(repeat)],
+        check=True, capture_output=True,
+        env=dict(os.environ, GOLAN_ARCHIVE_DIR=os.path.join(tree, 'archive'), GOLAN_SNAPSHOT='0')
+    ).stdout
+    return json.loads(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Паритет и бенчмарк ядра аукциона")
+    parser.add_argument("--seeds", type=int, default=100, help="Зерен на сценарий")
+    parser.add_argument("--repeat", type=int, default=3, help="Прогонов на сценарий (время - лучшее)")
+    parser.add_argument("--reference", help="Ревизия с прежними правилами (по умолчанию - до auction_core)")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="Только эти сценарии")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.scenario[0], args.seeds, args.repeat)
+        return
+
+    reference = args.reference or default_reference()
+    scenarios = args.scenario or SCENARIOS
+    print(f"Прежние правила: {reference}, зерен: {args.seeds}, прогонов: {args.repeat}")
+    print(f"{'Сценарий':<16} {'Паритет':>10} {'Прежнее, мс':>12} {'Ядро, мс':>10} {'Ускорение':>10}")
+    failed = False
+    with tempfile.TemporaryDirectory(prefix='golan-reference-') as reference_tree:
+        extract_tree(reference, reference_tree)
+        for scenario in scenarios:
+            old = run_scenario(reference_tree, scenario, args.seeds, args.repeat)
+            new = run_scenario(BASE_DIR, scenario, args.seeds, args.repeat)
+            same = sum(a == b for a, b in zip(old['results'], new['results']))
+            total = len(old['results'])
+            failed |= same != total
+            print(f"{scenario:<16} {f'{same}/{total}':>10} {old['elapsed_ms']:>12.1f} "
+                  f"{new['elapsed_ms']:>10.1f} {old['elapsed_ms'] / new['elapsed_ms']:>9.2f}x")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+📡 БЕНЧМАРК РАССЫЛКИ СОСТОЯНИЯ
+
+Описание: Стоимость одного изменения состояния при многих подписчиках
+- naive: состояние снимается и сериализуется для каждого подписчика
+  (как делал поток /api/game/stream до рассылки)
+- fanout: один кадр на изменение, одни и те же байты в очереди подписчиков
+- Медленные подписчики: очередь не растет больше GOLAN_STREAM_QUEUE кадров
+- Подписчики в потоках: задержка от публикации до получения кадра
+
+Запуск:
+    python benchmarks/bench_fanout.py --subscribers 5000 --updates 20
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Игры бенчмарка не восстанавливаются из снимка и не попадают в него
+os.environ.setdefault('GOLAN_SNAPSHOT', '0')
+
+import app
+from fanout import FanoutHub
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк рассылки состояния")
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=200, help="Подписчиков в отдельных потоках")
+    args = parser.parse_args()
+
+    random.seed(1)
+    room = app.get_room('bench-fanout')
+    app.auction_engine.start_new_game(room, 'bench')
+    game_id = room.game_id
+
+    def change_state():
+        app.auction_engine.conduct_dutch_auction_round(room)
+
+    # Как раньше: каждый подписчик сам снимает и сериализует состояние
+    started = time.perf_counter()
+    for _ in range(args.updates):
+        change_state()
+        for _ in range(args.subscribers):
+            json.dumps(app.auction_engine.get_current_game_state(room), ensure_ascii=False)
+    naive_ms = (time.perf_counter() - started) * 1000 / args.updates
+
+    # Рассылка: один кадр на изменение; половина подписчиков читает каждый кадр,
+    # половина не читает вовсе (очередь ограничена)
+    hub = FanoutHub(app.snapshot_room_state, app.get_room_version, queue_limit=app.STREAM_QUEUE_LIMIT)
+    subscriptions = [hub.subscribe(game_id) for _ in range(args.subscribers)]
+    readers, idle = subscriptions[::2], subscriptions[1::2]
+    started = time.perf_counter()
+    for _ in range(args.updates):
+        change_state()
+        hub.encode(game_id)
+        for subscription in readers:
+            subscription.get(0)
+    fanout_ms = (time.perf_counter() - started) * 1000 / args.updates
+    for subscription in subscriptions:
+        subscription.close()
+
+    metrics = hub.metrics()
+    print(f"Подписчиков: {args.subscribers}, изменений: {args.updates}")
+    print(f"naive   {naive_ms:9.2f} мс на изменение")
+    print(f"fanout  {fanout_ms:9.2f} мс на изменение ({naive_ms / fanout_ms:.0f}x), "
+          f"закодировано кадров: {metrics['encoded']}")
+    print(f"Непрочитанные очереди: не больше {max(len(s.queue) for s in idle)} кадров "
+          f"(лимит {hub.queue_limit}), отброшено {metrics['dropped']}")
+
+    # Подписчики в потоках: публикует фоновый поток рассылки
+    hub.start()
+    latencies = []
+    latencies_lock = threading.Lock()
+    published = {}
+    done = threading.Barrier(args.threads + 1)
+
+    def reader(subscription):
+        received = 0
+        while received < args.updates:
+            frame = subscription.get(5.0)
+            if frame is None:
+                break
+            if frame.version in published:
+                with latencies_lock:
+                    latencies.append(time.perf_counter() - published[frame.version])
+                received += 1
+        subscription.close()
+        done.wait()
+
+    subscriptions = [hub.subscribe(game_id) for _ in range(args.threads)]
+    for subscription in subscriptions:
+        threading.Thread(target=reader, args=(subscription,), daemon=True).start()
+    time.sleep(0.2)
+    for _ in range(args.updates):
+        with room.lock:
+            change_state()
+            published[room.state_version] = time.perf_counter()
+        hub.mark_dirty(game_id)
+        time.sleep(0.02)
+    done.wait(timeout=30)
+    if latencies:
+        print(f"Потоков-подписчиков: {args.threads}, задержка доставки "
+              f"p50 {percentile(latencies, 0.5) * 1000:.2f} мс, p99 {percentile(latencies, 0.99) * 1000:.2f} мс")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+📒 БЕНЧМАРК ЖУРНАЛА СДЕЛОК
+
+Описание: Стоимость записи сделки и чтения истории
+- Запись: время одной сделки (кольцевой режим и рост массивов)
+- Раунды: время раунда app.py с журналом и без записи в журнал
+- Чтение: страница истории игры и игрока, пока писатель пишет под
+  блокировкой комнаты; писатель не ждет читателей
+
+Запуск:
+    python benchmarks/bench_ledger.py --appends 1000000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Игры бенчмарка не восстанавливаются из снимка и не попадают в него
+os.environ.setdefault('GOLAN_SNAPSHOT', '0')
+
+import app
+from ledger import TransactionLedger
+from arbitration import percentile
+
+def time_appends(ledger, appends, players):
+    started = time.perf_counter()
+    for i in range(appends):
+        ledger.append(i // 10, i % players, i % 8, 100000 + i, 1000.0, 0.0)
+    return (time.perf_counter() - started) * 1e9 / appends
+
+def time_rounds(rounds, record):
+    """Раунды до конца игр; record=False - сделки не пишутся в журнал"""
+    random.seed(1)
+    room = app.GameRoom('bench-ledger')
+    app.create_initial_data(room)
+    if not record:
+        room.ledger.append = lambda *args, **kwargs: None
+    played = 0
+    started = time.perf_counter()
+    while played < rounds:
+        app.auction_engine.start_new_game(room, 'bench')
+        if not record:
+            room.ledger.append = lambda *args, **kwargs: None
+        while played < rounds:
+            played += 1
+            if app.auction_engine.conduct_dutch_auction_round(room).get('game_over') is not False:
+                break
+    return (time.perf_counter() - started) * 1e6 / played
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк журнала сделок")
+    parser.add_argument("--appends", type=int, default=1000000)
+    parser.add_argument("--capacity", type=int, default=app.LEDGER_CAPACITY)
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4, help="Потоков-читателей истории")
+    args = parser.parse_args()
+
+    ring_ns = time_appends(TransactionLedger(args.capacity, ring=True), args.appends, 100)
+    grow_ns = time_appends(TransactionLedger(args.capacity, ring=False), args.appends, 100)
+    print(f"Запись сделки: кольцо {ring_ns:.0f} нс, рост массивов {grow_ns:.0f} нс")
+
+    plain_us = time_rounds(args.rounds, record=False)
+    ledger_us = time_rounds(args.rounds, record=True)
+    print(f"Раунд app.py: без журнала {plain_us:.1f} мкс, с журналом {ledger_us:.1f} мкс")
+
+    # Писатель под блокировкой комнаты и читатели без блокировки
+    room = app.GameRoom('bench-ledger-read')
+    room.ledger = TransactionLedger(args.capacity, ring=True)
+    stop = threading.Event()
+    reads = []
+    reads_lock = threading.Lock()
+
+    def reader(index):
+        latencies = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            entries, cursor = room.ledger.read(None, 50, None if index % 2 else index)
+            if cursor is not None:
+                room.ledger.read(cursor, 50, None if index % 2 else index)
+            latencies.append(time.perf_counter() - started)
+        with reads_lock:
+            reads.extend(latencies)
+
+    def write(count):
+        started = time.perf_counter()
+        for i in range(count):
+            with room.lock:
+                room.ledger.append(i // 10, i % 100, i % 8, 100000 + i, 1000.0)
+        return (time.perf_counter() - started) * 1e9 / count
+
+    alone_ns = write(args.appends // 10)
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    shared_ns = write(args.appends // 10)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    reads.sort()
+    print(f"Запись под блокировкой: {alone_ns:.0f} нс, с {args.readers} читателями {shared_ns:.0f} нс "
+          f"(читатели делят с писателем только GIL)")
+    print(f"Чтение двух страниц по 50: p50 {percentile(reads, 0.5) * 1e6:.1f} мкс, "
+          f"p99 {percentile(reads, 0.99) * 1e6:.1f} мкс, чтений {len(reads)}")
+
+if __name__ == "__main__":
+    main()
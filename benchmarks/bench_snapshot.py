@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+💾 БЕНЧМАРК СНИМКОВ СОСТОЯНИЯ
+
+Описание: Размер снимка, пауза комнат и время восстановления для больших комнат
+- Комнаты с заданным числом ИИ-игроков, в каждой сыграно несколько раундов
+- Снимок: размер, наибольшая и суммарная пауза комнат (копирование под
+  блокировкой), время кодирования и записи
+- Восстановление: чтение, декодирование и сборка комнат; состояние
+  сверяется с исходным (to_dict)
+- Для сравнения - JSON + gzip, как в архиве выгруженных игр
+
+Запуск:
+    python benchmarks/bench_snapshot.py --rooms 4 --players 10000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Игры бенчмарка не восстанавливаются из снимка и не попадают в него
+os.environ.setdefault('GOLAN_SNAPSHOT', '0')
+
+import app
+from archive import GameArchive
+from snapshot import SnapshotStore
+
+def build_room(game_id, players, rounds):
+    """Комната с заданным числом ИИ-игроков и сыгранными раундами"""
+    room = app.GameRoom(game_id)
+    room.strategy_mix = {'random': 2, 'reservation': 1, 'pacing': 1}
+    app.create_initial_data(room)
+    names = [p.name for p in room.products]
+    user = room.players[-1]
+    room.players = []
+    for i in range(players):
+        wants = random.choice(names)
+        no_wants = random.choice([n for n in names if n != wants])
+        room.players.append(app.Player(i + 1, f"Бот {i + 1}", random.randint(150000, 195000), wants, no_wants))
+    user.id = players + 1
+    room.players.append(user)
+    app.assign_room_strategies(room)
+    room.rebuild_preferences()
+    room.current_game = app.Game(room.game_id)
+    room.current_game.status = 'playing'
+    for _ in range(rounds):
+        app.auction_engine.conduct_dutch_auction_round(room)
+    return room
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк снимков состояния")
+    parser.add_argument("--rooms", type=int, default=4)
+    parser.add_argument("--players", type=int, default=10000, help="ИИ-игроков в комнате")
+    parser.add_argument("--rounds", type=int, default=20, help="Сыгранных раундов до снимка")
+    parser.add_argument("--runs", type=int, default=5, help="Повторов снимка и восстановления")
+    args = parser.parse_args()
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory(prefix='golan-snapshot-') as directory:
+        app.snapshot_store = SnapshotStore(os.path.join(directory, 'bench.snap'))
+        with app.rooms_lock:
+            app.rooms.clear()
+            for i in range(args.rooms):
+                room = build_room(f'bench{i}', args.players, args.rounds)
+                app.rooms[room.game_id] = room
+        expected = {game_id: room.to_dict() for game_id, room in app.rooms.items()}
+
+        snapshots = [app.take_snapshot(force=True) for _ in range(args.runs)]
+        best = min(snapshots, key=lambda stats: stats['pause_total_ms'])
+        print(f"Комнат: {args.rooms}, игроков в комнате: {args.players + 1}")
+        print(f"Снимок:     {best['bytes'] / 1024:8.1f} КБ (до сжатия {best['raw_bytes'] / 1024:.1f} КБ)")
+        print(f"Пауза:      {best['pause_max_ms']:8.2f} мс на комнату, {best['pause_total_ms']:.2f} мс всего")
+        print(f"Кодирование {best['encode_ms']:8.2f} мс, запись {best['write_ms']:.2f} мс")
+
+        restore_ms = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            restored = [app.GameRoom.from_image(image) for image in app.snapshot_store.load()]
+            restore_ms.append((time.perf_counter() - started) * 1000)
+        same = all(room.to_dict() == expected[room.game_id] for room in restored)
+        print(f"Восстановление: {min(restore_ms):8.2f} мс, состояние совпадает: {'да' if same else 'НЕТ'}")
+
+        archive = GameArchive(os.path.join(directory, 'archive'))
+        started = time.perf_counter()
+        json_size = sum(archive.save(game_id, data) for game_id, data in expected.items())
+        json_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        for game_id in expected:
+            app.GameRoom.from_dict(archive.load(game_id))
+        json_load_ms = (time.perf_counter() - started) * 1000
+        print(f"JSON + gzip: {json_size / 1024:8.1f} КБ, запись {json_ms:.2f} мс, "
+              f"восстановление {json_load_ms:.2f} мс")
+    sys.exit(0 if same else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+⏱️ БЕНЧМАРК ЗАПУСКА СЕРВЕРА
+
+Описание: Замеряет время от запуска процесса app.py до ответа /healthz
+Режимы:
+- cold: байткод проекта удален и не сохраняется (python -B), каждый запуск
+  компилирует app.py заново
+- warm: байткод уже лежит в __pycache__
+
+Запуск:
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+
+def find_free_port():
+    """Возвращает свободный локальный порт"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_once(cold, timeout=30.0):
+    """
+    Запускает app.py и ждет ответа /healthz
+
+    Returns:
+        dict: Время до готовности и замеры запуска из /healthz (мс)
+    """
+    if cold:
+        shutil.rmtree(os.path.join(BASE_DIR, "__pycache__"), ignore_errors=True)
+    port = find_free_port()
+    command = [sys.executable] + (["-B"] if cold else []) + [
+        APP_PATH, "--production", "--host", "127.0.0.1", "--port", str(port)
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BASE_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            try:
+                url = f"http://127.0.0.1:{port}/healthz"
+                with urllib.request.urlopen(url, timeout=1.0) as response:
+                    health = json.loads(response.read().decode("utf-8"))
+                    result = {"ready_ms": (time.perf_counter() - started) * 1000}
+                    result.update(health.get("startup", {}))
+                    return result
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("Сервер не ответил за отведенное время")
+    finally:
+        process.terminate()
+        process.wait()
+
+def report(name, results):
+    """Печатает медиану и минимум каждого замера"""
+    print(f"\n{name} ({len(results)} запусков)")
+    for key in results[0]:
+        values = [r[key] for r in results if key in r]
+        print(f"   {key:<24} медиана {statistics.median(values):8.1f} мс   минимум {min(values):8.1f} мс")
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк запуска сервера")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report("🧊 Холодный запуск", [measure_once(cold=True) for _ in range(args.runs)])
+
+    measure_once(cold=False)  # Прогрев: сохраняем байткод
+    report("🔥 Теплый запуск", [measure_once(cold=False) for _ in range(args.runs)])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+🤖 БЕНЧМАРК СТРАТЕГИЙ ИИ-ПОКУПАТЕЛЕЙ
+
+Описание: Время одного шага цены для большой комнаты
+- legacy: исходный перебор игроков с get_preference_multiplier на каждого
+- остальные строки: пакетная оценка всей группы стратегией (auction_core/strategies.py)
+- scan/index: полный раунд (все шаги цены до покупки) перебором игроков
+  и через индекс цен резервирования (auction_core/matching.py)
+
+Запуск:
+    python benchmarks/bench_strategies.py --players 10000 --ticks 200
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Игры бенчмарка не восстанавливаются из снимка и не попадают в него
+os.environ.setdefault('GOLAN_SNAPSHOT', '0')
+
+import app
+from auction_core import available_strategies, MATCHING_SCAN, MATCHING_INDEX
+
+def build_room(players, strategy):
+    """Комната с заданным числом ИИ-игроков одной стратегии"""
+    room = app.GameRoom("bench")
+    room.strategy_mix = {strategy: 1.0}
+    app.create_initial_data(room)
+    names = [p.name for p in room.products]
+    room.players = []
+    for i in range(players):
+        wants = random.choice(names)
+        no_wants = random.choice([n for n in names if n != wants])
+        player = app.Player(i + 1, f"Бот {i + 1}", random.randint(150000, 195000), wants, no_wants)
+        player.strategy = strategy
+        room.players.append(player)
+    room.rebuild_preferences()
+    return room
+
+def legacy_find_first_buyer(room, product):
+    """Исходная реализация: строковые сравнения и вызовы методов на каждого игрока"""
+    active_players = [p for p in room.players if p.balance > 0]
+    candidates = []
+    for player in active_players:
+        if player.can_buy(product.current_price):
+            probability = player.get_preference_multiplier(product.name) * random.uniform(0.1, 1.0)
+            candidates.append((player, probability))
+    if not candidates:
+        return None
+    candidates.sort(key=lambda x: x[1], reverse=True)
+    top_players = candidates[:3]
+    if random.random() < 0.7:
+        return top_players[0][0]
+    return random.choice(top_players)[0]
+
+def measure(room, ticks, find):
+    """Среднее время шага (мс) по ticks шагам с понижением цены"""
+    engine = app.auction_engine
+    started = time.perf_counter()
+    for tick in range(ticks):
+        product = room.products[tick % len(room.products)]
+        product.current_price = int(product.initial_price * (1.0 - 0.05 * (tick % 14)))
+        find(engine, room, product)
+    return (time.perf_counter() - started) * 1000 / ticks
+
+def measure_rounds(room, rounds, mode):
+    """Среднее время раунда (мс): цена падает до покупки, затем продажа"""
+    engine = app.auction_engine
+    room.matching_mode = mode
+    started = time.perf_counter()
+    for tick in range(rounds):
+        product = room.products[tick % len(room.products)]
+        product.current_price = product.initial_price
+        if mode == MATCHING_INDEX:
+            winner = engine._match_by_index(room, product, 20)
+        else:
+            winner = engine._run_price_clock(room, product, 20)
+        if winner:
+            winner.buy_product(product, product.current_price)
+            room.on_purchase(winner)
+    return (time.perf_counter() - started) * 1000 / rounds
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк стратегий ИИ")
+    parser.add_argument("--players", type=int, default=10000, help="Игроков в комнате")
+    parser.add_argument("--ticks", type=int, default=200, help="Шагов цены")
+    args = parser.parse_args()
+
+    random.seed(1)
+    print(f"Игроков: {args.players}, шагов: {args.ticks}")
+    room = build_room(args.players, "random")
+    legacy = measure(room, args.ticks, lambda engine, r, p: legacy_find_first_buyer(r, p))
+    print(f"{'legacy':12} {legacy:8.2f} мс/шаг")
+    for name in available_strategies():
+        room = build_room(args.players, name)
+        ms = measure(room, args.ticks, lambda engine, r, p: engine._find_first_buyer(r, p))
+        print(f"{name:12} {ms:8.2f} мс/шаг")
+
+    print("Раунд до покупки, стратегия reservation:")
+    for mode in (MATCHING_SCAN, MATCHING_INDEX):
+        random.seed(1)
+        room = build_room(args.players, "reservation")
+        extra = ""
+        if mode == MATCHING_INDEX:
+            started = time.perf_counter()
+            room.get_reservation_index()
+            extra = f" (построение индекса {(time.perf_counter() - started) * 1000:.1f} мс)"
+        ms = measure_rounds(room, args.ticks, mode)
+        print(f"{mode:12} {ms:8.3f} мс/раунд{extra}")
+
+if __name__ == "__main__":
+    main()
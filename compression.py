@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+🗜️ СЖАТИЕ ОТВЕТОВ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Выбор кодировки по Accept-Encoding и сжатие gzip/brotli
+Особенности:
+- brotli используется, только если установлен пакет brotli
+- gzip без метки времени: одинаковые данные дают одинаковые байты
+- Сжатие ответов API на лету с настраиваемым уровнем и порогом размера
+"""
+
+import gzip
+import zlib
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+# Кодировки в порядке предпочтения сервера
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+def parse_accept_encoding(header):
+    """
+    Разбирает заголовок Accept-Encoding
+
+    Returns:
+        dict: кодировка -> вес q (0.0 означает "запрещено")
+    """
+    weights = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    return weights
+
+def negotiate_encoding(header, available=SUPPORTED_ENCODINGS):
+    """
+    Выбирает кодировку ответа
+
+    Args:
+        header: Значение Accept-Encoding запроса
+        available: Кодировки, которые есть у сервера, в порядке предпочтения
+
+    Returns:
+        str | None: Выбранная кодировка или None (отдать без сжатия)
+    """
+    weights = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress_gzip(data, level=9):
+    """Сжимает данные gzip (без метки времени)"""
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+def compress_brotli(data, quality=11):
+    """Сжимает данные brotli или возвращает None, если brotli не установлен"""
+    if brotli is None:
+        return None
+    return brotli.compress(data, quality=quality)
+
+class ResponseCompressor:
+    """
+    Сжатие ответов на лету
+
+    Для gzip и deflate заранее создается "шаблон" компрессора, и каждый
+    ответ сжимается его копией (deflateCopy) - это дешевле полной
+    инициализации нового компрессора на каждый запрос.
+
+    Args:
+        level: Уровень gzip/deflate (1 - быстро, 9 - сильно)
+        brotli_quality: Качество brotli (0-11; 4-5 - хороший баланс для API)
+        min_size: Ответы меньше этого размера (байт) не сжимаются
+    """
+
+    def __init__(self, level=6, brotli_quality=4, min_size=1024):
+        self.min_size = min_size
+        self.brotli_quality = brotli_quality
+        self.encodings = SUPPORTED_ENCODINGS + ('deflate',)
+        self._lock = threading.Lock()
+        self.set_level(level)
+
+    def set_level(self, level):
+        """Меняет уровень сжатия gzip/deflate (можно на лету)"""
+        templates = {
+            # wbits=31 - формат gzip, wbits=15 - формат zlib (HTTP deflate)
+            'gzip': zlib.compressobj(level, zlib.DEFLATED, 31),
+            'deflate': zlib.compressobj(level, zlib.DEFLATED, 15),
+        }
+        with self._lock:
+            self.level = level
+            self._templates = templates
+
+    def should_compress(self, size):
+        """Проверяет, стоит ли сжимать тело такого размера"""
+        return size >= self.min_size
+
+    def compress(self, data, encoding):
+        """
+        Сжимает данные в указанной кодировке
+
+        Returns:
+            bytes: Сжатые данные
+        """
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        with self._lock:
+            compressor = self._templates[encoding].copy()
+        return compressor.compress(data) + compressor.flush()
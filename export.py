@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+📤 ВЫГРУЗКА РЕЗУЛЬТАТОВ ИГРЫ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Выгрузка игроков, сделок и лотов игры в CSV или Parquet
+для хранилища аналитики
+Особенности:
+- Выгрузка - генератор частей ответа: строки читаются и кодируются
+  пачками, весь набор данных в памяти не собирается
+- Сделки и лоты (проданные и непроданные) читаются из журналов игры
+  без блокировки комнаты (ColumnJournal.scan); кольцевой журнал
+  копируется под блокировкой, чтобы писатель не перезаписал строки,
+  которые выгрузка еще не прочитала
+- Если кольцевой журнал уже перезаписал начало игры, выгрузка
+  отказывает (ExportIncomplete) - неполный файл только по явному
+  запросу partial, с заголовками X-Export-Complete и X-Export-First-Seq
+- Parquet - только если установлен pyarrow (группа строк на пачку)
+- Консольная выгрузка с работающего сервера:
+  python export.py --dataset sales --format parquet -o sales.parquet
+"""
+
+import io
+import os
+import csv
+import sys
+import argparse
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:  # pyarrow - необязательная зависимость
+    pyarrow = None
+
+# Строк в пачке CSV и в группе строк Parquet
+CSV_BATCH_ROWS = 1024
+PARQUET_BATCH_ROWS = 65536
+
+# Наборы данных: столбцы и их типы (типы pyarrow для Parquet)
+EXPORT_DATASETS = {
+    'players': (
+        ('id', 'int64'), ('name', 'string'), ('strategy', 'string'), ('is_user', 'bool_'),
+        ('initial_balance', 'int64'), ('balance', 'int64'), ('total_profit', 'float64'),
+        ('purchases', 'int64'), ('sales', 'int64')
+    ),
+    'sales': (
+        ('seq', 'int64'), ('round', 'int64'), ('at', 'float64'), ('player_id', 'int64'),
+        ('player', 'string'), ('product_id', 'int64'), ('product', 'string'),
+        ('price', 'int64'), ('profit', 'float64')
+    ),
+    'lots': (
+        ('seq', 'int64'), ('round', 'int64'), ('at', 'float64'), ('product_id', 'int64'),
+        ('product', 'string'), ('start_price', 'int64'), ('floor_price', 'int64'),
+        ('price', 'int64'), ('drops', 'int64'), ('sold', 'bool_'),
+        ('winner_id', 'int64'), ('winner', 'string')
+    ),
+}
+
+# Форматы: тип содержимого и расширение файла
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+class ExportError(ValueError):
+    """Неизвестный набор данных или формат, либо формат недоступен"""
+
+class ExportIncomplete(ExportError):
+    """Кольцевой журнал уже перезаписал начало игры - выгрузка была бы неполной"""
+
+class GameExport:
+    """
+    Подготовленная выгрузка
+
+    Атрибуты:
+    - content_type / extension: Тип содержимого и расширение файла
+    - chunks: Генератор частей bytes
+    - complete: Содержит ли выгрузка все строки игры
+    - first_seq: Номер первой строки журнала (None - набор не из журнала)
+    """
+
+    __slots__ = ('content_type', 'extension', 'chunks', 'complete', 'first_seq')
+
+    def __init__(self, content_type, extension, chunks, complete=True, first_seq=None):
+        self.content_type = content_type
+        self.extension = extension
+        self.chunks = chunks
+        self.complete = complete
+        self.first_seq = first_seq
+
+    def headers(self, game_id, dataset):
+        """Заголовки ответа: тип, имя файла и полнота выгрузки"""
+        headers = [
+            ('Content-Type', self.content_type),
+            ('Content-Disposition', f'attachment; filename="golan-{game_id}-{dataset}.{self.extension}"'),
+            ('Cache-Control', 'no-store'),
+            ('X-Export-Complete', 'true' if self.complete else 'false'),
+        ]
+        if self.first_seq is not None:
+            headers.append(('X-Export-First-Seq', str(self.first_seq)))
+        return headers
+
+# ============================================================================
+# СТРОКИ НАБОРОВ ДАННЫХ
+# ============================================================================
+
+def iter_players(rows):
+    """Игроки (скопированы под блокировкой комнаты - их немного)"""
+    yield from rows
+
+def iter_sales(ledger, stop, players, products):
+    """Сделки журнала от старых к новым"""
+    for row in ledger.scan(stop=stop):
+        yield (row['seq'], row['round'], row['at'], row['player_id'], players.get(row['player_id']),
+               row['product_id'], products.get(row['product_id']), row['price'], row['profit'])
+
+def iter_lots(lots, stop, players, products):
+    """Исходы лотов от старых к новым, включая непроданные"""
+    for row in lots.scan(stop=stop):
+        winner_id = row['winner_id'] if row['winner_id'] >= 0 else None
+        yield (row['seq'], row['round'], row['at'], row['product_id'], products.get(row['product_id']),
+               row['start_price'], row['floor_price'], row['price'], row['drops'], winner_id is not None,
+               winner_id, players.get(winner_id))
+
+def open_dataset(room, dataset):
+    """
+    Строки набора данных (вызывается под блокировкой комнаты)
+
+    Игроки копируются сразу; журналы фиксируются (ColumnJournal.frozen)
+    и читаются потом без блокировки.
+
+    Returns:
+        tuple: (генератор строк, все ли строки игры, номер первой строки или None)
+    """
+    players = {p.id: p.name for p in room.players}
+    if dataset == 'players':
+        rows = [(p.id, p.name, p.strategy, bool(p.is_user), p.initial_balance, p.balance,
+                 float(p.total_profit), p.purchases, p.sales) for p in room.players]
+        return iter_players(rows), True, None
+    products = {p.id: p.name for p in room.products}
+    journal = room.ledger if dataset == 'sales' else room.lots
+    complete, first_seq = journal.complete, journal.oldest
+    journal, stop = journal.frozen()
+    rows_of = iter_sales if dataset == 'sales' else iter_lots
+    return rows_of(journal, stop, players, products), complete, first_seq
+
+# ============================================================================
+# КОДИРОВАНИЕ
+# ============================================================================
+
+def iter_csv(columns, rows, batch_rows=CSV_BATCH_ROWS):
+    """CSV частями по batch_rows строк (UTF-8, заголовок - имена столбцов)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow([name for name, _ in columns])
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= batch_rows:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode('utf-8')
+
+class ChunkSink(io.RawIOBase):
+    """Файл для ParquetWriter, записанные байты забираются частями (drain)"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def iter_parquet(columns, rows, batch_rows=PARQUET_BATCH_ROWS):
+    """Parquet частями: группа строк на пачку, подвал файла - последней частью"""
+    schema = pyarrow.schema([(name, getattr(pyarrow, kind)()) for name, kind in columns])
+    sink = ChunkSink()
+    writer = parquet.ParquetWriter(sink, schema)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            writer.write_table(parquet_table(schema, batch))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_table(parquet_table(schema, batch))
+    writer.close()
+    yield sink.drain()
+
+def parquet_table(schema, batch):
+    """Таблица pyarrow из пачки строк-кортежей"""
+    arrays = [pyarrow.array(list(values), type=field.type) for values, field in zip(zip(*batch), schema)]
+    return pyarrow.Table.from_arrays(arrays, schema=schema)
+
+def export_game(room, dataset, fmt, partial=False):
+    """
+    Выгрузка набора данных игры
+
+    Ошибки проверяются сразу, до первой части: ответ с ошибкой
+    не превращается в оборванный файл.
+
+    Args:
+        dataset: players, sales или lots
+        fmt: csv или parquet
+        partial: Выгружать, даже если кольцевой журнал уже перезаписал
+            начало игры (только хранящиеся строки)
+
+    Returns:
+        GameExport: Тип содержимого, расширение, генератор частей и полнота
+
+    Raises:
+        ExportError: Неизвестный набор данных или формат, нет pyarrow
+        ExportIncomplete: Журнал хранит не все строки игры, а partial не задан
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ExportError(f'Неизвестный набор данных: {dataset} (есть: {", ".join(EXPORT_DATASETS)})')
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f'Неизвестный формат: {fmt} (есть: {", ".join(EXPORT_FORMATS)})')
+    if fmt == 'parquet' and pyarrow is None:
+        raise ExportError('Parquet недоступен: не установлен pyarrow')
+
+    with room.lock:
+        rows, complete, first_seq = open_dataset(room, dataset)
+    if not complete and not partial:
+        rows.close()
+        raise ExportIncomplete(
+            f'Журнал хранит строки с номера {first_seq}: начало игры уже перезаписано '
+            f'(GOLAN_LEDGER_RING=0 хранит всю игру). Неполная выгрузка - partial=1')
+
+    columns = EXPORT_DATASETS[dataset]
+    chunks = iter_parquet(columns, rows) if fmt == 'parquet' else iter_csv(columns, rows)
+    content_type, extension = EXPORT_FORMATS[fmt]
+    return GameExport(content_type, extension, chunks, complete, first_seq)
+
+# ============================================================================
+# КОНСОЛЬНАЯ ВЫГРУЗКА
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Выгрузка результатов игры Golan в CSV или Parquet")
+    parser.add_argument("--url", default="http://localhost:5000", help="Адрес сервера")
+    parser.add_argument("--game", help="ID игры (по умолчанию - игра по умолчанию)")
+    parser.add_argument("--dataset", choices=list(EXPORT_DATASETS), default="sales")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--partial", action="store_true",
+                        help="Выгрузить хранящиеся строки, даже если журнал перезаписал начало игры")
+    parser.add_argument("-o", "--output", help="Файл (по умолчанию golan-<игра>-<набор>.<формат>, '-' - stdout)")
+    args = parser.parse_args()
+
+    from golan_client import GolanClient, ApiError
+    output = args.output or f"golan-{args.game or 'default'}-{args.dataset}.{EXPORT_FORMATS[args.format][1]}"
+    client = GolanClient(args.url, game_id=args.game, timeout=60.0)
+    try:
+        if output == '-':
+            written = client.export(args.dataset, args.format, sys.stdout.buffer, args.partial)
+        else:
+            with open(output, 'wb') as target:
+                written = client.export(args.dataset, args.format, target, args.partial)
+    except ApiError as e:
+        if output != '-' and os.path.exists(output):
+            os.remove(output)
+        print(f"Ошибка выгрузки: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        client.close()
+    if output != '-':
+        print(f"{output}: {written:,} байт")
+
+if __name__ == "__main__":
+    main()
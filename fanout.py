@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+📡 РАССЫЛКА СОСТОЯНИЯ ИГР GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Публикация/подписка по играм - состояние кодируется один раз
+на изменение, подписчики получают одни и те же байты
+Особенности:
+- Изменения только отмечаются (mark_dirty); кодирует фоновый поток,
+  несколько изменений подряд склеиваются в один кадр
+- Кадр хранит JSON, готовое событие SSE и сжатые варианты (по запросу)
+- У каждого подписчика своя ограниченная очередь; если подписчик не
+  успевает, непрочитанные кадры отбрасываются и остается последний
+  (каждый кадр - полное состояние, промежуточные не нужны)
+- Кадр без подписчиков не кодируется заранее: его закодирует первый
+  запрос, и он же достанется следующим
+"""
+
+import json
+import time
+import threading
+from collections import deque
+
+class Frame:
+    """
+    Закодированное состояние игры одной версии
+
+    Атрибуты:
+    - version: Версия состояния комнаты
+    - payload: JSON (байты)
+    - sse: Событие Server-Sent Events с этим JSON (байты)
+    """
+
+    def __init__(self, version, state):
+        self.version = version
+        self.payload = json.dumps(state, ensure_ascii=False, default=str).encode('utf-8')
+        self.sse = b'id: %d\nevent: state\ndata: %s\n\n' % (version, self.payload)
+        self._encoded = {}
+
+    def encoded(self, encoding, compress):
+        """JSON, сжатый encoding (compress вызывается один раз на кадр и кодировку)"""
+        if not encoding:
+            return self.payload
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(self.payload, encoding)
+        return body
+
+class Subscription:
+    """
+    Подписчик одной игры с ограниченной очередью кадров
+
+    Атрибуты:
+    - dropped: Сколько кадров отброшено, пока подписчик не успевал
+    - closed: Подписка закрыта (игру выгрузили или подписчик ушел)
+    """
+
+    def __init__(self, hub, limit):
+        self.hub = hub
+        self.limit = limit
+        self.queue = deque()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, frame):
+        """Кладет кадр в очередь (вызывается под блокировкой рассылки)"""
+        if len(self.queue) >= self.limit:
+            # Медленный подписчик: старые кадры не нужны, оставляем последний
+            self.dropped += len(self.queue)
+            self.hub.dropped += len(self.queue)
+            self.queue.clear()
+        self.queue.append(frame)
+
+    def get(self, timeout):
+        """
+        Следующий кадр
+
+        Returns:
+            Frame | None: Кадр или None по таймауту / после закрытия
+        """
+        with self.hub.changed:
+            if not self.queue and not self.closed:
+                self.hub.changed.wait(timeout)
+            return self.queue.popleft() if self.queue else None
+
+    def close(self):
+        """Отписывается от игры"""
+        self.hub.unsubscribe(self)
+
+class StateHub:
+    """
+    Рассылка одной игры
+
+    Атрибуты:
+    - latest: Последний кадр (Frame) или None
+    - subscribers: Подписчики потока
+    - waiters: Сколько запросов ждут кадр без подписки (long-poll)
+    - changed: Условие, срабатывает при новом кадре
+    """
+
+    def __init__(self, game_id, queue_limit):
+        self.game_id = game_id
+        self.queue_limit = queue_limit
+        self.latest = None
+        self.subscribers = set()
+        self.waiters = 0
+        self.changed = threading.Condition()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def listening(self):
+        return bool(self.subscribers or self.waiters)
+
+    def subscribe(self):
+        """Новый подписчик; последний кадр (если есть) сразу в его очереди"""
+        subscription = Subscription(self, self.queue_limit)
+        with self.changed:
+            if self.latest is not None:
+                subscription.push(self.latest)
+            self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.changed:
+            self.subscribers.discard(subscription)
+            subscription.closed = True
+
+    def publish(self, frame):
+        """
+        Делает кадр последним и кладет его всем подписчикам
+
+        Returns:
+            Frame: Последний кадр (переданный или более новый, если он уже есть)
+        """
+        with self.changed:
+            if self.latest is not None and frame.version <= self.latest.version:
+                return self.latest
+            self.latest = frame
+            self.published += 1
+            for subscription in self.subscribers:
+                subscription.push(frame)
+            self.delivered += len(self.subscribers)
+            self.changed.notify_all()
+        return frame
+
+    def wait_newer(self, version, timeout):
+        """
+        Ждет кадр с версией, отличной от version (long-poll)
+
+        Returns:
+            Frame | None: Кадр или None по таймауту
+        """
+        deadline = time.monotonic() + timeout
+        with self.changed:
+            self.waiters += 1
+            try:
+                while self.latest is None or self.latest.version == version:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self.game_id is None:
+                        return None
+                    self.changed.wait(remaining)
+                return self.latest
+            finally:
+                self.waiters -= 1
+
+    def close(self):
+        """Закрывает всех подписчиков (игру выгрузили из памяти)"""
+        with self.changed:
+            for subscription in self.subscribers:
+                subscription.closed = True
+            self.subscribers.clear()
+            self.game_id = None
+            self.changed.notify_all()
+
+class FanoutHub:
+    """
+    Рассылки всех игр и фоновый поток кодирования
+
+    Args:
+        load_state: load_state(game_id) -> (версия, состояние) - снимается
+            под блокировкой комнаты
+        get_version: get_version(game_id) -> текущая версия состояния
+        queue_limit: Емкость очереди подписчика (кадров)
+    """
+
+    def __init__(self, load_state, get_version, queue_limit=8):
+        self.load_state = load_state
+        self.get_version = get_version
+        self.queue_limit = queue_limit
+        self.hubs = {}
+        self.encoded = 0
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def hub(self, game_id):
+        """Рассылка игры (создается при первом обращении)"""
+        with self._lock:
+            hub = self.hubs.get(game_id)
+            if hub is None:
+                hub = self.hubs[game_id] = StateHub(game_id, self.queue_limit)
+            return hub
+
+    def discard(self, game_id):
+        """Удаляет рассылку выгруженной игры; подписчики переподпишутся"""
+        with self._lock:
+            hub = self.hubs.pop(game_id, None)
+            self._dirty.discard(game_id)
+        if hub is not None:
+            hub.close()
+
+    def mark_dirty(self, game_id, *_):
+        """
+        Отмечает изменение состояния игры (подходит как app.add_state_listener)
+        Кадр кодируется фоновым потоком, только если игру кто-то слушает
+        """
+        hub = self.hubs.get(game_id)
+        if hub is not None and hub.listening:
+            with self._lock:
+                self._dirty.add(game_id)
+            self._wakeup.set()
+
+    def encode(self, game_id):
+        """Снимает и кодирует состояние игры, публикует кадр"""
+        version, state = self.load_state(game_id)
+        self.encoded += 1
+        return self.hub(game_id).publish(Frame(version, state))
+
+    def current_frame(self, game_id):
+        """
+        Кадр текущей версии состояния: готовый или закодированный сейчас
+        (им же воспользуются подписчики и следующие запросы)
+        """
+        latest = self.hub(game_id).latest
+        if latest is not None and latest.version == self.get_version(game_id):
+            return latest
+        return self.encode(game_id)
+
+    def subscribe(self, game_id):
+        """Подписка на поток игры (первый кадр - текущее состояние)"""
+        hub = self.hub(game_id)
+        subscription = hub.subscribe()
+        if not subscription.queue:
+            self.mark_dirty(game_id)
+        return subscription
+
+    def wait_newer(self, game_id, version, timeout):
+        """Кадр новее version или None по таймауту (long-poll)"""
+        frame = self.current_frame(game_id)
+        if frame.version != version:
+            return frame
+        return self.hub(game_id).wait_newer(version, timeout)
+
+    def start(self):
+        """Запускает фоновый поток кодирования (один раз)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='golan-fanout', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            for game_id in dirty:
+                try:
+                    self.encode(game_id)
+                except Exception as e:
+                    print(f"Ошибка рассылки состояния игры {game_id}: {e}")
+
+    def metrics(self):
+        """Рассылки, подписчики, закодированные и отброшенные кадры"""
+        with self._lock:
+            hubs = list(self.hubs.values())
+        return {
+            'games': len(hubs),
+            'subscribers': sum(len(hub.subscribers) for hub in hubs),
+            'waiters': sum(hub.waiters for hub in hubs),
+            'encoded': self.encoded,
+            'published': sum(hub.published for hub in hubs),
+            'delivered': sum(hub.delivered for hub in hubs),
+            'dropped': sum(hub.dropped for hub in hubs),
+            'queue_limit': self.queue_limit
+        }
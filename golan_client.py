@@ -0,0 +1,613 @@
+# -*- coding: utf-8 -*-
+"""
+🔌 HTTP-КЛИЕНТ API ГОЛЛАНДСКОГО АУКЦИОНА GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Клиент API app.py для консольной версии, ботов и нагрузочных тестов
+Особенности:
+- Одно постоянное keep-alive соединение HTTP/1.1 на клиента
+- Конвейер запросов: несколько вызовов уходят одной записью в сокет,
+  ответы читаются по порядку без ожидания каждого
+- Покупки и раунды уходят с Idempotency-Key: повтор после обрыва
+  соединения безопасен
+- Поток состояния (SSE /api/game/stream) вместо опроса статуса
+- Выгрузка результатов игры (CSV/Parquet) частями прямо в файл
+- Задержка каждого вызова: p50/p95/p99/максимум по имени вызова
+- Только стандартная библиотека
+
+Пример:
+    client = GolanClient('http://localhost:5000')
+    client.start_game()
+    buy, status = client.pipeline([client.buy_call(1), client.status_call()])
+    print(client.latency.summary())
+"""
+
+import ssl
+import gzip
+import json
+import zlib
+import time
+import uuid
+import socket
+import threading
+from collections import deque
+from urllib.parse import urlsplit, urlencode
+
+STREAM_PATH = '/api/game/stream'
+
+class ApiError(Exception):
+    """Ошибка соединения или протокола при обращении к API"""
+
+class LatencyTracker:
+    """
+    Задержки вызовов по имени (последние window значений на имя)
+
+    Args:
+        window: Сколько последних задержек хранить для каждого вызова
+    """
+
+    def __init__(self, window=10000):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, latency_ms, ok=True):
+        """Добавляет задержку вызова (мс)"""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(latency_ms)
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if not ok:
+                self._errors[name] = self._errors.get(name, 0) + 1
+
+    def summary(self):
+        """
+        Сводка задержек
+
+        Returns:
+            dict: Имя вызова -> {count, errors, p50, p95, p99, max} (мс)
+        """
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+            counts = dict(self._counts)
+            errors = dict(self._errors)
+        result = {}
+        for name, samples in snapshot.items():
+            result[name] = {
+                'count': counts[name],
+                'errors': errors.get(name, 0),
+                'p50': round(percentile(samples, 50), 3),
+                'p95': round(percentile(samples, 95), 3),
+                'p99': round(percentile(samples, 99), 3),
+                'max': round(samples[-1], 3)
+            }
+        return result
+
+def percentile(samples, percent):
+    """Перцентиль отсортированного списка (ближайший ранг)"""
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1, int(round(percent / 100 * len(samples) + 0.5)) - 1))
+    return samples[rank]
+
+class ApiResponse:
+    """
+    Ответ API
+
+    Атрибуты:
+    - status: HTTP-статус
+    - headers: Заголовки (имена в нижнем регистре)
+    - body: Тело ответа (уже распакованное)
+    - latency_ms: Время от отправки запроса до конца ответа
+    """
+
+    def __init__(self, status, headers, body, latency_ms):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.latency_ms = latency_ms
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def json(self):
+        """Тело ответа как JSON (None, если тело пустое или не JSON)"""
+        try:
+            return json.loads(self.body.decode('utf-8'))
+        except ValueError:
+            return None
+
+class ApiCall:
+    """
+    Подготовленный вызов для GolanClient.pipeline()
+
+    Вызов действия (покупка, раунд) получает ключ идемпотентности: повтор
+    того же ApiCall после обрыва соединения сервер не выполнит второй раз.
+    """
+    __slots__ = ('method', 'path', 'payload', 'name', 'idempotency_key')
+
+    def __init__(self, method, path, payload=None, name=None, idempotent=False):
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.name = name or path.rsplit('/', 1)[-1]
+        self.idempotency_key = uuid.uuid4().hex if idempotent else None
+
+    @property
+    def replayable(self):
+        """Можно ли отправить вызов повторно: чтение или вызов с ключом идемпотентности"""
+        return self.method in ('GET', 'HEAD') or self.idempotency_key is not None
+
+class HttpConnection:
+    """
+    Одно HTTP/1.1-соединение с сервером
+
+    Args:
+        host: Хост
+        port: Порт
+        secure: HTTPS
+        timeout: Таймаут операций сокета (секунды, None - без таймаута)
+    """
+
+    def __init__(self, host, port, secure=False, timeout=10.0):
+        sock = socket.create_connection((host, port), timeout=timeout)
+        # Маленькие запросы конвейера не должны ждать алгоритма Нейгла
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        self.sock = sock
+        self.reader = sock.makefile('rb')
+        self.requests = 0  # Сколько запросов отправлено по соединению
+        self.closed = False
+
+    def send(self, data):
+        self.sock.sendall(data)
+
+    def read_head(self):
+        """
+        Читает строку статуса и заголовки
+
+        Returns:
+            tuple: (статус, заголовки); заголовки Set-Cookie собраны в список
+        """
+        line = self.reader.readline(65537)
+        if not line:
+            raise EOFError('Сервер закрыл соединение')
+        parts = line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise ApiError(f'Неверная строка статуса: {line!r}')
+        status = int(parts[1])
+        headers = {'set-cookie': []}
+        while True:
+            line = self.reader.readline(65537)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            value = value.strip()
+            if name == 'set-cookie':
+                headers['set-cookie'].append(value)
+            elif name in headers:
+                headers[name] += ', ' + value
+            else:
+                headers[name] = value
+        if parts[0] == 'HTTP/1.0' and headers.get('connection', '').lower() != 'keep-alive':
+            headers['connection'] = 'close'
+        return status, headers
+
+    def iter_body(self, headers, head_only=False):
+        """Тело ответа частями по мере поступления (chunked, Content-Length или до закрытия)"""
+        if head_only:
+            return
+        reader = self.reader
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                size_line = reader.readline(65537)
+                if not size_line:
+                    raise EOFError('Соединение закрыто посреди ответа')
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+                if size == 0:
+                    # Завершающие заголовки (trailers) пропускаем
+                    while reader.readline(65537) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                chunk = reader.read(size)
+                reader.readline(65537)
+                if len(chunk) < size:
+                    raise EOFError('Соединение закрыто посреди ответа')
+                yield chunk
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+            while remaining > 0:
+                chunk = reader.read1(min(remaining, 65536))
+                if not chunk:
+                    raise EOFError('Соединение закрыто посреди ответа')
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            # Тело без длины заканчивается закрытием соединения
+            headers['connection'] = 'close'
+            while True:
+                chunk = reader.read1(65536)
+                if not chunk:
+                    return
+                yield chunk
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                self.reader.close()
+                self.sock.close()
+            except OSError:
+                pass
+
+def decode_body(body, encoding):
+    """Распаковывает тело по Content-Encoding"""
+    encoding = (encoding or '').lower()
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+class GolanClient:
+    """
+    Клиент API голландского аукциона
+
+    Хранит cookie сессии (как браузер) и ID игры: все вызовы одного клиента
+    относятся к одной игре. Потокобезопасен: вызовы из разных потоков
+    выполняются по очереди на общем соединении.
+
+    Args:
+        base_url: Адрес сервера (http://host:port)
+        game_id: ID игры (None - игра по умолчанию или из cookie)
+        timeout: Таймаут операций сокета (секунды)
+        latency: LatencyTracker (общий для нескольких клиентов нагрузочного теста)
+    """
+
+    def __init__(self, base_url='http://localhost:5000', game_id=None, timeout=10.0, latency=None):
+        url = urlsplit(base_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f'Неподдерживаемая схема адреса: {base_url}')
+        self.secure = url.scheme == 'https'
+        self.host = url.hostname or 'localhost'
+        self.port = url.port or (443 if self.secure else 80)
+        self.host_header = url.netloc
+        self.game_id = game_id
+        self.timeout = timeout
+        self.latency = latency or LatencyTracker()
+        self.cookies = {}
+        self.connections_opened = 0
+        self._connection = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Соединение
+    # ------------------------------------------------------------------
+
+    def _connect(self, timeout):
+        self.connections_opened += 1
+        return HttpConnection(self.host, self.port, self.secure, timeout)
+
+    def close(self):
+        """Закрывает постоянное соединение"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _store_cookies(self, headers):
+        for header in headers.get('set-cookie', ()):
+            pair = header.split(';', 1)[0]
+            name, _, value = pair.partition('=')
+            name = name.strip()
+            attributes = header.lower()
+            if not value or 'max-age=0' in attributes or 'expires=thu, 01 jan 1970' in attributes:
+                self.cookies.pop(name, None)
+            else:
+                self.cookies[name] = value.strip()
+
+    def _encode_request(self, call, extra_headers=None):
+        path = call.path
+        if self.game_id and 'game=' not in path:
+            path += ('&' if '?' in path else '?') + urlencode({'game': self.game_id})
+        headers = [
+            f'{call.method} {path} HTTP/1.1',
+            f'Host: {self.host_header}',
+            'Connection: keep-alive',
+            'Accept: application/json',
+            'Accept-Encoding: gzip, deflate',
+            'User-Agent: golan-client/2.0'
+        ]
+        if self.cookies:
+            headers.append('Cookie: ' + '; '.join(f'{k}={v}' for k, v in self.cookies.items()))
+        if call.idempotency_key:
+            headers.append(f'Idempotency-Key: {call.idempotency_key}')
+        for name, value in (extra_headers or {}).items():
+            headers.append(f'{name}: {value}')
+        body = b''
+        if call.payload is not None:
+            body = json.dumps(call.payload, ensure_ascii=False).encode('utf-8')
+            headers.append('Content-Type: application/json')
+        if body or call.method in ('POST', 'PUT', 'PATCH'):
+            headers.append(f'Content-Length: {len(body)}')
+        return ('\r\n'.join(headers) + '\r\n\r\n').encode('utf-8') + body
+
+    # ------------------------------------------------------------------
+    # Вызовы
+    # ------------------------------------------------------------------
+
+    def pipeline(self, calls):
+        """
+        Выполняет вызовы конвейером по постоянному соединению
+
+        Все запросы отправляются одной записью в сокет, ответы читаются
+        по порядку. Если переиспользуемое соединение оказалось закрыто
+        сервером до первого ответа, вызовы повторяются один раз
+        на новом соединении - только когда все они повторяемы
+        (ApiCall.replayable). Вызов без ключа (start, join) сервер мог
+        уже выполнить, поэтому такой конвейер завершается ошибкой.
+
+        Args:
+            calls: Список ApiCall
+
+        Returns:
+            list: ApiResponse в порядке вызовов
+
+        Raises:
+            ApiError: Ошибка соединения или протокола
+        """
+        if not calls:
+            return []
+        with self._lock:
+            try:
+                try:
+                    return self._pipeline(calls)
+                except ConnectionError as error:
+                    if not getattr(error, 'retriable', False):
+                        raise
+                    return self._pipeline(calls)
+            except (EOFError, OSError, ValueError) as error:
+                raise ApiError(str(error)) from error
+
+    def _pipeline(self, calls):
+        connection = self._connection
+        reused = connection is not None and connection.requests > 0
+        if connection is None:
+            connection = self._connection = self._connect(self.timeout)
+
+        # Cookie ответов внутри конвейера не видны следующим запросам того же конвейера
+        data = b''.join(self._encode_request(call) for call in calls)
+        started = time.perf_counter()
+        responses = []
+        try:
+            connection.send(data)
+            connection.requests += len(calls)
+            for call in calls:
+                status, headers = connection.read_head()
+                body = b''.join(connection.iter_body(headers, call.method == 'HEAD' or status in (204, 304)))
+                latency_ms = (time.perf_counter() - started) * 1000
+                self._store_cookies(headers)
+                body = decode_body(body, headers.get('content-encoding'))
+                response = ApiResponse(status, headers, body, latency_ms)
+                self.latency.record(call.name, latency_ms, response.ok)
+                responses.append(response)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (EOFError, OSError) as error:
+            connection.close()
+            self._connection = None
+            for call in calls[len(responses):]:
+                self.latency.record(call.name, (time.perf_counter() - started) * 1000, False)
+            if reused and not responses and all(call.replayable for call in calls):
+                # Keep-alive соединение истекло на стороне сервера
+                retry = ConnectionError(str(error))
+                retry.retriable = True
+                raise retry from error
+            raise
+
+        if responses and responses[-1].headers.get('connection', '').lower() == 'close':
+            connection.close()
+            self._connection = None
+            if len(responses) < len(calls):
+                # Сервер не принимает конвейер: остальные вызовы - на новом соединении
+                responses.extend(self._pipeline(calls[len(responses):]))
+        return responses
+
+    def request(self, method, path, payload=None, name=None):
+        """Один вызов API; возвращает ApiResponse"""
+        return self.pipeline([ApiCall(method, path, payload, name)])[0]
+
+    def call(self, call):
+        """Выполняет подготовленный ApiCall и возвращает JSON ответа"""
+        return self._remember_game(self.pipeline([call])[0].json())
+
+    def _remember_game(self, data):
+        if isinstance(data, dict) and data.get('game_id'):
+            self.game_id = data['game_id']
+        return data
+
+    # Подготовленные вызовы (для pipeline)
+
+    def start_call(self):
+        return ApiCall('POST', '/api/game/start', {}, 'start')
+
+    def join_call(self, name=None):
+        return ApiCall('POST', '/api/game/join', {'name': name} if name else {}, 'join')
+
+    def set_name_call(self, name):
+        return ApiCall('POST', '/api/set-player-name', {'name': name}, 'set-name')
+
+    def status_call(self):
+        return ApiCall('GET', '/api/game/status', None, 'status')
+
+    def next_round_call(self):
+        return ApiCall('POST', '/api/game/next-round', {}, 'next-round', idempotent=True)
+
+    def buy_call(self, product_id):
+        return ApiCall('POST', '/api/user/buy', {'product_id': product_id}, 'buy', idempotent=True)
+
+    def user_data_call(self):
+        return ApiCall('GET', '/api/user/data', None, 'user-data')
+
+    def statistics_call(self):
+        return ApiCall('GET', '/api/game/statistics', None, 'statistics')
+
+    # Отдельные вызовы (возвращают JSON ответа)
+
+    def start_game(self):
+        """Начинает игру; ID игры и cookie сессии запоминаются клиентом"""
+        return self.call(self.start_call())
+
+    def join_game(self, name=None):
+        """Подключается к идущей игре комнаты client.game_id еще одним пользователем"""
+        return self.call(self.join_call(name))
+
+    def set_name(self, name):
+        return self.call(self.set_name_call(name))
+
+    def status(self):
+        return self.call(self.status_call())
+
+    def next_round(self):
+        return self.call(self.next_round_call())
+
+    def buy(self, product_id):
+        return self.call(self.buy_call(product_id))
+
+    def user_data(self):
+        return self.call(self.user_data_call())
+
+    def statistics(self):
+        return self.call(self.statistics_call())
+
+    # ------------------------------------------------------------------
+    # Поток состояния
+    # ------------------------------------------------------------------
+
+    def stream(self, timeout=60.0, stop=None):
+        """
+        Поток состояния игры (SSE) на отдельном соединении
+
+        Поток занимает соединение целиком, поэтому не мешает конвейеру
+        вызовов. Пинги сервера не выдаются, но продлевают таймаут.
+
+        Args:
+            timeout: Сколько ждать данных без пингов, прежде чем считать
+                соединение потерянным (сервер пингует раз в 15 секунд)
+            stop: threading.Event для остановки потока
+
+        Yields:
+            tuple: (событие, данные JSON, ID события)
+        """
+        connection = HttpConnection(self.host, self.port, self.secure, timeout)
+        try:
+            with self._lock:
+                request = self._encode_request(
+                    ApiCall('GET', STREAM_PATH, None, 'stream'),
+                    {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache'}
+                ).replace(b'Accept: application/json\r\n', b'')
+            started = time.perf_counter()
+            connection.send(request)
+            status, headers = connection.read_head()
+            self.latency.record('stream-open', (time.perf_counter() - started) * 1000, status == 200)
+            if status != 200:
+                raise ApiError(f'Поток недоступен: HTTP {status}')
+
+            buffer = b''
+            event, data, event_id = 'message', [], None
+            for chunk in connection.iter_body(headers):
+                if stop is not None and stop.is_set():
+                    return
+                buffer += chunk
+                while b'\n' in buffer:
+                    raw, buffer = buffer.split(b'\n', 1)
+                    line = raw.rstrip(b'\r').decode('utf-8')
+                    if not line:
+                        # Пустая строка завершает событие
+                        if data:
+                            try:
+                                payload = json.loads('\n'.join(data))
+                            except ValueError:
+                                payload = '\n'.join(data)
+                            yield event, payload, event_id
+                        event, data = 'message', []
+                    elif line.startswith(':'):
+                        continue
+                    else:
+                        field, _, value = line.partition(':')
+                        value = value[1:] if value.startswith(' ') else value
+                        if field == 'event':
+                            event = value
+                        elif field == 'data':
+                            data.append(value)
+                        elif field == 'id':
+                            event_id = value
+        except (EOFError, OSError) as error:
+            if stop is None or not stop.is_set():
+                raise ApiError(str(error)) from error
+        finally:
+            connection.close()
+
+    # ------------------------------------------------------------------
+    # Выгрузка
+    # ------------------------------------------------------------------
+
+    def export(self, dataset, fmt, target, partial=False):
+        """
+        Выгрузка результатов игры (/api/game/export) в файл частями
+
+        Args:
+            dataset: players, sales или lots
+            fmt: csv или parquet
+            target: Двоичный файл для записи
+            partial: Согласиться на неполную выгрузку, если журнал
+                перезаписал начало игры (иначе ApiError)
+
+        Returns:
+            int: Сколько байт записано
+        """
+        connection = HttpConnection(self.host, self.port, self.secure, self.timeout)
+        try:
+            query = {'dataset': dataset, 'format': fmt}
+            if partial:
+                query['partial'] = '1'
+            path = '/api/game/export?' + urlencode(query)
+            with self._lock:
+                request = self._encode_request(ApiCall('GET', path, None, 'export'))
+            started = time.perf_counter()
+            connection.send(request)
+            status, headers = connection.read_head()
+            if status != 200:
+                body = decode_body(b''.join(connection.iter_body(headers)), headers.get('content-encoding'))
+                try:
+                    message = json.loads(body).get('message')
+                except ValueError:
+                    message = None
+                raise ApiError(message or f'Выгрузка недоступна: HTTP {status}')
+            written = 0
+            for chunk in connection.iter_body(headers):
+                target.write(chunk)
+                written += len(chunk)
+            self.latency.record('export', (time.perf_counter() - started) * 1000)
+            return written
+        except (EOFError, OSError) as error:
+            raise ApiError(str(error)) from error
+        finally:
+            connection.close()
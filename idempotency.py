@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+🔁 ИДЕМПОТЕНТНЫЕ ЗАПРОСЫ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Повтор запроса с тем же заголовком Idempotency-Key получает
+сохраненный ответ первого запроса, а не выполняет действие еще раз
+Особенности:
+- Ограниченный кэш ответов: LRU на capacity ключей и срок жизни ttl
+- Ключ действует в своей области (клиент, игра, маршрут): чужой клиент
+  с тем же ключом не получит чужой ответ
+- Повтор, пришедший, пока первый запрос еще выполняется, ждет его ответ
+- Тот же ключ с другим телом запроса - ошибка, а не повтор
+- Сохраняются только завершенные ответы (не 5xx и не 429): после сбоя
+  или отказа по нагрузке запрос можно повторить с тем же ключом
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Статусы, ответы с которыми не сохраняются (действие не выполнено)
+UNSTORED_STATUSES = frozenset({429})
+
+# Заголовки одного соединения (RFC 7230, 6.1) - в повтор не попадают
+HOP_BY_HOP_HEADERS = frozenset({
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade'
+})
+
+def stored_headers(headers):
+    """Заголовки ответа для повтора: все, кроме заголовков соединения"""
+    return [(name, value) for name, value in headers if name.lower() not in HOP_BY_HOP_HEADERS]
+
+class StoredResponse:
+    """Сохраненный ответ: статус, заголовки (список пар) и тело"""
+
+    __slots__ = ('status', 'headers', 'body')
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+class IdempotencyEntry:
+    """
+    Запись кэша
+
+    Атрибуты:
+    - fingerprint: Хэш тела запроса
+    - response: StoredResponse или None, пока запрос выполняется
+    - expires: Когда запись устареет (time.monotonic)
+    - done: Событие завершения первого запроса
+    """
+
+    __slots__ = ('fingerprint', 'response', 'expires', 'done')
+
+    def __init__(self, fingerprint, expires):
+        self.fingerprint = fingerprint
+        self.response = None
+        self.expires = expires
+        self.done = threading.Event()
+
+class IdempotencyCache:
+    """
+    LRU-кэш ответов по ключам идемпотентности со сроком жизни
+
+    Args:
+        capacity: Наибольшее число ключей
+        ttl: Срок жизни ответа (секунды)
+        wait: Сколько повтор ждет первый запрос с тем же ключом (секунды)
+    """
+
+    def __init__(self, capacity=4096, ttl=300.0, wait=30.0):
+        self.capacity = max(1, capacity)
+        self.ttl = ttl
+        self.wait = wait
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self.expired = 0
+        self.conflicts = 0
+
+    @staticmethod
+    def fingerprint(body):
+        """Хэш тела запроса"""
+        return hashlib.blake2b(body or b'', digest_size=16).digest()
+
+    def begin(self, key, fingerprint):
+        """
+        Начинает запрос с ключом key
+
+        Returns:
+            tuple: ('run', запись) - выполнить запрос и вызвать finish;
+            ('replay', StoredResponse) - отдать сохраненный ответ;
+            ('conflict', None) - ключ уже использован с другим телом;
+            ('busy', None) - первый запрос не завершился за время ожидания
+        """
+        deadline = time.monotonic() + self.wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                entry = self._entries.get(key)
+                if entry is not None and entry.response is not None and entry.expires <= now:
+                    del self._entries[key]
+                    self.expired += 1
+                    entry = None
+                if entry is None:
+                    entry = IdempotencyEntry(fingerprint, now + self.ttl)
+                    self._entries[key] = entry
+                    self._evict(now)
+                    self.misses += 1
+                    return 'run', entry
+                if entry.fingerprint != fingerprint:
+                    self.conflicts += 1
+                    return 'conflict', None
+                if entry.response is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return 'replay', entry.response
+            # Первый запрос с этим ключом еще выполняется
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not entry.done.wait(remaining):
+                return 'busy', None
+
+    def finish(self, key, entry, response):
+        """
+        Завершает запрос: сохраняет ответ или, если response None,
+        освобождает ключ для повтора
+        """
+        with self._lock:
+            if response is None:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            else:
+                entry.response = response
+                entry.expires = time.monotonic() + self.ttl
+                self.stored += 1
+        entry.done.set()
+
+    def _evict(self, now):
+        """
+        Удаляет устаревшие записи с начала очереди и лишние сверх capacity
+
+        Выполняющиеся запросы (response None) не удаляются: иначе их повтор
+        выполнил бы действие второй раз. Пока они в начале очереди, кэш может
+        ненадолго превысить capacity.
+        """
+        entries = self._entries
+        excess = len(entries) - self.capacity
+        stale = []
+        for key, entry in entries.items():
+            if entry.response is None:
+                continue
+            if entry.expires <= now:
+                self.expired += 1
+            elif excess > 0:
+                self.evicted += 1
+            else:
+                break
+            stale.append(key)
+            excess -= 1
+        for key in stale:
+            del entries[key]
+
+    def metrics(self):
+        """Размер кэша и счетчики повторов"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'capacity': self.capacity,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stored': self.stored,
+                'evicted': self.evicted,
+                'expired': self.expired,
+                'conflicts': self.conflicts
+            }
@@ -8,17 +8,38 @@
 Описание: Умный запускатель для веб-приложения аукциона
 Особенности:
 - Автоматическая установка Flask
-- Автоматическое открытие браузера
+- Автоматическое открытие браузера (как только сервер готов)
 - Простой запуск (один клик)
 - Кроссплатформенность
+- Production-режим: несколько рабочих процессов за одним портом
 """
 
+import time
+
+# Время запуска launcher - точка отсчета для замера готовности сервера
+LAUNCHER_STARTED = time.perf_counter()
+
 import os
+import re
 import sys
+import bisect
+import asyncio
+import socket
+import hashlib
+import uuid
+import argparse
 import subprocess
 import webbrowser
-import time
 import threading
+import importlib.util
+import json
+import urllib.request
+from http.cookies import SimpleCookie, CookieError
+from urllib.parse import urlsplit, parse_qs
+
+# Папка проекта и путь к приложению
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "app.py")
 
 def check_flask():
     """
@@ -27,11 +48,8 @@ def check_flask():
     Returns:
         bool: True если Flask установлен, False если нет
     """
-    try:
-        import flask
-        return True
-    except ImportError:
-        return False
+    # find_spec ищет модуль, не импортируя его - это почти бесплатно
+    return importlib.util.find_spec("flask") is not None
 
 def install_flask():
     """
@@ -50,13 +68,613 @@ def install_flask():
         print("❌ Ошибка установки Flask")
         return False
 
-def open_browser():
+def wait_until_ready(url, timeout=30.0, interval=0.05):
+    """
+    Ждет, пока сервер ответит на /healthz
+    
+    Returns:
+        dict | None: Ответ /healthz или None, если сервер не поднялся за timeout
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/healthz", timeout=1.0) as response:
+                if response.status == 200:
+                    return json.loads(response.read().decode("utf-8"))
+        except (OSError, ValueError):
+            pass
+        time.sleep(interval)
+    return None
+
+def print_startup_report(health):
+    """Печатает замеры запуска сервера"""
+    ready_ms = (time.perf_counter() - LAUNCHER_STARTED) * 1000
+    print(f"⏱️  Сервер готов через {ready_ms:.0f} мс после запуска launcher")
+    for name, value in (health.get("startup") or {}).items():
+        print(f"   {name}: {value} мс")
+
+def open_browser(url="http://localhost:5000"):
+    """
+    Открывает браузер, как только сервер готов
+    Вместо фиксированной паузы опрашивает /healthz
+    """
+    health = wait_until_ready(url)
+    if health is None:
+        print(f"⚠️  Сервер не ответил, откройте {url} вручную")
+        return
+    print_startup_report(health)
+    webbrowser.open(url)  # Открываем в браузере
+
+def profile_imports(top=15):
+    """
+    Показывает самые медленные импорты app.py (python -X importtime)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # Формат: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.strip()))
+    rows.sort(reverse=True)
+    print(f"{'накопительно, мс':>18} {'сам модуль, мс':>16}  модуль")
+    for cumulative_us, self_us, module in rows[:top]:
+        print(f"{cumulative_us / 1000:>18.1f} {self_us / 1000:>16.1f}  {module}")
+
+# ============================================================================
+# PRODUCTION-РЕЖИМ: НЕСКОЛЬКО РАБОЧИХ ПРОЦЕССОВ
+# ============================================================================
+
+# Должны совпадать с app.py (launcher не импортирует app, чтобы стартовать быстро)
+DEFAULT_GAME_ID = 'main'
+GAME_COOKIE_NAME = 'golan_game'
+GAME_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+HEALTH_CHECK_INTERVAL = 2.0  # Период проверки рабочих процессов (секунды)
+HEALTH_CHECK_TIMEOUT = 1.0  # Таймаут запроса /healthz (секунды)
+HEALTH_CHECK_FAILURES = 3  # Сколько проверок подряд можно провалить до перезапуска
+STARTUP_TIMEOUT = 30.0  # Сколько ждать первого ответа /healthz после запуска (секунды)
+READY_WAIT = 5.0  # Сколько запрос ждет запускающийся процесс до ответа 503 (секунды)
+MAX_REQUEST_HEAD = 64 * 1024  # Максимальный размер заголовков запроса (байт)
+UPSTREAM_IDLE_CONNECTIONS = 32  # Свободных соединений с процессом в запасе
+
+# Заголовки одного соединения (RFC 7230, 6.1): маршрутизатор ведет свои
+# соединения с клиентом и с процессом и не передает их дальше
+HOP_BY_HOP_HEADERS = frozenset({
+    b'connection', b'keep-alive', b'proxy-connection', b'te', b'trailer', b'upgrade'
+})
+
+# Переменная окружения рабочего процесса: перед ним маршрутизатор launcher.py
+# (app.py доверяет X-Forwarded-For только с ней)
+BEHIND_ROUTER_ENV = 'GOLAN_BEHIND_ROUTER'
+
+class HashRing:
+    """
+    Кольцо согласованного хеширования: ID игры -> номер рабочего процесса
+    
+    Каждый процесс занимает несколько виртуальных точек на кольце, поэтому
+    игры распределяются равномерно, а одна и та же игра всегда попадает
+    в один и тот же процесс (в том числе после его перезапуска).
+    """
+    def __init__(self, nodes, replicas=64):
+        points = sorted(
+            (self._hash(f"{node}:{replica}"), node)
+            for node in nodes
+            for replica in range(replicas)
+        )
+        self._keys = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+    
+    @staticmethod
+    def _hash(key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+    
+    def get_node(self, key):
+        """Возвращает узел, отвечающий за ключ"""
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._nodes[index]
+
+class WorkerProcess:
+    """
+    Рабочий процесс app.py на локальном порту
+    
+    Атрибуты:
+    - index: Номер процесса (его место на кольце хеширования)
+    - port: Локальный порт процесса
+    - process: Объект subprocess.Popen или None
+    - ready: Прошел ли процесс проверку /healthz после запуска
+    - failures: Проваленных проверок подряд
+    - restarts: Количество перезапусков
+    - generation: Номер запуска (соединения прежнего запуска не переиспользуются)
+    - idle: Свободные соединения с процессом (reader, writer, generation)
+    """
+    def __init__(self, index, port):
+        self.index = index
+        self.port = port
+        self.process = None
+        self.ready = False
+        self.failures = 0
+        self.restarts = 0
+        self.generation = 0
+        self.idle = []
+    
+    def start(self):
+        """
+        Запускает процесс приложения без отладчика
+        
+        Готовность проверяется сразу: /healthz опрашивается в отдельном
+        потоке, не дожидаясь очередной проверки supervise_workers.
+        """
+        self.ready = False
+        self.failures = 0
+        self.generation += 1
+        # Свой файл снимка у каждого места на кольце: после перезапуска
+        # процесс получает те же игры, что и сохранил
+        self.process = subprocess.Popen(
+            [sys.executable, APP_PATH, "--production",
+             "--host", "127.0.0.1", "--port", str(self.port)],
+            cwd=BASE_DIR,
+            env=dict(os.environ, GOLAN_SNAPSHOT_NAME=f"worker-{self.index}",
+                     **{BEHIND_ROUTER_ENV: '1'})
+        )
+        probe = threading.Thread(target=self.await_ready, args=(self.generation,))
+        probe.daemon = True
+        probe.start()
+    
+    def await_ready(self, generation):
+        """Опрашивает /healthz только что запущенного процесса и отмечает готовность"""
+        health = wait_until_ready(f"http://127.0.0.1:{self.port}", timeout=STARTUP_TIMEOUT)
+        if health is not None and generation == self.generation and not self.ready:
+            self.ready = True
+            print(f"✅ Процесс #{self.index} готов (порт {self.port})")
+    
+    def stop(self):
+        """Останавливает процесс"""
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+    
+    def restart(self, reason):
+        """Перезапускает процесс"""
+        print(f"♻️  Процесс #{self.index} (порт {self.port}) перезапускается: {reason}")
+        self.stop()
+        self.restarts += 1
+        self.start()
+    
+    def is_alive(self):
+        """Проверяет, что процесс не завершился"""
+        return self.process is not None and self.process.poll() is None
+    
+    async def connect(self):
+        """
+        Соединение с процессом: свободное из запаса или новое
+        
+        Returns:
+            tuple: (reader, writer, generation, переиспользовано ли)
+        """
+        while self.idle:
+            reader, writer, generation = self.idle.pop()
+            # Соединение прежнего запуска или закрытое процессом выбрасывается
+            if generation == self.generation and not reader.at_eof() and not writer.is_closing():
+                return reader, writer, generation, True
+            writer.close()
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port, limit=MAX_REQUEST_HEAD)
+        return reader, writer, self.generation, False
+    
+    def release(self, reader, writer, generation):
+        """Возвращает соединение в запас (лишние закрываются)"""
+        if generation == self.generation and len(self.idle) < UPSTREAM_IDLE_CONNECTIONS:
+            self.idle.append((reader, writer, generation))
+        else:
+            writer.close()
+    
+    def check_health(self):
+        """Запрашивает /healthz процесса"""
+        try:
+            url = f"http://127.0.0.1:{self.port}/healthz"
+            with urllib.request.urlopen(url, timeout=HEALTH_CHECK_TIMEOUT) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+def find_free_port():
+    """Возвращает свободный локальный порт"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def supervise_workers(workers, stop_event):
+    """
+    Следит за рабочими процессами (запускается в отдельном потоке)
+    
+    Упавший процесс перезапускается сразу, зависший - после
+    HEALTH_CHECK_FAILURES проваленных проверок /healthz подряд.
+    """
+    while not stop_event.wait(HEALTH_CHECK_INTERVAL):
+        for worker in workers:
+            if not worker.is_alive():
+                worker.restart(f"процесс завершился с кодом {worker.process.returncode}")
+                continue
+            if worker.check_health():
+                if not worker.ready:
+                    print(f"✅ Процесс #{worker.index} готов (порт {worker.port})")
+                worker.ready = True
+                worker.failures = 0
+            elif worker.ready:
+                worker.failures += 1
+                if worker.failures >= HEALTH_CHECK_FAILURES:
+                    worker.restart("не отвечает на /healthz")
+
+def extract_game_id(head):
+    """
+    Извлекает ID игры из заголовков HTTP запроса
+    
+    Порядок тот же, что в app.get_request_game_id:
+    параметр ?game=, заголовок X-Game-Id, cookie golan_game.
+    Возвращает None, если запрос не указывает игру.
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split(' ')
+    candidates = []
+    if len(parts) >= 2:
+        candidates.append(parse_qs(urlsplit(parts[1]).query).get('game', [None])[0])
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        name = name.strip().lower()
+        if name == 'x-game-id':
+            candidates.append(value.strip())
+        elif name == 'cookie':
+            cookie = SimpleCookie()
+            try:
+                cookie.load(value.strip())
+            except CookieError:
+                continue
+            if GAME_COOKIE_NAME in cookie:
+                candidates.append(cookie[GAME_COOKIE_NAME].value)
+    for game_id in candidates:
+        if game_id and GAME_ID_PATTERN.match(game_id):
+            return game_id
+    return None
+
+def parse_head(head):
+    """
+    Разбирает заголовки HTTP сообщения
+    
+    Returns:
+        tuple: (части первой строки, список пар (имя в нижнем регистре, значение))
+    """
+    lines = head.split(b'\r\n')
+    headers = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(b':')
+        headers.append((name.strip().lower(), value.strip()))
+    return lines[0].split(b' ', 2), headers
+
+def header_tokens(headers, name):
+    """Значения заголовка name через запятую (в нижнем регистре)"""
+    return [token.strip().lower() for header, value in headers if header == name
+            for token in value.split(b',')]
+
+def body_framing(headers):
+    """
+    Как ограничено тело сообщения
+    
+    Returns:
+        tuple: ('chunked', None), ('length', байт) или (None, None) - тела нет
+        (для ответа это значит: до закрытия соединения)
+    """
+    if b'chunked' in header_tokens(headers, b'transfer-encoding'):
+        return 'chunked', None
+    for name, value in headers:
+        if name == b'content-length':
+            return 'length', int(value)
+    return None, None
+
+def rewrite_request_head(head, client_address):
+    """
+    Заголовки запроса для процесса: без заголовков соединения с клиентом
+    и Expect (маршрутизатор сам отвечает 100 Continue), с X-Forwarded-For
+    
+    Соединение с процессом остается открытым (HTTP/1.1 по умолчанию).
+    """
+    lines = head.split(b'\r\n')
+    kept = [lines[0]]
+    for line in lines[1:]:
+        if not line:
+            continue
+        name = line.split(b':', 1)[0].strip().lower()
+        if name in HOP_BY_HOP_HEADERS or name in (b'x-forwarded-for', b'expect'):
+            continue
+        kept.append(line)
+    kept.append(b'X-Forwarded-For: ' + str(client_address).encode('latin-1'))
+    return b'\r\n'.join(kept) + b'\r\n\r\n'
+
+def rewrite_response_head(head, close):
+    """Заголовки ответа для клиента: без заголовков соединения с процессом"""
+    lines = head.split(b'\r\n')
+    kept = [lines[0]]
+    for line in lines[1:]:
+        if not line:
+            continue
+        if line.split(b':', 1)[0].strip().lower() in HOP_BY_HOP_HEADERS:
+            continue
+        kept.append(line)
+    if close:
+        kept.append(b'Connection: close')
+    return b'\r\n'.join(kept) + b'\r\n\r\n'
+
+async def copy_exact(reader, writer, size):
+    """Перекачивает ровно size байт"""
+    while size > 0:
+        chunk = await reader.read(min(size, 65536))
+        if not chunk:
+            raise asyncio.IncompleteReadError(b'', size)
+        writer.write(chunk)
+        await writer.drain()
+        size -= len(chunk)
+
+async def copy_chunked(reader, writer):
+    """Перекачивает тело в кодировке chunked вместе с завершающими заголовками"""
+    while True:
+        line = await reader.readuntil(b'\r\n')
+        writer.write(line)
+        size = int(line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            break
+        await copy_exact(reader, writer, size + 2)
+    while True:
+        line = await reader.readuntil(b'\r\n')
+        writer.write(line)
+        if line == b'\r\n':
+            break
+    await writer.drain()
+
+async def copy_body(reader, writer, framing, length):
+    """Перекачивает тело сообщения по его framing (см. body_framing)"""
+    if framing == 'chunked':
+        await copy_chunked(reader, writer)
+    elif framing == 'length':
+        await copy_exact(reader, writer, length)
+
+async def pipe_stream(reader, writer):
+    """Перекачивает байты из reader в writer до конца потока"""
+    try:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+
+class UpstreamFailed(Exception):
     """
-    Открывает браузер через 3 секунды
-    Дает время серверу запуститься
+    Соединение с процессом оборвалось
+
+    Атрибуты:
+    - answered: Процесс успел начать ответ (повторять запрос нельзя)
     """
-    time.sleep(3)  # Ждем 3 секунды для запуска сервера
-    webbrowser.open("http://localhost:5000")  # Открываем в браузере
+
+    def __init__(self, answered=False):
+        super().__init__()
+        self.answered = answered
+
+class GameRouter:
+    """
+    Маршрутизатор запросов на общем порту
+    
+    Принимает соединения, читает заголовки запроса, определяет ID игры и
+    передает запрос процессу, выбранному кольцом хеширования. Все запросы
+    одной игры попадают в один процесс, поэтому состояние игры согласовано.
+    
+    Соединения с клиентами и с процессами постоянные (keep-alive): запросы
+    одного клиентского соединения, в том числе отправленные конвейером,
+    разбираются по очереди, ответы уходят в том же порядке.
+    """
+    def __init__(self, workers):
+        self.workers = workers
+        self.ring = HashRing([worker.index for worker in workers])
+    
+    def route(self, head):
+        """Процесс для запроса и заголовки (новой игре без ID назначается ID)"""
+        game_id = extract_game_id(head)
+        if game_id is None:
+            # Новая игра без ID получает собственную комнату, чтобы
+            # игроки распределялись по процессам, а не в одну комнату
+            if head.startswith(b'POST /api/game/start'):
+                game_id = uuid.uuid4().hex[:12]
+                head = head[:-2] + f'X-Game-Id: {game_id}\r\n\r\n'.encode('latin-1')
+            else:
+                game_id = DEFAULT_GAME_ID
+        return self.workers[self.ring.get_node(game_id)], head
+    
+    async def wait_ready(self, worker):
+        """Ждет запускающийся процесс до READY_WAIT секунд. Returns: bool"""
+        deadline = time.perf_counter() + READY_WAIT
+        while not worker.ready and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        return worker.ready
+    
+    async def handle_client(self, reader, writer):
+        """Обрабатывает клиентское соединение: запросы по очереди, пока клиент его держит"""
+        client_address = (writer.get_extra_info('peername') or ('unknown',))[0]
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break  # Клиент закрыл соединение между запросами
+                if not await self.handle_request(head, reader, writer, client_address):
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    async def handle_request(self, head, reader, writer, client_address):
+        """
+        Передает один запрос процессу и ответ клиенту
+        
+        Returns:
+            bool: Можно ли читать следующий запрос с этого соединения
+        """
+        request_line, headers = parse_head(head)
+        method = request_line[0]
+        version = request_line[2] if len(request_line) > 2 else b'HTTP/1.0'
+        connection = header_tokens(headers, b'connection')
+        close = b'close' in connection or (version == b'HTTP/1.0' and b'keep-alive' not in connection)
+        framing, length = body_framing(headers)
+        
+        worker, head = self.route(head)
+        if not await self.wait_ready(worker):
+            writer.write(b'HTTP/1.1 503 Service Unavailable\r\n'
+                         b'Retry-After: 1\r\nContent-Length: 0\r\n'
+                         b'Connection: close\r\n\r\n')
+            await writer.drain()
+            return False
+        if b'100-continue' in header_tokens(headers, b'expect'):
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+        
+        upstream_head = rewrite_request_head(head, client_address)
+        try:
+            upstream = await worker.connect()
+            try:
+                response = await self.forward(upstream, upstream_head, reader, framing, length)
+            except UpstreamFailed as e:
+                # Свободное соединение могло закрыться по таймауту процесса, не приняв
+                # запрос; безопасный запрос (GET/HEAD) отправляется еще раз по новому
+                safe = method in (b'GET', b'HEAD') and framing is None
+                if e.answered or not upstream[3] or not safe:
+                    raise
+                upstream = await worker.connect()
+                response = await self.forward(upstream, upstream_head, reader, None, None)
+        except (UpstreamFailed, OSError):
+            writer.write(b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n'
+                         b'Connection: close\r\n\r\n')
+            await writer.drain()
+            return False
+        
+        upstream_reader, upstream_writer, generation, _ = upstream
+        reusable = False
+        try:
+            reusable, close = await self.relay_response(method, response, upstream_reader, writer, close)
+        finally:
+            if reusable:
+                worker.release(upstream_reader, upstream_writer, generation)
+            else:
+                upstream_writer.close()
+        return not close
+    
+    async def forward(self, upstream, upstream_head, reader, framing, length):
+        """
+        Отправляет запрос процессу и читает заголовки ответа
+        (промежуточные ответы 1xx пропускаются)
+        
+        Raises:
+            UpstreamFailed: Соединение с процессом оборвалось
+        """
+        upstream_reader, upstream_writer = upstream[0], upstream[1]
+        try:
+            upstream_writer.write(upstream_head)
+            # Обрыв чтения тела у клиента (IncompleteReadError) уходит выше как есть
+            await copy_body(reader, upstream_writer, framing, length)
+        except ConnectionError as e:
+            upstream_writer.close()
+            raise UpstreamFailed() from e
+        except BaseException:
+            upstream_writer.close()
+            raise
+        try:
+            while True:
+                response = await upstream_reader.readuntil(b'\r\n\r\n')
+                status = response.split(b' ', 2)[1]
+                if not (status.startswith(b'1') and status != b'101'):
+                    return response
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as e:
+            upstream_writer.close()
+            answered = not isinstance(e, asyncio.IncompleteReadError) or bool(e.partial)
+            raise UpstreamFailed(answered) from e
+    
+    async def relay_response(self, method, response, upstream_reader, writer, close):
+        """
+        Передает ответ клиенту
+        
+        Returns:
+            tuple: (можно ли вернуть соединение с процессом в запас,
+            нужно ли закрыть соединение с клиентом)
+        """
+        status_line, headers = parse_head(response)
+        status = status_line[1]
+        if status == b'101':
+            # Смена протокола: дальше соединение - просто поток байт
+            writer.write(response)
+            await pipe_stream(upstream_reader, writer)
+            return False, True
+        
+        upstream_close = b'close' in header_tokens(headers, b'connection')
+        if method == b'HEAD' or status in (b'204', b'304'):
+            framing, length = 'length', 0
+        else:
+            framing, length = body_framing(headers)
+        if framing is None:
+            # Тело до закрытия соединения: клиент узнает конец тела так же
+            close = True
+        writer.write(rewrite_response_head(response, close))
+        if framing is None:
+            await pipe_stream(upstream_reader, writer)
+            return False, True
+        await copy_body(upstream_reader, writer, framing, length)
+        await writer.drain()
+        return not upstream_close, close
+
+async def serve_router(router, host, port):
+    """Запускает маршрутизатор на общем порту"""
+    server = await asyncio.start_server(router.handle_client, host, port,
+                                        limit=MAX_REQUEST_HEAD, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+def run_production(workers_count, host, port):
+    """
+    Production-режим: N рабочих процессов app.py за одним портом
+    
+    Процессы слушают локальные порты, launcher принимает соединения на
+    общем порту и направляет каждую игру в ее процесс. Пропускная
+    способность растет с количеством ядер, а не упирается в один GIL.
+    """
+    workers = [WorkerProcess(index, find_free_port()) for index in range(workers_count)]
+    for worker in workers:
+        worker.start()
+    
+    stop_event = threading.Event()
+    supervisor = threading.Thread(target=supervise_workers, args=(workers, stop_event))
+    supervisor.daemon = True
+    supervisor.start()
+    
+    print(f"🏭 Production-режим: {workers_count} процессов")
+    print(f"📱 Адрес: http://localhost:{port}")
+    print("⏹️  Для остановки нажмите Ctrl+C")
+    print()
+    
+    try:
+        asyncio.run(serve_router(GameRouter(workers), host, port))
+    except KeyboardInterrupt:
+        print("\n👋 Приложение остановлено!")
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.stop()
 
 def main():
     """
@@ -67,7 +685,26 @@ def main():
     2. Установку Flask если нужно
     3. Запуск веб-приложения
     4. Автоматическое открытие браузера
+    
+    С флагом --production запускает несколько рабочих процессов
     """
+    parser = argparse.ArgumentParser(description="Запускатель аукциона Golan")
+    parser.add_argument("--production", action="store_true",
+                        help="Несколько рабочих процессов за одним портом")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Количество рабочих процессов (production)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--no-browser", action="store_true",
+                        help="Не открывать браузер")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="Показать время импорта модулей и выйти")
+    args = parser.parse_args()
+    
+    if args.profile_imports:
+        profile_imports()
+        return
+    
     print("=" * 60)
     print("🔥 ГОЛЛАНДСКИЙ АУКЦИОН GOLAN 🔥")
     print("=" * 60)
@@ -81,20 +718,26 @@ def main():
             input("Нажмите Enter для выхода...")
             return
     
+    if args.production:
+        run_production(max(1, args.workers), args.host, args.port)
+        return
+    
     print("🚀 Запускаю приложение...")
-    print("📱 Браузер откроется автоматически через 3 секунды")
+    print("📱 Браузер откроется автоматически, как только сервер будет готов")
     print("⏹️  Для остановки закройте это окно")
     print()
     
-    # Запускаем браузер в отдельном потоке (неблокирующий)
-    browser_thread = threading.Thread(target=open_browser)
-    browser_thread.daemon = True  # Поток завершится с основным процессом
-    browser_thread.start()
+    # Ждем готовности и открываем браузер в отдельном потоке (неблокирующий)
+    if not args.no_browser:
+        browser_thread = threading.Thread(target=open_browser,
+                                          args=(f"http://localhost:{args.port}",))
+        browser_thread.daemon = True  # Поток завершится с основным процессом
+        browser_thread.start()
     
     # Запускаем приложение
     try:
         # Запускаем app.py из корневой папки
-        subprocess.run([sys.executable, "app.py"])
+        subprocess.run([sys.executable, APP_PATH, "--port", str(args.port)], cwd=BASE_DIR)
     except KeyboardInterrupt:
         print("\n👋 Приложение остановлено!")
     except Exception as e:
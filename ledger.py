@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+📒 ЖУРНАЛЫ ИГРЫ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Компактные журналы игры - сделки (кто, что, за сколько и в каком
+раунде купил) и исходы лотов (продан или нет, после скольких снижений)
+Особенности:
+- Столбцы в заранее выделенных массивах (array): запись - O(1), без
+  словаря на каждую строку
+- Кольцевой режим: при заполнении перезаписываются самые старые строки;
+  без него массивы удваиваются
+- Сделки игрока связаны ссылкой на его предыдущую сделку - история игрока
+  читается за O(limit), без просмотра всего журнала
+- Чтение не берет блокировок: пишет один поток (под блокировкой комнаты),
+  читатель проверяет, что строку не перезаписали, пока он ее читал
+- Постраничное чтение сделок по курсору (номер сделки), от новых к старым
+- Выгрузка всех строк от старых к новым генератором (scan)
+- Хранящиеся строки копируются по столбцам (export_columns) для снимка
+  и архива игры и восстанавливаются из них (from_columns)
+"""
+
+import time
+from array import array
+
+# Столбцы журнала сделок: имя и код типа array
+LEDGER_COLUMNS = (
+    ('seq', 'q'),           # Номер сделки (с 0, растет всю игру)
+    ('round', 'l'),         # Раунд игры
+    ('player_id', 'l'),     # Покупатель
+    ('product_id', 'l'),    # Товар
+    ('price', 'q'),         # Цена покупки
+    ('profit', 'd'),        # Прибыль покупателя
+    ('at', 'd'),            # Время сделки (time.time())
+    ('player_prev', 'q'),   # Номер предыдущей сделки того же игрока или -1
+)
+
+# Столбцы журнала лотов
+LOT_COLUMNS = (
+    ('seq', 'q'),           # Номер лота (с 0, растет всю игру)
+    ('round', 'l'),         # Раунд игры
+    ('product_id', 'l'),    # Товар
+    ('start_price', 'q'),   # Цена в начале лота
+    ('floor_price', 'q'),   # Нижняя граница цены (себестоимость)
+    ('price', 'q'),         # Цена продажи или последняя цена непроданного лота
+    ('drops', 'l'),         # Снижений цены до продажи (или до конца лота)
+    ('winner_id', 'l'),     # Покупатель или -1, если лот не продан
+    ('at', 'd'),            # Время исхода (time.time())
+)
+
+class ColumnJournal:
+    """
+    Журнал строк по столбцам (основа журналов сделок и лотов)
+
+    Первый столбец - номер строки seq. Подклассы задают COLUMNS и пишут
+    строку так: _reserve(), запись значений по индексу, _commit(seq).
+
+    Args:
+        capacity: Емкость массивов (строк)
+        ring: Кольцевой режим - хранить только последние capacity строк
+
+    Атрибуты:
+    - head: Сколько строк зарезервировано писателем (номер следующей)
+    - count: Сколько строк записано полностью (видны читателям)
+    """
+
+    COLUMNS = ()
+
+    def __init__(self, capacity=4096, ring=True):
+        self.capacity = max(1, int(capacity))
+        self.ring = ring
+        self.columns = {name: array(code, [0]) * self.capacity for name, code in self.COLUMNS}
+        self._arrays = tuple(self.columns[name] for name, _ in self.COLUMNS)
+        self.head = 0
+        self.count = 0
+
+    def _reserve(self):
+        """
+        Резервирует номер следующей строки
+
+        Номер резервируется до записи: читатель отбросит строку, которую
+        сейчас перезаписывают.
+
+        Returns:
+            tuple: (номер строки, индекс в массивах)
+        """
+        seq = self.head
+        if seq >= self.capacity and not self.ring:
+            self._grow()
+        self.head = seq + 1
+        return seq, seq % self.capacity
+
+    def _commit(self, seq):
+        """Делает строку seq видимой читателям"""
+        self.count = seq + 1
+
+    def _grow(self):
+        """Удваивает массивы (режим без кольца); читатели дочитывают старые"""
+        capacity = self.capacity * 2
+        columns = {}
+        for name, code in self.COLUMNS:
+            column = array(code, self.columns[name])
+            column.extend(array(code, [0]) * (capacity - len(column)))
+            columns[name] = column
+        self.capacity = capacity
+        self._arrays = tuple(columns[name] for name, _ in self.COLUMNS)
+        self.columns = columns
+
+    @property
+    def oldest(self):
+        """Номер самой старой строки, которая еще хранится"""
+        return max(0, self.head - self.capacity)
+
+    @property
+    def complete(self):
+        """Хранятся ли все строки игры (кольцо еще не перезаписало начало)"""
+        return self.oldest == 0
+
+    def _row(self, columns, capacity, seq):
+        """Строка seq как словарь или None, если ее уже перезаписали"""
+        index = seq % capacity
+        row = {name: columns[name][index] for name, _ in self.COLUMNS}
+        if row['seq'] != seq or seq < self.head - capacity:
+            return None
+        return row
+
+    def scan(self, start=0, stop=None):
+        """
+        Строки от старых к новым (генератор для выгрузки)
+
+        Читает без блокировок до последней строки на момент начала чтения
+        (или до stop). Если писатель перезаписал еще не прочитанные строки
+        (кольцевой режим), чтение продолжается с самой старой сохранившейся.
+
+        Args:
+            start: Номер первой строки
+            stop: Номер строки, на которой остановиться (None - count)
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        seq = max(start, self.oldest)
+        while seq < stop:
+            # Массивы перечитываются на каждой строке: их могли заменить при удвоении
+            columns = self.columns
+            row = self._row(columns, len(columns['seq']), seq)
+            if row is None:
+                seq = max(seq + 1, self.oldest)
+                continue
+            yield row
+            seq += 1
+
+    def export_columns(self):
+        """
+        Хранящиеся строки по столбцам от старых к новым (вызывается под
+        блокировкой комнаты)
+
+        Returns:
+            dict: {столбец: array} - копии, писатель их больше не меняет
+        """
+        start = self.oldest
+        stop = self.count
+        first = start % self.capacity
+        exported = {}
+        for name, code in self.COLUMNS:
+            column = self.columns[name]
+            if stop - start == self.capacity and first:
+                # Кольцо заполнено и сдвинуто: старые строки - в конце массива
+                exported[name] = column[first:] + column[:first]
+            else:
+                exported[name] = column[first:first + stop - start]
+        return exported
+
+    @classmethod
+    def from_columns(cls, columns, capacity=4096, ring=True):
+        """
+        Журнал из столбцов export_columns (массивы или списки)
+
+        Номера строк сохраняются. Если емкость меньше числа строк,
+        кольцевой журнал оставляет последние, а журнал без кольца растет.
+        """
+        seqs = columns['seq']
+        total = len(seqs)
+        if not ring:
+            capacity = max(capacity, total)
+        journal = cls(capacity, ring)
+        skip = max(0, total - journal.capacity)
+        for name, code in cls.COLUMNS:
+            target = journal.columns[name]
+            for seq, value in zip(seqs[skip:], columns[name][skip:]):
+                target[seq % journal.capacity] = value
+        if total:
+            journal.head = journal.count = seqs[-1] + 1
+        journal._restored(columns, skip)
+        return journal
+
+    def _restored(self, columns, skip):
+        """Восстанавливает служебное состояние подкласса после from_columns"""
+
+    def frozen(self):
+        """
+        Журнал, строки которого больше не меняются (вызывается под
+        блокировкой комнаты)
+
+        Кольцевой журнал копируется: писатель иначе перезапишет строки,
+        которые выгрузка еще не прочитала. Журнал без кольца строк
+        не перезаписывает и читается на месте до текущей последней строки.
+
+        Returns:
+            tuple: (журнал, граница чтения для scan)
+        """
+        if self.ring:
+            copy = type(self).from_columns(self.export_columns(), self.capacity, True)
+            return copy, copy.count
+        return self, self.count
+
+    def stats(self):
+        """Размер журнала"""
+        return {
+            'total': self.count,
+            'retained': self.count - self.oldest,
+            'capacity': self.capacity,
+            'ring': self.ring
+        }
+
+class TransactionLedger(ColumnJournal):
+    """
+    Журнал сделок одной игры
+
+    Args:
+        capacity: Емкость массивов (сделок)
+        ring: Кольцевой режим - хранить только последние capacity сделок
+    """
+
+    COLUMNS = LEDGER_COLUMNS
+
+    def __init__(self, capacity=4096, ring=True):
+        super().__init__(capacity, ring)
+        self._player_last = {}
+
+    def append(self, round_number, player_id, product_id, price, profit, at=None):
+        """
+        Записывает сделку (вызывается под блокировкой комнаты)
+
+        Returns:
+            int: Номер сделки
+        """
+        # _reserve() и _commit() встроены: запись сделки - в каждом раунде
+        seq = self.head
+        if seq >= self.capacity and not self.ring:
+            self._grow()
+        self.head = seq + 1
+        index = seq % self.capacity
+        seqs, rounds, players, products, prices, profits, times, previous = self._arrays
+        seqs[index] = seq
+        rounds[index] = round_number
+        players[index] = player_id
+        products[index] = product_id
+        prices[index] = int(price)
+        profits[index] = profit
+        times[index] = time.time() if at is None else at
+        last = self._player_last
+        previous[index] = last.get(player_id, -1)
+        last[player_id] = seq
+        self.count = seq + 1
+        return seq
+
+    def _restored(self, columns, skip):
+        """Последняя сделка каждого игрока - начало его истории"""
+        last = self._player_last
+        for seq, player_id in zip(columns['seq'][skip:], columns['player_id'][skip:]):
+            last[player_id] = seq
+
+    def read(self, cursor=None, limit=50, player_id=None):
+        """
+        Страница сделок от новых к старым
+
+        Args:
+            cursor: Вернуть сделки с номером меньше cursor (None - с последней);
+                курсор следующей страницы возвращается этим же методом
+            limit: Размер страницы
+            player_id: Только сделки этого игрока
+
+        Returns:
+            tuple: (сделки, курсор следующей страницы или None)
+        """
+        # Емкость берется из самих массивов: их могли заменить при удвоении
+        columns = self.columns
+        capacity = len(columns['seq'])
+        end = self.count if cursor is None else min(cursor, self.count)
+        entries = []
+
+        if player_id is None:
+            seq = end - 1
+            while seq >= 0 and len(entries) < limit:
+                row = self._row(columns, capacity, seq)
+                if row is None:
+                    break
+                entries.append(row)
+                seq -= 1
+        else:
+            # Курсор страницы игрока указывает прямо на его следующую сделку
+            seq = end - 1 if cursor is not None else self._player_last.get(player_id, -1)
+            start = self._row(columns, capacity, seq) if seq >= 0 else None
+            if start is not None and start['player_id'] != player_id:
+                seq = self._player_last.get(player_id, -1)
+            while seq >= 0 and len(entries) < limit:
+                row = self._row(columns, capacity, seq)
+                if row is None:
+                    break
+                if seq < end:
+                    entries.append(row)
+                seq = row['player_prev']
+
+        # Следующая страница начинается со сделки seq, если она еще хранится
+        if len(entries) < limit or seq < self.oldest:
+            return entries, None
+        return entries, seq + 1
+
+class LotJournal(ColumnJournal):
+    """
+    Журнал исходов лотов одной игры - проданных и непроданных
+
+    Args:
+        capacity: Емкость массивов (лотов)
+        ring: Кольцевой режим - хранить только последние capacity лотов
+    """
+
+    COLUMNS = LOT_COLUMNS
+
+    def append(self, round_number, product_id, start_price, floor_price, price, drops,
+               winner_id=None, at=None):
+        """
+        Записывает исход лота (вызывается под блокировкой комнаты)
+
+        Args:
+            winner_id: Покупатель или None, если лот не продан
+
+        Returns:
+            int: Номер лота
+        """
+        seq, index = self._reserve()
+        seqs, rounds, products, starts, floors, prices, drop_counts, winners, times = self._arrays
+        seqs[index] = seq
+        rounds[index] = round_number
+        products[index] = product_id
+        starts[index] = int(start_price)
+        floors[index] = int(floor_price)
+        prices[index] = int(price)
+        drop_counts[index] = drops
+        winners[index] = -1 if winner_id is None else winner_id
+        times[index] = time.time() if at is None else at
+        self._commit(seq)
+        return seq
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+🚦 ОГРАНИЧЕНИЕ НАГРУЗКИ GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Token bucket по сессии и по игре + контроль допуска к движку
+Особенности:
+- Состояние корзины - два числа, пополнение считается лениво при обращении
+- Число корзин ограничено: простаивающие (полные) корзины выбрасываются
+- Если движок перегружен, запрос сразу получает 429 вместо ожидания в очереди
+- Счетчики показывают, сколько трафика было ограничено
+- Настройки проверяются при создании: скорость 0 отключает корзину
+"""
+
+import math
+import time
+import threading
+
+class RateLimiter:
+    """
+    Набор token bucket по ключу
+
+    Корзина хранится как список [токены, время последнего пополнения].
+    Пополнение считается при обращении, фоновых таймеров нет.
+
+    Args:
+        rate: Токенов в секунду
+        burst: Емкость корзины (сколько запросов можно сделать разом)
+        max_keys: Максимум корзин в памяти
+
+    Raises:
+        ValueError: Скорость не положительная или емкость меньше одного токена
+    """
+
+    def __init__(self, rate, burst, max_keys=100000):
+        if not rate > 0:
+            raise ValueError(f"скорость корзины должна быть больше 0, а не {rate}")
+        if not burst >= 1:
+            raise ValueError(f"емкость корзины должна быть не меньше 1, а не {burst}")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key, now=None):
+        """
+        Забирает один токен из корзины ключа
+
+        Returns:
+            float: 0.0, если токен выдан, иначе через сколько секунд он появится
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._evict_idle(now)
+                bucket = self._buckets[key] = [self.burst, now]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return 0.0
+            return (1.0 - bucket[0]) / self.rate
+
+    def refund(self, key):
+        """Возвращает токен, выданный запросу, который потом отклонили"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + 1.0)
+
+    def _evict_idle(self, now):
+        """Выбрасывает корзины, которые уже успели наполниться (ключ простаивает)"""
+        full_after = self.burst / self.rate
+        idle = [key for key, (_, updated) in self._buckets.items() if now - updated >= full_after]
+        for key in idle:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            # Все ключи активны - жертвуем самыми старыми по вставке
+            for key in list(self._buckets)[:len(self._buckets) // 10 + 1]:
+                del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+class AdmissionController:
+    """
+    Контроль допуска к движку
+
+    Ограничивает число одновременно выполняемых тяжелых запросов.
+    Лишние запросы не ждут в очереди, а сразу получают отказ.
+    """
+
+    def __init__(self, max_inflight):
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self._lock = threading.Lock()
+
+    def try_enter(self):
+        """Пытается занять слот. Returns: bool"""
+        with self._lock:
+            if self.inflight >= self.max_inflight:
+                return False
+            self.inflight += 1
+            return True
+
+    def leave(self):
+        """Освобождает слот"""
+        with self._lock:
+            self.inflight -= 1
+
+class TrafficShaper:
+    """
+    Ограничение запросов к тяжелым маршрутам (раунды и покупки)
+
+    Порядок проверок: корзина сессии, корзина игры, свободный слот движка.
+    Отклоненный запрос не тратит токены: выданные до отказа возвращаются.
+    Каждый отказ учитывается в счетчиках metrics(). Скорость 0 снимает
+    ограничение (корзина не создается).
+
+    Raises:
+        ValueError: Отрицательная скорость или емкость меньше 1 (см. RateLimiter)
+    """
+
+    def __init__(self, session_rate=5, session_burst=10,
+                 game_rate=50, game_burst=100, max_inflight=64):
+        self.session_limiter = _limiter(session_rate, session_burst)
+        self.game_limiter = _limiter(game_rate, game_burst)
+        self.admission = AdmissionController(max_inflight)
+        self._counters = {}
+        self._counters_lock = threading.Lock()
+
+    def _count(self, route, outcome):
+        with self._counters_lock:
+            per_route = self._counters.setdefault(route, {
+                'allowed': 0, 'limited_session': 0, 'limited_game': 0, 'shed': 0
+            })
+            per_route[outcome] += 1
+
+    def admit(self, route, session_key, game_id):
+        """
+        Решает, пропустить ли запрос
+
+        Returns:
+            float | None: None - запрос пропущен (после обработки вызвать release()),
+            иначе рекомендуемый Retry-After в секундах
+        """
+        now = time.monotonic()
+        session_limiter = self.session_limiter
+        game_limiter = self.game_limiter
+        retry_after = session_limiter.acquire(session_key, now) if session_limiter is not None else 0.0
+        if retry_after:
+            self._count(route, 'limited_session')
+            return retry_after
+
+        retry_after = game_limiter.acquire(game_id, now) if game_limiter is not None else 0.0
+        if retry_after:
+            if session_limiter is not None:
+                session_limiter.refund(session_key)
+            self._count(route, 'limited_game')
+            return retry_after
+
+        if not self.admission.try_enter():
+            if session_limiter is not None:
+                session_limiter.refund(session_key)
+            if game_limiter is not None:
+                game_limiter.refund(game_id)
+            self._count(route, 'shed')
+            return 1.0
+
+        self._count(route, 'allowed')
+        return None
+
+    def release(self):
+        """Освобождает слот движка после обработки пропущенного запроса"""
+        self.admission.leave()
+
+    def metrics(self):
+        """Счетчики ограничения трафика"""
+        with self._counters_lock:
+            routes = {route: dict(counters) for route, counters in self._counters.items()}
+        totals = {'allowed': 0, 'limited_session': 0, 'limited_game': 0, 'shed': 0}
+        for counters in routes.values():
+            for outcome, value in counters.items():
+                totals[outcome] += value
+        rejected = totals['limited_session'] + totals['limited_game'] + totals['shed']
+        handled = totals['allowed'] + rejected
+        return {
+            'routes': routes,
+            'totals': totals,
+            'shaped_ratio': round(rejected / handled, 4) if handled else 0.0,
+            'inflight': self.admission.inflight,
+            'max_inflight': self.admission.max_inflight,
+            'tracked_sessions': len(self.session_limiter) if self.session_limiter is not None else 0,
+            'tracked_games': len(self.game_limiter) if self.game_limiter is not None else 0
+        }
+
+def _limiter(rate, burst):
+    """RateLimiter или None, если скорость 0 (без ограничения)"""
+    if rate == 0:
+        return None
+    return RateLimiter(rate, burst)
+
+def retry_after_header(seconds):
+    """Значение заголовка Retry-After (целые секунды, не меньше 1)"""
+    return str(max(1, math.ceil(seconds)))
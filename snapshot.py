@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+💾 СНИМКИ СОСТОЯНИЯ ИГР GOLAN
+
+Автор: Golan Auction Team
+Версия: 2.0
+Описание: Компактный двоичный снимок всех комнат, чтобы перезапуск
+или обновление сервера не обрывали начатые игры
+Особенности:
+- Комната копируется под своей блокировкой (RoomImage.capture) - пауза
+  только этой комнаты на время копирования столбцов; кодирование,
+  сжатие и запись на диск идут уже без блокировок
+- Игроки и товары хранятся по столбцам: числа - упакованные массивы
+  (array), строки - общая таблица уникальных строк и индексы в ней
+- Снимок сжимается zlib (быстрый уровень), запись атомарная
+- Журналы сделок и лотов комнаты пишутся теми же упакованными столбцами
+- Восстановление - распаковка столбцов и сборка моделей, без разбора
+  каждого игрока из JSON
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import threading
+from array import array
+from operator import attrgetter
+
+from auction_core import Player, Product, Game
+from ledger import LEDGER_COLUMNS, LOT_COLUMNS
+
+# Сигнатура файла и версия формата (снимок другой версии не читается)
+MAGIC = b'GOLSNAP'
+FORMAT_VERSION = 1
+
+# Столбцы моделей: атрибут и вид значения
+# n - число (int64, если все значения целые, иначе float64), s - строка или None, b - флаг
+PLAYER_COLUMNS = (
+    ('id', 'n'), ('name', 's'), ('balance', 'n'), ('initial_balance', 'n'),
+    ('wants', 's'), ('no_wants', 's'), ('total_profit', 'n'), ('purchases', 'n'),
+    ('sales', 'n'), ('is_user', 'b'), ('session_id', 's'), ('strategy', 's')
+)
+PRODUCT_COLUMNS = (
+    ('id', 'n'), ('name', 's'), ('cost', 'n'), ('initial_price', 'n'),
+    ('current_price', 'n'), ('quantity', 'n'), ('initial_quantity', 'n'), ('description', 's')
+)
+
+_LENGTH = struct.Struct('<I')
+
+class RoomImage:
+    """
+    Копия состояния одной комнаты
+
+    Атрибуты:
+    - settings: Настройки и текущая игра комнаты (словарь, как в архиве)
+    - players: Столбцы игроков {атрибут: список значений}
+    - products: Столбцы товаров {атрибут: список значений}
+    - ledger: Столбцы журнала сделок {столбец: array} (ColumnJournal.export_columns)
+    - lots: Столбцы журнала лотов {столбец: array}
+    """
+
+    def __init__(self, settings, players, products, ledger=None, lots=None):
+        self.settings = settings
+        self.players = players
+        self.products = products
+        self.ledger = ledger if ledger is not None else {name: array(code) for name, code in LEDGER_COLUMNS}
+        self.lots = lots if lots is not None else {name: array(code) for name, code in LOT_COLUMNS}
+
+    @classmethod
+    def capture(cls, settings, players, products, ledger=None, lots=None):
+        """Копирует столбцы моделей и журналов (вызывается под блокировкой комнаты)"""
+        return cls(
+            settings,
+            {name: list(map(attrgetter(name), players)) for name, _ in PLAYER_COLUMNS},
+            {name: list(map(attrgetter(name), products)) for name, _ in PRODUCT_COLUMNS},
+            ledger.export_columns() if ledger is not None else None,
+            lots.export_columns() if lots is not None else None
+        )
+
+    @property
+    def player_count(self):
+        return len(self.players['id'])
+
+    def build_players(self):
+        """Игроки из столбцов"""
+        return _build_models(Player, self.players, PLAYER_COLUMNS, Player(0, '', 0, '', ''))
+
+    def build_products(self):
+        """Товары из столбцов"""
+        return _build_models(Product, self.products, PRODUCT_COLUMNS, Product(0, '', 0, 0, 0))
+
+    def build_game(self):
+        """Текущая игровая сессия или None"""
+        data = self.settings.get('current_game')
+        return Game.from_dict(data) if data else None
+
+def _build_models(cls, columns, layout, template):
+    """
+    Собирает модели по строкам столбцов без вызова конструктора
+
+    Атрибуты модели - сохраненные столбцы; атрибуты, которых нет
+    в снимке, получают значения по умолчанию из шаблона.
+    """
+    names = [name for name, _ in layout]
+    missing = {key: value for key, value in vars(template).items() if key not in names}
+    new = object.__new__
+    models = []
+    for values in zip(*(columns[name] for name in names)):
+        model = new(cls)
+        state = dict(zip(names, values))
+        if missing:
+            state.update(missing)
+        model.__dict__ = state
+        models.append(model)
+    return models
+
+# ============================================================================
+# КОДИРОВАНИЕ
+# ============================================================================
+
+def _encode_column(values, kind, strings):
+    """Столбец в байты: код типа (1 байт) + упакованный массив"""
+    if kind == 's':
+        return b'i' + array('i', [-1 if v is None else strings.setdefault(v, len(strings))
+                                  for v in values]).tobytes()
+    if kind == 'b':
+        return b'B' + bytes(map(bool, values))
+    if all(type(v) is int for v in values):
+        try:
+            return b'q' + array('q', values).tobytes()
+        except OverflowError:
+            pass
+    return b'd' + array('d', values).tobytes()
+
+def _encode_array(values):
+    """Столбец журнала (array) в байты: код типа + массив; long пишется как int64"""
+    if values.typecode == 'l':
+        values = array('q', values)
+    return values.typecode.encode('ascii') + values.tobytes()
+
+def _decode_array(blob, swap):
+    """Байты столбца журнала обратно в array"""
+    values = array(chr(blob[0]))
+    values.frombytes(blob[1:])
+    if swap:
+        values.byteswap()
+    return values
+
+def _decode_column(blob, kind, strings, swap):
+    """Байты столбца обратно в список значений"""
+    typecode = chr(blob[0])
+    if typecode == 'B':
+        return [bool(v) for v in blob[1:]]
+    values = array(typecode)
+    values.frombytes(blob[1:])
+    if swap:
+        values.byteswap()
+    if kind == 's':
+        return [None if i < 0 else strings[i] for i in values]
+    return values.tolist()
+
+def encode_snapshot(images, level=1):
+    """
+    Кодирует снимок комнат
+
+    Формат: MAGIC, версия (1 байт), затем zlib от последовательности
+    блоков с длиной: заголовок JSON (настройки комнат, таблица строк),
+    далее столбцы игроков, товаров, журнала сделок и журнала лотов каждой
+    комнаты по порядку.
+
+    Returns:
+        tuple: (байты снимка, размер до сжатия)
+    """
+    strings = {}
+    columns = []
+    for image in images:
+        for name, kind in PLAYER_COLUMNS:
+            columns.append(_encode_column(image.players[name], kind, strings))
+        for name, kind in PRODUCT_COLUMNS:
+            columns.append(_encode_column(image.products[name], kind, strings))
+        for name, _ in LEDGER_COLUMNS:
+            columns.append(_encode_array(image.ledger[name]))
+        for name, _ in LOT_COLUMNS:
+            columns.append(_encode_array(image.lots[name]))
+
+    header = json.dumps({
+        'byteorder': sys.byteorder,
+        'created': time.time(),
+        'rooms': [image.settings for image in images],
+        'strings': list(strings)
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    body = bytearray()
+    for block in [header] + columns:
+        body += _LENGTH.pack(len(block))
+        body += block
+    return MAGIC + bytes([FORMAT_VERSION]) + zlib.compress(body, level), len(body)
+
+def decode_snapshot(data):
+    """
+    Декодирует снимок
+
+    Returns:
+        list: RoomImage в порядке записи
+
+    Raises:
+        ValueError: Не снимок или неизвестная версия формата
+    """
+    if data[:len(MAGIC)] != MAGIC or len(data) <= len(MAGIC) or data[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError('неизвестный формат снимка')
+    body = memoryview(zlib.decompress(data[len(MAGIC) + 1:]))
+
+    blocks = []
+    offset = 0
+    while offset < len(body):
+        (length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        blocks.append(body[offset:offset + length])
+        offset += length
+
+    header = json.loads(bytes(blocks[0]).decode('utf-8'))
+    strings = header['strings']
+    swap = header['byteorder'] != sys.byteorder
+    columns = iter(blocks[1:])
+
+    images = []
+    for settings in header['rooms']:
+        players = {name: _decode_column(next(columns), kind, strings, swap) for name, kind in PLAYER_COLUMNS}
+        products = {name: _decode_column(next(columns), kind, strings, swap) for name, kind in PRODUCT_COLUMNS}
+        ledger = {name: _decode_array(next(columns), swap) for name, _ in LEDGER_COLUMNS}
+        lots = {name: _decode_array(next(columns), swap) for name, _ in LOT_COLUMNS}
+        images.append(RoomImage(settings, players, products, ledger, lots))
+    return images
+
+# ============================================================================
+# ХРАНИЛИЩЕ
+# ============================================================================
+
+class SnapshotStore:
+    """
+    Файл снимка на диске
+
+    Args:
+        path: Путь к файлу снимка (папка создается при первой записи)
+        level: Уровень zlib
+    """
+
+    def __init__(self, path, level=1):
+        self.path = path
+        self.level = level
+        self._lock = threading.Lock()
+
+    def save(self, images):
+        """
+        Кодирует и атомарно записывает снимок
+
+        Returns:
+            dict: Комнаты, игроки, размер (байты), время кодирования и записи (мс)
+        """
+        started = time.perf_counter()
+        data, raw_size = encode_snapshot(images, self.level)
+        encoded = time.perf_counter()
+        temp_path = f'{self.path}.{threading.get_ident()}.tmp'
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        return {
+            'rooms': len(images),
+            'players': sum(image.player_count for image in images),
+            'bytes': len(data),
+            'raw_bytes': raw_size,
+            'encode_ms': round((encoded - started) * 1000, 2),
+            'write_ms': round((time.perf_counter() - encoded) * 1000, 2)
+        }
+
+    def load(self):
+        """Читает и декодирует снимок; None, если снимка нет или он поврежден"""
+        try:
+            with open(self.path, 'rb') as f:
+                return decode_snapshot(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, StopIteration, zlib.error) as e:
+            print(f"Ошибка чтения снимка {self.path}: {e}")
+            return None
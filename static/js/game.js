@@ -14,15 +14,38 @@ document.addEventListener("DOMContentLoaded", function () {
 
   // Состояние игры
   let gameState = {
-    game: { status: "waiting", round: 0, current_lot: null },
+    game: { status: "waiting", current_round: 0, current_product_id: null },
     players: [],
     products: [],
+    lot: null,
   };
 
   let userData = null;
 
+  // Разница часов сервера и браузера (мс): цена лота считается по времени сервера
+  let serverOffset = 0;
+
+  // Поток состояния (EventSource) и версия последнего полученного состояния;
+  // пока вкладка скрыта, поток закрыт
+  let stateStream = null;
+  let stateVersion = -1;
+  let pollGeneration = 0;
+  let pollAbort = null;
+
+  // Отложенная перерисовка (один кадр на несколько изменений) и карточки игроков по id
+  let renderFrame = null;
+  const playerCards = new Map();
+
+  // Часы лота: кадр анимации и последний показанный шаг
+  let clockFrame = null;
+  let shownTick = -1;
+  let shownResultLot = null;
+
   // Простые API функции
-  async function apiCall(url, method = "GET", data = null) {
+  // idempotent - действие (покупка, раунд): запрос уходит с Idempotency-Key
+  // и после сетевой ошибки повторяется один раз с тем же ключом - сервер
+  // вернет сохраненный ответ, а не выполнит действие второй раз
+  async function apiCall(url, method = "GET", data = null, idempotent = false) {
     const options = {
       method: method,
       headers: {
@@ -33,9 +56,44 @@ document.addEventListener("DOMContentLoaded", function () {
     if (data) {
       options.body = JSON.stringify(data);
     }
+    if (idempotent) {
+      options.headers["Idempotency-Key"] = newIdempotencyKey();
+    }
 
-    const response = await fetch(url, options);
-    return await response.json();
+    const sentAt = Date.now();
+    let response;
+    try {
+      response = await fetch(url, options);
+    } catch (error) {
+      if (!idempotent) {
+        throw error;
+      }
+      response = await fetch(url, options);
+    }
+    const result = await response.json();
+    syncClock(
+      Number(response.headers.get("X-Server-Time")) || result.server_time,
+      sentAt
+    );
+    return result;
+  }
+
+  function newIdempotencyKey() {
+    if (window.crypto && window.crypto.randomUUID) {
+      return window.crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+  }
+
+  // Сверяет часы с сервером (середина запроса ~ время ответа сервера)
+  function syncClock(serverTime, sentAt) {
+    if (serverTime) {
+      serverOffset = serverTime - (sentAt + Date.now()) / 2;
+    }
+  }
+
+  function serverNow() {
+    return Date.now() + serverOffset;
   }
 
   // Форматирование денег
@@ -72,12 +130,11 @@ document.addEventListener("DOMContentLoaded", function () {
     }, 3000);
   }
 
-  // Загружает состояние игры
+  // Загружает состояние игры (один раз при открытии; дальше - поток)
   async function loadGameState() {
     try {
       const response = await apiCall("/api/game/status");
-      gameState = response;
-      updateUI();
+      applyState(response);
 
       // Загружаем данные пользователя
       await loadUserData();
@@ -87,25 +144,160 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   }
 
+  // Применяет новое состояние игры
+  function applyState(state) {
+    const wasPlaying = gameState.game && gameState.game.status === "playing";
+    gameState = state;
+
+    // Данные пользователя берутся из списка игроков, без отдельного запроса
+    if (userData && gameState.players) {
+      userData =
+        gameState.players.find((player) => player.id === userData.id) ||
+        userData;
+    }
+
+    scheduleRender();
+
+    if (wasPlaying && gameState.game && gameState.game.status === "finished") {
+      showNotification("Игра завершена!", "info");
+    }
+  }
+
+  // Подписка на изменения состояния: поток SSE, без EventSource - long-poll
+  function connectStateStream() {
+    disconnectStateStream();
+    if (document.hidden) {
+      return;
+    }
+
+    if (!window.EventSource) {
+      pollState(pollGeneration);
+      return;
+    }
+    stateStream = new EventSource("/api/game/stream");
+    stateStream.addEventListener("state", (event) => {
+      stateVersion = Number(event.lastEventId);
+      applyState(JSON.parse(event.data));
+    });
+  }
+
+  function disconnectStateStream() {
+    if (stateStream) {
+      stateStream.close();
+      stateStream = null;
+    }
+    pollGeneration += 1;
+    if (pollAbort) {
+      pollAbort.abort();
+      pollAbort = null;
+    }
+  }
+
+  async function pollState(generation) {
+    while (generation === pollGeneration) {
+      try {
+        const sentAt = Date.now();
+        pollAbort = new AbortController();
+        const response = await fetch(
+          `/api/game/poll?since=${stateVersion}&timeout=25`,
+          { signal: pollAbort.signal }
+        );
+        if (response.status === 200) {
+          stateVersion = Number(response.headers.get("X-State-Version"));
+          syncClock(Number(response.headers.get("X-Server-Time")), sentAt);
+          applyState(await response.json());
+        } else if (response.status !== 204) {
+          await new Promise((resolve) => setTimeout(resolve, 3000));
+        }
+      } catch (error) {
+        if (generation === pollGeneration) {
+          await new Promise((resolve) => setTimeout(resolve, 3000));
+        }
+      }
+    }
+  }
+
+  // Скрытая вкладка не держит соединение и не анимирует цену; при возврате
+  // первый кадр потока - текущее состояние
+  function handleVisibilityChange() {
+    if (document.hidden) {
+      disconnectStateStream();
+      stopLotClock();
+    } else {
+      connectStateStream();
+    }
+  }
+
   // Загружает данные пользователя
   async function loadUserData() {
     try {
       const response = await apiCall("/api/user/data");
       if (response.success) {
         userData = response.user_data;
-        updateUserInfo();
+        scheduleRender();
       }
     } catch (error) {
       console.log("Пользователь не найден");
     }
   }
 
+  // Планирует перерисовку: несколько изменений за кадр - одна перерисовка
+  function scheduleRender() {
+    if (renderFrame === null) {
+      renderFrame = requestAnimationFrame(() => {
+        renderFrame = null;
+        updateUI();
+        showLotResult();
+      });
+    }
+  }
+
+  // Меняет текст узла, только если он изменился
+  function setText(el, text) {
+    if (el && el.textContent !== text) {
+      el.textContent = text;
+    }
+  }
+
+  // Меняет свойство стиля узла, только если оно изменилось
+  // (браузер нормализует цвета, поэтому заданное значение хранится в data-)
+  function setStyle(el, property, value) {
+    const key = "style" + property.charAt(0).toUpperCase() + property.slice(1);
+    if (el && el.dataset[key] !== value) {
+      el.dataset[key] = value;
+      el.style[property] = value;
+    }
+  }
+
+  function field(root, role) {
+    return root.querySelector(`[data-role="${role}"]`);
+  }
+
+  // Перерисовывает разметку блока, только если сменился ее ключ
+  // (товар лота, наличие пользователя); иначе блок обновляется по полям
+  function renderOnce(el, key, html) {
+    if (el.dataset.viewKey !== key) {
+      el.dataset.viewKey = key;
+      el.innerHTML = html;
+      return true;
+    }
+    return false;
+  }
+
+  function formatProfit(amount) {
+    return (amount >= 0 ? "+" : "") + formatMoney(amount);
+  }
+
+  function profitColor(amount) {
+    return amount >= 0 ? "#10b981" : "#ef4444";
+  }
+
   // Обновляет интерфейс
   function updateUI() {
     // Обновляем статус игры
     if (gameState.game) {
-      gameStatusEl.textContent = getStatusText(gameState.game.status);
-      gameRoundEl.textContent = `Раунд: ${gameState.game.current_round || 0}`;
+      setText(gameStatusEl, getStatusText(gameState.game.status));
+      setText(gameRoundEl, `Раунд: ${gameState.game.current_round || 0}`);
     }
 
     // Обновляем кнопки
@@ -123,8 +315,26 @@ document.addEventListener("DOMContentLoaded", function () {
 
   // Обновляет информацию о пользователе
   function updateUserInfo() {
-    if (userData && userInfoEl) {
-      userInfoEl.innerHTML = `
+    if (!userInfoEl) {
+      return;
+    }
+    if (!userData) {
+      renderOnce(
+        userInfoEl,
+        "empty",
+        `
+                <div style="text-align: center; padding: 20px; color: #6b7280;">
+                    <p style="font-size: 14px;">Начните игру, чтобы увидеть ваш профиль</p>
+                </div>
+            `
+      );
+      return;
+    }
+
+    renderOnce(
+      userInfoEl,
+      "user",
+      `
                 <div class="user-card" style="
                     background: #f8fafc;
                     padding: 20px;
@@ -135,46 +345,36 @@ document.addEventListener("DOMContentLoaded", function () {
                     <div class="user-stats" style="display: grid; gap: 8px;">
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Баланс:</span>
-                            <span style="color: #10b981; font-weight: 600; font-size: 14px;">${formatMoney(
-                              userData.balance
-                            )}</span>
+                            <span data-role="balance" style="color: #10b981; font-weight: 600; font-size: 14px;"></span>
                         </div>
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Прибыль:</span>
-                            <span style="color: ${
-                              userData.total_profit >= 0 ? "#10b981" : "#ef4444"
-                            }; font-weight: 600; font-size: 14px;">${
-        userData.total_profit >= 0 ? "+" : ""
-      }${formatMoney(userData.total_profit)}</span>
+                            <span data-role="profit" style="font-weight: 600; font-size: 14px;"></span>
                         </div>
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Покупки:</span>
-                            <span style="color: #f59e0b; font-weight: 600; font-size: 14px;">${
-                              userData.purchases
-                            }</span>
+                            <span data-role="purchases" style="color: #f59e0b; font-weight: 600; font-size: 14px;"></span>
                         </div>
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Любимый:</span>
-                            <span style="color: #8b5cf6; font-weight: 600; font-size: 14px;">${
-                              userData.wants
-                            }</span>
+                            <span data-role="wants" style="color: #8b5cf6; font-weight: 600; font-size: 14px;"></span>
                         </div>
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Не любит:</span>
-                            <span style="color: #ef4444; font-weight: 600; font-size: 14px;">${
-                              userData.no_wants
-                            }</span>
+                            <span data-role="no-wants" style="color: #ef4444; font-weight: 600; font-size: 14px;"></span>
                         </div>
                     </div>
                 </div>
-            `;
-    } else if (userInfoEl) {
-      userInfoEl.innerHTML = `
-                <div style="text-align: center; padding: 20px; color: #6b7280;">
-                    <p style="font-size: 14px;">Начните игру, чтобы увидеть ваш профиль</p>
-                </div>
-            `;
-    }
+            `
+    );
+
+    const profitEl = field(userInfoEl, "profit");
+    setText(field(userInfoEl, "balance"), formatMoney(userData.balance));
+    setText(profitEl, formatProfit(userData.total_profit));
+    setStyle(profitEl, "color", profitColor(userData.total_profit));
+    setText(field(userInfoEl, "purchases"), String(userData.purchases));
+    setText(field(userInfoEl, "wants"), userData.wants);
+    setText(field(userInfoEl, "no-wants"), userData.no_wants);
   }
 
   // Возвращает текстовое описание статуса
@@ -197,104 +397,184 @@ document.addEventListener("DOMContentLoaded", function () {
     resetGameBtn.disabled = false;
   }
 
+  // Текущий лот: товар раунда и расписание цены, если лот торгуется сейчас
+  function getCurrentLot() {
+    const productId = gameState.game && gameState.game.current_product_id;
+    const product = (gameState.products || []).find(
+      (p) => p.id === productId
+    );
+    if (!product) {
+      return null;
+    }
+    const schedule =
+      gameState.lot &&
+      gameState.lot.status === "live" &&
+      gameState.lot.product_id === product.id
+        ? gameState.lot
+        : null;
+    return { product: product, schedule: schedule };
+  }
+
+  // Шаг часов лота по времени сервера
+  function lotTick(schedule) {
+    return Math.max(
+      0,
+      Math.floor((serverNow() - schedule.opened_at) / schedule.tick_ms)
+    );
+  }
+
+  // Цена лота на шаге tick - та же лестница цен, что на сервере (price_ladder)
+  function lotPrice(schedule, tick) {
+    let price = schedule.start_price;
+    for (let drop = 0; drop < Math.min(tick, schedule.max_drops); drop++) {
+      price = Math.trunc(price * (1 - schedule.step_ratio));
+      if (price <= schedule.floor) {
+        return schedule.floor;
+      }
+    }
+    return price;
+  }
+
+  // Кадр анимации: меняются только узлы цены, и только при новом шаге
+  function runLotClock() {
+    clockFrame = null;
+    const current = getCurrentLot();
+    if (!current || !current.schedule) {
+      return;
+    }
+    const tick = lotTick(current.schedule);
+    if (tick !== shownTick) {
+      shownTick = tick;
+      renderLotPrice(current.product, lotPrice(current.schedule, tick));
+    }
+    clockFrame = requestAnimationFrame(runLotClock);
+  }
+
+  function startLotClock() {
+    if (clockFrame === null) {
+      clockFrame = requestAnimationFrame(runLotClock);
+    }
+  }
+
+  function stopLotClock() {
+    if (clockFrame !== null) {
+      cancelAnimationFrame(clockFrame);
+      clockFrame = null;
+    }
+  }
+
+  // Обновляет цену, прибыль и кнопку покупки на карточке лота
+  function renderLotPrice(product, price) {
+    const canBuy = Boolean(userData && userData.balance >= price);
+    const buyEl = field(currentLotEl, "lot-buy");
+    setText(field(currentLotEl, "lot-price"), formatMoney(price));
+    setText(field(currentLotEl, "lot-profit"), formatMoney(product.cost - price));
+    if (buyEl) {
+      if (buyEl.disabled === canBuy) {
+        buyEl.disabled = !canBuy;
+      }
+      setStyle(buyEl, "background", canBuy ? "#10b981" : "#d1d5db");
+      setStyle(buyEl, "cursor", canBuy ? "pointer" : "not-allowed");
+      setText(
+        buyEl,
+        canBuy ? "🛒 Купить за " + formatMoney(price) : "❌ Недостаточно средств"
+      );
+    }
+  }
+
   // Обновляет отображение текущего лота
   function updateCurrentLot() {
-    if (gameState.game && gameState.game.current_lot) {
-      const lot = gameState.game.current_lot;
-      const canBuy = userData && userData.balance >= lot.current_price;
+    const current = getCurrentLot();
+    if (!current) {
+      stopLotClock();
+      renderOnce(
+        currentLotEl,
+        "none",
+        `
+                <div style="text-align: center; padding: 40px; color: #6b7280;">
+                    <h3 style="color: #374151; font-size: 16px; margin-bottom: 8px;">💎 Товар не выбран</h3>
+                    <p style="font-size: 14px;">Нажмите "Следующий раунд" чтобы начать торги</p>
+                </div>
+            `
+      );
+      return;
+    }
 
-      currentLotEl.innerHTML = `
+    const lot = current.product;
+    renderOnce(
+      currentLotEl,
+      `lot-${lot.id}-${userData ? "user" : "guest"}`,
+      `
                 <div class="lot-info" style="
                     background: #f8fafc;
                     padding: 20px;
                     border-radius: 8px;
                     border: 1px solid #e2e8f0;
                 ">
-                    <h3 style="margin: 0 0 16px 0; color: #1a202c; font-size: 18px; font-weight: 600;">${
-                      lot.name
-                    }</h3>
+                    <h3 data-role="lot-name" style="margin: 0 0 16px 0; color: #1a202c; font-size: 18px; font-weight: 600;"></h3>
                     <div class="lot-details" style="display: grid; gap: 8px; margin-bottom: 20px;">
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Количество:</span> 
-                            <span style="color: #3b82f6; font-weight: 600; font-size: 14px;">${
-                              lot.quantity
-                            } шт.</span>
+                            <span data-role="lot-quantity" style="color: #3b82f6; font-weight: 600; font-size: 14px;"></span>
                         </div>
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Текущая цена:</span> 
-                            <span style="color: #10b981; font-weight: 600; font-size: 16px;">${formatMoney(
-                              lot.current_price
-                            )}</span>
+                            <span data-role="lot-price" style="color: #10b981; font-weight: 600; font-size: 16px;"></span>
                         </div>
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Себестоимость:</span> 
-                            <span style="color: #f59e0b; font-weight: 600; font-size: 14px;">${formatMoney(
-                              lot.cost
-                            )}</span>
+                            <span data-role="lot-cost" style="color: #f59e0b; font-weight: 600; font-size: 14px;"></span>
                         </div>
                         <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
                             <span style="color: #6b7280; font-size: 14px;">Потенциальная прибыль:</span> 
-                            <span style="color: #8b5cf6; font-weight: 600; font-size: 14px;">${formatMoney(
-                              lot.cost - lot.current_price
-                            )}</span>
+                            <span data-role="lot-profit" style="color: #8b5cf6; font-weight: 600; font-size: 14px;"></span>
                         </div>
                     </div>
                     ${
                       userData
                         ? `
                         <div class="user-actions" style="text-align: center;">
-                            <button onclick="buyProduct(${lot.id})" 
+                            <button data-role="lot-buy" onclick="buyProduct(${lot.id})" 
                                     style="
-                                        background: ${
-                                          canBuy ? "#10b981" : "#d1d5db"
-                                        };
                                         color: white;
                                         border: none;
                                         padding: 12px 24px;
                                         font-size: 14px;
                                         font-weight: 600;
                                         border-radius: 8px;
-                                        cursor: ${
-                                          canBuy ? "pointer" : "not-allowed"
-                                        };
                                         transition: all 0.2s;
                                         min-width: 160px;
                                     "
                                     onmouseover="if(this.style.cursor === 'pointer') this.style.background = '#059669'"
-                                    onmouseout="this.style.background = '${
-                                      canBuy ? "#10b981" : "#d1d5db"
-                                    }'"
-                                    ${!canBuy ? "disabled" : ""}>
-                                ${
-                                  canBuy
-                                    ? "🛒 Купить за " +
-                                      formatMoney(lot.current_price)
-                                    : "❌ Недостаточно средств"
-                                }
+                                    onmouseout="this.style.background = this.disabled ? '#d1d5db' : '#10b981'">
                             </button>
                         </div>
                     `
                         : ""
                     }
                 </div>
-            `;
+            `
+    );
+
+    setText(field(currentLotEl, "lot-name"), lot.name);
+    setText(field(currentLotEl, "lot-quantity"), `${lot.quantity} шт.`);
+    setText(field(currentLotEl, "lot-cost"), formatMoney(lot.cost));
+    if (current.schedule) {
+      shownTick = lotTick(current.schedule);
+      renderLotPrice(lot, lotPrice(current.schedule, shownTick));
+      startLotClock();
     } else {
-      currentLotEl.innerHTML = `
-                <div style="text-align: center; padding: 40px; color: #6b7280;">
-                    <h3 style="color: #374151; font-size: 16px; margin-bottom: 8px;">💎 Товар не выбран</h3>
-                    <p style="font-size: 14px;">Нажмите "Следующий раунд" чтобы начать торги</p>
-                </div>
-            `;
+      stopLotClock();
+      renderLotPrice(lot, lot.current_price);
     }
   }
 
-  // Обновляет список игроков
-  function updatePlayersList() {
-    if (gameState.players && gameState.players.length > 0) {
-      playersListEl.innerHTML = gameState.players
-        .map(
-          (player) => `
-                <div class="player-card" style="
+  // Карточка игрока (создается один раз на id игрока)
+  function createPlayerCard(player) {
+    const card = document.createElement("div");
+    card.className = "player-card";
+    card.dataset.playerId = player.id;
+    card.style.cssText = `
                     background: rgba(255, 255, 255, 0.9);
                     padding: 15px;
                     border-radius: 10px;
@@ -302,8 +582,9 @@ document.addEventListener("DOMContentLoaded", function () {
                     box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
                     text-align: center;
                     min-width: 150px;
-                ">
-                    <div class="player-avatar" style="
+                `;
+    card.innerHTML = `
+                    <div class="player-avatar" data-role="avatar" style="
                         width: 40px;
                         height: 40px;
                         background: #2196F3;
@@ -315,31 +596,62 @@ document.addEventListener("DOMContentLoaded", function () {
                         font-weight: bold;
                         font-size: 18px;
                         margin: 0 auto 10px;
-                    ">${player.name.charAt(0)}</div>
-                    <h3 style="margin: 0 0 10px 0; color: #333;">${
-                      player.name
-                    }</h3>
+                    "></div>
+                    <h3 data-role="name" style="margin: 0 0 10px 0; color: #333;"></h3>
                     <div style="font-size: 14px; color: #666;">
-                        <p style="margin: 5px 0;"><strong>Баланс:</strong> ${formatMoney(
-                          player.balance
-                        )}</p>
-                        <p style="margin: 5px 0;"><strong>Прибыль:</strong> <span style="color: ${
-                          player.total_profit >= 0 ? "#10b981" : "#ef4444"
-                        };">${player.total_profit >= 0 ? "+" : ""}${formatMoney(
-            player.total_profit
-          )}</span></p>
-                        <p style="margin: 5px 0;"><strong>Покупки:</strong> ${
-                          player.purchases
-                        }</p>
+                        <p style="margin: 5px 0;"><strong>Баланс:</strong> <span data-role="balance"></span></p>
+                        <p style="margin: 5px 0;"><strong>Прибыль:</strong> <span data-role="profit"></span></p>
+                        <p style="margin: 5px 0;"><strong>Покупки:</strong> <span data-role="purchases"></span></p>
                     </div>
-                </div>
-            `
-        )
-        .join("");
-    } else {
-      playersListEl.innerHTML =
-        '<p style="text-align: center; color: #666;">Загрузка игроков...</p>';
+                `;
+    return card;
+  }
+
+  // Обновляет список игроков: карточки по id игрока, меняются только изменившиеся поля
+  function updatePlayersList() {
+    const players = gameState.players || [];
+    if (players.length === 0) {
+      playerCards.clear();
+      renderOnce(
+        playersListEl,
+        "empty",
+        '<p style="text-align: center; color: #666;">Загрузка игроков...</p>'
+      );
+      return;
     }
+    if (renderOnce(playersListEl, "players", "")) {
+      playerCards.clear();
+    }
+
+    const seen = new Set();
+    players.forEach((player, index) => {
+      let card = playerCards.get(player.id);
+      if (!card) {
+        card = createPlayerCard(player);
+        playerCards.set(player.id, card);
+      }
+      seen.add(player.id);
+
+      const profitEl = field(card, "profit");
+      setText(field(card, "avatar"), player.name.charAt(0));
+      setText(field(card, "name"), player.name);
+      setText(field(card, "balance"), formatMoney(player.balance));
+      setText(profitEl, formatProfit(player.total_profit));
+      setStyle(profitEl, "color", profitColor(player.total_profit));
+      setText(field(card, "purchases"), String(player.purchases));
+
+      // Порядок карточек - как в списке игроков
+      if (playersListEl.children[index] !== card) {
+        playersListEl.insertBefore(card, playersListEl.children[index] || null);
+      }
+    });
+
+    playerCards.forEach((card, id) => {
+      if (!seen.has(id)) {
+        card.remove();
+        playerCards.delete(id);
+      }
+    });
   }
 
   // Начинает новую игру
@@ -352,7 +664,9 @@ document.addEventListener("DOMContentLoaded", function () {
         if (response.user_data) {
           userData = response.user_data;
         }
+        // Игра могла смениться (cookie комнаты) - переподключаем поток
         await loadGameState();
+        connectStateStream();
       } else {
         showNotification(response.message, "error");
       }
@@ -365,14 +679,18 @@ document.addEventListener("DOMContentLoaded", function () {
   // Покупает товар
   async function buyProduct(productId) {
     try {
-      const response = await apiCall("/api/user/buy", "POST", {
-        product_id: productId,
-      });
+      const response = await apiCall(
+        "/api/user/buy",
+        "POST",
+        { product_id: productId },
+        true
+      );
 
       if (response.success) {
+        // Новое состояние придет в потоке
         showNotification(response.message, "success");
         userData = response.user_data;
-        await loadGameState();
+        scheduleRender();
       } else {
         showNotification(response.message, "error");
       }
@@ -385,80 +703,21 @@ document.addEventListener("DOMContentLoaded", function () {
   // Делаем функцию покупки глобальной
   window.buyProduct = buyProduct;
 
-  // Переходит к следующему раунду
+  // Переходит к следующему раунду: лот торгуется в реальном времени,
+  // цену считает браузер, итог приходит в потоке состояния
   async function nextRound() {
     try {
-      const response = await apiCall("/api/game/next-round", "POST");
+      const response = await apiCall(
+        "/api/game/next-round",
+        "POST",
+        { live: true },
+        true
+      );
 
       if (response.success) {
-        // Обновляем состояние игры
-        if (gameState.game) {
-          gameState.game.round = response.round;
-          gameState.game.current_lot = response.current_lot;
-        }
-
-        if (response.game_over) {
-          gameState.game.status = "finished";
-          showNotification(response.message, "info");
-        }
-
-        updateUI();
-
-        // Показываем результат раунда
-        if (response.winner) {
-          auctionResultEl.innerHTML = `
-                        <div style="
-                            background: #f0fdf4;
-                            padding: 20px;
-                            border-radius: 8px;
-                            border: 1px solid #bbf7d0;
-                            text-align: center;
-                        ">
-                            <h3 style="color: #10b981; margin: 0 0 16px 0; font-size: 18px; font-weight: 600;">🏆 ${
-                              response.winner.name
-                            } купил!</h3>
-                            <div style="display: grid; gap: 8px; text-align: left; max-width: 300px; margin: 0 auto;">
-                                <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
-                                    <span style="color: #6b7280; font-size: 14px;">Товар:</span>
-                                    <span style="color: #1a202c; font-weight: 600; font-size: 14px;">${
-                                      response.current_lot.name
-                                    }</span>
-                                </div>
-                                <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
-                                    <span style="color: #6b7280; font-size: 14px;">Цена:</span>
-                                    <span style="color: #10b981; font-weight: 600; font-size: 14px;">${formatMoney(
-                                      response.winner.purchase_price
-                                    )}</span>
-                                </div>
-                                <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
-                                    <span style="color: #6b7280; font-size: 14px;">Прибыль:</span>
-                                    <span style="color: ${
-                                      response.winner.profit >= 0
-                                        ? "#10b981"
-                                        : "#ef4444"
-                                    }; font-weight: 600; font-size: 14px;">${
-            response.winner.profit >= 0 ? "+" : ""
-          }${formatMoney(response.winner.profit)}</span>
-                                </div>
-                            </div>
-                        </div>
-                    `;
-        } else {
-          auctionResultEl.innerHTML = `
-                        <div style="
-                            background: #fef3c7;
-                            padding: 20px;
-                            border-radius: 8px;
-                            border: 1px solid #fde68a;
-                            text-align: center;
-                        ">
-                            <h3 style="color: #f59e0b; margin: 0 0 8px 0; font-size: 16px; font-weight: 600;">⏳ Товар не продан</h3>
-                            <p style="color: #6b7280; font-size: 14px; margin: 0;">Цена снижена до ${formatMoney(
-                              response.current_lot.current_price
-                            )}</p>
-                        </div>
-                    `;
-        }
+        auctionResultEl.innerHTML = "";
+      } else if (response.game_over) {
+        showNotification(response.message, "info");
       } else {
         showNotification(response.message, "error");
       }
@@ -468,6 +727,75 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   }
 
+  // Показывает итог закрытого лота (один раз на лот)
+  function showLotResult() {
+    const lot = gameState.lot;
+    if (!lot || lot.status === "live" || lot.id === shownResultLot) {
+      return;
+    }
+    shownResultLot = lot.id;
+    const product =
+      (gameState.products || []).find((p) => p.id === lot.product_id) || {};
+    const winner = (gameState.players || []).find(
+      (p) => p.id === lot.winner_id
+    );
+
+    if (winner) {
+      auctionResultEl.innerHTML = `
+                    <div style="
+                        background: #f0fdf4;
+                        padding: 20px;
+                        border-radius: 8px;
+                        border: 1px solid #bbf7d0;
+                        text-align: center;
+                    ">
+                        <h3 style="color: #10b981; margin: 0 0 16px 0; font-size: 18px; font-weight: 600;">🏆 ${
+                          winner.name
+                        } купил!</h3>
+                        <div style="display: grid; gap: 8px; text-align: left; max-width: 300px; margin: 0 auto;">
+                            <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
+                                <span style="color: #6b7280; font-size: 14px;">Товар:</span>
+                                <span style="color: #1a202c; font-weight: 600; font-size: 14px;">${
+                                  product.name
+                                }</span>
+                            </div>
+                            <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
+                                <span style="color: #6b7280; font-size: 14px;">Цена:</span>
+                                <span style="color: #10b981; font-weight: 600; font-size: 14px;">${formatMoney(
+                                  lot.price
+                                )}</span>
+                            </div>
+                            <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">
+                                <span style="color: #6b7280; font-size: 14px;">Прибыль:</span>
+                                <span style="color: ${
+                                  lot.profit >= 0
+                                    ? "#10b981"
+                                    : "#ef4444"
+                                }; font-weight: 600; font-size: 14px;">${
+        lot.profit >= 0 ? "+" : ""
+      }${formatMoney(lot.profit)}</span>
+                            </div>
+                        </div>
+                    </div>
+                `;
+    } else {
+      auctionResultEl.innerHTML = `
+                    <div style="
+                        background: #fef3c7;
+                        padding: 20px;
+                        border-radius: 8px;
+                        border: 1px solid #fde68a;
+                        text-align: center;
+                    ">
+                        <h3 style="color: #f59e0b; margin: 0 0 8px 0; font-size: 16px; font-weight: 600;">⏳ Товар не продан</h3>
+                        <p style="color: #6b7280; font-size: 14px; margin: 0;">Цена снижена до ${formatMoney(
+                          lot.price
+                        )}</p>
+                    </div>
+                `;
+    }
+  }
+
   // Сбрасывает игру
   async function resetGame() {
     try {
@@ -475,7 +803,6 @@ document.addEventListener("DOMContentLoaded", function () {
 
       if (response.success) {
         showNotification("Игра сброшена!", "success");
-        await loadGameState();
       } else {
         showNotification(response.message, "error");
       }
@@ -489,10 +816,9 @@ document.addEventListener("DOMContentLoaded", function () {
   startGameBtn.addEventListener("click", startGame);
   nextRoundBtn.addEventListener("click", nextRound);
   resetGameBtn.addEventListener("click", resetGame);
+  document.addEventListener("visibilitychange", handleVisibilityChange);
 
-  // Загружаем начальное состояние
+  // Загружаем начальное состояние и подписываемся на изменения
   loadGameState();
-
-  // Обновляем состояние каждые 3 секунды
-  setInterval(loadGameState, 3000);
+  connectStateStream();
 });
@@ -0,0 +1,205 @@
+// Страница статистики голландского аукциона
+document.addEventListener("DOMContentLoaded", function () {
+  // Получаем элементы DOM
+  const refreshBtn = document.getElementById("refreshStats");
+  const gameStatusEl = document.getElementById("gameStatus");
+  const totalProfitEl = document.getElementById("totalProfit");
+  const totalPurchasesEl = document.getElementById("totalPurchases");
+  const bestPlayerEl = document.getElementById("bestPlayer");
+  const playersRankingEl = document.getElementById("playersRanking");
+  const productsStatsEl = document.getElementById("productsStats");
+  const marketSummaryEl = document.getElementById("marketSummary");
+  const marketStatsEl = document.getElementById("marketStats");
+
+  // ID игры из адреса страницы (?game=...), иначе сервер возьмет его из cookie
+  const gameId = new URLSearchParams(window.location.search).get("game");
+  const statisticsUrl = gameId
+    ? `/api/game/statistics?game=${encodeURIComponent(gameId)}`
+    : "/api/game/statistics";
+
+  // Форматирование денег
+  function formatMoney(amount) {
+    return new Intl.NumberFormat("ru-RU").format(Math.round(amount)) + " ₽";
+  }
+
+  // Возвращает текстовое описание статуса
+  function getStatusText(status) {
+    const statusMap = {
+      waiting: "Ожидание начала",
+      playing: "Игра идет",
+      finished: "Игра завершена",
+    };
+    return statusMap[status] || "Нет игры";
+  }
+
+  // Рейтинг игроков
+  function renderRanking(players) {
+    if (!players || players.length === 0) {
+      playersRankingEl.innerHTML =
+        '<p style="text-align: center; color: #666;">Нет данных</p>';
+      return;
+    }
+    playersRankingEl.innerHTML = players
+      .map(
+        (player, index) => `
+                <div style="display: flex; justify-content: space-between; padding: 8px 12px; background: white; border-radius: 6px; border: 1px solid #e2e8f0; margin-bottom: 6px;">
+                    <span style="color: #1a202c; font-weight: 600; font-size: 14px;">${
+                      index + 1
+                    }. ${player.name}</span>
+                    <span style="color: ${
+                      player.total_profit >= 0 ? "#10b981" : "#ef4444"
+                    }; font-weight: 600; font-size: 14px;">${formatMoney(
+          player.total_profit
+        )} · ${player.purchases} покупок</span>
+                </div>
+            `
+      )
+      .join("");
+  }
+
+  // Остатки товаров
+  function renderProducts(products) {
+    if (!products || products.length === 0) {
+      productsStatsEl.innerHTML =
+        '<p style="text-align: center; color: #666;">Нет данных</p>';
+      return;
+    }
+    productsStatsEl.innerHTML = products
+      .map(
+        (product) => `
+                <div style="background: #f8fafc; padding: 12px; border-radius: 8px; border: 1px solid #e2e8f0;">
+                    <h3 style="margin: 0 0 8px 0; color: #1a202c; font-size: 15px;">${
+                      product.name
+                    }</h3>
+                    <div style="font-size: 13px; color: #6b7280;">Продано: ${
+                      product.initial_quantity - product.quantity
+                    } из ${product.initial_quantity}</div>
+                    <div style="font-size: 13px; color: #6b7280;">Цена: ${formatMoney(
+                      product.current_price
+                    )}</div>
+                </div>
+            `
+      )
+      .join("");
+  }
+
+  // Доля в процентах или прочерк
+  function formatShare(share) {
+    return share === null || share === undefined
+      ? "-"
+      : Math.round(share * 100) + "%";
+  }
+
+  // Мини-график средней цены сделок (точки ряда уже прорежены сервером)
+  function renderSparkline(series) {
+    if (!series || series.length < 2) {
+      return '<div style="font-size: 12px; color: #9ca3af;">Мало сделок для графика</div>';
+    }
+    const width = 220;
+    const height = 48;
+    const low = Math.min(...series.map((point) => point.min));
+    const high = Math.max(...series.map((point) => point.max));
+    const span = high - low || 1;
+    const points = series
+      .map((point, index) => {
+        const x = (index / (series.length - 1)) * width;
+        const y = height - ((point.avg - low) / span) * (height - 4) - 2;
+        return `${x.toFixed(1)},${y.toFixed(1)}`;
+      })
+      .join(" ");
+    return `<svg viewBox="0 0 ${width} ${height}" width="100%" height="${height}" preserveAspectRatio="none">
+                <polyline points="${points}" fill="none" stroke="#6366f1" stroke-width="2"/>
+            </svg>`;
+  }
+
+  // Гистограмма: сколько лотов продано после N снижений цены
+  function renderHistogram(histogram) {
+    const peak = Math.max(...histogram);
+    if (!peak) {
+      return '<div style="font-size: 12px; color: #9ca3af;">Лоты еще не продавались</div>';
+    }
+    const bars = histogram
+      .map(
+        (count, drops) => `
+                <div title="${drops} снижений: ${count}" style="flex: 1; background: ${
+                  count ? "#10b981" : "#e5e7eb"
+                }; height: ${Math.max(2, (count / peak) * 40)}px;"></div>`
+      )
+      .join("");
+    return `<div style="display: flex; align-items: flex-end; gap: 1px; height: 40px;">${bars}</div>
+            <div style="display: flex; justify-content: space-between; font-size: 11px; color: #9ca3af;">
+                <span>0 снижений</span><span>${histogram.length - 1}+</span>
+            </div>`;
+  }
+
+  // Аналитика рынка по товарам
+  function renderMarket(market) {
+    if (!market || !market.products || market.products.length === 0) {
+      marketSummaryEl.textContent = "";
+      marketStatsEl.innerHTML =
+        '<p style="text-align: center; color: #666;">Нет данных</p>';
+      return;
+    }
+    marketSummaryEl.textContent =
+      `Лотов: ${market.lots} · продано: ${market.lots_sold} · ` +
+      `не продано: ${market.lots_unsold} · продаваемость: ${formatShare(
+        market.sell_through
+      )}`;
+    marketStatsEl.innerHTML = market.products
+      .map(
+        (item) => `
+                <div style="background: #f8fafc; padding: 12px; border-radius: 8px; border: 1px solid #e2e8f0;">
+                    <h3 style="margin: 0 0 8px 0; color: #1a202c; font-size: 15px;">${
+                      item.name
+                    }</h3>
+                    <div style="font-size: 13px; color: #6b7280;">Сделок: ${
+                      item.sales
+                    } · средняя цена: ${
+          item.avg_price === null ? "-" : formatMoney(item.avg_price)
+        }</div>
+                    <div style="font-size: 13px; color: #6b7280;">Диапазон: ${
+                      item.min_price === null
+                        ? "-"
+                        : `${formatMoney(item.min_price)} – ${formatMoney(
+                            item.max_price
+                          )}`
+                    }</div>
+                    <div style="font-size: 13px; color: #6b7280;">Лотов: ${
+                      item.lots
+                    } · не продано: ${
+          item.lots_unsold
+        } · продаваемость: ${formatShare(item.sell_through)}</div>
+                    <div style="margin: 8px 0;">${renderSparkline(
+                      item.price_series
+                    )}</div>
+                    ${renderHistogram(item.drop_histogram)}
+                </div>
+            `
+      )
+      .join("");
+  }
+
+  // Загружает статистику
+  async function loadStatistics() {
+    try {
+      const response = await fetch(statisticsUrl);
+      const stats = await response.json();
+
+      gameStatusEl.textContent = getStatusText(
+        stats.game_info && stats.game_info.status
+      );
+      totalProfitEl.textContent = formatMoney(stats.total_profit || 0);
+      totalPurchasesEl.textContent = stats.total_purchases || 0;
+      bestPlayerEl.textContent = stats.best_player || "-";
+      renderRanking(stats.players);
+      renderProducts(stats.products);
+      renderMarket(stats.market);
+    } catch (error) {
+      console.error("Ошибка загрузки статистики:", error);
+      gameStatusEl.textContent = "Ошибка загрузки";
+    }
+  }
+
+  refreshBtn.addEventListener("click", loadStatistics);
+  loadStatistics();
+});